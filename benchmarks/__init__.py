@@ -0,0 +1,35 @@
+"""
+Benchmarks de Weather CLI contra un OpenWeatherMap local.
+
+Los tests mockean la red, así que no dicen nada del rendimiento. Este paquete
+levanta StubWeatherServer (tests/fixtures/http_server.py), que sirve las
+respuestas de tests/fixtures/api_responses.py con latencia, jitter y tasa de
+errores configurables, y mide:
+
+    single   Consultas secuenciales con WeatherService (get + parse).
+    batch    fetch_many() con un pool de hilos, como el modo --cities-file.
+    async    AsyncWeatherService.get_many() (requiere aiohttp).
+    pipeline get_weather → parse → format_weather, con pico de memoria.
+    parse    Micro-benchmark de WeatherService.parse_weather_data().
+    format   Micro-benchmark de WeatherFormatter.format_weather().
+    startup  Arranque en frío del CLI (proceso nuevo que importa src.main).
+
+Los escenarios end-to-end informan throughput y latencias p50/p95/p99; los
+micro-benchmarks, nanosegundos por llamada. El resultado es un documento JSON
+para comparar cambios en los caminos calientes sin tocar la API real ni
+gastar cuota. benchmarks.regression lo guarda como baseline y detecta
+regresiones contra él.
+
+Note:
+    El servidor local corre en el mismo proceso y compite por el GIL con los
+    hilos del escenario batch. Los números sirven para comparar dos
+    versiones del código en la misma máquina, no como capacidad absoluta.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks                                  # todo, JSON a stdout
+    python -m benchmarks --output resultados.json
+    python -m benchmarks --scenarios single,batch --latency 20 --jitter 5
+    python -m benchmarks --error-rate 0.05 --requests 1000 --workers 32
+    python -m benchmarks --save-baseline main            # guardar baseline
+    python -m benchmarks --compare main                  # 1 si hay regresiones
+"""
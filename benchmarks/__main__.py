@@ -0,0 +1,8 @@
+"""Permite ejecutar los benchmarks con `python -m benchmarks`."""
+
+import sys
+
+from benchmarks.suite import main
+
+if __name__ == "__main__":
+    sys.exit(main())
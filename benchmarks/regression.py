@@ -0,0 +1,513 @@
+"""
+Baselines guardados y detección de regresiones de rendimiento.
+
+Un baseline es un documento de resultados de `python -m benchmarks` guardado
+con un nombre (por defecto en .benchmarks/<nombre>.json). compare() enfrenta
+una corrida nueva con un baseline métrica por métrica:
+
+    throughput   RPS de los escenarios end-to-end (más es mejor).
+    latency      p50/p95/p99 de los escenarios end-to-end.
+    micro        Nanosegundos por llamada de parse y format.
+    startup      Arranque en frío del CLI (mediana en ms).
+    memory       Pico de memoria del pipeline y RSS del arranque.
+
+Una métrica es una regresión si empeora más que su tolerancia (relativa,
+por tipo) y, cuando hay muestras suficientes de ambos lados, si además la
+diferencia es estadísticamente significativa: test de Mann-Whitney U de una
+cola sobre las muestras crudas con nivel alpha, como hace asv. Así el ruido
+de una máquina compartida no rompe el CI, pero un empeoramiento consistente
+sí. Mann-Whitney compara distribuciones completas y no ve una cola que
+empeora si el resto no se mueve, así que p95 y p99 usan en cambio un
+bootstrap de la diferencia del percentil. Las métricas de memoria y las que
+tienen menos de MIN_SAMPLES muestras se juzgan solo por la tolerancia.
+
+Uso:
+    python -m benchmarks --save-baseline main            # guardar
+    python -m benchmarks --compare main                  # medir y comparar
+    python -m benchmarks.regression main actual.json     # comparar dos documentos
+    python -m benchmarks.regression base.json actual.json --tolerance latency=0.25
+
+El código de salida es 1 si hay alguna regresión.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import re
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from src.latency import percentile
+
+# Directorio por defecto de los baselines (relativo al directorio actual)
+DEFAULT_BASELINE_DIR = ".benchmarks"
+
+# Empeoramiento relativo tolerado por tipo de métrica (0.10 = 10 %)
+DEFAULT_TOLERANCES: Dict[str, float] = {
+    "throughput": 0.10,
+    "latency": 0.15,
+    "micro": 0.10,
+    "startup": 0.20,
+    "memory": 0.10,
+}
+
+# Nivel de significancia del test de Mann-Whitney
+DEFAULT_ALPHA = 0.01
+
+# Muestras mínimas por lado para exigir significancia estadística. Con menos
+# de 5 por lado el test no puede bajar de alpha = 0.01 ni con las muestras
+# completamente separadas
+MIN_SAMPLES = 5
+
+# Remuestreos del bootstrap de los percentiles altos. Con 1000 el p-valor
+# mínimo es ~0.001, por debajo de DEFAULT_ALPHA
+BOOTSTRAP_RESAMPLES = 1000
+
+_BASELINE_NAME = re.compile(r"^[A-Za-z0-9._-]+$")
+
+
+@dataclass
+class Metric:
+    """
+    Una métrica extraída de un documento de resultados.
+
+    Attributes:
+        kind (str): Tipo de métrica (una clave de DEFAULT_TOLERANCES).
+        value (float): Valor resumen comparado.
+        samples (Sequence[float]): Muestras crudas para el test estadístico
+            (vacío si la métrica no tiene).
+        higher_is_better (bool): True para throughput.
+        quantile (Optional[float]): Percentil que resume `value` (0.95,
+            0.99) cuando se testea con bootstrap en vez de Mann-Whitney.
+    """
+
+    kind: str
+    value: float
+    samples: Sequence[float] = ()
+    higher_is_better: bool = False
+    quantile: Optional[float] = None
+
+
+@dataclass
+class Comparison:
+    """
+    Resultado de comparar una métrica contra el baseline.
+
+    Attributes:
+        scenario (str): Escenario del benchmark.
+        metric (str): Nombre de la métrica dentro del escenario.
+        kind (str): Tipo de métrica.
+        baseline (float): Valor del baseline.
+        current (float): Valor de la corrida actual.
+        change (float): Empeoramiento relativo (positivo = peor, negativo =
+            mejor), independiente de si la métrica crece o decrece.
+        p_value (Optional[float]): p-valor de que la corrida actual sea
+            peor, o None si no hay muestras suficientes.
+        status (str): "regression", "noise" (supera la tolerancia sin
+            significancia), "improvement" u "ok".
+    """
+
+    scenario: str
+    metric: str
+    kind: str
+    baseline: float
+    current: float
+    change: float
+    p_value: Optional[float]
+    status: str
+
+
+def mann_whitney_greater(reference: Sequence[float], candidate: Sequence[float]) -> float:
+    """
+    p-valor de una cola de que `candidate` tienda a ser mayor que `reference`.
+
+    Test U de Mann-Whitney con aproximación normal, corrección por empates y
+    por continuidad. No asume normalidad, lo que importa con latencias (colas
+    largas) y con tiempos medidos en máquinas compartidas.
+
+    Args:
+        reference (Sequence[float]): Muestras del baseline.
+        candidate (Sequence[float]): Muestras de la corrida actual.
+
+    Returns:
+        float: p-valor entre 0 y 1 (1.0 si alguna muestra está vacía o
+            todos los valores son iguales).
+    """
+    n_ref, n_cand = len(reference), len(candidate)
+    if not n_ref or not n_cand:
+        return 1.0
+
+    # Rangos promedio sobre la muestra combinada (los empates comparten rango)
+    combined = sorted([(value, 0) for value in reference] + [(value, 1) for value in candidate])
+    total = len(combined)
+    rank_sum = 0.0
+    tie_term = 0.0
+    index = 0
+    while index < total:
+        end = index
+        while end + 1 < total and combined[end + 1][0] == combined[index][0]:
+            end += 1
+        average_rank = (index + end) / 2 + 1
+        ties = end - index + 1
+        tie_term += ties ** 3 - ties
+        rank_sum += average_rank * sum(1 for _, group in combined[index:end + 1] if group)
+        index = end + 1
+
+    u_candidate = rank_sum - n_cand * (n_cand + 1) / 2
+    mean = n_ref * n_cand / 2
+    variance = n_ref * n_cand / 12 * ((total + 1) - tie_term / (total * (total - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u_candidate - mean - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def bootstrap_percentile_greater(
+    reference: Sequence[float],
+    candidate: Sequence[float],
+    q: float,
+    resamples: int = BOOTSTRAP_RESAMPLES,
+    seed: int = 0,
+) -> float:
+    """
+    p-valor de una cola de que el percentil `q` de `candidate` sea mayor.
+
+    Remuestrea ambos lados con reposición y cuenta en qué fracción de los
+    remuestreos el percentil de la candidata no supera al del baseline. A
+    diferencia de Mann-Whitney detecta cambios solo en la cola (unas pocas
+    consultas mucho más lentas). La semilla fija hace el resultado
+    reproducible entre corridas del gate.
+
+    Args:
+        reference (Sequence[float]): Muestras del baseline.
+        candidate (Sequence[float]): Muestras de la corrida actual.
+        q (float): Percentil entre 0 y 1 (por ejemplo 0.99).
+        resamples (int): Cantidad de remuestreos.
+        seed (int): Semilla del generador.
+
+    Returns:
+        float: p-valor entre 0 y 1 (1.0 si alguna muestra está vacía).
+    """
+    if not reference or not candidate:
+        return 1.0
+    rng = random.Random(seed)
+    not_greater = 0
+    for _ in range(resamples):
+        before = percentile(sorted(rng.choices(reference, k=len(reference))), q)
+        after = percentile(sorted(rng.choices(candidate, k=len(candidate))), q)
+        if after <= before:
+            not_greater += 1
+    return (not_greater + 1) / (resamples + 1)
+
+
+def extract_metrics(document: Mapping[str, Any]) -> Dict[Tuple[str, str], Metric]:
+    """
+    Extrae las métricas comparables de un documento de resultados.
+
+    Args:
+        document (Mapping[str, Any]): Documento de run_suite().
+
+    Returns:
+        Dict[Tuple[str, str], Metric]: (escenario, métrica) -> Metric. Los
+            escenarios omitidos (por ejemplo async sin aiohttp) no aportan
+            métricas.
+    """
+    metrics: Dict[Tuple[str, str], Metric] = {}
+    for scenario, result in document.get("results", {}).items():
+        if "skipped" in result:
+            continue
+        samples = result.get("samples", {})
+
+        if "throughput_rps" in result and result["throughput_rps"] is not None:
+            metrics[(scenario, "throughput_rps")] = Metric(
+                "throughput", result["throughput_rps"], samples.get("throughput_rps", ()), True
+            )
+        if "latency_ms" in result:
+            for name, quantile in (("p50", None), ("p95", 0.95), ("p99", 0.99)):
+                value = result["latency_ms"].get(name)
+                if value is not None:
+                    metrics[(scenario, f"latency_{name}_ms")] = Metric(
+                        "latency", value, samples.get("latency_ms", ()), quantile=quantile
+                    )
+        if "median_ns" in result:
+            metrics[(scenario, "ns_per_call")] = Metric(
+                "micro", result["median_ns"], samples.get("ns_per_call", ())
+            )
+        if "startup_ms" in result and result["startup_ms"].get("p50") is not None:
+            metrics[(scenario, "startup_p50_ms")] = Metric(
+                "startup", result["startup_ms"]["p50"], samples.get("startup_ms", ())
+            )
+        for name in ("memory_peak_kb", "rss_mb"):
+            if result.get(name) is not None:
+                metrics[(scenario, name)] = Metric("memory", result[name])
+    return metrics
+
+
+def compare(
+    baseline: Mapping[str, Any],
+    current: Mapping[str, Any],
+    tolerances: Optional[Mapping[str, float]] = None,
+    alpha: float = DEFAULT_ALPHA,
+) -> List[Comparison]:
+    """
+    Compara una corrida con un baseline métrica por métrica.
+
+    Solo se comparan las métricas presentes en ambos documentos.
+
+    Args:
+        baseline (Mapping[str, Any]): Documento del baseline.
+        current (Mapping[str, Any]): Documento de la corrida actual.
+        tolerances (Optional[Mapping[str, float]]): Tolerancias por tipo que
+            reemplazan a las de DEFAULT_TOLERANCES.
+        alpha (float): Nivel de significancia.
+
+    Returns:
+        List[Comparison]: Una comparación por métrica, en orden de escenario.
+    """
+    limits = dict(DEFAULT_TOLERANCES)
+    limits.update(tolerances or {})
+    before = extract_metrics(baseline)
+    after = extract_metrics(current)
+
+    comparisons = []
+    for key, old in before.items():
+        new = after.get(key)
+        if new is None or not old.value:
+            continue
+
+        # El test pregunta si `candidate` es mayor que `reference`: para
+        # throughput empeorar es bajar, así que los roles se invierten
+        if old.higher_is_better:
+            change = (old.value - new.value) / old.value
+            reference, candidate = new.samples, old.samples
+        else:
+            change = (new.value - old.value) / old.value
+            reference, candidate = old.samples, new.samples
+
+        p_value = None
+        if old.kind != "memory" and min(len(old.samples), len(new.samples)) >= MIN_SAMPLES:
+            if old.quantile is not None:
+                p_value = bootstrap_percentile_greater(reference, candidate, old.quantile)
+            else:
+                p_value = mann_whitney_greater(reference, candidate)
+
+        tolerance = limits[old.kind]
+        if change > tolerance:
+            significant = p_value is None or p_value < alpha
+            status = "regression" if significant else "noise"
+        elif change < -tolerance:
+            status = "improvement"
+        else:
+            status = "ok"
+
+        comparisons.append(Comparison(
+            scenario=key[0],
+            metric=key[1],
+            kind=old.kind,
+            baseline=old.value,
+            current=new.value,
+            change=round(change, 4),
+            p_value=None if p_value is None else round(p_value, 6),
+            status=status,
+        ))
+    return comparisons
+
+
+def compatibility_warnings(baseline: Mapping[str, Any], current: Mapping[str, Any]) -> List[str]:
+    """
+    Diferencias de entorno u opciones que vuelven dudosa la comparación.
+
+    Returns:
+        List[str]: Un aviso por diferencia (vacío si son comparables).
+    """
+    warnings = []
+    if baseline.get("schema") != current.get("schema"):
+        warnings.append(
+            f"Versión de formato distinta: {baseline.get('schema')} vs {current.get('schema')}"
+        )
+    for section in ("environment", "options"):
+        old, new = baseline.get(section, {}), current.get(section, {})
+        for key in sorted(set(old) | set(new)):
+            if old.get(key) != new.get(key):
+                warnings.append(f"{section}.{key} distinto: {old.get(key)!r} vs {new.get(key)!r}")
+    return warnings
+
+
+def format_comparisons(comparisons: Iterable[Comparison]) -> str:
+    """
+    Formatea las comparaciones como tabla de texto.
+
+    Args:
+        comparisons (Iterable[Comparison]): Resultado de compare().
+
+    Returns:
+        str: Una fila por métrica con baseline, actual, cambio, p-valor y estado.
+    """
+    lines = [
+        f"{'Escenario':<10}{'Métrica':<20}{'Baseline':>12}{'Actual':>12}"
+        f"{'Cambio':>9}{'p':>9}  Estado"
+    ]
+    for item in comparisons:
+        p_value = "-" if item.p_value is None else f"{item.p_value:.3f}"
+        lines.append(
+            f"{item.scenario:<10}{item.metric:<20}{item.baseline:>12g}{item.current:>12g}"
+            f"{item.change:>+9.1%}{p_value:>9}  {item.status}"
+        )
+    return "\n".join(lines)
+
+
+def parse_tolerances(values: Iterable[str]) -> Dict[str, float]:
+    """
+    Interpreta tolerancias "tipo=valor" de la línea de comandos.
+
+    Args:
+        values (Iterable[str]): Por ejemplo ["latency=0.25", "memory=0.05"].
+
+    Returns:
+        Dict[str, float]: Tolerancias por tipo.
+
+    Raises:
+        ValueError: Si el tipo no existe o el valor no es un número >= 0.
+    """
+    tolerances = {}
+    for value in values:
+        kind, _, number = value.partition("=")
+        if kind not in DEFAULT_TOLERANCES:
+            raise ValueError(
+                f"Tipo de métrica desconocido: {kind!r} "
+                f"(válidos: {', '.join(DEFAULT_TOLERANCES)})"
+            )
+        try:
+            tolerance = float(number)
+        except ValueError:
+            raise ValueError(f"Tolerancia inválida: {value!r}")
+        if tolerance < 0:
+            raise ValueError(f"La tolerancia no puede ser negativa: {value!r}")
+        tolerances[kind] = tolerance
+    return tolerances
+
+
+def baseline_path(name: str, directory: str = DEFAULT_BASELINE_DIR) -> str:
+    """
+    Ruta del archivo de un baseline.
+
+    Raises:
+        ValueError: Si el nombre tiene caracteres fuera de [A-Za-z0-9._-].
+    """
+    if not _BASELINE_NAME.match(name):
+        raise ValueError(f"Nombre de baseline inválido: {name!r}")
+    return os.path.join(directory, f"{name}.json")
+
+
+def save_baseline(
+    document: Mapping[str, Any], name: str, directory: str = DEFAULT_BASELINE_DIR
+) -> str:
+    """
+    Guarda un documento de resultados como baseline (reemplaza el anterior).
+
+    Returns:
+        str: Ruta del archivo escrito.
+    """
+    path = baseline_path(name, directory)
+    os.makedirs(directory, exist_ok=True)
+    # Escritura atómica: un CI cortado a mitad no deja un baseline truncado
+    partial = f"{path}.tmp"
+    with open(partial, "w", encoding="utf-8") as output:
+        json.dump(document, output, indent=2, ensure_ascii=False)
+    os.replace(partial, path)
+    return path
+
+
+def load_document(reference: str, directory: str = DEFAULT_BASELINE_DIR) -> Dict[str, Any]:
+    """
+    Carga un documento desde una ruta existente o por nombre de baseline.
+
+    Args:
+        reference (str): Ruta a un JSON o nombre de un baseline guardado.
+        directory (str): Directorio de los baselines.
+
+    Raises:
+        FileNotFoundError: Si no existe ni el archivo ni el baseline.
+        ValueError: Si el archivo no es JSON válido.
+    """
+    path = reference if os.path.isfile(reference) else baseline_path(reference, directory)
+    with open(path, encoding="utf-8") as stream:
+        return json.load(stream)
+
+
+def report(
+    baseline: Mapping[str, Any],
+    current: Mapping[str, Any],
+    tolerances: Optional[Mapping[str, float]] = None,
+    alpha: float = DEFAULT_ALPHA,
+    stream: Any = None,
+) -> int:
+    """
+    Compara, imprime avisos y tabla, y devuelve el código de salida.
+
+    Returns:
+        int: 1 si hay alguna regresión, 0 si no.
+    """
+    stream = stream if stream is not None else sys.stdout
+    for warning in compatibility_warnings(baseline, current):
+        print(f"Aviso: {warning}", file=stream)
+    comparisons = compare(baseline, current, tolerances, alpha)
+    print(format_comparisons(comparisons), file=stream)
+    regressions = [item for item in comparisons if item.status == "regression"]
+    if regressions:
+        print(f"\n{len(regressions)} regresión(es) de rendimiento.", file=stream)
+        return 1
+    print("\nSin regresiones de rendimiento.", file=stream)
+    return 0
+
+
+def add_comparison_arguments(parser: argparse.ArgumentParser) -> None:
+    """Agrega --tolerance, --alpha y --baseline-dir a un parser."""
+    parser.add_argument(
+        "--tolerance",
+        action="append",
+        default=[],
+        metavar="TIPO=VALOR",
+        help=(
+            "Empeoramiento relativo tolerado por tipo de métrica, repetible "
+            f"(default: {', '.join(f'{k}={v}' for k, v in DEFAULT_TOLERANCES.items())})."
+        ),
+    )
+    parser.add_argument("--alpha", type=float, default=DEFAULT_ALPHA,
+                        help=f"Nivel de significancia (default: {DEFAULT_ALPHA}).")
+    parser.add_argument("--baseline-dir", default=DEFAULT_BASELINE_DIR,
+                        help=f"Directorio de baselines (default: {DEFAULT_BASELINE_DIR}).")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Punto de entrada de `python -m benchmarks.regression BASELINE ACTUAL`.
+
+    Returns:
+        int: 0 sin regresiones, 1 con regresiones, 2 si los argumentos o
+            los documentos son inválidos.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.regression",
+        description="Compara dos corridas de benchmarks y detecta regresiones.",
+    )
+    parser.add_argument("baseline", help="Nombre de baseline o ruta a un JSON.")
+    parser.add_argument("current", help="Nombre de baseline o ruta a un JSON.")
+    add_comparison_arguments(parser)
+    args = parser.parse_args(argv)
+
+    try:
+        tolerances = parse_tolerances(args.tolerance)
+        baseline = load_document(args.baseline, args.baseline_dir)
+        current = load_document(args.current, args.baseline_dir)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    return report(baseline, current, tolerances, args.alpha)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
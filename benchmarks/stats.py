@@ -0,0 +1,83 @@
+"""
+Resumen estadístico de las mediciones de los benchmarks.
+
+Los percentiles usan el mismo método nearest-rank que los histogramas de
+latencia del servicio (src.latency.latency_summary), así los números de un
+benchmark se pueden comparar con los de latency_stats() y con el load test.
+"""
+
+import statistics
+import time
+from typing import Any, Callable, Dict, Mapping, Sequence
+
+from src.latency import latency_summary
+
+
+def summarize(
+    latencies: Sequence[float], elapsed: float, errors: Mapping[str, int]
+) -> Dict[str, Any]:
+    """
+    Resume un escenario end-to-end.
+
+    Args:
+        latencies (Sequence[float]): Duración de cada consulta en segundos
+            (incluidas las que fallaron).
+        elapsed (float): Duración total del escenario en segundos.
+        errors (Mapping[str, int]): Cantidad de errores por clase de excepción.
+
+    Returns:
+        Dict[str, Any]: requests, errors, error_count, elapsed_s,
+            throughput_rps y latency_ms (p50, p95, p99, mean y max).
+    """
+    return {
+        "requests": len(latencies),
+        "errors": dict(errors),
+        "error_count": sum(errors.values()),
+        "elapsed_s": round(elapsed, 6),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed > 0 else None,
+        "latency_ms": latency_summary(latencies),
+    }
+
+
+def micro(
+    func: Callable[[Any], Any], arg: Any, iterations: int, repeat: int = 5
+) -> Dict[str, Any]:
+    """
+    Mide el costo por llamada de una función con un argumento.
+
+    Cada repetición llama a la función `iterations` veces seguidas; el mejor
+    valor es el más representativo del costo propio (las demás incluyen
+    ruido del sistema) y la mediana muestra la dispersión.
+
+    Args:
+        func (Callable[[Any], Any]): Función a medir.
+        arg (Any): Argumento con el que se la llama.
+        iterations (int): Llamadas por repetición.
+        repeat (int): Cantidad de repeticiones.
+
+    Returns:
+        Dict[str, Any]: iterations, repeat, best_ns, median_ns, ops_per_s y
+            samples.ns_per_call (una muestra por repetición).
+
+    Raises:
+        ValueError: Si iterations o repeat son menores a 1.
+    """
+    if iterations < 1 or repeat < 1:
+        raise ValueError("iterations y repeat deben ser mayores a 0")
+
+    per_call = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for _ in range(iterations):
+            func(arg)
+        per_call.append((time.perf_counter_ns() - start) / iterations)
+
+    best = min(per_call)
+    return {
+        "iterations": iterations,
+        "repeat": repeat,
+        "best_ns": round(best, 1),
+        "median_ns": round(statistics.median(per_call), 1),
+        "ops_per_s": round(1e9 / best, 1) if best > 0 else None,
+        "samples": {"ns_per_call": [round(value, 1) for value in per_call]},
+    }
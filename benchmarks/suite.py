@@ -0,0 +1,493 @@
+"""
+Escenarios de benchmark y CLI (`python -m benchmarks`).
+
+Cada escenario recibe las opciones de la corrida y devuelve un diccionario
+serializable a JSON. run_suite() levanta un único StubWeatherServer, apunta
+Config.BASE_URL a él mientras corren los escenarios y arma el documento
+final con los metadatos del entorno (versión de Python, backend JSON).
+
+Los escenarios end-to-end se repiten `repeat` veces y guardan las muestras
+crudas (latencia de cada consulta y throughput de cada repetición) para que
+benchmarks.regression pueda decidir si una diferencia es significativa.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+from benchmarks import regression
+from benchmarks.stats import micro, summarize
+from src import fast_json
+from src.batch import fetch_many
+from src.config import Config
+from src.exceptions import ConfigurationException
+from src.latency import latency_summary
+from src.models import WeatherReading
+from src.weather_formatter import WeatherFormatter
+from src.weather_service import WeatherService
+from tests.fixtures.api_responses import get_madrid_response
+from tests.fixtures.http_server import StubWeatherServer
+
+# Versión del formato del documento JSON de resultados (2: muestras crudas)
+SCHEMA_VERSION = 2
+
+# Raíz del proyecto, desde donde se mide el arranque del CLI
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Consultas del pipeline medidas con tracemalloc (que lo hace varias veces
+# más lento, por eso se mide aparte y sobre menos consultas)
+MEMORY_PROBE_REQUESTS = 50
+
+
+@dataclass
+class BenchmarkOptions:
+    """
+    Parámetros de una corrida de benchmarks.
+
+    Attributes:
+        requests (int): Consultas por escenario end-to-end.
+        workers (int): Concurrencia de los escenarios batch y async.
+        latency_ms (float): Demora media del servidor local.
+        jitter_ms (float): Variación máxima de la demora.
+        error_rate (float): Fracción de respuestas 500 del servidor local.
+        iterations (int): Llamadas por repetición de los micro-benchmarks.
+        repeat (int): Repeticiones de cada escenario end-to-end.
+        startup_runs (int): Arranques en frío del CLI a medir.
+        seed (Optional[int]): Semilla de demoras y errores del servidor.
+    """
+
+    requests: int = 200
+    workers: int = 16
+    latency_ms: float = 5.0
+    jitter_ms: float = 2.0
+    error_rate: float = 0.0
+    iterations: int = 20000
+    repeat: int = 5
+    startup_runs: int = 10
+    seed: Optional[int] = 1
+
+
+class Run(NamedTuple):
+    """Mediciones crudas de una repetición de un escenario end-to-end."""
+
+    latencies: List[float]
+    elapsed: float
+    errors: Counter
+
+
+def benchmark_routes(count: int) -> Dict[str, Any]:
+    """
+    Rutas del servidor local: `count` ciudades distintas con la respuesta de Madrid.
+
+    Ciudades distintas evitan que el coalescing single-flight junte
+    consultas concurrentes y mida menos peticiones de las pedidas.
+    """
+    routes = {}
+    for index in range(count):
+        body = get_madrid_response()
+        body["name"] = f"Ciudad {index}"
+        routes[body["name"]] = (200, body)
+    return routes
+
+
+@contextmanager
+def pointed_at(server: StubWeatherServer) -> Iterator[None]:
+    """Apunta Config al servidor local mientras dura el bloque."""
+    previous = (Config.BASE_URL, Config.API_KEY)
+    Config.BASE_URL, Config.API_KEY = server.base_url, "benchmark"
+    try:
+        yield
+    finally:
+        Config.BASE_URL, Config.API_KEY = previous
+
+
+class _TimedService:
+    """
+    Envoltorio de WeatherService que mide cada get_weather() + parse_weather_data().
+
+    fetch_many() llama a ambos métodos desde los hilos del pool; el inicio
+    de cada consulta se guarda por hilo y la duración se registra al
+    terminar el parseo o al fallar la consulta.
+    """
+
+    def __init__(self, service: WeatherService):
+        self._service = service
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.latencies: List[float] = []
+        self.errors: Counter = Counter()
+
+    def get_weather(self, city: str) -> Dict[str, Any]:
+        self._local.start = time.perf_counter()
+        try:
+            return self._service.get_weather(city)
+        except Exception as e:
+            self._finish(type(e).__name__)
+            raise
+
+    def parse_weather_data(self, data: Dict[str, Any]) -> WeatherReading:
+        try:
+            return self._service.parse_weather_data(data)
+        finally:
+            self._finish(None)
+
+    def _finish(self, error: Optional[str]) -> None:
+        elapsed = time.perf_counter() - self._local.start
+        with self._lock:
+            self.latencies.append(elapsed)
+            if error is not None:
+                self.errors[error] += 1
+
+
+def bench_single(cities: Sequence[str], options: BenchmarkOptions) -> Run:
+    """Consultas secuenciales: latencia sin contención, una conexión keep-alive."""
+    with WeatherService(skip_validation=True) as service:
+        timed = _TimedService(service)
+        start = time.perf_counter()
+        for city in cities:
+            try:
+                timed.parse_weather_data(timed.get_weather(city))
+            except Exception:  # noqa: BLE001 - ya contado por _TimedService
+                pass
+        elapsed = time.perf_counter() - start
+    return Run(timed.latencies, elapsed, timed.errors)
+
+
+def bench_batch(cities: Sequence[str], options: BenchmarkOptions) -> Run:
+    """fetch_many() con `workers` hilos, como el modo batch del CLI."""
+    with WeatherService(skip_validation=True, pool_maxsize=options.workers) as service:
+        timed = _TimedService(service)
+        start = time.perf_counter()
+        for _ in fetch_many(timed, cities, options.workers):
+            pass
+        elapsed = time.perf_counter() - start
+    return Run(timed.latencies, elapsed, timed.errors)
+
+
+def _pipeline(service: WeatherService, city: str) -> str:
+    """El camino completo del CLI interactivo: consulta, parseo y formato."""
+    return WeatherFormatter.format_weather(
+        service.parse_weather_data(service.get_weather(city))
+    )
+
+
+def bench_pipeline(cities: Sequence[str], options: BenchmarkOptions) -> Run:
+    """get_weather() → parse_weather_data() → format_weather(), secuencial."""
+    latencies: List[float] = []
+    errors: Counter = Counter()
+    with WeatherService(skip_validation=True) as service:
+        start = time.perf_counter()
+        for city in cities:
+            started = time.perf_counter()
+            try:
+                _pipeline(service, city)
+            except Exception as e:  # noqa: BLE001 - se cuenta por clase
+                errors[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - started)
+        elapsed = time.perf_counter() - start
+    return Run(latencies, elapsed, errors)
+
+
+def pipeline_memory_peak(cities: Sequence[str]) -> int:
+    """Pico de memoria asignada (bytes, según tracemalloc) del pipeline."""
+    tracemalloc.start()
+    try:
+        with WeatherService(skip_validation=True) as service:
+            for city in cities[:MEMORY_PROBE_REQUESTS]:
+                try:
+                    _pipeline(service, city)
+                except Exception:  # noqa: BLE001 - solo interesa la memoria
+                    pass
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_async(cities: Sequence[str], options: BenchmarkOptions) -> Run:
+    """
+    AsyncWeatherService con `workers` consultas en vuelo.
+
+    Cada una de las `workers` corrutinas toma la siguiente ciudad al
+    terminar la anterior, así la latencia medida es la de la consulta y no
+    incluye la espera en el semáforo (igual que en el escenario batch).
+    """
+    from src.async_weather_service import AsyncWeatherService
+
+    latencies: List[float] = []
+    errors: Counter = Counter()
+
+    async def worker(service: AsyncWeatherService, pending: Iterator[str]) -> None:
+        for city in pending:
+            start = time.perf_counter()
+            try:
+                service.parse_weather_data(await service.get_weather(city))
+            except Exception as e:  # noqa: BLE001 - se cuenta por clase
+                errors[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - start)
+
+    async def run() -> float:
+        async with AsyncWeatherService(
+            skip_validation=True, max_concurrency=options.workers
+        ) as service:
+            pending = iter(cities)
+            start = time.perf_counter()
+            await asyncio.gather(*(worker(service, pending) for _ in range(options.workers)))
+            return time.perf_counter() - start
+
+    # Sin aiohttp lanza ConfigurationException y run_end_to_end() informa
+    # el escenario como omitido
+    elapsed = asyncio.run(run())
+    return Run(latencies, elapsed, errors)
+
+
+def run_end_to_end(
+    scenario: Callable[[Sequence[str], BenchmarkOptions], Run],
+    cities: Sequence[str],
+    options: BenchmarkOptions,
+) -> Dict[str, Any]:
+    """
+    Repite un escenario end-to-end y resume todas las repeticiones juntas.
+
+    Returns:
+        Dict[str, Any]: El resumen de summarize() más runs y samples
+            (latency_ms de cada consulta y throughput_rps de cada repetición),
+            o {"skipped": motivo} si falta una dependencia opcional.
+    """
+    runs: List[Run] = []
+    try:
+        for _ in range(options.repeat):
+            runs.append(scenario(cities, options))
+    except ConfigurationException as e:
+        return {"skipped": str(e).splitlines()[0]}
+
+    latencies = [latency for run in runs for latency in run.latencies]
+    errors: Counter = sum((run.errors for run in runs), Counter())
+    result = summarize(latencies, sum(run.elapsed for run in runs), errors)
+    result["runs"] = len(runs)
+    result["samples"] = {
+        "latency_ms": [round(latency * 1000, 3) for latency in latencies],
+        "throughput_rps": [
+            round(len(run.latencies) / run.elapsed, 2) for run in runs if run.elapsed > 0
+        ],
+    }
+    return result
+
+
+def bench_parse(options: BenchmarkOptions) -> Dict[str, Any]:
+    """Costo de WeatherService.parse_weather_data() sobre una respuesta ya decodificada."""
+    service = WeatherService(skip_validation=True)
+    return micro(service.parse_weather_data, get_madrid_response(), options.iterations)
+
+
+def bench_format(options: BenchmarkOptions) -> Dict[str, Any]:
+    """Costo de WeatherFormatter.format_weather() sobre una lectura parseada."""
+    reading = WeatherReading.from_api(get_madrid_response())
+    return micro(WeatherFormatter.format_weather, reading, options.iterations)
+
+
+def bench_startup(options: BenchmarkOptions) -> Dict[str, Any]:
+    """
+    Arranque en frío del CLI: un intérprete nuevo que importa src.main.
+
+    Mide el tiempo de pared de cada proceso (intérprete + imports) y la
+    memoria residente máxima de los procesos hijos.
+    """
+    import resource
+
+    command = [sys.executable, "-c", "import src.main"]
+    samples: List[float] = []
+    for _ in range(options.startup_runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=PROJECT_ROOT, check=True, capture_output=True)
+        samples.append(time.perf_counter() - start)
+
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss está en KiB en Linux y en bytes en macOS
+    rss_bytes = peak if sys.platform == "darwin" else peak * 1024
+    return {
+        "runs": len(samples),
+        "startup_ms": latency_summary(samples),
+        "rss_mb": round(rss_bytes / (1024 * 1024), 1),
+        "samples": {"startup_ms": [round(sample * 1000, 3) for sample in samples]},
+    }
+
+
+# Escenarios que necesitan el servidor local (reciben la lista de ciudades)
+END_TO_END: Dict[str, Callable[[Sequence[str], BenchmarkOptions], Run]] = {
+    "single": bench_single,
+    "batch": bench_batch,
+    "async": bench_async,
+    "pipeline": bench_pipeline,
+}
+
+# Escenarios sin red: micro-benchmarks y arranque del CLI
+LOCAL: Dict[str, Callable[[BenchmarkOptions], Dict[str, Any]]] = {
+    "parse": bench_parse,
+    "format": bench_format,
+    "startup": bench_startup,
+}
+
+SCENARIOS = tuple(END_TO_END) + tuple(LOCAL)
+
+
+def run_suite(
+    options: BenchmarkOptions, scenarios: Sequence[str] = SCENARIOS
+) -> Dict[str, Any]:
+    """
+    Ejecuta los escenarios pedidos y arma el documento de resultados.
+
+    Args:
+        options (BenchmarkOptions): Parámetros de la corrida.
+        scenarios (Sequence[str]): Nombres de SCENARIOS a ejecutar.
+
+    Returns:
+        Dict[str, Any]: Documento con schema, created, environment, options
+            y results (un diccionario por escenario).
+
+    Raises:
+        ValueError: Si un escenario no existe.
+    """
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        raise ValueError(f"Escenarios desconocidos: {', '.join(unknown)}")
+
+    results: Dict[str, Any] = {}
+    if any(name in END_TO_END for name in scenarios):
+        cities = list(benchmark_routes(options.requests))
+        with StubWeatherServer(
+            routes=benchmark_routes(options.requests),
+            latency=options.latency_ms / 1000,
+            jitter=options.jitter_ms / 1000,
+            error_rate=options.error_rate,
+            seed=options.seed,
+        ) as server, pointed_at(server):
+            for name in scenarios:
+                if name in END_TO_END:
+                    results[name] = run_end_to_end(END_TO_END[name], cities, options)
+            if "pipeline" in results:
+                results["pipeline"]["memory_peak_kb"] = round(
+                    pipeline_memory_peak(cities) / 1024, 1
+                )
+
+    for name in scenarios:
+        if name in LOCAL:
+            results[name] = LOCAL[name](options)
+
+    return {
+        "schema": SCHEMA_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "json_backend": fast_json.BACKEND,
+        },
+        "options": asdict(options),
+        "results": results,
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Interpreta los argumentos de `python -m benchmarks`."""
+    defaults = BenchmarkOptions()
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmarks de Weather CLI contra un OpenWeatherMap local.",
+    )
+    parser.add_argument(
+        "--scenarios",
+        default=",".join(SCENARIOS),
+        help=f"Escenarios separados por coma (default: {','.join(SCENARIOS)}).",
+    )
+    parser.add_argument("--requests", type=int, default=defaults.requests,
+                        help="Consultas por escenario end-to-end.")
+    parser.add_argument("--workers", type=int, default=defaults.workers,
+                        help="Concurrencia de los escenarios batch y async.")
+    parser.add_argument("--latency", type=float, default=defaults.latency_ms,
+                        help="Demora media del servidor local en ms.")
+    parser.add_argument("--jitter", type=float, default=defaults.jitter_ms,
+                        help="Variación máxima de la demora en ms.")
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate,
+                        help="Fracción de respuestas 500 (0 a 1).")
+    parser.add_argument("--iterations", type=int, default=defaults.iterations,
+                        help="Llamadas por repetición de los micro-benchmarks.")
+    parser.add_argument("--repeat", type=int, default=defaults.repeat,
+                        help="Repeticiones de cada escenario end-to-end.")
+    parser.add_argument("--startup-runs", type=int, default=defaults.startup_runs,
+                        help="Arranques en frío del CLI a medir.")
+    parser.add_argument("--seed", type=int, default=defaults.seed,
+                        help="Semilla de demoras y errores del servidor.")
+    parser.add_argument("--output", default=None,
+                        help="Archivo JSON de resultados ('-' para stdout). Por defecto "
+                             "se escribe en stdout salvo con --compare o --save-baseline.")
+    parser.add_argument("--save-baseline", metavar="NOMBRE",
+                        help="Guarda los resultados como baseline con este nombre.")
+    parser.add_argument("--compare", metavar="NOMBRE",
+                        help="Compara los resultados con un baseline (nombre o ruta) y "
+                             "sale con 1 si hay regresiones.")
+    regression.add_comparison_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Punto de entrada de `python -m benchmarks`.
+
+    Returns:
+        int: 0 si la corrida terminó (sin regresiones si se pidió
+            --compare), 1 si hay regresiones, 2 si los argumentos o el
+            baseline son inválidos.
+    """
+    args = parse_args(argv)
+    options = BenchmarkOptions(
+        requests=args.requests,
+        workers=args.workers,
+        latency_ms=args.latency,
+        jitter_ms=args.jitter,
+        error_rate=args.error_rate,
+        iterations=args.iterations,
+        repeat=args.repeat,
+        startup_runs=args.startup_runs,
+        seed=args.seed,
+    )
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    try:
+        tolerances = regression.parse_tolerances(args.tolerance)
+        if args.save_baseline:
+            regression.baseline_path(args.save_baseline, args.baseline_dir)
+        # El baseline se carga antes de medir para fallar rápido si no existe
+        baseline = (
+            regression.load_document(args.compare, args.baseline_dir) if args.compare else None
+        )
+        document = run_suite(options, scenarios)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    output = args.output
+    if output is None and not (args.compare or args.save_baseline):
+        output = "-"
+    if output == "-":
+        sys.stdout.write(json.dumps(document, indent=2, ensure_ascii=False) + "\n")
+    elif output is not None:
+        with open(output, "w", encoding="utf-8") as stream:
+            json.dump(document, stream, indent=2, ensure_ascii=False)
+
+    if args.save_baseline:
+        path = regression.save_baseline(document, args.save_baseline, args.baseline_dir)
+        print(f"Baseline guardado en {path}", file=sys.stderr)
+    if baseline is not None:
+        return regression.report(baseline, document, tolerances, args.alpha)
+    return 0
@@ -12,7 +12,14 @@ El problema que resuelve:
     - Este script ejecuta "src.main" como módulo usando runpy.run_module()
 
 Uso:
-    python run.py
+    python run.py                              # Modo interactivo
+    python run.py --cities-file ciudades.txt   # Modo batch (una ciudad por línea)
+    cat ciudades.txt | python run.py --cities-file -
+    python run.py --cities-file ciudades.txt --format ndjson --output clima.ndjson
+    python run.py --cities-file ciudades.txt --metrics metricas.prom  # Fases por consulta
+    python run.py daemon                       # Proceso residente (socket Unix)
+    python run.py serve --port 8080            # Servidor HTTP/JSON
+    python run.py loadtest --mix "Madrid=3,Lima" --duration 30 --rate 50
 
 Alternativa:
     python -m src.main
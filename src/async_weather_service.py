@@ -0,0 +1,228 @@
+"""
+Cliente asíncrono (asyncio) para la API de OpenWeatherMap.
+
+AsyncWeatherService ofrece el mismo contrato que WeatherService
+(get_weather / parse_weather_data, mismas excepciones y mismo
+WeatherReading parseado) pero sobre un event loop de asyncio. Todas las consultas comparten
+un único pool de conexiones de aiohttp y un semáforo limita cuántas están en
+vuelo a la vez, así miles de ciudades no requieren miles de hilos.
+
+Dependencias:
+    aiohttp (opcional): solo se necesita para este cliente. Si no está
+    instalado, crear un AsyncWeatherService lanza ConfigurationException con
+    instrucciones de instalación; el resto del CLI sigue funcionando.
+
+Example:
+    >>> import asyncio
+    >>> async def consultar():
+    ...     async with AsyncWeatherService() as service:
+    ...         data = await service.get_weather("Madrid")
+    ...         return service.parse_weather_data(data)
+    >>> asyncio.run(consultar())["city"]
+    'Madrid'
+"""
+
+import asyncio
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - depende del entorno
+    aiohttp = None
+
+from . import fast_json
+from .batch import BatchResult
+from .config import Config
+from .exceptions import ConfigurationException, NetworkException, WeatherAPIException
+from .rate_limiter import parse_retry_after
+from .weather_service import WeatherService, raise_for_status
+
+
+class AsyncWeatherService:
+    """
+    Servicio asíncrono para interactuar con la API de OpenWeatherMap.
+
+    La sesión de aiohttp se crea de forma perezosa dentro del event loop en
+    la primera consulta y se reutiliza en todas las siguientes (keep-alive).
+    El semáforo acota las consultas simultáneas para no superar el tamaño
+    del pool ni saturar la API.
+
+    Attributes:
+        max_concurrency (int): Máximo de consultas en vuelo al mismo tiempo.
+
+    Example:
+        >>> async with AsyncWeatherService() as service:
+        ...     results = await service.get_many(["Madrid", "Lima"])
+
+    Note:
+        Usar siempre `async with` o llamar a close() al terminar para cerrar
+        las conexiones del pool.
+    """
+
+    # Mismo parseo que el cliente síncrono: no depende del estado de la
+    # instancia, así ambos clientes devuelven exactamente la misma lectura
+    parse_weather_data = WeatherService.parse_weather_data
+    parse_weather_json = WeatherService.parse_weather_json
+
+    # El cliente asíncrono no tiene instrumentación por fases (src/metrics.py)
+    metrics = None
+
+    def __init__(
+        self,
+        skip_validation: bool = False,
+        max_concurrency: Optional[int] = None,
+        session: Optional["aiohttp.ClientSession"] = None,
+    ):
+        """
+        Inicializa el servicio asíncrono y valida la configuración.
+
+        Args:
+            skip_validation (bool): Si es True, omite la validación de
+                configuración (útil en tests).
+            max_concurrency (Optional[int]): Consultas simultáneas máximas.
+                Default: Config.ASYNC_MAX_CONCURRENCY.
+            session (Optional[aiohttp.ClientSession]): Sesión a reutilizar. Si
+                se provee, close() no la cierra.
+
+        Raises:
+            ConfigurationException: Si aiohttp no está instalado, si la
+                configuración es inválida o si max_concurrency es menor a 1.
+        """
+        if aiohttp is None:
+            raise ConfigurationException(
+                "AsyncWeatherService requiere aiohttp.\n"
+                "Instálalo con: pip install aiohttp"
+            )
+
+        if not skip_validation:
+            Config.validate()
+
+        self.max_concurrency = (
+            max_concurrency if max_concurrency is not None else Config.ASYNC_MAX_CONCURRENCY
+        )
+        if self.max_concurrency < 1:
+            raise ConfigurationException("La concurrencia máxima debe ser mayor a 0")
+
+        self._owns_session = session is None
+        self._session = session
+        # El semáforo se crea perezosamente para quedar ligado al loop que
+        # efectivamente ejecuta las consultas
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """
+        Devuelve la sesión compartida, creándola en el primer uso.
+
+        El connector limita las conexiones totales y por host a la
+        concurrencia máxima, de modo que cada consulta en vuelo tiene su
+        conexión keep-alive y no se abren conexiones de más.
+        """
+        if self._session is None:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_concurrency,
+                limit_per_host=self.max_concurrency,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=Config.TIMEOUT),
+            )
+        return self._session
+
+    async def get_weather(self, city: str) -> Dict[str, Any]:
+        """
+        Obtiene la información del clima para una ciudad de forma asíncrona.
+
+        Equivalente asíncrono de WeatherService.get_weather(): valida el
+        input, consulta la API respetando el límite de concurrencia y traduce
+        los errores HTTP y de red a las excepciones del dominio.
+
+        Args:
+            city (str): Nombre de la ciudad a consultar.
+
+        Returns:
+            Dict[str, Any]: Respuesta JSON completa de la API.
+
+        Raises:
+            ValueError: Si el nombre de la ciudad está vacío.
+            CityNotFoundException: Si la API retorna 404.
+            InvalidAPIKeyException: Si la API retorna 401.
+            RateLimitException: Si la API retorna 429.
+            NetworkException: Si hay timeout o error de conexión.
+            WeatherAPIException: Para otros errores HTTP.
+        """
+        if not city or not city.strip():
+            raise ValueError("El nombre de la ciudad no puede estar vacío")
+
+        city = city.strip()
+        url = Config.get_api_url(city)
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        try:
+            async with self._semaphore:
+                async with self._get_session().get(url) as response:
+                    if response.status == 200:
+                        body = await response.read()
+                        try:
+                            return fast_json.loads(body)
+                        except ValueError as e:
+                            raise WeatherAPIException(
+                                f"Error al parsear los datos de la API: {str(e)}"
+                            )
+                    retry_after = (
+                        parse_retry_after(response.headers.get("Retry-After"))
+                        if response.status == 429
+                        else None
+                    )
+                    raise_for_status(
+                        response.status, await response.text(), city, retry_after=retry_after
+                    )
+
+        except asyncio.TimeoutError:
+            raise NetworkException(
+                f"Timeout al intentar conectar con la API (>{Config.TIMEOUT}s)"
+            )
+
+        except aiohttp.ClientConnectionError:
+            raise NetworkException(
+                "No se pudo conectar con la API. Verifica tu conexión a internet."
+            )
+
+        except aiohttp.ClientError as e:
+            raise NetworkException(f"Error de red: {str(e)}")
+
+    async def _lookup(self, city: str) -> BatchResult:
+        """Consulta y parsea una ciudad devolviendo el error como resultado."""
+        try:
+            data = self.parse_weather_data(await self.get_weather(city))
+            return BatchResult(city, data, None)
+        except Exception as e:  # noqa: BLE001 - se reporta por ciudad
+            return BatchResult(city, None, e)
+
+    async def get_many(self, cities: Iterable[str]) -> List[BatchResult]:
+        """
+        Consulta y parsea muchas ciudades concurrentemente.
+
+        Args:
+            cities (Iterable[str]): Nombres de ciudades a consultar.
+
+        Returns:
+            List[BatchResult]: Un resultado por ciudad, en el orden de entrada.
+                Los errores se informan por ciudad en BatchResult.error.
+        """
+        return await asyncio.gather(*(self._lookup(city) for city in cities))
+
+    async def close(self) -> None:
+        """Cierra la sesión de aiohttp si fue creada por el servicio."""
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> "AsyncWeatherService":
+        """Permite usar el servicio con `async with`."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        """Cierra la sesión al salir del bloque `async with`."""
+        await self.close()
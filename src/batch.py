@@ -0,0 +1,130 @@
+"""
+Consulta concurrente del clima de muchas ciudades (modo batch).
+
+Este módulo permite consultar una lista de ciudades en un solo proceso,
+reutilizando la sesión HTTP de WeatherService y repartiendo las consultas en
+un pool acotado de hilos. Los resultados se entregan apenas termina cada
+consulta (no en el orden de entrada) para poder mostrarlos en streaming.
+
+Las consultas HTTP pasan casi todo su tiempo esperando la red, por lo que
+los hilos alcanzan para solaparlas aunque exista el GIL.
+
+Example:
+    >>> from src.batch import fetch_many, read_cities
+    >>> with open("ciudades.txt") as f, WeatherService() as service:
+    ...     for result in fetch_many(service, read_cities(f), max_workers=8):
+    ...         print(result.city, result.ok)
+"""
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Iterable, Iterator, Mapping, NamedTuple, Optional, Set, TextIO
+
+
+class BatchResult(NamedTuple):
+    """
+    Resultado de la consulta de una ciudad dentro de un batch.
+
+    Attributes:
+        city (str): Nombre de la ciudad tal como vino en la entrada.
+        data (Optional[Mapping[str, Any]]): Lectura parseada por
+            parse_weather_data() (un WeatherReading), o None si la consulta
+            falló.
+        error (Optional[Exception]): Excepción lanzada por la consulta, o
+            None si fue exitosa.
+    """
+
+    city: str
+    data: Optional[Mapping[str, Any]]
+    error: Optional[Exception]
+
+    @property
+    def ok(self) -> bool:
+        """Indica si la consulta fue exitosa."""
+        return self.error is None
+
+
+def read_cities(stream: TextIO) -> Iterator[str]:
+    """
+    Lee nombres de ciudades de un archivo de texto, una por línea.
+
+    Se ignoran las líneas vacías y las que comienzan con '#' (comentarios),
+    y se limpian los espacios en blanco de cada nombre. La lectura es
+    perezosa para no cargar archivos grandes completos en memoria.
+
+    Args:
+        stream (TextIO): Archivo abierto o sys.stdin.
+
+    Yields:
+        str: Nombre de ciudad limpio.
+
+    Example:
+        >>> import io
+        >>> list(read_cities(io.StringIO("Madrid\\n\\n# comentario\\n Lima \\n")))
+        ['Madrid', 'Lima']
+    """
+    for line in stream:
+        city = line.strip()
+        if city and not city.startswith("#"):
+            yield city
+
+
+def _lookup(service: Any, city: str) -> BatchResult:
+    """
+    Consulta y parsea una ciudad, capturando cualquier error como resultado.
+
+    Un fallo en una ciudad no debe cortar el batch completo, por eso la
+    excepción se devuelve dentro del BatchResult en vez de propagarse.
+    """
+    try:
+        data = service.parse_weather_data(service.get_weather(city))
+        return BatchResult(city, data, None)
+    except Exception as e:  # noqa: BLE001 - se reporta por ciudad
+        return BatchResult(city, None, e)
+
+
+def fetch_many(
+    service: Any, cities: Iterable[str], max_workers: int = 8
+) -> Iterator[BatchResult]:
+    """
+    Consulta muchas ciudades en paralelo y entrega cada resultado al terminar.
+
+    Mantiene como máximo 2 * max_workers consultas encoladas: la entrada se
+    consume a medida que se liberan lugares, así un archivo con millones de
+    ciudades no crea millones de futures en memoria.
+
+    Args:
+        service (WeatherService): Servicio (o compatible) con get_weather()
+            y parse_weather_data(). Debe ser seguro de usar desde varios hilos.
+        cities (Iterable[str]): Nombres de ciudades a consultar.
+        max_workers (int): Cantidad máxima de consultas simultáneas.
+
+    Yields:
+        BatchResult: Resultado de cada ciudad en orden de finalización.
+
+    Raises:
+        ValueError: Si max_workers es menor a 1.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers debe ser mayor a 0")
+
+    max_pending = max_workers * 2
+    city_iter = iter(cities)
+    pending: Set[Future] = set()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        exhausted = False
+        while True:
+            # Rellenar la cola hasta el límite sin consumir toda la entrada
+            while not exhausted and len(pending) < max_pending:
+                city = next(city_iter, None)
+                if city is None:
+                    exhausted = True
+                    break
+                pending.add(executor.submit(_lookup, service, city))
+
+            if not pending:
+                return
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
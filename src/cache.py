@@ -0,0 +1,233 @@
+"""
+Caché en memoria de respuestas de la API con expiración (TTL) y desalojo LRU.
+
+Las cargas de trabajo típicas consultan las mismas ciudades una y otra vez en
+pocos minutos, y OpenWeatherMap actualiza el clima actual cada ~10 minutos.
+Guardar la respuesta cruda durante un TTL corto evita repetir la consulta
+HTTP (y gastar cuota de la API) para datos que no cambiaron.
+
+Se guardan los bytes JSON crudos de la respuesta y no el diccionario
+decodificado por dos motivos:
+    - El presupuesto en bytes se mide exactamente con len(valor).
+    - Cada lectura decodifica una copia nueva, así un llamador que modifica
+      el diccionario devuelto no corrompe la entrada cacheada.
+
+Example:
+    >>> cache = TTLCache(ttl=600, max_entries=1000)
+    >>> key = make_cache_key("  Buenos   Aires ")
+    >>> cache.set(key, b'{"name": "Buenos Aires"}')
+    >>> cache.get(key)
+    b'{"name": "Buenos Aires"}'
+    >>> cache.stats()["hits"]
+    1
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from .config import Config
+
+
+def make_cache_key(city: str, lang: Optional[str] = None, units: Optional[str] = None) -> str:
+    """
+    Construye la clave de caché normalizada para una consulta.
+
+    El nombre de la ciudad se normaliza (espacios colapsados y casefold) para
+    que "buenos aires" y "Buenos  Aires" compartan entrada. El idioma y las
+    unidades forman parte de la clave porque cambian la respuesta de la API.
+
+    Args:
+        city (str): Nombre de la ciudad tal como lo ingresó el usuario.
+        lang (Optional[str]): Idioma de la respuesta. Default: Config.LANG.
+        units (Optional[str]): Unidades de medida. Default: Config.UNITS.
+
+    Returns:
+        str: Clave de la forma "ciudad|idioma|unidades".
+
+    Example:
+        >>> make_cache_key("  Buenos   AIRES ", "es", "metric")
+        'buenos aires|es|metric'
+    """
+    normalized = " ".join(city.split()).casefold()
+    return f"{normalized}|{lang or Config.LANG}|{units or Config.UNITS}"
+
+
+class TTLCache:
+    """
+    Caché LRU acotada por cantidad de entradas y por bytes, con TTL por entrada.
+
+    Usa un OrderedDict como lista LRU: cada acierto mueve la entrada al final
+    y el desalojo elimina desde el principio (la menos usada recientemente).
+    Todas las operaciones son O(1) y están protegidas por un lock, por lo que
+    la caché se puede compartir entre los hilos del modo batch.
+
+    Attributes:
+        ttl (float): Segundos que una entrada se considera válida.
+        max_entries (int): Máximo de entradas (0 = sin límite).
+        max_bytes (int): Máximo de bytes sumando todos los valores
+            (0 = sin límite).
+
+    Example:
+        >>> cache = TTLCache(ttl=60, max_entries=2)
+        >>> cache.set("a", b"1"); cache.set("b", b"2"); cache.set("c", b"3")
+        >>> cache.get("a") is None  # desalojada por LRU
+        True
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int = 0,
+        max_bytes: int = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Inicializa una caché vacía.
+
+        Args:
+            ttl (float): Tiempo de vida de cada entrada en segundos.
+            max_entries (int): Máximo de entradas (0 = sin límite).
+            max_bytes (int): Presupuesto total en bytes (0 = sin límite).
+            clock (Callable[[], float]): Reloj monótono; inyectable en tests.
+
+        Raises:
+            ValueError: Si ttl no es positivo o algún límite es negativo.
+        """
+        if ttl <= 0:
+            raise ValueError("El TTL de la caché debe ser mayor a 0")
+        if max_entries < 0 or max_bytes < 0:
+            raise ValueError("Los límites de la caché no pueden ser negativos")
+
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._lock = threading.Lock()
+        # clave -> (momento de expiración, valor)
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    @classmethod
+    def from_config(cls) -> "TTLCache":
+        """Crea una caché con los límites definidos en Config (CACHE_*)."""
+        return cls(
+            ttl=Config.CACHE_TTL,
+            max_entries=Config.CACHE_MAX_ENTRIES,
+            max_bytes=Config.CACHE_MAX_BYTES,
+        )
+
+    @classmethod
+    def negative_from_config(cls) -> "TTLCache":
+        """
+        Crea la caché negativa (ciudades inexistentes) con límites de Config.
+
+        Usa un TTL propio más corto (NEGATIVE_CACHE_TTL) y un límite de
+        entradas (NEGATIVE_CACHE_MAX_ENTRIES); los valores son marcadores
+        vacíos, así que no necesita presupuesto en bytes.
+        """
+        return cls(
+            ttl=Config.NEGATIVE_CACHE_TTL,
+            max_entries=Config.NEGATIVE_CACHE_MAX_ENTRIES,
+        )
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Obtiene un valor si existe y no expiró.
+
+        Las entradas expiradas se eliminan al encontrarlas (expiración
+        perezosa), sin necesidad de un hilo de limpieza.
+
+        Args:
+            key (str): Clave construida con make_cache_key().
+
+        Returns:
+            Optional[bytes]: El valor cacheado, o None si no está o expiró.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                self._remove(key)
+                self._expirations += 1
+                self._misses += 1
+                return None
+
+            # Marcar como usada recientemente
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        """
+        Guarda un valor y desaloja entradas LRU si se superan los límites.
+
+        Un valor más grande que todo el presupuesto en bytes no se guarda,
+        ya que desalojaría la caché completa sin poder quedarse.
+
+        Args:
+            key (str): Clave construida con make_cache_key().
+            value (bytes): Cuerpo crudo de la respuesta de la API.
+        """
+        size = len(value)
+        if self.max_bytes and size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._bytes += size
+
+            # Desalojar desde la entrada menos usada hasta entrar en límites
+            while (self.max_entries and len(self._entries) > self.max_entries) or (
+                self.max_bytes and self._bytes > self.max_bytes
+            ):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._evictions += 1
+
+    def _remove(self, key: str) -> None:
+        """Elimina una entrada actualizando el contador de bytes (sin lock)."""
+        _, value = self._entries.pop(key)
+        self._bytes -= len(value)
+
+    def clear(self) -> None:
+        """Vacía la caché. Los contadores de estadísticas se conservan."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        """Cantidad de entradas almacenadas (incluye expiradas no purgadas)."""
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Devuelve las estadísticas de uso de la caché.
+
+        Returns:
+            Dict[str, float]: Contadores hits, misses, evictions (desalojos
+                LRU), expirations, entries, bytes y hit_rate (0.0 a 1.0).
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,352 @@
+"""
+Grabación y reproducción de tráfico HTTP (cassettes) debajo de WeatherService.
+
+Un cassette es un archivo NDJSON (comprimido con gzip si termina en .gz) con
+una interacción por línea: método, URL, status, headers, cuerpo y tiempos
+de cada respuesta real. Sirve para reproducir offline la forma del tráfico
+de producción (mezcla de ciudades, 404, 401, 5xx, timeouts, latencias) al
+perfilar o medir, sin gastar cuota de la API.
+
+Los dos modos son adaptadores de transporte de requests que se montan en
+la sesión del servicio, así todo lo que está por encima (reintentos,
+circuit breaker, cachés, traducción de códigos a excepciones) se ejecuta
+igual que contra la red:
+
+RecordingAdapter:
+    Un HTTPAdapter normal que además escribe cada respuesta (o cada timeout
+    y error de conexión) en el cassette apenas llega.
+
+ReplayAdapter:
+    Responde desde el cassette sin abrir conexiones, a velocidad de cable
+    ("wire") o con los tiempos grabados ("original"): cada respuesta sale
+    no antes de su instante de grabación ("t", relativo a la primera
+    interacción reproducida) y después de su latencia grabada. Las
+    respuestas de una misma URL se devuelven en el orden en que se grabaron
+    y vuelven a empezar al agotarse.
+
+Note:
+    La API key (parámetro appid) se quita de las URLs antes de grabarlas y
+    de buscarlas, así que un cassette se puede compartir y reproducir con
+    cualquier key.
+
+Example:
+    >>> service = WeatherService(transport=RecordingAdapter("trafico.ndjson.gz"))
+    >>> service.get_weather("Madrid")        # consulta real, queda grabada
+    >>> replay = WeatherService(transport=ReplayAdapter("trafico.ndjson.gz"))
+    >>> replay.get_weather("Madrid")         # misma respuesta, sin red
+"""
+
+import base64
+import gzip
+import io
+import json
+import threading
+import time
+from datetime import timedelta
+from typing import IO, Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .config import Config
+from .exceptions import ConfigurationException, WeatherAPIException
+
+# Versión del formato del archivo (primera línea del cassette)
+CASSETTE_VERSION = 1
+
+# Modos de reproducción
+TIMINGS = ("wire", "original")
+
+# Parámetros de la URL que no se graban ni participan de la búsqueda
+SECRET_PARAMS = frozenset({"appid"})
+
+# Headers que describen la codificación en el cable y no el cuerpo grabado
+# (requests ya lo descomprimió): reproducirlos sería engañoso
+_WIRE_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding"})
+
+# Errores de red grabados -> excepción de requests que se relanza
+_ERRORS = {
+    "timeout": requests.exceptions.ReadTimeout,
+    "connection": requests.exceptions.ConnectionError,
+}
+
+
+class CassetteMissError(WeatherAPIException):
+    """
+    El cassette no tiene ninguna respuesta grabada para la petición.
+
+    No es un error de requests a propósito: así WeatherService no lo traduce
+    a NetworkException, no se reintenta y no cuenta como falla del host en
+    el circuit breaker (una consulta sin grabar no debe cambiar cómo se
+    reproducen las demás).
+    """
+
+
+def normalize_url(url: str) -> str:
+    """
+    Clave de búsqueda de una URL: sin API key y con los parámetros ordenados.
+
+    Args:
+        url (str): URL completa de la petición.
+
+    Returns:
+        str: URL sin los parámetros de SECRET_PARAMS y con el query ordenado.
+    """
+    parts = urlsplit(url)
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key not in SECRET_PARAMS
+    )
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ""))
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    """Abre el cassette en modo texto, con gzip si la ruta termina en .gz."""
+    if path.endswith(".gz"):
+        return io.TextIOWrapper(gzip.open(path, mode + "b"), encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def load_cassette(path: str) -> List[Dict[str, Any]]:
+    """
+    Lee las interacciones grabadas en un cassette.
+
+    Args:
+        path (str): Ruta del cassette (.ndjson o .ndjson.gz).
+
+    Returns:
+        List[Dict[str, Any]]: Interacciones en orden de grabación.
+
+    Raises:
+        ConfigurationException: Si el archivo no existe, no es un cassette o
+            es de una versión de formato desconocida.
+    """
+    try:
+        with _open(path, "r") as stream:
+            lines = [line for line in stream if line.strip()]
+    except (OSError, EOFError) as e:
+        raise ConfigurationException(f"No se pudo leer el cassette {path}: {e}")
+
+    try:
+        header = json.loads(lines[0]) if lines else {}
+        interactions = [json.loads(line) for line in lines[1:]]
+    except ValueError as e:
+        raise ConfigurationException(f"Cassette inválido {path}: {e}")
+    if header.get("cassette") != CASSETTE_VERSION:
+        raise ConfigurationException(
+            f"Cassette inválido {path}: se esperaba la versión {CASSETTE_VERSION}"
+        )
+    return interactions
+
+
+class RecordingAdapter(HTTPAdapter):
+    """
+    Adaptador HTTP real que graba cada respuesta en un cassette.
+
+    Cada interacción se escribe (y se vuelca al archivo) apenas termina, así
+    que un proceso interrumpido deja grabado todo lo anterior. Es seguro
+    usarlo desde varios hilos.
+
+    Attributes:
+        path (str): Ruta del cassette.
+        recorded (int): Interacciones grabadas por este adaptador.
+    """
+
+    def __init__(self, path: str, **kwargs):
+        """
+        Args:
+            path (str): Ruta del cassette. Si ya existe se reemplaza.
+            **kwargs: Argumentos de HTTPAdapter (pool_connections, etc.).
+        """
+        super().__init__(**kwargs)
+        self.path = path
+        self.recorded = 0
+        self._lock = threading.Lock()
+        self._stream: Optional[IO[str]] = None
+        self._started = time.monotonic()
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        """Envía la petición por la red y graba la respuesta o el error."""
+        offset = time.monotonic() - self._started
+        started = time.perf_counter()
+        entry: Dict[str, Any] = {
+            "t": round(offset, 6),
+            "method": request.method,
+            "url": normalize_url(request.url),
+        }
+        try:
+            response = super().send(
+                request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies
+            )
+            # Leer el cuerpo acá para que el tiempo grabado lo incluya
+            body = response.content
+        except requests.exceptions.Timeout:
+            self._write(dict(entry, elapsed=_elapsed(started), error="timeout"))
+            raise
+        except requests.exceptions.ConnectionError:
+            self._write(dict(entry, elapsed=_elapsed(started), error="connection"))
+            raise
+
+        entry.update(
+            elapsed=_elapsed(started),
+            status=response.status_code,
+            reason=response.reason,
+            headers={
+                name: value
+                for name, value in response.headers.items()
+                if name.lower() not in _WIRE_HEADERS
+            },
+        )
+        try:
+            entry["body"] = body.decode("utf-8")
+        except UnicodeDecodeError:
+            entry["body_b64"] = base64.b64encode(body).decode("ascii")
+        self._write(entry)
+        return response
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        """Agrega una interacción al cassette (creándolo en la primera)."""
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._stream is None:
+                self._stream = _open(self.path, "w")
+                header = {"cassette": CASSETTE_VERSION, "created": time.time()}
+                self._stream.write(json.dumps(header) + "\n")
+            self._stream.write(line)
+            self._stream.flush()
+            self.recorded += 1
+
+    def close(self) -> None:
+        """Cierra el pool de conexiones y el archivo del cassette."""
+        super().close()
+        with self._lock:
+            if self._stream is not None:
+                self._stream.close()
+                self._stream = None
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Adaptador que responde desde un cassette sin tocar la red.
+
+    Attributes:
+        timing (str): "wire" (sin demoras) u "original" (espera hasta el
+            instante grabado de cada interacción, contado desde la primera
+            reproducida, y luego su latencia grabada).
+        replayed (int): Respuestas devueltas.
+    """
+
+    def __init__(self, path: str, timing: str = "wire"):
+        """
+        Args:
+            path (str): Ruta del cassette grabado con RecordingAdapter.
+            timing (str): "wire" u "original". Por defecto "wire".
+
+        Raises:
+            ConfigurationException: Si el cassette no se puede leer o el
+                modo de reproducción no existe.
+        """
+        super().__init__()
+        if timing not in TIMINGS:
+            raise ConfigurationException(
+                f"Modo de reproducción desconocido: {timing!r} (válidos: {', '.join(TIMINGS)})"
+            )
+        self.timing = timing
+        self.replayed = 0
+        self._lock = threading.Lock()
+        # URL normalizada -> (interacciones en orden, próxima a devolver)
+        self._tracks: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self._cursors: Dict[Tuple[str, str], int] = {}
+        # (monotonic al reproducir la primera interacción, su "t" grabado)
+        self._origin: Optional[Tuple[float, float]] = None
+        for entry in load_cassette(path):
+            self._tracks.setdefault((entry["method"], entry["url"]), []).append(entry)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        """Devuelve la siguiente respuesta grabada para el método y la URL."""
+        key = (request.method, normalize_url(request.url))
+        track = self._tracks.get(key)
+        if not track:
+            raise CassetteMissError(f"Sin respuesta grabada para {key[0]} {key[1]}")
+        with self._lock:
+            index = self._cursors.get(key, 0)
+            self._cursors[key] = (index + 1) % len(track)
+            self.replayed += 1
+            entry = track[index]
+            if self._origin is None:
+                self._origin = (time.monotonic(), entry.get("t", 0.0))
+            origin = self._origin
+
+        if self.timing == "original":
+            # Respetar el espaciado grabado entre peticiones; al dar la vuelta
+            # a una URL el instante ya pasó y solo cuenta la latencia
+            started, first_t = origin
+            delay = started + entry.get("t", first_t) - first_t - time.monotonic()
+            time.sleep(max(0.0, delay) + entry["elapsed"])
+
+        error = entry.get("error")
+        if error is not None:
+            raise _ERRORS.get(error, requests.exceptions.ConnectionError)(
+                f"Error de red grabado: {error}", request=request
+            )
+        return self._build_response(request, entry)
+
+    def _build_response(self, request, entry: Dict[str, Any]) -> requests.Response:
+        """Arma un requests.Response equivalente al grabado."""
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.reason = entry.get("reason")
+        response.headers = CaseInsensitiveDict(entry.get("headers", {}))
+        response.encoding = get_encoding_from_headers(response.headers)
+        if "body_b64" in entry:
+            response._content = base64.b64decode(entry["body_b64"])
+        else:
+            response._content = entry.get("body", "").encode("utf-8")
+        response.url = request.url
+        response.request = request
+        response.elapsed = timedelta(seconds=entry["elapsed"])
+        response.connection = self
+        return response
+
+    def close(self) -> None:
+        """No hay conexiones que cerrar."""
+
+
+def _elapsed(started: float) -> float:
+    """Segundos transcurridos desde `started` (perf_counter), redondeados."""
+    return round(time.perf_counter() - started, 6)
+
+
+def transport_from_config() -> Optional[BaseAdapter]:
+    """
+    Crea el adaptador de grabación o reproducción según Config (CASSETTE_*).
+
+    Returns:
+        Optional[BaseAdapter]: RecordingAdapter, ReplayAdapter o None si
+            CASSETTE_MODE está vacío.
+
+    Raises:
+        ConfigurationException: Si el modo es desconocido, falta
+            CASSETTE_PATH o el cassette a reproducir no se puede leer.
+    """
+    mode = Config.CASSETTE_MODE
+    if not mode:
+        return None
+    if not Config.CASSETTE_PATH:
+        raise ConfigurationException("CASSETTE_MODE requiere configurar CASSETTE_PATH")
+    if mode == "record":
+        return RecordingAdapter(
+            Config.CASSETTE_PATH,
+            pool_connections=Config.POOL_CONNECTIONS,
+            pool_maxsize=Config.POOL_MAXSIZE,
+            pool_block=Config.POOL_BLOCK,
+        )
+    if mode == "replay":
+        return ReplayAdapter(Config.CASSETTE_PATH, timing=Config.CASSETTE_TIMING)
+    raise ConfigurationException(
+        f"CASSETTE_MODE desconocido: {mode!r} (válidos: record, replay)"
+    )
@@ -0,0 +1,266 @@
+"""
+Índice offline nombre de ciudad → ID de OpenWeatherMap, mapeado en memoria.
+
+Cada consulta por nombre (`q=ciudad`) cuesta un round trip completo aunque
+el nombre tenga un typo y termine en CityNotFoundException. Con este índice
+el nombre se resuelve localmente al ID numérico antes de ir a la red, y los
+nombres desconocidos se rechazan sin ninguna petición HTTP.
+
+El índice se construye una sola vez a partir de `city.list.json(.gz)`
+(descargable de https://bulk.openweathermap.org/sample/) con:
+
+    python -m src.city_index build city.list.json.gz ciudades.idx
+
+Formato del archivo (little-endian):
+    - Cabecera de 16 bytes: magic b"OWMIDX1\\0", cantidad de registros (u32)
+      y 4 bytes reservados.
+    - Registros de 12 bytes ordenados por hash: hash de 64 bits de la clave
+      normalizada (u64) + ID de ciudad (u32).
+
+Al abrirlo no se parsea nada: el archivo se mapea con mmap y cada búsqueda es
+una búsqueda binaria sobre los registros (≈18 comparaciones para 200k
+ciudades), así abrir el índice toma milisegundos y no crea diccionarios.
+
+Claves:
+    Cada ciudad se indexa por su nombre normalizado ("buenos aires") y por
+    nombre + país ("buenos aires,ar"). La normalización quita acentos,
+    pasa a minúsculas (casefold) y colapsa espacios, así "Bogotá", "BOGOTA"
+    y "bogota" son la misma clave. Si varios lugares comparten nombre se
+    conserva el primero de la lista; agregar el país desambigua.
+
+Example:
+    >>> index = CityIndex.open("ciudades.idx")
+    >>> index.lookup("Bogotá, CO")
+    3688689
+    >>> index.lookup("Gotham") is None
+    True
+"""
+
+import gzip
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import unicodedata
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .exceptions import ConfigurationException
+
+# Cabecera: magic (8 bytes) + cantidad de registros (u32) + reservado (u32)
+MAGIC = b"OWMIDX1\0"
+_HEADER = struct.Struct("<8sII")
+
+# Registro: hash de la clave normalizada (u64) + ID de ciudad (u32)
+_RECORD = struct.Struct("<QI")
+
+
+def normalize_city_name(name: str) -> str:
+    """
+    Normaliza un nombre de ciudad para búsquedas insensibles a acentos y mayúsculas.
+
+    Descompone los caracteres (NFKD) y descarta las marcas diacríticas,
+    aplica casefold, colapsa espacios y quita los espacios alrededor de la
+    coma que separa el código de país.
+
+    Args:
+        name (str): Nombre tal como lo escribió el usuario, con o sin país.
+
+    Returns:
+        str: Clave normalizada.
+
+    Example:
+        >>> normalize_city_name("  São   Paulo , BR ")
+        'sao paulo,br'
+    """
+    decomposed = unicodedata.normalize("NFKD", name)
+    folded = "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+    parts = [" ".join(part.split()) for part in folded.split(",")]
+    return ",".join(parts)
+
+
+def _key_hash(key: str) -> int:
+    """Hash estable de 64 bits de una clave normalizada (igual entre procesos)."""
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def build_index(cities: Iterable[Dict[str, Any]], output_path: str) -> int:
+    """
+    Construye el archivo de índice a partir de los registros de city.list.json.
+
+    Args:
+        cities (Iterable[Dict[str, Any]]): Registros con al menos las claves
+            id, name y country (formato de city.list.json).
+        output_path (str): Ruta del archivo de índice a generar.
+
+    Returns:
+        int: Cantidad de claves escritas en el índice.
+    """
+    entries: Dict[int, int] = {}
+    for city in cities:
+        city_id = city.get("id")
+        name = city.get("name")
+        if not isinstance(city_id, int) or not name:
+            continue
+        key = normalize_city_name(name)
+        country = (city.get("country") or "").strip()
+        keys = [key, f"{key},{normalize_city_name(country)}"] if country else [key]
+        for k in keys:
+            # setdefault: ante nombres repetidos se conserva la primera ciudad
+            entries.setdefault(_key_hash(k), city_id)
+
+    records: List[Tuple[int, int]] = sorted(entries.items())
+
+    # Escribir a un archivo temporal y renombrar: un proceso que abra el
+    # índice mientras se reconstruye nunca ve un archivo a medio escribir
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(records), 0))
+        for key_hash, city_id in records:
+            f.write(_RECORD.pack(key_hash, city_id))
+    os.replace(tmp_path, output_path)
+    return len(records)
+
+
+def build_index_from_file(source_path: str, output_path: str) -> int:
+    """
+    Construye el índice desde city.list.json o city.list.json.gz.
+
+    Args:
+        source_path (str): Ruta de la lista de ciudades de OpenWeatherMap.
+        output_path (str): Ruta del archivo de índice a generar.
+
+    Returns:
+        int: Cantidad de claves escritas en el índice.
+    """
+    opener = gzip.open if source_path.endswith(".gz") else open
+    with opener(source_path, "rt", encoding="utf-8") as f:
+        cities = json.load(f)
+    return build_index(cities, output_path)
+
+
+class _HashColumn:
+    """Vista de solo lectura de los hashes del índice para usar con bisect."""
+
+    def __init__(self, buffer: mmap.mmap, count: int):
+        self._buffer = buffer
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i: int) -> int:
+        return _RECORD.unpack_from(self._buffer, _HEADER.size + i * _RECORD.size)[0]
+
+
+class CityIndex:
+    """
+    Índice de ciudades mapeado en memoria con búsqueda binaria por hash.
+
+    Attributes:
+        path (str): Ruta del archivo de índice.
+
+    Example:
+        >>> with CityIndex.open("ciudades.idx") as index:
+        ...     index.lookup("Madrid, ES")
+        3117735
+    """
+
+    def __init__(self, path: str, buffer: mmap.mmap, count: int):
+        """No usar directamente: abrir el índice con CityIndex.open()."""
+        self.path = path
+        self._buffer = buffer
+        self._count = count
+        self._hashes = _HashColumn(buffer, count)
+
+    @classmethod
+    def open(cls, path: str) -> "CityIndex":
+        """
+        Abre un índice generado con build_index() mapeándolo en memoria.
+
+        Args:
+            path (str): Ruta del archivo de índice.
+
+        Returns:
+            CityIndex: Índice listo para búsquedas.
+
+        Raises:
+            ConfigurationException: Si el archivo no existe, no se puede leer
+                o no es un índice válido.
+        """
+        try:
+            with open(path, "rb") as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise ConfigurationException(f"No se pudo abrir el índice de ciudades {path}: {e}")
+
+        if len(buffer) < _HEADER.size:
+            buffer.close()
+            raise ConfigurationException(f"El índice de ciudades {path} no es válido")
+
+        magic, count, _ = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or len(buffer) != _HEADER.size + count * _RECORD.size:
+            buffer.close()
+            raise ConfigurationException(f"El índice de ciudades {path} no es válido")
+
+        return cls(path, buffer, count)
+
+    def lookup(self, city: str) -> Optional[int]:
+        """
+        Resuelve un nombre de ciudad (opcionalmente con país) a su ID.
+
+        Args:
+            city (str): Nombre como "Madrid" o "Paris, FR".
+
+        Returns:
+            Optional[int]: ID de OpenWeatherMap, o None si no está en el índice.
+        """
+        key_hash = _key_hash(normalize_city_name(city))
+        i = bisect_left(self._hashes, key_hash)
+        if i < self._count and self._hashes[i] == key_hash:
+            return _RECORD.unpack_from(self._buffer, _HEADER.size + i * _RECORD.size)[1]
+        return None
+
+    def __len__(self) -> int:
+        """Cantidad de claves del índice."""
+        return self._count
+
+    def close(self) -> None:
+        """Libera el mapeo en memoria del archivo."""
+        self._buffer.close()
+
+    def __enter__(self) -> "CityIndex":
+        """Permite usar el índice como context manager (with)."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Cierra el índice al salir del bloque with."""
+        self.close()
+
+
+def main(argv: List[str]) -> int:
+    """
+    Herramienta de línea de comandos para construir el índice.
+
+    Uso:
+        python -m src.city_index build city.list.json.gz ciudades.idx
+
+    Args:
+        argv (List[str]): Argumentos sin el nombre del programa.
+
+    Returns:
+        int: Código de salida (0 éxito, 2 uso incorrecto).
+    """
+    if len(argv) != 3 or argv[0] != "build":
+        print("Uso: python -m src.city_index build <city.list.json[.gz]> <salida.idx>")
+        return 2
+
+    count = build_index_from_file(argv[1], argv[2])
+    print(f"Índice generado en {argv[2]} con {count} claves")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -12,6 +12,68 @@ Variables de entorno utilizadas:
     - OPENWEATHER_API_KEY (obligatoria): API key de OpenWeatherMap
     - WEATHER_LANG (opcional): Idioma de respuestas (default: 'es')
     - REQUEST_TIMEOUT (opcional): Timeout HTTP en segundos (default: 10)
+    - HTTP_POOL_CONNECTIONS (opcional): Pools de conexión por host (default: 10)
+    - HTTP_POOL_MAXSIZE (opcional): Conexiones keep-alive por pool (default: 10)
+    - HTTP_POOL_BLOCK (opcional): Bloquear si el pool está lleno (default: false)
+    - BATCH_WORKERS (opcional): Consultas simultáneas en modo batch (default: 8)
+    - ASYNC_MAX_CONCURRENCY (opcional): Consultas en vuelo del cliente
+      asíncrono (default: 50)
+    - CACHE_TTL (opcional): Segundos de validez de la caché en memoria (default: 600)
+    - CACHE_MAX_ENTRIES (opcional): Máximo de respuestas cacheadas (default: 1024)
+    - CACHE_MAX_BYTES (opcional): Presupuesto en bytes de la caché (default: 16 MiB)
+    - DISK_CACHE_ENABLED (opcional): Activa la caché persistente (default: false)
+    - DISK_CACHE_DIR (opcional): Directorio de la caché persistente
+      (default: $XDG_CACHE_HOME/weather-cli o ~/.cache/weather-cli)
+    - DISK_CACHE_TTL (opcional): Segundos de frescura en disco (default: 600)
+    - DISK_CACHE_STALE_TTL (opcional): Segundos extra sirviendo datos vencidos
+      mientras se refrescan en segundo plano (default: 0)
+    - NEGATIVE_CACHE_TTL (opcional): Segundos que se recuerda una ciudad
+      inexistente (default: 300)
+    - NEGATIVE_CACHE_MAX_ENTRIES (opcional): Máximo de ciudades inexistentes
+      recordadas en memoria (default: 4096)
+    - RATE_LIMIT_PER_MINUTE (opcional): Consultas por minuto permitidas por el
+      limitador del cliente; 0 lo deshabilita (default: 60, plan gratuito)
+    - RATE_LIMIT_PER_DAY (opcional): Tope diario de consultas (default: 0, sin tope)
+    - RATE_LIMIT_STATE_FILE (opcional): Archivo de estado compartido entre
+      procesos (default: ratelimit.json dentro de DISK_CACHE_DIR)
+    - RATE_LIMIT_MAX_WAIT (opcional): Segundos máximos esperando cuota (default: 60)
+    - CONNECT_TIMEOUT (opcional): Timeout máximo para establecer la conexión,
+      separado del de lectura (default: 3)
+    - ADAPTIVE_TIMEOUTS (opcional): Ajustar los timeouts a la latencia
+      observada de cada endpoint (default: true)
+    - LATENCY_WINDOW / LATENCY_MIN_SAMPLES (opcional): Muestras recientes por
+      endpoint y mínimo antes de adaptar timeouts (default: 256 / 20)
+    - HEDGE_BUDGET (opcional): Fracción de peticiones que pueden duplicarse
+      al superar el p95; 0 deshabilita el hedging (default: 0)
+    - RETRY_MAX_ATTEMPTS (opcional): Intentos por consulta ante timeouts,
+      errores de conexión y 5xx; 1 deshabilita los reintentos (default: 3)
+    - RETRY_BACKOFF_BASE / RETRY_BACKOFF_MAX (opcional): Espera base y máxima
+      del backoff exponencial con jitter en segundos (default: 0.5 / 8)
+    - CIRCUIT_FAILURE_THRESHOLD (opcional): Fallos consecutivos que abren el
+      circuit breaker de un host; 0 lo deshabilita (default: 5)
+    - CIRCUIT_RESET_TIMEOUT (opcional): Segundos que el circuito queda abierto
+      antes de probar el host de nuevo (default: 30)
+    - DAEMON_SOCKET (opcional): Socket Unix de `weather daemon`; vacío
+      deshabilita el modo cliente (default: $XDG_RUNTIME_DIR/weather-cli.sock
+      o weather-cli.sock dentro de DISK_CACHE_DIR)
+    - DAEMON_TIMEOUT (opcional): Segundos que el CLI espera la respuesta del
+      daemon (default: 120)
+    - SERVER_HOST / SERVER_PORT (opcional): Dirección de `weather serve`
+      (default: 127.0.0.1 / 8080)
+    - SERVER_WORKERS (opcional): Hilos que atienden peticiones HTTP (default: 16)
+    - SERVER_QUEUE_SIZE (opcional): Conexiones en espera antes de responder
+      503 (default: 64)
+    - SERVER_MAX_BATCH (opcional): Ciudades máximas por /weather/batch
+      (default: 100)
+    - CITY_INDEX_PATH (opcional): Índice local nombre → ID generado con
+      `python -m src.city_index build` (default: sin índice)
+    - CASSETTE_MODE (opcional): 'record' graba el tráfico HTTP en un cassette
+      y 'replay' responde desde él sin red (default: vacío, red real)
+    - CASSETTE_PATH (opcional): Archivo del cassette (.ndjson o .ndjson.gz)
+    - CASSETTE_TIMING (opcional): 'wire' reproduce sin demoras y 'original'
+      con el espaciado y la latencia grabados (default: wire)
+    - METRICS_ENABLED (opcional): Mide las fases de cada consulta, los
+      resultados, la caché y los reintentos para /metrics (default: false)
 
 Example:
     >>> from src.config import Config
@@ -21,15 +83,61 @@ Example:
     https://api.openweathermap.org/data/2.5/weather?q=Madrid&appid=...
 """
 
+import functools
 import os
-from typing import Optional
-
-from dotenv import load_dotenv
+from typing import List, Optional
 
 from .exceptions import ConfigurationException
 
-# Cargar variables de entorno desde archivo .env en la raíz del proyecto
-load_dotenv()
+
+def find_env_file() -> Optional[str]:
+    """
+    Busca un archivo .env desde el directorio de este módulo hacia arriba.
+
+    Es la misma búsqueda que hace python-dotenv por defecto (directorio del
+    archivo que llama y sus padres), pero sin importar la librería.
+
+    Returns:
+        Optional[str]: Ruta del .env más cercano, o None si no hay ninguno.
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        candidate = os.path.join(directory, ".env")
+        if os.path.isfile(candidate):
+            return candidate
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+
+@functools.lru_cache(maxsize=None)
+def load_env() -> Optional[str]:
+    """
+    Carga el archivo .env en las variables de entorno una sola vez por proceso.
+
+    python-dotenv se importa solo si existe un .env: cuando la configuración
+    llega por variables de entorno (scripts, cron, contenedores) el CLI no
+    paga el costo de importarla. Las llamadas siguientes devuelven el
+    resultado cacheado sin volver a leer el archivo.
+
+    Returns:
+        Optional[str]: Ruta del .env cargado, o None si no había ninguno.
+
+    Note:
+        Como python-dotenv, no pisa variables de entorno ya definidas.
+    """
+    path = find_env_file()
+    if path is not None:
+        from dotenv import load_dotenv
+
+        load_dotenv(path)
+    return path
+
+
+# Cargar variables de entorno desde archivo .env (si existe) antes de leer
+# los atributos de Config
+load_env()
 
 
 class Config:
@@ -45,11 +153,90 @@ class Config:
     
     Attributes:
         BASE_URL (str): URL base de la API de OpenWeatherMap (weather endpoint).
+        GROUP_URL (str): URL del endpoint group, que devuelve el clima de
+            varias ciudades (por ID) en una sola petición.
+        GROUP_MAX_IDS (int): Máximo de IDs por petición al endpoint group (20).
         API_KEY (Optional[str]): API key de OpenWeatherMap, cargada desde variable
             de entorno OPENWEATHER_API_KEY. None si no está configurada.
         LANG (str): Código de idioma para respuestas (es, en, fr, etc.).
             Default: 'es' (español).
         TIMEOUT (int): Timeout para peticiones HTTP en segundos. Default: 10.
+        POOL_CONNECTIONS (int): Cantidad de pools de conexión (uno por host)
+            que mantiene la sesión HTTP. Default: 10.
+        POOL_MAXSIZE (int): Máximo de conexiones keep-alive reutilizables por
+            host. Default: 10.
+        POOL_BLOCK (bool): Si es True, las peticiones esperan una conexión
+            libre en vez de abrir conexiones extra fuera del pool.
+        BATCH_WORKERS (int): Consultas simultáneas en modo batch
+            (--cities-file). Default: 8.
+        ASYNC_MAX_CONCURRENCY (int): Consultas simultáneas máximas (y tamaño
+            del pool de conexiones) de AsyncWeatherService. Default: 50.
+        UNITS (str): Unidades de medida de la API. Siempre 'metric' (Celsius,
+            m/s); forma parte de la clave de caché.
+        CACHE_TTL (int): Segundos que una respuesta cacheada en memoria se
+            considera vigente. Default: 600 (la API actualiza cada ~10 min).
+        CACHE_MAX_ENTRIES (int): Máximo de respuestas en la caché en memoria
+            (0 = sin límite). Default: 1024.
+        CACHE_MAX_BYTES (int): Presupuesto total en bytes de la caché en
+            memoria (0 = sin límite). Default: 16 MiB.
+        DISK_CACHE_ENABLED (bool): Si es True, el CLI usa la caché SQLite
+            persistente compartida entre invocaciones. Default: False.
+        DISK_CACHE_DIR (str): Directorio del archivo SQLite de la caché.
+        DISK_CACHE_TTL (int): Segundos que una respuesta en disco es fresca.
+            Default: 600.
+        DISK_CACHE_STALE_TTL (int): Segundos adicionales durante los cuales
+            una respuesta vencida se sirve mientras se refresca en segundo
+            plano (stale-while-revalidate). Default: 0 (deshabilitado).
+        NEGATIVE_CACHE_TTL (int): Segundos durante los cuales una ciudad que
+            dio 404 se rechaza sin consultar la API. Default: 300 (más corto
+            que CACHE_TTL para que un alta nueva se vea pronto).
+        NEGATIVE_CACHE_MAX_ENTRIES (int): Máximo de ciudades inexistentes en
+            la caché negativa en memoria. Default: 4096.
+        RATE_LIMIT_PER_MINUTE (int): Consultas por minuto del token bucket del
+            cliente (0 = sin limitador). Default: 60.
+        RATE_LIMIT_PER_DAY (int): Consultas por día UTC (0 = sin tope).
+        RATE_LIMIT_STATE_FILE (str): Archivo JSON con el estado del limitador,
+            compartido por todos los procesos del host.
+        RATE_LIMIT_MAX_WAIT (float): Segundos máximos que una consulta espera
+            cuota antes de fallar con RateLimitException. Default: 60.
+        CONNECT_TIMEOUT (float): Tope del timeout de conexión en segundos
+            (TIMEOUT pasa a ser el tope del de lectura). Default: 3.
+        ADAPTIVE_TIMEOUTS (bool): Derivar los timeouts de connect y read de
+            los percentiles de latencia observados. Default: True.
+        LATENCY_WINDOW (int): Muestras recientes por endpoint. Default: 256.
+        LATENCY_MIN_SAMPLES (int): Muestras necesarias antes de adaptar
+            timeouts o hacer hedging. Default: 20.
+        HEDGE_BUDGET (float): Fracción máxima de peticiones duplicadas por
+            hedging (0 = sin hedging). Default: 0.
+        RETRY_MAX_ATTEMPTS (int): Intentos totales por petición ante fallas
+            transitorias (1 = sin reintentos). Default: 3.
+        RETRY_BACKOFF_BASE (float): Espera base del backoff exponencial.
+            Default: 0.5.
+        RETRY_BACKOFF_MAX (float): Tope de espera entre reintentos. Default: 8.
+        CIRCUIT_FAILURE_THRESHOLD (int): Fallos consecutivos que abren el
+            circuito de un host (0 = sin circuit breaker). Default: 5.
+        CIRCUIT_RESET_TIMEOUT (float): Segundos de circuito abierto antes de
+            dejar pasar una consulta de prueba (half-open). Default: 30.
+        DAEMON_SOCKET (str): Ruta del socket Unix del daemon residente. Si
+            existe, el CLI consulta a través del daemon. Vacío = nunca.
+        DAEMON_TIMEOUT (float): Segundos máximos esperando al daemon.
+            Default: 120.
+        SERVER_HOST (str): Interfaz donde escucha el servidor HTTP.
+            Default: "127.0.0.1".
+        SERVER_PORT (int): Puerto del servidor HTTP. Default: 8080.
+        SERVER_WORKERS (int): Hilos que atienden peticiones. Default: 16.
+        SERVER_QUEUE_SIZE (int): Conexiones en espera; con la cola llena se
+            responde 503 (load shedding). Default: 64.
+        SERVER_MAX_BATCH (int): Ciudades máximas por petición batch.
+            Default: 100.
+        CITY_INDEX_PATH (Optional[str]): Ruta del índice de ciudades. Si está
+            configurado, los nombres se resuelven a ID localmente y los
+            desconocidos se rechazan sin consultar la API.
+        CASSETTE_MODE (str): "record", "replay" o vacío (sin cassette).
+        CASSETTE_PATH (Optional[str]): Ruta del cassette a grabar o reproducir.
+        CASSETTE_TIMING (str): "wire" u "original". Default: "wire".
+        METRICS_ENABLED (bool): Instrumentar las consultas del servicio
+            (ver src/metrics.py). Default: False.
     
     Example:
         >>> Config.validate()  # Verificar configuración antes de usar
@@ -67,6 +254,10 @@ class Config:
     # URL base de la API de OpenWeatherMap (endpoint de clima actual)
     BASE_URL: str = "https://api.openweathermap.org/data/2.5/weather"
 
+    # Endpoint group: clima actual de hasta 20 ciudades (por ID) por petición
+    GROUP_URL: str = "https://api.openweathermap.org/data/2.5/group"
+    GROUP_MAX_IDS: int = 20
+
     # API key (cargada desde variable de entorno OPENWEATHER_API_KEY)
     # None si no está configurada
     API_KEY: Optional[str] = os.getenv("OPENWEATHER_API_KEY")
@@ -79,6 +270,102 @@ class Config:
     # Aumentar si la conexión es lenta
     TIMEOUT: int = int(os.getenv("REQUEST_TIMEOUT", "10"))
 
+    # Timeout de conexión separado del de lectura: un handshake colgado se
+    # detecta mucho antes que una respuesta lenta
+    CONNECT_TIMEOUT: float = float(os.getenv("CONNECT_TIMEOUT", "3"))
+
+    # Timeouts adaptativos y hedging a partir de la latencia observada
+    ADAPTIVE_TIMEOUTS: bool = os.getenv("ADAPTIVE_TIMEOUTS", "true").lower() in (
+        "1", "true", "yes"
+    )
+    LATENCY_WINDOW: int = int(os.getenv("LATENCY_WINDOW", "256"))
+    LATENCY_MIN_SAMPLES: int = int(os.getenv("LATENCY_MIN_SAMPLES", "20"))
+    HEDGE_BUDGET: float = float(os.getenv("HEDGE_BUDGET", "0"))
+
+    # Pool de conexiones HTTP keep-alive de la sesión de WeatherService.
+    # Reutilizar conexiones evita repetir el handshake TCP + TLS en cada ciudad
+    POOL_CONNECTIONS: int = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))
+    POOL_MAXSIZE: int = int(os.getenv("HTTP_POOL_MAXSIZE", "10"))
+    POOL_BLOCK: bool = os.getenv("HTTP_POOL_BLOCK", "false").lower() in (
+        "1", "true", "yes"
+    )
+
+    # Hilos que consultan ciudades en paralelo en modo batch (--cities-file)
+    BATCH_WORKERS: int = int(os.getenv("BATCH_WORKERS", "8"))
+
+    # Consultas en vuelo del cliente asíncrono (AsyncWeatherService)
+    ASYNC_MAX_CONCURRENCY: int = int(os.getenv("ASYNC_MAX_CONCURRENCY", "50"))
+
+    # Unidades de medida (métrico: Celsius, metros/segundo)
+    UNITS: str = "metric"
+
+    # Caché en memoria de respuestas (TTL + LRU acotada por entradas y bytes)
+    CACHE_TTL: int = int(os.getenv("CACHE_TTL", "600"))
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+    CACHE_MAX_BYTES: int = int(os.getenv("CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+
+    # Caché persistente en disco (SQLite) compartida entre invocaciones del CLI
+    DISK_CACHE_ENABLED: bool = os.getenv("DISK_CACHE_ENABLED", "false").lower() in (
+        "1", "true", "yes"
+    )
+    DISK_CACHE_DIR: str = os.getenv(
+        "DISK_CACHE_DIR",
+        os.path.join(
+            os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+            "weather-cli",
+        ),
+    )
+    DISK_CACHE_TTL: int = int(os.getenv("DISK_CACHE_TTL", "600"))
+    DISK_CACHE_STALE_TTL: int = int(os.getenv("DISK_CACHE_STALE_TTL", "0"))
+
+    # Caché negativa: ciudades inexistentes (404) con TTL propio y acotada
+    NEGATIVE_CACHE_TTL: int = int(os.getenv("NEGATIVE_CACHE_TTL", "300"))
+    NEGATIVE_CACHE_MAX_ENTRIES: int = int(os.getenv("NEGATIVE_CACHE_MAX_ENTRIES", "4096"))
+
+    # Limitador de tasa del cliente (token bucket compartido entre procesos)
+    RATE_LIMIT_PER_MINUTE: int = int(os.getenv("RATE_LIMIT_PER_MINUTE", "60"))
+    RATE_LIMIT_PER_DAY: int = int(os.getenv("RATE_LIMIT_PER_DAY", "0"))
+    RATE_LIMIT_STATE_FILE: str = os.getenv(
+        "RATE_LIMIT_STATE_FILE", os.path.join(DISK_CACHE_DIR, "ratelimit.json")
+    )
+    RATE_LIMIT_MAX_WAIT: float = float(os.getenv("RATE_LIMIT_MAX_WAIT", "60"))
+
+    # Reintentos con backoff exponencial y jitter ante fallas transitorias
+    RETRY_MAX_ATTEMPTS: int = int(os.getenv("RETRY_MAX_ATTEMPTS", "3"))
+    RETRY_BACKOFF_BASE: float = float(os.getenv("RETRY_BACKOFF_BASE", "0.5"))
+    RETRY_BACKOFF_MAX: float = float(os.getenv("RETRY_BACKOFF_MAX", "8"))
+
+    # Circuit breaker por host: falla rápido mientras la API está caída
+    CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+    CIRCUIT_RESET_TIMEOUT: float = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))
+
+    # Daemon residente (python run.py daemon) y su socket Unix
+    DAEMON_SOCKET: str = os.getenv(
+        "DAEMON_SOCKET",
+        os.path.join(os.getenv("XDG_RUNTIME_DIR") or DISK_CACHE_DIR, "weather-cli.sock"),
+    )
+    DAEMON_TIMEOUT: float = float(os.getenv("DAEMON_TIMEOUT", "120"))
+
+    # Servidor HTTP/JSON embebido (python run.py serve)
+    SERVER_HOST: str = os.getenv("SERVER_HOST", "127.0.0.1")
+    SERVER_PORT: int = int(os.getenv("SERVER_PORT", "8080"))
+    SERVER_WORKERS: int = int(os.getenv("SERVER_WORKERS", "16"))
+    SERVER_QUEUE_SIZE: int = int(os.getenv("SERVER_QUEUE_SIZE", "64"))
+    SERVER_MAX_BATCH: int = int(os.getenv("SERVER_MAX_BATCH", "100"))
+
+    # Índice local nombre de ciudad -> ID (None = consultar por nombre)
+    CITY_INDEX_PATH: Optional[str] = os.getenv("CITY_INDEX_PATH") or None
+
+    # Grabación/reproducción del tráfico HTTP (ver src/cassette.py)
+    CASSETTE_MODE: str = os.getenv("CASSETTE_MODE", "").lower()
+    CASSETTE_PATH: Optional[str] = os.getenv("CASSETTE_PATH") or None
+    CASSETTE_TIMING: str = os.getenv("CASSETTE_TIMING", "wire").lower()
+
+    # Instrumentación por fases de las consultas (ver src/metrics.py)
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "false").lower() in (
+        "1", "true", "yes"
+    )
+
     @classmethod
     def validate(cls) -> None:
         """
@@ -88,6 +375,7 @@ class Config:
         1. La API key de OpenWeatherMap esté configurada
         2. La API key no sea el valor placeholder por defecto
         3. El timeout sea un valor positivo válido
+        4. Los tamaños del pool de conexiones sean positivos
         
         Esta función debe llamarse al inicio de la aplicación, típicamente
         en el constructor de WeatherService, para detectar problemas de
@@ -116,9 +404,15 @@ class Config:
             )
 
         # Verificar que el timeout sea válido (mayor a 0)
-        if cls.TIMEOUT <= 0:
+        if cls.TIMEOUT <= 0 or cls.CONNECT_TIMEOUT <= 0:
             raise ConfigurationException("El timeout debe ser mayor a 0 segundos")
 
+        # Verificar que el pool de conexiones tenga al menos una conexión
+        if cls.POOL_CONNECTIONS <= 0 or cls.POOL_MAXSIZE <= 0:
+            raise ConfigurationException(
+                "El tamaño del pool de conexiones debe ser mayor a 0"
+            )
+
     @classmethod
     def get_api_url(cls, city: str) -> str:
         """
@@ -152,5 +446,57 @@ class Config:
             f"?q={city}"
             f"&appid={cls.API_KEY}"
             f"&lang={cls.LANG}"
-            f"&units=metric"  # Unidades métricas: Celsius, metros/segundo
+            f"&units={cls.UNITS}"  # Unidades métricas: Celsius, metros/segundo
+        )
+
+    @classmethod
+    def get_api_url_by_id(cls, city_id: int) -> str:
+        """
+        Construye la URL para consultar el clima de una ciudad por su ID.
+
+        Consultar por ID evita la ambigüedad de los nombres (hay decenas de
+        "San José") y es lo que usa WeatherService cuando hay un índice de
+        ciudades configurado.
+
+        Args:
+            city_id (int): ID de ciudad de OpenWeatherMap.
+
+        Returns:
+            str: URL completa con query parameters listos para el GET.
+
+        Example:
+            >>> Config.get_api_url_by_id(3117735)
+            'https://api.openweathermap.org/data/2.5/weather?id=3117735&appid=...&lang=es&units=metric'
+        """
+        return (
+            f"{cls.BASE_URL}"
+            f"?id={city_id}"
+            f"&appid={cls.API_KEY}"
+            f"&lang={cls.LANG}"
+            f"&units={cls.UNITS}"
+        )
+
+    @classmethod
+    def get_group_url(cls, city_ids: List[int]) -> str:
+        """
+        Construye la URL del endpoint group para varias ciudades por ID.
+
+        Args:
+            city_ids (List[int]): IDs de ciudad de OpenWeatherMap (como máximo
+                GROUP_MAX_IDS; dividir en lotes antes de llamar).
+
+        Returns:
+            str: URL completa con los IDs separados por coma, API key, idioma
+                y unidades.
+
+        Example:
+            >>> Config.get_group_url([3435910, 3117735])
+            'https://api.openweathermap.org/data/2.5/group?id=3435910,3117735&appid=...&lang=es&units=metric'
+        """
+        return (
+            f"{cls.GROUP_URL}"
+            f"?id={','.join(str(city_id) for city_id in city_ids)}"
+            f"&appid={cls.API_KEY}"
+            f"&lang={cls.LANG}"
+            f"&units={cls.UNITS}"
         )
@@ -0,0 +1,284 @@
+"""
+Daemon residente y cliente liviano sobre un socket Unix.
+
+Cada invocación del CLI paga el arranque del intérprete, los imports, el
+handshake TLS con la API y arranca con cachés vacías. `weather daemon`
+levanta un proceso de larga vida dueño del pool HTTP, de las cachés y del
+limitador de tasa; el CLI pasa a ser un cliente liviano que envía la ciudad
+por un socket Unix y muestra el resultado.
+
+Protocolo (una línea JSON por mensaje, UTF-8):
+    Petición:  {"city": "Madrid"}
+    Respuesta: {"ok": true, "data": {...parse_weather_data()...}}
+               {"ok": false, "error": "not_found", "message": "...", "city": "Madrid"}
+
+Los errores viajan como categorías ("not_found", "invalid_key",
+"rate_limit", "network", "config", "invalid_input", "api", "internal") y el
+cliente los reconstruye como las excepciones del dominio, así el CLI los
+muestra igual que en modo local.
+
+Si no hay daemon escuchando (socket inexistente o huérfano de un proceso
+caído) query() devuelve None y el CLI consulta en el mismo proceso. Un
+daemon vivo que no responde a tiempo es un NetworkException: repetir la
+consulta en el proceso duplicaría la petición que el daemon sigue haciendo.
+
+Example:
+    $ python run.py daemon &                # una vez por host/sesión
+    $ echo "Madrid" | python run.py         # usa el daemon si está activo
+"""
+
+import json
+import os
+import socket
+import socketserver
+from typing import Any, Dict, Optional
+
+from .config import Config
+from .exceptions import (
+    CityNotFoundException,
+    ConfigurationException,
+    InvalidAPIKeyException,
+    NetworkException,
+    RateLimitException,
+    WeatherAPIException,
+)
+
+# Tamaño máximo de una línea del protocolo (una ciudad o una respuesta)
+MAX_MESSAGE_BYTES = 64 * 1024
+
+
+def error_category(error: BaseException) -> str:
+    """Clasifica una excepción del servicio en una categoría del protocolo."""
+    if isinstance(error, CityNotFoundException):
+        return "not_found"
+    if isinstance(error, InvalidAPIKeyException):
+        return "invalid_key"
+    if isinstance(error, RateLimitException):
+        return "rate_limit"
+    if isinstance(error, NetworkException):
+        return "network"
+    if isinstance(error, ConfigurationException):
+        return "config"
+    if isinstance(error, ValueError):
+        return "invalid_input"
+    if isinstance(error, WeatherAPIException):
+        return "api"
+    return "internal"
+
+
+def _rebuild_error(payload: Dict[str, Any]) -> Exception:
+    """Reconstruye en el cliente la excepción informada por el daemon."""
+    category = payload.get("error")
+    message = payload.get("message", "")
+    if category == "not_found":
+        return CityNotFoundException(payload.get("city", ""))
+    if category == "invalid_key":
+        return InvalidAPIKeyException()
+    if category == "rate_limit":
+        # El mensaje ya incluye el "reintentar en Ns" del daemon
+        return RateLimitException(message)
+    if category == "network":
+        return NetworkException(message)
+    if category == "config":
+        return ConfigurationException(message)
+    if category == "invalid_input":
+        return ValueError(message)
+    if category == "api":
+        return WeatherAPIException(message)
+    return Exception(message)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Atiende una conexión: una respuesta por cada línea recibida."""
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if len(line) > MAX_MESSAGE_BYTES:
+                break
+            response = self.server.weather_daemon.respond(line)
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Servidor de socket Unix con un hilo por conexión."""
+
+    daemon_threads = True
+
+    def __init__(self, path: str, weather_daemon: "WeatherDaemon"):
+        self.weather_daemon = weather_daemon
+        super().__init__(path, _RequestHandler)
+
+
+class WeatherDaemon:
+    """
+    Servidor residente que responde consultas de clima por un socket Unix.
+
+    El servicio se comparte entre todas las conexiones, así el pool HTTP
+    keep-alive, las cachés y el limitador de tasa sirven a todos los scripts
+    del host.
+
+    Attributes:
+        service: WeatherService (o compatible) que resuelve las consultas.
+        socket_path (str): Ruta del socket Unix.
+
+    Example:
+        >>> with WeatherService() as service:
+        ...     WeatherDaemon(service, "/run/user/1000/weather-cli.sock").serve_forever()
+    """
+
+    def __init__(self, service: Any, socket_path: str):
+        """
+        Crea el socket y lo deja escuchando (solo accesible por el usuario).
+
+        Un socket huérfano de un daemon anterior que murió se reemplaza; si
+        otro daemon sigue respondiendo en la misma ruta se rechaza el inicio.
+
+        Args:
+            service: Servicio con get_weather() y parse_weather_data().
+            socket_path (str): Ruta del socket Unix a crear.
+
+        Raises:
+            ConfigurationException: Si ya hay un daemon escuchando en la ruta
+                o no se puede crear el socket.
+        """
+        self.service = service
+        self.socket_path = socket_path
+
+        if os.path.exists(socket_path):
+            if _is_listening(socket_path):
+                raise ConfigurationException(
+                    f"Ya hay un daemon escuchando en {socket_path}"
+                )
+            os.unlink(socket_path)
+
+        directory = os.path.dirname(socket_path)
+        try:
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # umask restrictiva: el socket nace accesible solo por el usuario
+            previous_umask = os.umask(0o177)
+            try:
+                self._server = _UnixServer(socket_path, self)
+            finally:
+                os.umask(previous_umask)
+        except OSError as e:
+            raise ConfigurationException(f"No se pudo crear el socket {socket_path}: {e}")
+
+    def respond(self, line: bytes) -> Dict[str, Any]:
+        """
+        Resuelve una línea del protocolo y arma la respuesta.
+
+        Args:
+            line (bytes): Petición JSON recibida.
+
+        Returns:
+            Dict[str, Any]: Respuesta a serializar para el cliente.
+        """
+        city = ""
+        try:
+            request = json.loads(line)
+            city = request.get("city", "") if isinstance(request, dict) else ""
+            if not isinstance(city, str):
+                raise ValueError("El nombre de la ciudad debe ser texto")
+            data = self.service.parse_weather_data(self.service.get_weather(city))
+            # parse_weather_data() devuelve un WeatherReading (Mapping)
+            return {"ok": True, "data": dict(data)}
+        except Exception as e:  # noqa: BLE001 - el error viaja al cliente
+            return {
+                "ok": False,
+                "error": error_category(e),
+                "message": str(e),
+                "city": city,
+            }
+
+    def serve_forever(self) -> None:
+        """Atiende conexiones hasta shutdown() o Ctrl+C y luego libera el socket."""
+        try:
+            self._server.serve_forever(poll_interval=0.1)
+        finally:
+            self.close()
+
+    def shutdown(self) -> None:
+        """Detiene serve_forever() desde otro hilo."""
+        self._server.shutdown()
+
+    def close(self) -> None:
+        """Cierra el socket y borra el archivo. Es seguro llamarlo más de una vez."""
+        self._server.server_close()
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+
+def _is_listening(socket_path: str) -> bool:
+    """Indica si hay un proceso aceptando conexiones en el socket."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(1.0)
+            sock.connect(socket_path)
+        return True
+    except OSError:
+        return False
+
+
+def query(
+    city: str, socket_path: Optional[str] = None, timeout: Optional[float] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Consulta el clima de una ciudad a través del daemon.
+
+    Args:
+        city (str): Nombre de la ciudad.
+        socket_path (Optional[str]): Ruta del socket. Default:
+            Config.DAEMON_SOCKET.
+        timeout (Optional[float]): Segundos máximos esperando la respuesta.
+            Default: Config.DAEMON_TIMEOUT.
+
+    Returns:
+        Optional[Dict[str, Any]]: Datos parseados (mismo formato que
+            parse_weather_data()), o None si no hay daemon disponible y hay
+            que consultar en el mismo proceso.
+
+    Raises:
+        Las mismas excepciones que WeatherService.get_weather(), informadas
+        por el daemon.
+        NetworkException: Si el daemon acepta la conexión pero no responde
+            dentro del timeout o la corta a mitad de la respuesta.
+    """
+    path = socket_path if socket_path is not None else Config.DAEMON_SOCKET
+    if not path or not os.path.exists(path):
+        return None
+    timeout = timeout if timeout is not None else Config.DAEMON_TIMEOUT
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        try:
+            sock.connect(path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            # Socket huérfano o borrado recién: no hay daemon, la consulta
+            # se hace en el mismo proceso
+            return None
+        except socket.timeout:
+            raise NetworkException(f"El daemon no aceptó la conexión en {timeout:g}s")
+        except OSError as e:
+            raise NetworkException(f"No se pudo conectar con el daemon: {e}")
+
+        try:
+            sock.sendall(json.dumps({"city": city}).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as stream:
+                line = stream.readline(MAX_MESSAGE_BYTES)
+        except socket.timeout:
+            raise NetworkException(f"El daemon no respondió en {timeout:g}s")
+        except OSError as e:
+            raise NetworkException(f"Error de comunicación con el daemon: {e}")
+
+    try:
+        response = json.loads(line)
+    except ValueError:
+        return None
+
+    if response.get("ok"):
+        return response["data"]
+    raise _rebuild_error(response)
@@ -0,0 +1,348 @@
+"""
+Caché persistente en disco (SQLite) compartida entre invocaciones del CLI.
+
+La caché en memoria (src/cache.py) vive lo que vive el proceso, así que cada
+`python run.py` empieza vacío. Esta caché guarda las respuestas crudas en un
+archivo SQLite dentro de un directorio configurable para que los cron jobs y
+scripts que invocan el CLI una y otra vez no repitan consultas idénticas.
+
+Por cada entrada se guarda:
+    - body: bytes JSON crudos tal como llegaron de la API
+    - fetched_at: momento (epoch) en que se descargó la respuesta
+    - observed_at: campo `dt` de la respuesta (momento de la observación)
+
+Una entrada es "fresca" durante `ttl` segundos y "vencida pero servible"
+durante `stale_ttl` segundos más (stale-while-revalidate): en esa ventana
+WeatherService la devuelve de inmediato y la refresca en segundo plano.
+
+Además se recuerdan las ciudades inexistentes (404) durante `negative_ttl`
+segundos, así los nombres inválidos que se repiten en cada corrida de un
+batch fallan sin ir a la red.
+
+Las entradas que ya no se pueden servir se borran al abrir la caché y cada
+PURGE_EVERY escrituras, así el archivo no crece sin límite en un cron job
+que consulta ciudades distintas en cada corrida.
+
+Concurrencia:
+    SQLite en modo WAL permite lectores concurrentes con un escritor, y el
+    busy_timeout hace que un proceso espere (en vez de fallar) si otro está
+    escribiendo. Cada hilo usa su propia conexión porque las conexiones de
+    sqlite3 no deben compartirse entre hilos.
+
+Example:
+    >>> cache = DiskCache("/tmp/weather-cache", ttl=600, stale_ttl=3600)
+    >>> cache.set("madrid|es|metric", b'{"dt": 1699632000}', observed_at=1699632000)
+    >>> entry = cache.get("madrid|es|metric")
+    >>> entry.fresh
+    True
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, NamedTuple, Optional
+
+from .config import Config
+
+# Nombre del archivo SQLite dentro del directorio de caché
+DB_FILENAME = "weather-cache.sqlite3"
+
+# Milisegundos que un proceso espera el lock de escritura de otro proceso
+BUSY_TIMEOUT_MS = 5000
+
+# Escrituras (positivas y negativas) entre dos purgas de entradas vencidas
+PURGE_EVERY = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    fetched_at REAL NOT NULL,
+    observed_at INTEGER
+)
+"""
+
+# Resultados negativos (ciudad no encontrada) con su propio TTL
+_NEGATIVE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS not_found (
+    key TEXT PRIMARY KEY,
+    failed_at REAL NOT NULL
+)
+"""
+
+
+class DiskCacheEntry(NamedTuple):
+    """
+    Entrada leída de la caché en disco.
+
+    Attributes:
+        body (bytes): Cuerpo JSON crudo de la respuesta.
+        fetched_at (float): Epoch en que se descargó la respuesta.
+        observed_at (Optional[int]): Campo `dt` de la observación, si existía.
+        fresh (bool): True si todavía está dentro del TTL; False si está
+            vencida pero dentro de la ventana stale-while-revalidate.
+    """
+
+    body: bytes
+    fetched_at: float
+    observed_at: Optional[int]
+    fresh: bool
+
+
+class DiskCache:
+    """
+    Caché de respuestas persistente respaldada por SQLite.
+
+    Attributes:
+        path (str): Ruta del archivo SQLite.
+        ttl (float): Segundos durante los cuales una entrada es fresca.
+        stale_ttl (float): Segundos extra durante los cuales una entrada
+            vencida todavía puede servirse mientras se refresca (0 = nunca).
+        negative_ttl (float): Segundos que se recuerda una ciudad
+            inexistente (0 = no se guardan resultados negativos).
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        ttl: float,
+        stale_ttl: float = 0,
+        negative_ttl: float = 0,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Abre (o crea) la caché en el directorio indicado.
+
+        Args:
+            directory (str): Directorio donde se guarda el archivo SQLite. Se
+                crea si no existe.
+            ttl (float): Tiempo de frescura de cada entrada en segundos.
+            stale_ttl (float): Ventana adicional para servir entradas
+                vencidas. Default: 0 (no se sirven entradas vencidas).
+            negative_ttl (float): Tiempo que se recuerda una ciudad
+                inexistente. Default: 0 (deshabilitado).
+            clock (Callable[[], float]): Reloj de pared (epoch); inyectable en
+                tests. Se usa tiempo de pared y no monótono porque el valor se
+                comparte entre procesos.
+
+        Raises:
+            ValueError: Si ttl no es positivo o stale_ttl/negative_ttl son
+                negativos.
+            OSError: Si no se puede crear el directorio.
+        """
+        if ttl <= 0:
+            raise ValueError("El TTL de la caché en disco debe ser mayor a 0")
+        if stale_ttl < 0 or negative_ttl < 0:
+            raise ValueError("La ventana stale de la caché no puede ser negativa")
+
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, DB_FILENAME)
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self._clock = clock
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+        self._negative_hits = 0
+        self._writes = 0
+
+        # Crear el esquema y activar WAL una sola vez (persisten en el archivo)
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(_SCHEMA)
+        conn.execute(_NEGATIVE_SCHEMA)
+        self._purge_quietly()
+
+    @classmethod
+    def from_config(cls) -> "DiskCache":
+        """Crea la caché con el directorio y tiempos definidos en Config."""
+        return cls(
+            directory=Config.DISK_CACHE_DIR,
+            ttl=Config.DISK_CACHE_TTL,
+            stale_ttl=Config.DISK_CACHE_STALE_TTL,
+            negative_ttl=Config.NEGATIVE_CACHE_TTL,
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        """Devuelve la conexión SQLite del hilo actual, creándola si hace falta."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # isolation_level=None: autocommit, cada sentencia es atómica y no
+            # se mantienen transacciones abiertas que bloqueen a otros procesos
+            conn = sqlite3.connect(
+                self.path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None
+            )
+            conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[DiskCacheEntry]:
+        """
+        Lee una entrada si todavía es fresca o está dentro de la ventana stale.
+
+        Args:
+            key (str): Clave construida con make_cache_key().
+
+        Returns:
+            Optional[DiskCacheEntry]: La entrada, o None si no existe, ya no
+                se puede servir o la base está bloqueada por otro proceso.
+        """
+        try:
+            row = self._connection().execute(
+                "SELECT body, fetched_at, observed_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+        except sqlite3.OperationalError:
+            # Base bloqueada más allá del busy_timeout: tratar como miss
+            row = None
+
+        age = self._clock() - row[1] if row is not None else None
+        with self._stats_lock:
+            if row is None or age >= self.ttl + self.stale_ttl:
+                self._misses += 1
+                return None
+            fresh = age < self.ttl
+            if fresh:
+                self._hits += 1
+            else:
+                self._stale_hits += 1
+
+        return DiskCacheEntry(bytes(row[0]), row[1], row[2], fresh)
+
+    def set(self, key: str, body: bytes, observed_at: Optional[int] = None) -> None:
+        """
+        Guarda (o reemplaza) la respuesta cruda de una consulta.
+
+        Args:
+            key (str): Clave construida con make_cache_key().
+            body (bytes): Cuerpo JSON crudo de la respuesta.
+            observed_at (Optional[int]): Campo `dt` de la respuesta.
+        """
+        try:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO responses (key, body, fetched_at, observed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, sqlite3.Binary(body), self._clock(), observed_at),
+            )
+        except sqlite3.OperationalError:
+            # La caché es una optimización: si otro proceso mantiene el lock
+            # más allá del busy_timeout se descarta la escritura
+            pass
+        self._count_write()
+
+    def is_not_found(self, key: str) -> bool:
+        """
+        Indica si la ciudad se registró como inexistente dentro del TTL negativo.
+
+        Args:
+            key (str): Clave construida con make_cache_key().
+
+        Returns:
+            bool: True si la ciudad dio 404 hace menos de negative_ttl segundos.
+        """
+        if not self.negative_ttl:
+            return False
+
+        try:
+            row = self._connection().execute(
+                "SELECT failed_at FROM not_found WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.OperationalError:
+            return False
+
+        if row is None or self._clock() - row[0] >= self.negative_ttl:
+            return False
+
+        with self._stats_lock:
+            self._negative_hits += 1
+        return True
+
+    def set_not_found(self, key: str) -> None:
+        """
+        Registra que la ciudad no existe (respuesta 404 de la API).
+
+        Args:
+            key (str): Clave construida con make_cache_key().
+        """
+        if not self.negative_ttl:
+            return
+
+        try:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO not_found (key, failed_at) VALUES (?, ?)",
+                (key, self._clock()),
+            )
+        except sqlite3.OperationalError:
+            pass
+        self._count_write()
+
+    def _count_write(self) -> None:
+        """Cuenta una escritura y purga las entradas vencidas cada PURGE_EVERY."""
+        with self._stats_lock:
+            self._writes += 1
+            due = self._writes % PURGE_EVERY == 0
+        if due:
+            self._purge_quietly()
+
+    def _purge_quietly(self) -> None:
+        """purge_expired() sin fallar si otro proceso tiene la base bloqueada."""
+        try:
+            self.purge_expired()
+        except sqlite3.OperationalError:
+            pass
+
+    def purge_expired(self) -> int:
+        """
+        Elimina las entradas que ya no se pueden servir ni como stale.
+
+        También elimina los resultados negativos vencidos.
+
+        Returns:
+            int: Cantidad de entradas eliminadas.
+        """
+        now = self._clock()
+        conn = self._connection()
+        cursor = conn.execute(
+            "DELETE FROM responses WHERE fetched_at <= ?", (now - (self.ttl + self.stale_ttl),)
+        )
+        removed = cursor.rowcount
+        cursor = conn.execute(
+            "DELETE FROM not_found WHERE failed_at <= ?", (now - self.negative_ttl,)
+        )
+        return removed + cursor.rowcount
+
+    def clear(self) -> None:
+        """Elimina todas las entradas de la caché en disco (positivas y negativas)."""
+        self.clear_not_found()
+        self._connection().execute("DELETE FROM responses")
+
+    def clear_not_found(self) -> None:
+        """Elimina solo los resultados negativos (ciudades no encontradas)."""
+        self._connection().execute("DELETE FROM not_found")
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Devuelve las estadísticas de uso de este proceso.
+
+        Returns:
+            Dict[str, int]: Contadores hits (frescos), stale_hits, misses y
+                negative_hits (ciudades inexistentes respondidas desde disco).
+        """
+        with self._stats_lock:
+            return {
+                "hits": self._hits,
+                "stale_hits": self._stale_hits,
+                "misses": self._misses,
+                "negative_hits": self._negative_hits,
+            }
+
+    def close(self) -> None:
+        """Cierra la conexión SQLite del hilo actual."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -10,7 +10,10 @@ La jerarquía es:
     ├── WeatherAPIException (base para errores de API)
     │   ├── CityNotFoundException (ciudad no encontrada - 404)
     │   ├── InvalidAPIKeyException (API key inválida - 401)
+    │   ├── RateLimitException (límite de consultas superado - 429)
+    │   ├── ServerErrorException (error del servidor de la API - 5xx)
     │   └── NetworkException (problemas de red/timeout)
+    │       └── CircuitOpenException (circuit breaker abierto, sin consultar)
     └── ConfigurationException (problemas de configuración)
 
 Esta estructura permite capturar excepciones en diferentes niveles de
@@ -25,6 +28,8 @@ Example:
     No se encontró la ciudad: Atlantis
 """
 
+from typing import Optional
+
 
 class WeatherAPIException(Exception):
     """
@@ -111,6 +116,78 @@ class InvalidAPIKeyException(WeatherAPIException):
         )
 
 
+class RateLimitException(WeatherAPIException):
+    """
+    Se lanza cuando se supera el límite de consultas de la API.
+
+    Corresponde a un error HTTP 429 de la API, o a que el limitador del
+    cliente (RateLimiter) determinó que no queda cuota disponible dentro del
+    tiempo de espera permitido.
+
+    Attributes:
+        retry_after (Optional[float]): Segundos sugeridos antes de reintentar
+            (header Retry-After o estimación del limitador), o None si se
+            desconoce.
+
+    Example:
+        >>> raise RateLimitException(retry_after=30)
+        Traceback (most recent call last):
+        ...
+        RateLimitException: Se superó el límite de consultas a la API (reintentar en 30s)
+
+    Note:
+        Si ocurre seguido, bajar RATE_LIMIT_PER_MINUTE o la cantidad de workers.
+    """
+
+    def __init__(
+        self,
+        message: str = "Se superó el límite de consultas a la API",
+        retry_after: Optional[float] = None,
+    ):
+        """
+        Inicializa la excepción con el tiempo sugerido de espera.
+
+        Args:
+            message (str): Descripción del límite alcanzado.
+            retry_after (Optional[float]): Segundos antes de reintentar.
+        """
+        self.retry_after = retry_after
+        if retry_after is not None:
+            message = f"{message} (reintentar en {retry_after:.0f}s)"
+        super().__init__(message)
+
+
+class ServerErrorException(WeatherAPIException):
+    """
+    Se lanza cuando la API responde con un error del servidor (5xx).
+
+    A diferencia de los errores 4xx, un 5xx suele ser transitorio (caída
+    parcial o sobrecarga de OpenWeatherMap), por eso WeatherService lo
+    reintenta según su RetryPolicy y lo cuenta como falla del host en el
+    circuit breaker.
+
+    Attributes:
+        status_code (int): Código HTTP devuelto por la API (500, 502, etc.).
+
+    Example:
+        >>> raise ServerErrorException(503, "Service Unavailable")
+        Traceback (most recent call last):
+        ...
+        ServerErrorException: Error de la API: 503 - Service Unavailable
+    """
+
+    def __init__(self, status_code: int, body: str = ""):
+        """
+        Inicializa la excepción con el código y el cuerpo de la respuesta.
+
+        Args:
+            status_code (int): Código HTTP 5xx de la respuesta.
+            body (str): Cuerpo de la respuesta (se incluye en el mensaje).
+        """
+        self.status_code = status_code
+        super().__init__(f"Error de la API: {status_code} - {body}")
+
+
 class ConfigurationException(Exception):
     """
     Se lanza cuando hay problemas con la configuración de la aplicación.
@@ -175,3 +252,43 @@ class NetworkException(WeatherAPIException):
             message (str): Descripción específica del problema de red.
         """
         super().__init__(message)
+
+
+class CircuitOpenException(NetworkException):
+    """
+    Se lanza cuando el circuit breaker del host está abierto.
+
+    Después de varias fallas consecutivas contra la API, las consultas se
+    rechazan de inmediato sin tocar la red hasta que pase el tiempo de
+    enfriamiento. Así una API caída no consume a todos los workers
+    esperando timeouts.
+
+    Attributes:
+        host (str): Host cuyo circuito está abierto.
+        retry_after (float): Segundos hasta que se permita una consulta de
+            prueba (half-open).
+
+    Example:
+        >>> raise CircuitOpenException("api.openweathermap.org", 12)
+        Traceback (most recent call last):
+        ...
+        CircuitOpenException: La API no está disponible (api.openweathermap.org); reintentar en 12s
+
+    Note:
+        Hereda de NetworkException para que el código que ya maneja errores
+        de red la trate igual.
+    """
+
+    def __init__(self, host: str, retry_after: float):
+        """
+        Inicializa la excepción con el host y el tiempo de enfriamiento.
+
+        Args:
+            host (str): Host de la API cuyo circuito está abierto.
+            retry_after (float): Segundos hasta la consulta de prueba.
+        """
+        self.host = host
+        self.retry_after = retry_after
+        super().__init__(
+            f"La API no está disponible ({host}); reintentar en {retry_after:.0f}s"
+        )
@@ -0,0 +1,185 @@
+"""
+Decodificación rápida de JSON y extracción precompilada de campos.
+
+Cada respuesta de la API se decodifica entera y después parse_weather_data()
+recorre claves anidadas (data["main"]["temp"], ...). En batches grandes eso
+es una parte medible del CPU. Este módulo ofrece dos piezas:
+
+loads():
+    Usa orjson si está instalado (varias veces más rápido que json y acepta
+    bytes directamente) y si no cae a json de la biblioteca estándar. Ambos
+    lanzan una subclase de ValueError ante un cuerpo inválido.
+
+FieldExtractor:
+    Recibe las rutas de los campos que interesan ("main.temp",
+    "weather.0.description") y genera una única función Python con los
+    accesos ya escritos, como hace collections.namedtuple. Los prefijos
+    comunes (data["main"]) se resuelven una sola vez por registro. Los
+    errores son los mismos que al indexar a mano (KeyError, IndexError,
+    TypeError), así que los llamadores conservan su manejo de errores.
+
+Dependencias:
+    orjson (opcional): si no está instalado se usa json sin cambios de
+    comportamiento.
+
+Example:
+    >>> extractor = FieldExtractor(["name", "main.temp", "weather.0.description"])
+    >>> extractor({"name": "Madrid", "main": {"temp": 18.3},
+    ...            "weather": [{"description": "nuboso"}]})
+    ('Madrid', 18.3, 'nuboso')
+    >>> list(extractor.extract_many([b'{"name": "Lima", ...}']))
+"""
+
+import json
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sequence, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+
+# Biblioteca usada por loads(): "orjson" o "json"
+BACKEND = "orjson" if orjson is not None else "json"
+
+JSONInput = Union[bytes, bytearray, memoryview, str]
+
+
+def loads(body: JSONInput) -> Any:
+    """
+    Decodifica un documento JSON con el backend más rápido disponible.
+
+    Args:
+        body (JSONInput): Cuerpo de la respuesta en bytes o texto.
+
+    Returns:
+        Any: Documento decodificado.
+
+    Raises:
+        ValueError: Si el cuerpo no es JSON válido (orjson.JSONDecodeError y
+            json.JSONDecodeError son subclases de ValueError).
+    """
+    if orjson is not None:
+        return orjson.loads(body)
+    if isinstance(body, memoryview):
+        body = body.tobytes()
+    return json.loads(body)
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Serializa un objeto a JSON en bytes UTF-8 con el backend disponible.
+
+    Args:
+        obj (Any): Objeto serializable (dicts, listas, números, textos).
+
+    Returns:
+        bytes: Documento JSON compacto.
+
+    Raises:
+        TypeError: Si el objeto no es serializable.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _split_path(path: str) -> Tuple[Union[str, int], ...]:
+    """Convierte "weather.0.description" en ("weather", 0, "description")."""
+    if not path:
+        raise ValueError("La ruta de un campo no puede estar vacía")
+    return tuple(int(part) if part.isdigit() else part for part in path.split("."))
+
+
+class FieldExtractor:
+    """
+    Función precompilada que extrae un conjunto fijo de rutas de un registro.
+
+    Attributes:
+        paths (Tuple[str, ...]): Rutas extraídas, en el orden de la tupla
+            resultante.
+    """
+
+    def __init__(self, paths: Sequence[str]):
+        """
+        Genera y compila la función de extracción.
+
+        Args:
+            paths (Sequence[str]): Rutas separadas por puntos; los segmentos
+                numéricos son índices de lista ("weather.0.description").
+
+        Raises:
+            ValueError: Si no hay rutas o alguna está vacía.
+        """
+        if not paths:
+            raise ValueError("El extractor necesita al menos una ruta")
+
+        self.paths = tuple(paths)
+        self._extract = self._compile([_split_path(path) for path in self.paths])
+
+    @staticmethod
+    def _compile(paths: List[Tuple[Union[str, int], ...]]) -> Callable[[Any], Tuple[Any, ...]]:
+        """Genera el código de la función y lo compila."""
+        # Cada prefijo intermedio (("main",), ("weather", 0)) se guarda en una
+        # variable local la primera vez que aparece. Los accesos se emiten en
+        # el orden de las rutas, así el primer campo faltante es el que falla
+        names: Dict[Tuple[Union[str, int], ...], str] = {(): "data"}
+        lines: List[str] = []
+        results: List[str] = []
+        for index, path in enumerate(paths):
+            for depth in range(1, len(path)):
+                prefix = path[:depth]
+                if prefix not in names:
+                    names[prefix] = f"v{len(names)}"
+                    lines.append(f"    {names[prefix]} = {names[prefix[:-1]]}[{prefix[-1]!r}]")
+            results.append(f"r{index}")
+            lines.append(f"    r{index} = {names[path[:-1]]}[{path[-1]!r}]")
+
+        source = "def extract(data):\n{}\n    return ({},)\n".format(
+            "\n".join(lines), ", ".join(results)
+        )
+        namespace: Dict[str, Any] = {}
+        # Las rutas se insertan con repr(), así que el código generado solo
+        # contiene literales y subíndices
+        exec(compile(source, "<FieldExtractor>", "exec"), namespace)
+        return namespace["extract"]
+
+    def __call__(self, data: Any) -> Tuple[Any, ...]:
+        """
+        Extrae los campos de un registro ya decodificado.
+
+        Args:
+            data (Any): Registro JSON decodificado (normalmente un dict).
+
+        Returns:
+            Tuple[Any, ...]: Un valor por ruta, en el orden de paths.
+
+        Raises:
+            KeyError: Si falta una clave.
+            IndexError: Si una lista no tiene el índice pedido.
+            TypeError: Si un nivel intermedio no es dict ni lista.
+        """
+        return self._extract(data)
+
+    def from_bytes(self, body: JSONInput) -> Tuple[Any, ...]:
+        """Decodifica un cuerpo JSON con loads() y extrae sus campos."""
+        return self._extract(loads(body))
+
+    def extract_many(self, bodies: Iterable[JSONInput]) -> Iterator[Tuple[Any, ...]]:
+        """
+        Decodifica y extrae una secuencia de cuerpos JSON.
+
+        Args:
+            bodies (Iterable[JSONInput]): Cuerpos crudos (por ejemplo los
+                guardados en la caché).
+
+        Yields:
+            Tuple[Any, ...]: Los campos de cada cuerpo, en el mismo orden.
+
+        Raises:
+            ValueError: Si un cuerpo no es JSON válido.
+            KeyError, IndexError, TypeError: Si falta un campo.
+        """
+        extract = self._extract
+        decode = loads
+        for body in bodies:
+            yield extract(decode(body))
@@ -0,0 +1,316 @@
+"""
+Histograma de latencias por endpoint, timeouts adaptativos y presupuesto de hedging.
+
+Un único Config.TIMEOUT para conectar y leer obliga a elegir entre esperar
+10 segundos en un socket colgado o cortar respuestas lentas pero válidas.
+Midiendo la latencia real de cada endpoint se pueden derivar timeouts
+ajustados a lo que la API efectivamente tarda:
+
+    - read: p99 observado × READ_TIMEOUT_MULTIPLIER, acotado entre
+      MIN_READ_TIMEOUT y Config.TIMEOUT.
+    - connect: p50 observado × CONNECT_TIMEOUT_MULTIPLIER (un handshake
+      TCP + TLS cuesta unos pocos RTT), acotado entre MIN_CONNECT_TIMEOUT y
+      Config.CONNECT_TIMEOUT.
+
+Mientras no haya suficientes muestras se usan los valores de Config.
+
+Hedging:
+    En un batch una sola consulta lenta retrasa todo el reporte. Cuando una
+    petición supera el p95 del endpoint, WeatherService puede enviar un
+    duplicado y quedarse con la primera respuesta. HedgeBudget limita qué
+    fracción de las peticiones puede duplicarse para no duplicar la carga
+    (y la cuota de la API) cuando todo el servicio está lento.
+
+Example:
+    >>> tracker = LatencyTracker(window=256, min_samples=20)
+    >>> tracker.record("/data/2.5/weather", 0.120)
+    >>> tracker.timeouts("/data/2.5/weather")   # (connect, read)
+    (3.0, 10)
+"""
+
+import threading
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional, Sequence, Tuple
+
+from .config import Config
+
+# Factores y pisos de los timeouts adaptativos
+READ_TIMEOUT_MULTIPLIER = 3.0
+CONNECT_TIMEOUT_MULTIPLIER = 3.0
+MIN_READ_TIMEOUT = 1.0
+MIN_CONNECT_TIMEOUT = 0.5
+
+
+def percentile(samples: Sequence[float], q: float) -> Optional[float]:
+    """
+    Calcula un percentil de muestras ya ordenadas (método nearest-rank).
+
+    Args:
+        samples (Sequence[float]): Muestras ordenadas de menor a mayor.
+        q (float): Percentil entre 0 y 1 (0.95 = p95).
+
+    Returns:
+        Optional[float]: El valor del percentil, o None si no hay muestras.
+    """
+    if not samples:
+        return None
+    rank = min(len(samples) - 1, max(0, int(round(q * len(samples))) - 1))
+    return samples[rank]
+
+
+def latency_summary(samples: Iterable[float]) -> Dict[str, Optional[float]]:
+    """
+    Resume latencias en segundos como p50, p95, p99, media y máximo en milisegundos.
+
+    Args:
+        samples (Iterable[float]): Latencias en segundos, en cualquier orden.
+
+    Returns:
+        Dict[str, Optional[float]]: p50, p95, p99, mean y max en ms
+            redondeados a microsegundos (None si no hay muestras).
+    """
+    ordered = sorted(samples)
+    summary = {
+        name: percentile(ordered, q)
+        for name, q in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99))
+    }
+    summary["mean"] = sum(ordered) / len(ordered) if ordered else None
+    summary["max"] = ordered[-1] if ordered else None
+    return {
+        name: None if value is None else round(value * 1000, 3)
+        for name, value in summary.items()
+    }
+
+
+class LatencyHistogram:
+    """
+    Ventana deslizante con las últimas latencias de un endpoint.
+
+    Guarda las últimas `window` muestras; los percentiles se calculan sobre
+    esa ventana, así el histograma sigue los cambios de la API (una
+    degradación se refleja en pocos cientos de consultas).
+
+    Attributes:
+        window (int): Cantidad máxima de muestras conservadas.
+    """
+
+    def __init__(self, window: int = 256):
+        """
+        Inicializa un histograma vacío.
+
+        Args:
+            window (int): Cantidad de muestras recientes a conservar.
+
+        Raises:
+            ValueError: Si window es menor a 1.
+        """
+        if window < 1:
+            raise ValueError("La ventana de latencias debe ser mayor a 0")
+
+        self.window = window
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        """Agrega una muestra de latencia en segundos."""
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        """Cantidad de muestras en la ventana."""
+        return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Calcula un percentil de la ventana (método nearest-rank).
+
+        Args:
+            q (float): Percentil entre 0 y 1 (0.95 = p95).
+
+        Returns:
+            Optional[float]: Latencia en segundos, o None si no hay muestras.
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        return percentile(samples, q)
+
+
+class LatencyTracker:
+    """
+    Histogramas de latencia por endpoint y timeouts derivados de ellos.
+
+    Attributes:
+        window (int): Muestras por endpoint.
+        min_samples (int): Muestras necesarias antes de adaptar timeouts y
+            habilitar hedging para un endpoint.
+
+    Example:
+        >>> tracker = LatencyTracker()
+        >>> tracker.stats()
+        {}
+    """
+
+    def __init__(self, window: int = 256, min_samples: int = 20):
+        """
+        Inicializa el tracker sin endpoints.
+
+        Args:
+            window (int): Muestras por endpoint.
+            min_samples (int): Muestras mínimas para confiar en los percentiles.
+        """
+        self.window = window
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, LatencyHistogram] = {}
+
+    @classmethod
+    def from_config(cls) -> "LatencyTracker":
+        """Crea el tracker con los valores definidos en Config (LATENCY_*)."""
+        return cls(window=Config.LATENCY_WINDOW, min_samples=Config.LATENCY_MIN_SAMPLES)
+
+    def histogram(self, endpoint: str) -> LatencyHistogram:
+        """Devuelve el histograma del endpoint, creándolo si no existía."""
+        with self._lock:
+            histogram = self._histograms.get(endpoint)
+            if histogram is None:
+                histogram = LatencyHistogram(self.window)
+                self._histograms[endpoint] = histogram
+            return histogram
+
+    def record(self, endpoint: str, seconds: float) -> None:
+        """Registra la latencia de una respuesta del endpoint."""
+        self.histogram(endpoint).record(seconds)
+
+    def record_timeout(self, endpoint: str, timeout: float) -> None:
+        """
+        Registra una petición que se cortó por timeout.
+
+        La latencia real es desconocida pero al menos `timeout`, así que se
+        guarda ese valor como muestra censurada. Sin ella, si la API se
+        vuelve más lenta que el timeout adaptativo todas las peticiones se
+        cortan, ninguna aporta muestras y el timeout nunca vuelve a crecer;
+        con ella unos pocos timeouts suben el p99 y el timeout se agranda
+        (hasta Config.TIMEOUT) para dejar pasar las respuestas lentas.
+
+        Args:
+            endpoint (str): Path del endpoint.
+            timeout (float): Timeout en segundos que se agotó.
+        """
+        self.histogram(endpoint).record(timeout)
+
+    def percentile(self, endpoint: str, q: float) -> Optional[float]:
+        """
+        Percentil del endpoint, o None si todavía no hay min_samples muestras.
+
+        Args:
+            endpoint (str): Path del endpoint (ej: "/data/2.5/weather").
+            q (float): Percentil entre 0 y 1.
+        """
+        histogram = self.histogram(endpoint)
+        if len(histogram) < self.min_samples:
+            return None
+        return histogram.percentile(q)
+
+    def timeouts(self, endpoint: str) -> Tuple[float, float]:
+        """
+        Calcula los timeouts (connect, read) para el endpoint.
+
+        Args:
+            endpoint (str): Path del endpoint.
+
+        Returns:
+            Tuple[float, float]: Timeouts de conexión y de lectura en
+                segundos, listos para el parámetro timeout de requests.
+        """
+        connect, read = Config.CONNECT_TIMEOUT, Config.TIMEOUT
+        p50 = self.percentile(endpoint, 0.50)
+        p99 = self.percentile(endpoint, 0.99)
+        if p50 is not None:
+            connect = min(connect, max(MIN_CONNECT_TIMEOUT, p50 * CONNECT_TIMEOUT_MULTIPLIER))
+        if p99 is not None:
+            read = min(read, max(MIN_READ_TIMEOUT, p99 * READ_TIMEOUT_MULTIPLIER))
+        return connect, read
+
+    def stats(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """
+        Devuelve los percentiles de cada endpoint para monitoreo.
+
+        Returns:
+            Dict[str, Dict[str, Optional[float]]]: Por endpoint: count, p50,
+                p95 y p99 en segundos.
+        """
+        with self._lock:
+            histograms = dict(self._histograms)
+        return {
+            endpoint: {
+                "count": len(histogram),
+                "p50": histogram.percentile(0.50),
+                "p95": histogram.percentile(0.95),
+                "p99": histogram.percentile(0.99),
+            }
+            for endpoint, histogram in histograms.items()
+        }
+
+
+class HedgeBudget:
+    """
+    Limita la fracción de peticiones que pueden duplicarse (hedging).
+
+    Attributes:
+        ratio (float): Fracción máxima de peticiones con duplicado (0.05 = 5%).
+
+    Example:
+        >>> budget = HedgeBudget(ratio=0.1)
+        >>> for _ in range(10):
+        ...     budget.record_request()
+        >>> budget.try_acquire(), budget.try_acquire()
+        (True, False)
+    """
+
+    def __init__(self, ratio: float):
+        """
+        Inicializa el presupuesto.
+
+        Args:
+            ratio (float): Fracción entre 0 y 1 de peticiones duplicables.
+
+        Raises:
+            ValueError: Si ratio está fuera de [0, 1].
+        """
+        if not 0 <= ratio <= 1:
+            raise ValueError("El presupuesto de hedging debe estar entre 0 y 1")
+
+        self.ratio = ratio
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._hedged = 0
+        self._wins = 0
+
+    def record_request(self) -> None:
+        """Cuenta una petición candidata a hedging."""
+        with self._lock:
+            self._requests += 1
+
+    def try_acquire(self) -> bool:
+        """Reserva un duplicado si no se supera la fracción permitida."""
+        with self._lock:
+            if self._hedged + 1 > self.ratio * self._requests:
+                return False
+            self._hedged += 1
+            return True
+
+    def record_win(self) -> None:
+        """Cuenta un duplicado que respondió antes que la petición original."""
+        with self._lock:
+            self._wins += 1
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Devuelve los contadores de hedging.
+
+        Returns:
+            Dict[str, int]: requests, hedged (duplicados enviados) y wins
+                (duplicados que respondieron primero).
+        """
+        with self._lock:
+            return {"requests": self._requests, "hedged": self._hedged, "wins": self._wins}
@@ -0,0 +1,509 @@
+"""
+Generador de carga para dimensionar pools de workers y presupuestos de caché.
+
+`weather loadtest` envía consultas durante un tiempo fijo contra uno de tres
+destinos y reporta qué se logró:
+
+    sync    WeatherService (el del CLI) desde un pool de hilos.
+    async   AsyncWeatherService con `concurrency` consultas en vuelo.
+    daemon  El daemon residente a través de su socket Unix.
+
+Modos:
+    - Concurrencia (por defecto): `concurrency` trabajadores consultan uno
+      tras otro sin pausa (lazo cerrado). Mide la capacidad máxima.
+    - Tasa (--rate): las consultas se programan a intervalos fijos (lazo
+      abierto). La latencia se mide desde el momento programado, así la
+      espera en cola cuando el sistema no da abasto queda a la vista en vez
+      de esconderse (coordinated omission).
+
+Las ciudades salen de una mezcla ponderada ("Madrid=3,Lima=1"). Con
+cache_hit_ratio (solo destino sync) esa fracción de las consultas se
+responde desde una caché en memoria precargada y el resto va a la red, para
+estimar el efecto de un presupuesto de caché sobre la latencia y la cuota.
+
+El reporte incluye RPS logrado, percentiles de latencia, errores por clase
+de excepción (las de src/exceptions.py) y una serie temporal de RPS, CPU y
+memoria residente (RSS) del proceso.
+
+Example:
+    >>> mix = CityMix.parse("Madrid=3,Buenos Aires=1")
+    >>> options = LoadTestOptions(duration=30, concurrency=16, rate=50)
+    >>> report = run_load_test(lambda city, hit: service.get_weather(city), mix, options)
+    >>> print(format_report(report))
+"""
+
+import asyncio
+import bisect
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .latency import latency_summary
+
+# Destinos disponibles para --target
+TARGETS: Tuple[str, ...] = ("sync", "async", "daemon")
+
+# Una consulta: recibe la ciudad y si debe responderse desde la caché
+LoadCall = Callable[[str, bool], Any]
+AsyncLoadCall = Callable[[str, bool], Awaitable[Any]]
+
+
+@dataclass
+class LoadTestOptions:
+    """
+    Parámetros de una corrida de carga.
+
+    Attributes:
+        duration (float): Segundos durante los que se envían consultas.
+        concurrency (int): Consultas simultáneas máximas.
+        rate (Optional[float]): Consultas por segundo a programar. None
+            consulta sin pausa con `concurrency` trabajadores.
+        cache_hit_ratio (float): Fracción (0 a 1) de consultas que deben
+            responderse desde la caché.
+        sample_interval (float): Segundos entre muestras de RPS, CPU y RSS.
+        seed (Optional[int]): Semilla para elegir ciudades y aciertos.
+    """
+
+    duration: float = 10.0
+    concurrency: int = 8
+    rate: Optional[float] = None
+    cache_hit_ratio: float = 0.0
+    sample_interval: float = 1.0
+    seed: Optional[int] = None
+
+    def validate(self) -> None:
+        """
+        Verifica que los parámetros sean coherentes.
+
+        Raises:
+            ValueError: Si algún valor está fuera de rango.
+        """
+        if self.duration <= 0:
+            raise ValueError("La duración debe ser mayor a 0")
+        if self.concurrency < 1:
+            raise ValueError("La concurrencia debe ser mayor a 0")
+        if self.rate is not None and self.rate <= 0:
+            raise ValueError("La tasa debe ser mayor a 0")
+        if not 0.0 <= self.cache_hit_ratio <= 1.0:
+            raise ValueError("La proporción de aciertos de caché debe estar entre 0 y 1")
+        if self.sample_interval <= 0:
+            raise ValueError("El intervalo de muestreo debe ser mayor a 0")
+
+
+class CityMix:
+    """
+    Mezcla ponderada de ciudades.
+
+    Attributes:
+        cities (Tuple[str, ...]): Ciudades de la mezcla, en orden de entrada.
+        weights (Tuple[float, ...]): Peso de cada ciudad.
+    """
+
+    def __init__(self, weighted: Sequence[Tuple[str, float]]):
+        """
+        Inicializa la mezcla.
+
+        Args:
+            weighted (Sequence[Tuple[str, float]]): Pares (ciudad, peso).
+
+        Raises:
+            ValueError: Si la mezcla está vacía o algún peso no es positivo.
+        """
+        if not weighted:
+            raise ValueError("La mezcla de ciudades está vacía")
+        for city, weight in weighted:
+            if weight <= 0:
+                raise ValueError(f"El peso de {city!r} debe ser mayor a 0")
+
+        self.cities = tuple(city for city, _ in weighted)
+        self.weights = tuple(float(weight) for _, weight in weighted)
+        self._cumulative: List[float] = []
+        total = 0.0
+        for weight in self.weights:
+            total += weight
+            self._cumulative.append(total)
+
+    @classmethod
+    def parse(cls, spec: str) -> "CityMix":
+        """
+        Crea la mezcla desde "Madrid=3,Lima=1" o desde un archivo ("@ruta").
+
+        El archivo tiene una entrada por línea con el mismo formato
+        (CIUDAD o CIUDAD=PESO); las líneas vacías y las que empiezan con
+        `#` se ignoran. Sin peso, la ciudad pesa 1.
+
+        Args:
+            spec (str): Mezcla en línea o "@" seguido de la ruta del archivo.
+
+        Returns:
+            CityMix: Mezcla lista para usar.
+
+        Raises:
+            ValueError: Si la mezcla está vacía o un peso es inválido.
+            OSError: Si no se puede leer el archivo.
+        """
+        if spec.startswith("@"):
+            with open(spec[1:], encoding="utf-8") as stream:
+                entries = [line.strip() for line in stream]
+            entries = [entry for entry in entries if entry and not entry.startswith("#")]
+        else:
+            entries = [entry.strip() for entry in spec.split(",") if entry.strip()]
+
+        weighted = []
+        for entry in entries:
+            city, separator, weight = entry.rpartition("=")
+            if not separator:
+                city, weight = entry, "1"
+            try:
+                weighted.append((city.strip(), float(weight)))
+            except ValueError:
+                raise ValueError(f"Peso inválido en la mezcla de ciudades: {entry!r}")
+        return cls(weighted)
+
+    def pick(self, rng: random.Random) -> str:
+        """Elige una ciudad al azar respetando los pesos."""
+        point = rng.random() * self._cumulative[-1]
+        return self.cities[bisect.bisect_right(self._cumulative, point)]
+
+
+class LoadRecorder:
+    """
+    Acumula latencias y errores de las consultas (seguro entre hilos).
+
+    Attributes:
+        latencies (List[float]): Duración de cada consulta en segundos.
+        errors (Counter): Errores por nombre de clase de excepción.
+    """
+
+    def __init__(self):
+        """Inicializa el registro vacío."""
+        self._lock = threading.Lock()
+        self.latencies: List[float] = []
+        self.errors: Counter = Counter()
+
+    def record(self, seconds: float, error: Optional[BaseException] = None) -> None:
+        """Registra una consulta terminada (con su excepción si falló)."""
+        with self._lock:
+            self.latencies.append(seconds)
+            if error is not None:
+                self.errors[type(error).__name__] += 1
+
+    @property
+    def completed(self) -> int:
+        """Consultas terminadas hasta el momento."""
+        return len(self.latencies)
+
+
+def _rss_bytes() -> Optional[int]:
+    """
+    Memoria residente actual del proceso en bytes.
+
+    Usa /proc/self/statm (Linux). En otros sistemas cae al pico de
+    resource.getrusage(), y devuelve None si tampoco está disponible.
+    """
+    try:
+        with open("/proc/self/statm", "rb") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss está en KiB en Linux y en bytes en macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class ResourceSampler:
+    """
+    Muestrea RPS, CPU y RSS del proceso a intervalos regulares en un hilo aparte.
+
+    Attributes:
+        timeline (List[Dict[str, Optional[float]]]): Una muestra por
+            intervalo con t (segundos desde el inicio), rps, cpu_percent
+            (100 = un núcleo completo) y rss_mb.
+    """
+
+    def __init__(self, recorder: LoadRecorder, interval: float):
+        """
+        Inicializa el muestreador (sin iniciarlo).
+
+        Args:
+            recorder (LoadRecorder): Registro del que se toman las consultas
+                terminadas.
+            interval (float): Segundos entre muestras.
+        """
+        self._recorder = recorder
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="loadtest-sampler", daemon=True)
+        self.timeline: List[Dict[str, Optional[float]]] = []
+
+    def start(self) -> None:
+        """Toma la muestra inicial y arranca el hilo."""
+        self._started = self._last_wall = time.perf_counter()
+        self._last_cpu = time.process_time()
+        self._last_completed = self._recorder.completed
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Detiene el hilo y registra la última muestra parcial si no es demasiado corta."""
+        self._stop.set()
+        self._thread.join()
+        # Un intervalo de pocos milisegundos da porcentajes de CPU sin sentido
+        if not self.timeline or time.perf_counter() - self._last_wall >= self._interval / 4:
+            self._sample()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            self._sample()
+
+    def _sample(self) -> None:
+        wall, cpu = time.perf_counter(), time.process_time()
+        completed = self._recorder.completed
+        elapsed = wall - self._last_wall
+        if elapsed <= 0:
+            return
+        rss = _rss_bytes()
+        self.timeline.append({
+            "t": round(wall - self._started, 3),
+            "rps": round((completed - self._last_completed) / elapsed, 2),
+            "cpu_percent": round(100 * (cpu - self._last_cpu) / elapsed, 1),
+            "rss_mb": None if rss is None else round(rss / (1024 * 1024), 1),
+        })
+        self._last_wall, self._last_cpu, self._last_completed = wall, cpu, completed
+
+
+def _rng(options: LoadTestOptions, offset: int = 0) -> random.Random:
+    """Generador propio por trabajador (random.Random no comparte estado entre hilos)."""
+    return random.Random(None if options.seed is None else options.seed + offset)
+
+
+def run_load_test(call: LoadCall, mix: CityMix, options: LoadTestOptions) -> Dict[str, Any]:
+    """
+    Ejecuta la carga desde un pool de hilos (destinos sync y daemon).
+
+    Args:
+        call (LoadCall): Función que hace una consulta: recibe la ciudad y
+            si debe ser un acierto de caché. Sus excepciones se cuentan
+            como errores.
+        mix (CityMix): Ciudades a consultar.
+        options (LoadTestOptions): Parámetros de la corrida.
+
+    Returns:
+        Dict[str, Any]: Reporte (ver format_report()).
+
+    Raises:
+        ValueError: Si las opciones son inválidas.
+    """
+    options.validate()
+    recorder = LoadRecorder()
+    sampler = ResourceSampler(recorder, options.sample_interval)
+
+    def timed(city: str, hit: bool, scheduled: float) -> None:
+        try:
+            call(city, hit)
+        except Exception as e:  # noqa: BLE001 - se cuenta por clase
+            recorder.record(time.perf_counter() - scheduled, e)
+        else:
+            recorder.record(time.perf_counter() - scheduled)
+
+    sampler.start()
+    start = time.perf_counter()
+    deadline = start + options.duration
+    try:
+        if options.rate is None:
+            def worker(index: int) -> None:
+                rng = _rng(options, index)
+                while time.perf_counter() < deadline:
+                    hit = rng.random() < options.cache_hit_ratio
+                    timed(mix.pick(rng), hit, time.perf_counter())
+
+            threads = [
+                threading.Thread(target=worker, args=(index,), name=f"loadtest-{index}")
+                for index in range(options.concurrency)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        else:
+            rng = _rng(options)
+            with ThreadPoolExecutor(
+                max_workers=options.concurrency, thread_name_prefix="loadtest"
+            ) as executor:
+                for scheduled in _schedule(start, deadline, options.rate):
+                    delay = scheduled - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                    hit = rng.random() < options.cache_hit_ratio
+                    executor.submit(timed, mix.pick(rng), hit, scheduled)
+    finally:
+        elapsed = time.perf_counter() - start
+        sampler.stop()
+
+    return _report(recorder, sampler, options, elapsed)
+
+
+def run_async_load_test(
+    call: AsyncLoadCall,
+    mix: CityMix,
+    options: LoadTestOptions,
+    cleanup: Optional[Callable[[], Awaitable[None]]] = None,
+) -> Dict[str, Any]:
+    """
+    Ejecuta la carga en un event loop de asyncio (destino async).
+
+    Igual que run_load_test() pero `call` es una corrutina y la
+    concurrencia la dan tareas en vez de hilos.
+
+    Args:
+        call (AsyncLoadCall): Corrutina que hace una consulta.
+        mix (CityMix): Ciudades a consultar.
+        options (LoadTestOptions): Parámetros de la corrida.
+        cleanup (Optional[Callable[[], Awaitable[None]]]): Corrutina a
+            esperar al terminar, dentro del mismo event loop (por ejemplo
+            AsyncWeatherService.close para cerrar su sesión).
+
+    Returns:
+        Dict[str, Any]: Reporte (ver format_report()).
+
+    Raises:
+        ValueError: Si las opciones son inválidas.
+    """
+    options.validate()
+    recorder = LoadRecorder()
+    sampler = ResourceSampler(recorder, options.sample_interval)
+
+    async def timed(city: str, hit: bool, scheduled: float) -> None:
+        try:
+            await call(city, hit)
+        except Exception as e:  # noqa: BLE001 - se cuenta por clase
+            recorder.record(time.perf_counter() - scheduled, e)
+        else:
+            recorder.record(time.perf_counter() - scheduled)
+
+    async def drive(start: float, deadline: float) -> None:
+        try:
+            await send(start, deadline)
+        finally:
+            if cleanup is not None:
+                await cleanup()
+
+    async def send(start: float, deadline: float) -> None:
+        if options.rate is None:
+            async def worker(index: int) -> None:
+                rng = _rng(options, index)
+                while time.perf_counter() < deadline:
+                    hit = rng.random() < options.cache_hit_ratio
+                    await timed(mix.pick(rng), hit, time.perf_counter())
+
+            await asyncio.gather(*(worker(index) for index in range(options.concurrency)))
+            return
+
+        rng = _rng(options)
+        # El semáforo acota las consultas en vuelo como el pool de hilos
+        semaphore = asyncio.Semaphore(options.concurrency)
+
+        async def bounded(city: str, hit: bool, scheduled: float) -> None:
+            async with semaphore:
+                await timed(city, hit, scheduled)
+
+        tasks = []
+        for scheduled in _schedule(start, deadline, options.rate):
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            hit = rng.random() < options.cache_hit_ratio
+            tasks.append(asyncio.ensure_future(bounded(mix.pick(rng), hit, scheduled)))
+        await asyncio.gather(*tasks)
+
+    sampler.start()
+    start = time.perf_counter()
+    try:
+        asyncio.run(drive(start, start + options.duration))
+    finally:
+        elapsed = time.perf_counter() - start
+        sampler.stop()
+
+    return _report(recorder, sampler, options, elapsed)
+
+
+def _schedule(start: float, deadline: float, rate: float):
+    """Momentos (perf_counter) en los que se debe enviar cada consulta."""
+    index = 0
+    while True:
+        scheduled = start + index / rate
+        if scheduled >= deadline:
+            return
+        yield scheduled
+        index += 1
+
+
+def _report(
+    recorder: LoadRecorder, sampler: ResourceSampler, options: LoadTestOptions, elapsed: float
+) -> Dict[str, Any]:
+    """Arma el reporte serializable a JSON de una corrida."""
+    rss = [sample["rss_mb"] for sample in sampler.timeline if sample["rss_mb"] is not None]
+    cpu = [sample["cpu_percent"] for sample in sampler.timeline]
+    return {
+        "mode": "concurrency" if options.rate is None else "rate",
+        "duration_s": round(elapsed, 3),
+        "concurrency": options.concurrency,
+        "target_rps": options.rate,
+        "cache_hit_ratio": options.cache_hit_ratio,
+        "requests": recorder.completed,
+        "achieved_rps": round(recorder.completed / elapsed, 2) if elapsed > 0 else None,
+        "latency_ms": latency_summary(recorder.latencies),
+        "errors": dict(recorder.errors.most_common()),
+        "error_count": sum(recorder.errors.values()),
+        "cpu_percent_mean": round(sum(cpu) / len(cpu), 1) if cpu else None,
+        "rss_mb_peak": max(rss) if rss else None,
+        "timeline": sampler.timeline,
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """
+    Formatea un reporte de carga como texto para la terminal.
+
+    Args:
+        report (Dict[str, Any]): Reporte de run_load_test() o
+            run_async_load_test() (con la clave opcional "target").
+
+    Returns:
+        str: Resumen, latencias, errores por tipo y serie de recursos.
+    """
+    def number(value: Optional[float], spec: str = ".1f") -> str:
+        return "-" if value is None else format(value, spec)
+
+    target_rate = report["target_rps"]
+    latency = report["latency_ms"]
+    lines = [
+        f"Load test: {report.get('target', '-')}, {report['duration_s']:.1f} s, "
+        f"{report['concurrency']} concurrentes, "
+        + (f"tasa objetivo {target_rate:g}/s" if target_rate else "sin límite de tasa")
+        + f", aciertos de caché {report['cache_hit_ratio']:.0%}",
+        f"Consultas: {report['requests']} ({number(report['achieved_rps'])}/s)  "
+        f"Errores: {report['error_count']}",
+        "Latencia (ms): "
+        + "  ".join(f"{name} {number(latency[name])}" for name in ("p50", "p95", "p99", "max")),
+    ]
+    if report["errors"]:
+        lines.append("Errores por tipo:")
+        lines.extend(f"  {name:<28}{count:>8}" for name, count in report["errors"].items())
+    lines.append("Recursos:")
+    lines.append(f"  {'t (s)':>8}{'req/s':>10}{'CPU %':>8}{'RSS MB':>9}")
+    for sample in report["timeline"]:
+        lines.append(
+            f"  {sample['t']:>8.1f}{sample['rps']:>10.1f}"
+            f"{sample['cpu_percent']:>8.1f}{number(sample['rss_mb']):>9}"
+        )
+    return "\n".join(lines)
@@ -1,9 +1,21 @@
-"""Entry point principal del CLI de consulta de clima."""
+"""
+Entry point principal del CLI de consulta de clima.
 
+Note:
+    El CLI se invoca miles de veces por día desde scripts, así que el
+    arranque del intérprete domina el costo de cada consulta. Por eso este
+    módulo solo importa lo imprescindible al cargarse: WeatherService (y con
+    él requests), el modo batch y las cachés se importan recién en la
+    función que los usa. tests/test_startup.py controla el presupuesto de
+    tiempo de importación.
+"""
+
+import argparse
+import os
 import sys
-from typing import NoReturn
+from typing import TYPE_CHECKING, Any, Dict, List, NoReturn, Optional
 
-from .weather_service import WeatherService
+from .config import Config
 from .weather_formatter import WeatherFormatter
 from .exceptions import (
     CityNotFoundException,
@@ -13,8 +25,581 @@ from .exceptions import (
     ConfigurationException,
 )
 
+if TYPE_CHECKING:  # pragma: no cover - solo para anotaciones
+    from .metrics import RequestMetrics
+    from .weather_service import WeatherService
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Importa WeatherService recién cuando se lo pide (PEP 562).
+
+    Mantiene `src.main.WeatherService` disponible (y parcheable en tests)
+    sin importar requests al cargar el módulo.
+    """
+    if name == "WeatherService":
+        from .weather_service import WeatherService
+
+        globals()["WeatherService"] = WeatherService
+        return WeatherService
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _positive_int(value: str) -> int:
+    """Tipo de argparse que acepta solo enteros mayores a 0."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("debe ser un entero mayor a 0")
+    return number
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    """
+    Parsea los argumentos de línea de comandos del CLI.
+
+    Sin argumentos el CLI funciona en modo interactivo (pide una ciudad).
+    Con --cities-file pasa a modo batch y consulta todas las ciudades del
+    archivo ('-' para leer de stdin). El comando `daemon` levanta el proceso
+    residente que atiende consultas por socket Unix, `serve` el servidor
+    HTTP/JSON para otros servicios y `loadtest` el generador de carga.
+
+    Args:
+        argv (List[str]): Argumentos sin el nombre del programa.
+
+    Returns:
+        argparse.Namespace: Argumentos con los atributos command (None,
+            "daemon", "serve" o "loadtest"), cities_file, workers, format,
+            output, metrics, host, port, mix, duration, rate, target y
+            cache_hit_ratio.
+    """
+    parser = argparse.ArgumentParser(
+        prog="weather",
+        description="Consulta el clima de cualquier ciudad.",
+    )
+    parser.add_argument(
+        "command",
+        nargs="?",
+        choices=["daemon", "serve", "loadtest"],
+        help=(
+            "'daemon' inicia el proceso residente que atiende al CLI por socket Unix; "
+            "'serve' inicia el servidor HTTP/JSON; 'loadtest' genera carga y "
+            "reporta RPS, latencias, errores, CPU y memoria."
+        ),
+    )
+    parser.add_argument(
+        "--cities-file",
+        metavar="RUTA",
+        help="Archivo con una ciudad por línea ('-' para stdin). Activa el modo batch.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=_positive_int,
+        default=Config.BATCH_WORKERS,
+        help=(
+            f"Consultas simultáneas en modo batch y en loadtest "
+            f"(default: {Config.BATCH_WORKERS})."
+        ),
+    )
+    parser.add_argument(
+        "--format",
+        choices=["pretty", "ndjson", "csv", "table"],
+        default="pretty",
+        help="Formato de salida del modo batch (default: pretty).",
+    )
+    parser.add_argument(
+        "--output",
+        metavar="RUTA",
+        default="-",
+        help=(
+            "Archivo de salida del modo batch ('-' para stdout, default). "
+            "En loadtest, archivo donde guardar el reporte JSON."
+        ),
+    )
+    parser.add_argument(
+        "--metrics",
+        metavar="RUTA",
+        help=(
+            "Mide las fases de cada consulta y guarda las métricas al terminar: "
+            "formato Prometheus si la ruta termina en .prom, JSON si no."
+        ),
+    )
+    parser.add_argument(
+        "--host",
+        default=Config.SERVER_HOST,
+        help=f"Interfaz del servidor HTTP (default: {Config.SERVER_HOST}).",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=Config.SERVER_PORT,
+        help=f"Puerto del servidor HTTP (default: {Config.SERVER_PORT}).",
+    )
+    parser.add_argument(
+        "--mix",
+        default="Buenos Aires,Madrid",
+        help=(
+            "loadtest: ciudades con peso opcional ('Madrid=3,Lima=1') o '@archivo' "
+            "con una por línea."
+        ),
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=10.0,
+        help="loadtest: segundos de carga (default: 10).",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        help="loadtest: consultas por segundo. Sin --rate se consulta sin pausa.",
+    )
+    parser.add_argument(
+        "--target",
+        choices=["sync", "async", "daemon"],
+        default="sync",
+        help="loadtest: WeatherService, AsyncWeatherService o el daemon (default: sync).",
+    )
+    parser.add_argument(
+        "--cache-hit-ratio",
+        type=float,
+        default=0.0,
+        help="loadtest (target sync): fracción de consultas servidas desde la caché.",
+    )
+    return parser.parse_args(argv)
+
+
+def create_service(**kwargs) -> "WeatherService":
+    """
+    Crea el WeatherService del CLI con la caché en disco, el índice de
+    ciudades, el limitador de tasa, los reintentos, el circuit breaker, los
+    timeouts adaptativos, el hedging, el cassette de grabación o
+    reproducción y la instrumentación por fases según la configuración.
+
+    Si la caché persistente no se puede abrir (directorio sin permisos,
+    archivo corrupto, etc.) el CLI sigue funcionando sin ella: la caché es
+    una optimización y no debe impedir consultar el clima.
+
+    Args:
+        **kwargs: Argumentos adicionales para WeatherService (pool, caché en
+            memoria, etc.). Tienen prioridad sobre los armados desde la
+            configuración (por ejemplo disk_cache=None la desactiva).
+
+    Returns:
+        WeatherService: Servicio listo para usar.
+
+    Raises:
+        ConfigurationException: Si la configuración es inválida o el índice
+            de ciudades configurado no se puede abrir.
+    """
+    # WeatherService se resuelve por nombre para respetar un reemplazo en tests
+    service_class = globals().get("WeatherService") or __getattr__("WeatherService")
+
+    disk_cache = None
+    if Config.DISK_CACHE_ENABLED and "disk_cache" not in kwargs:
+        import sqlite3
+
+        from .disk_cache import DiskCache
+
+        try:
+            disk_cache = DiskCache.from_config()
+        except (OSError, sqlite3.Error, ValueError):
+            disk_cache = None
+
+    # Un índice configurado explícitamente debe existir: si falla se informa
+    # como error de configuración en vez de ignorarlo en silencio
+    city_index = None
+    if Config.CITY_INDEX_PATH:
+        from .city_index import CityIndex
+
+        city_index = CityIndex.open(Config.CITY_INDEX_PATH)
+
+    from .latency import HedgeBudget
+    from .rate_limiter import RateLimiter
+    from .resilience import CircuitBreakerRegistry, RetryPolicy
+
+    # Limitador compartido por todos los procesos del host (0 = deshabilitado)
+    rate_limiter = RateLimiter.from_config() if Config.RATE_LIMIT_PER_MINUTE > 0 else None
+
+    # Reintentos ante fallas transitorias y corte rápido si la API está caída
+    retry_policy = RetryPolicy.from_config() if Config.RETRY_MAX_ATTEMPTS > 1 else None
+    circuit_breakers = (
+        CircuitBreakerRegistry.from_config() if Config.CIRCUIT_FAILURE_THRESHOLD > 0 else None
+    )
+
+    # Cassette de tráfico HTTP: al reproducir no se gasta cuota, así que el
+    # limitador de tasa solo distorsionaría la forma del tráfico
+    transport = None
+    if Config.CASSETTE_MODE:
+        from .cassette import transport_from_config
+
+        transport = transport_from_config()
+        if Config.CASSETTE_MODE == "replay":
+            rate_limiter = None
+
+    metrics = None
+    if Config.METRICS_ENABLED:
+        from .metrics import RequestMetrics
+
+        metrics = RequestMetrics()
+
+    options: Dict[str, Any] = dict(
+        transport=transport,
+        metrics=metrics,
+        disk_cache=disk_cache,
+        city_index=city_index,
+        rate_limiter=rate_limiter,
+        retry_policy=retry_policy,
+        circuit_breakers=circuit_breakers,
+        adaptive_timeouts=Config.ADAPTIVE_TIMEOUTS,
+        hedge_budget=HedgeBudget(Config.HEDGE_BUDGET) if Config.HEDGE_BUDGET > 0 else None,
+    )
+    options.update(kwargs)
+    return service_class(**options)
+
+
+def run_batch(
+    cities_file: str,
+    workers: int,
+    output_format: str = "pretty",
+    output: str = "-",
+    metrics: Optional["RequestMetrics"] = None,
+) -> int:
+    """
+    Consulta en paralelo todas las ciudades de un archivo y muestra cada resultado.
+
+    Los resultados se escriben apenas termina cada consulta (en orden de
+    finalización) con el escritor del formato pedido (ver src/writers.py),
+    que acumula la salida y la vuelca por bloques. Fuera de una terminal el
+    formato pretty se escribe sin emojis. Un error en una ciudad se informa
+    y el batch continúa.
+    Las ciudades repetidas se responden desde la caché en memoria y las
+    inexistentes repetidas desde la caché negativa, sin ir a la red.
+
+    Args:
+        cities_file (str): Ruta del archivo de ciudades, o '-' para stdin.
+        workers (int): Cantidad máxima de consultas simultáneas.
+        output_format (str): "pretty", "ndjson", "csv" o "table".
+        output (str): Ruta del archivo de salida, o '-' para stdout.
+        metrics (Optional[RequestMetrics]): Instrumentación a usar en lugar
+            de la configurada; la escritura de cada resultado se mide como
+            la fase format.
+
+    Returns:
+        int: Código de salida: 0 si todas las ciudades se consultaron bien,
+            1 si alguna falló.
+
+    Raises:
+        ConfigurationException: Si la configuración es inválida o no se puede
+            abrir el archivo de salida.
+        OSError: Si no se puede abrir el archivo de ciudades.
+        ValueError: Si workers es menor a 1.
+    """
+    if workers < 1:
+        raise ValueError("--workers debe ser mayor a 0")
+
+    from .batch import fetch_many, read_cities
+    from .cache import TTLCache
+    from .writers import create_writer
+
+    # El pool HTTP debe tener al menos una conexión por hilo para no
+    # descartar conexiones keep-alive cuando todos los hilos están activos
+    pool_maxsize = max(workers, Config.POOL_MAXSIZE)
+
+    # En un batch las ciudades repetidas se responden desde la caché en
+    # memoria (CACHE_TTL=0 la deshabilita)
+    cache = TTLCache.from_config() if Config.CACHE_TTL > 0 else None
+    negative_cache = (
+        TTLCache.negative_from_config() if Config.NEGATIVE_CACHE_TTL > 0 else None
+    )
+
+    stream = sys.stdin if cities_file == "-" else open(cities_file, encoding="utf-8")
+    try:
+        if output == "-":
+            # Lo ya impreso en modo texto debe salir antes que los bytes
+            sys.stdout.flush()
+            destination = sys.stdout.buffer
+        else:
+            try:
+                destination = open(output, "wb")
+            except OSError as e:
+                raise ConfigurationException(f"No se pudo abrir el archivo de salida {output}: {e}")
+        try:
+            service_options: Dict[str, Any] = dict(
+                pool_maxsize=pool_maxsize, cache=cache, negative_cache=negative_cache
+            )
+            if metrics is not None:
+                service_options["metrics"] = metrics
+            with create_service(**service_options) as weather_service, \
+                    create_writer(output_format, destination) as writer:
+                for result in fetch_many(weather_service, read_cities(stream), workers):
+                    if metrics is None:
+                        writer.write(result)
+                    else:
+                        metrics.call("format", writer.write, result)
+        finally:
+            if destination is not sys.stdout.buffer:
+                destination.close()
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+    return 1 if writer.failures else 0
+
+
+def run_daemon(socket_path: str, metrics: Optional["RequestMetrics"] = None) -> int:
+    """
+    Ejecuta el daemon residente hasta recibir SIGTERM o Ctrl+C.
+
+    El daemon es dueño del pool HTTP, de las cachés en memoria y del
+    limitador de tasa, y los comparte entre todas las invocaciones del CLI
+    del host (ver src/daemon.py).
+
+    Args:
+        socket_path (str): Ruta del socket Unix donde escuchar.
+        metrics (Optional[RequestMetrics]): Instrumentación a usar en lugar
+            de la configurada.
+
+    Returns:
+        int: Código de salida (0 al detenerse normalmente).
+
+    Raises:
+        ConfigurationException: Si la configuración es inválida, el socket
+            está vacío o ya hay otro daemon escuchando.
+    """
+    import signal
+
+    from .cache import TTLCache
+    from .daemon import WeatherDaemon
+
+    if not socket_path:
+        raise ConfigurationException("DAEMON_SOCKET no puede estar vacío")
 
-def main() -> NoReturn:
+    # SIGTERM (systemd, kill) sale por el mismo camino que Ctrl+C y borra el socket
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    cache = TTLCache.from_config() if Config.CACHE_TTL > 0 else None
+    negative_cache = (
+        TTLCache.negative_from_config() if Config.NEGATIVE_CACHE_TTL > 0 else None
+    )
+    service_options: Dict[str, Any] = dict(cache=cache, negative_cache=negative_cache)
+    if metrics is not None:
+        service_options["metrics"] = metrics
+    with create_service(**service_options) as weather_service:
+        daemon = WeatherDaemon(weather_service, socket_path)
+        print(f"🌍 Daemon escuchando en {socket_path} (Ctrl+C para detener)", flush=True)
+        daemon.serve_forever()
+    return 0
+
+
+def run_server(host: str, port: int, metrics: Optional["RequestMetrics"] = None) -> int:
+    """
+    Ejecuta el servidor HTTP/JSON hasta recibir SIGTERM o Ctrl+C.
+
+    Un único WeatherService (pool HTTP, cachés, coalescing y limitador)
+    atiende a todos los consumidores, que dejan de consultar
+    OpenWeatherMap por su cuenta (ver src/server.py).
+
+    Args:
+        host (str): Interfaz donde escuchar.
+        port (int): Puerto TCP (0 = uno libre).
+        metrics (Optional[RequestMetrics]): Instrumentación a usar en lugar
+            de la configurada (también se expone en /metrics).
+
+    Returns:
+        int: Código de salida (0 al detenerse normalmente).
+
+    Raises:
+        ConfigurationException: Si la configuración es inválida o no se
+            puede escuchar en la dirección pedida.
+    """
+    import signal
+
+    from .cache import TTLCache
+    from .server import WeatherHTTPServer
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    cache = TTLCache.from_config() if Config.CACHE_TTL > 0 else None
+    negative_cache = (
+        TTLCache.negative_from_config() if Config.NEGATIVE_CACHE_TTL > 0 else None
+    )
+    # Cada worker del servidor (y del pool de batch) puede tener una
+    # petición en curso: el pool HTTP necesita una conexión por hilo
+    pool_maxsize = max(Config.SERVER_WORKERS, Config.POOL_MAXSIZE)
+
+    service_options: Dict[str, Any] = dict(
+        pool_maxsize=pool_maxsize, cache=cache, negative_cache=negative_cache
+    )
+    if metrics is not None:
+        service_options["metrics"] = metrics
+    with create_service(**service_options) as weather_service:
+        try:
+            server = WeatherHTTPServer((host, port), weather_service)
+        except OSError as e:
+            raise ConfigurationException(f"No se pudo escuchar en {host}:{port}: {e}")
+        address, bound_port = server.server_address[:2]
+        print(
+            f"🌍 Servidor escuchando en http://{address}:{bound_port} (Ctrl+C para detener)",
+            flush=True,
+        )
+        try:
+            server.serve_forever(poll_interval=0.1)
+        finally:
+            server.server_close()
+    return 0
+
+
+def run_loadtest(args: argparse.Namespace, metrics: Optional["RequestMetrics"] = None) -> int:
+    """
+    Genera carga contra el destino elegido y muestra el reporte.
+
+    El destino sync usa dos servicios que comparten el pool HTTP: uno con
+    caché en memoria (límites CACHE_*) precargada con las ciudades de la
+    mezcla, que responde los aciertos, y otro sin cachés para los fallos.
+    Así --cache-hit-ratio fija qué fracción de la carga llega a la API y
+    permite dimensionar pools y presupuestos de caché (ver src/loadtest.py).
+
+    Args:
+        args (argparse.Namespace): Argumentos del CLI (mix, duration, rate,
+            workers, target, cache_hit_ratio y output).
+        metrics (Optional[RequestMetrics]): Instrumentación de los servicios
+            del destino sync (sin la precarga de la caché).
+
+    Returns:
+        int: Código de salida: 0 si todas las consultas fueron exitosas, 1
+            si alguna falló.
+
+    Raises:
+        ConfigurationException: Si la configuración o los parámetros son
+            inválidos, o si el destino daemon no está escuchando.
+        OSError: Si no se puede leer el archivo de la mezcla.
+    """
+    import json
+
+    from .loadtest import (
+        CityMix,
+        LoadTestOptions,
+        format_report,
+        run_async_load_test,
+        run_load_test,
+    )
+
+    options = LoadTestOptions(
+        duration=args.duration,
+        concurrency=args.workers,
+        rate=args.rate,
+        cache_hit_ratio=args.cache_hit_ratio,
+    )
+    try:
+        mix = CityMix.parse(args.mix)
+        options.validate()
+    except ValueError as e:
+        raise ConfigurationException(f"Parámetros de loadtest inválidos: {e}")
+    if options.cache_hit_ratio and args.target != "sync":
+        raise ConfigurationException("--cache-hit-ratio solo se puede usar con --target sync")
+    if options.cache_hit_ratio and Config.CACHE_TTL <= 0:
+        raise ConfigurationException("--cache-hit-ratio requiere CACHE_TTL mayor a 0")
+
+    if args.target == "sync":
+        from .cache import TTLCache
+
+        if Config.RATE_LIMIT_PER_MINUTE > 0:
+            print(
+                f"Nota: el limitador de tasa (RATE_LIMIT_PER_MINUTE="
+                f"{Config.RATE_LIMIT_PER_MINUTE}) acota las consultas que llegan a la API.",
+                flush=True,
+            )
+
+        cache = TTLCache.from_config() if options.cache_hit_ratio else None
+        pool_maxsize = max(args.workers, Config.POOL_MAXSIZE)
+        # Una misma instrumentación suma las consultas de ambos servicios
+        shared: Dict[str, Any] = {} if metrics is None else {"metrics": metrics}
+        # Las consultas "sin caché" tienen que llegar todas a la API: sin
+        # coalescing ni caché negativa, que juntarían o evitarían peticiones
+        # y falsearían la tasa que ve el upstream
+        with create_service(
+            pool_maxsize=pool_maxsize, cache=cache, **shared
+        ) as cached, create_service(
+            session=cached.session, disk_cache=None, negative_cache=None, coalesce=False,
+            **shared,
+        ) as uncached:
+            if cache is not None:
+                for city in mix.cities:
+                    try:
+                        cached.get_weather(city)
+                    except (WeatherAPIException, ValueError):
+                        # Los errores se verán (y contarán) durante la carga
+                        pass
+            if metrics is not None:
+                # Medir solo la carga, no la precarga
+                metrics.reset()
+
+            def call(city: str, hit: bool) -> Any:
+                service = cached if hit else uncached
+                return service.parse_weather_data(service.get_weather(city))
+
+            report = run_load_test(call, mix, options)
+
+    elif args.target == "async":
+        from .async_weather_service import AsyncWeatherService
+
+        async_service = AsyncWeatherService(max_concurrency=args.workers)
+
+        async def async_call(city: str, hit: bool) -> Any:
+            return async_service.parse_weather_data(await async_service.get_weather(city))
+
+        report = run_async_load_test(async_call, mix, options, cleanup=async_service.close)
+
+    else:
+        from .daemon import query
+
+        if not Config.DAEMON_SOCKET or not os.path.exists(Config.DAEMON_SOCKET):
+            raise ConfigurationException(f"No hay un daemon escuchando en {Config.DAEMON_SOCKET}")
+
+        def daemon_call(city: str, hit: bool) -> Any:
+            data = query(city)
+            if data is None:
+                raise NetworkException("El daemon no respondió")
+            return data
+
+        report = run_load_test(daemon_call, mix, options)
+
+    report["target"] = args.target
+    print(format_report(report))
+    if args.output != "-":
+        try:
+            with open(args.output, "w", encoding="utf-8") as output:
+                json.dump(report, output, indent=2, ensure_ascii=False)
+        except OSError as e:
+            raise ConfigurationException(f"No se pudo escribir el reporte en {args.output}: {e}")
+    return 1 if report["error_count"] else 0
+
+
+def query_daemon(city: str) -> Optional[Dict[str, Any]]:
+    """
+    Consulta la ciudad a través del daemon residente si hay uno activo.
+
+    Args:
+        city (str): Nombre de la ciudad ya limpio.
+
+    Returns:
+        Optional[Dict[str, Any]]: Datos parseados, o None si no hay daemon
+            (socket inexistente o huérfano) y hay que consultar en el mismo
+            proceso.
+
+    Raises:
+        Las mismas excepciones que WeatherService.get_weather(), y
+        NetworkException si el daemon está vivo pero no responde a tiempo.
+    """
+    if not Config.DAEMON_SOCKET or not os.path.exists(Config.DAEMON_SOCKET):
+        return None
+
+    from .daemon import query
+
+    return query(city, Config.DAEMON_SOCKET)
+
+
+def main(argv: Optional[List[str]] = None) -> NoReturn:
     """
     Función principal del CLI de consulta de clima.
 
@@ -29,6 +614,18 @@ def main() -> NoReturn:
     El flujo incluye manejo exhaustivo de errores para todos los casos
     posibles (ciudad no encontrada, API key inválida, problemas de red,
     errores de configuración, etc.).
+
+    Con --cities-file se ejecuta el modo batch (ver run_batch()) en lugar
+    del flujo interactivo, con el comando `daemon` el proceso residente
+    (ver run_daemon()), con `serve` el servidor HTTP (ver run_server()) y
+    con `loadtest` el generador de carga (ver run_loadtest()). Si hay un
+    daemon activo, la consulta interactiva se delega en él y el CLI solo
+    muestra el resultado.
+
+    Args:
+        argv (Optional[List[str]]): Argumentos de línea de comandos sin el
+            nombre del programa. None equivale a sin argumentos (modo
+            interactivo).
     
     Returns:
         NoReturn: Esta función siempre termina con sys.exit() y nunca retorna.
@@ -52,12 +649,46 @@ def main() -> NoReturn:
         ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         ...
     """
+    metrics = None
+    cities_file = None
     try:
+        args = parse_args(argv if argv is not None else [])
+        if args.metrics:
+            # Los targets async y daemon no pasan por un WeatherService de
+            # este proceso: no habría nada que medir
+            if args.command == "loadtest" and args.target != "sync":
+                raise ConfigurationException("--metrics solo se puede usar con --target sync")
+            from .metrics import RequestMetrics
+
+            metrics = RequestMetrics()
+
+        # Proceso residente: atender consultas por socket Unix hasta detenerlo
+        if args.command == "daemon":
+            sys.exit(run_daemon(Config.DAEMON_SOCKET, metrics))
+
+        # Servidor HTTP/JSON para otros servicios
+        if args.command == "serve":
+            sys.exit(run_server(args.host, args.port, metrics))
+
+        # Generador de carga para dimensionar pools y cachés
+        if args.command == "loadtest":
+            sys.exit(run_loadtest(args, metrics))
+
+        # Modo batch: consultar todas las ciudades del archivo y salir
+        if args.cities_file:
+            cities_file = args.cities_file
+            sys.exit(run_batch(
+                args.cities_file, args.workers, args.format, args.output, metrics
+            ))
+
         # Mostrar mensaje de bienvenida al usuario
         print(WeatherFormatter.format_welcome())
 
-        # Inicializar el servicio de clima y validar configuración (API key, timeout, etc.)
-        weather_service = WeatherService()
+        # Con un daemon activo el servicio vive en el daemon; si no, se
+        # inicializa aquí y se valida la configuración (API key, timeout, etc.)
+        daemon_running = bool(Config.DAEMON_SOCKET) and os.path.exists(Config.DAEMON_SOCKET)
+        service_options = {} if metrics is None else {"metrics": metrics}
+        weather_service = None if daemon_running else create_service(**service_options)
 
         # Solicitar el nombre de la ciudad al usuario y limpiar espacios en blanco
         city = input(WeatherFormatter.format_city_prompt()).strip()
@@ -70,14 +701,23 @@ def main() -> NoReturn:
         # Mostrar feedback visual mientras se consulta la API
         print(WeatherFormatter.format_loading(city))
 
-        # Obtener datos del clima desde OpenWeatherMap API (puede lanzar excepciones)
-        weather_data = weather_service.get_weather(city)
+        # Consultar por el daemon; si no respondió, en este mismo proceso
+        parsed_data = query_daemon(city) if daemon_running else None
+        if parsed_data is None:
+            if weather_service is None:
+                weather_service = create_service(**service_options)
+
+            # Obtener datos del clima desde OpenWeatherMap API (puede lanzar excepciones)
+            weather_data = weather_service.get_weather(city)
 
-        # Extraer y estructurar solo los campos relevantes del JSON de la API
-        parsed_data = weather_service.parse_weather_data(weather_data)
+            # Extraer y estructurar solo los campos relevantes del JSON de la API
+            parsed_data = weather_service.parse_weather_data(weather_data)
 
         # Formatear los datos en texto amigable con emojis y mostrar al usuario
-        print(WeatherFormatter.format_weather(parsed_data))
+        if metrics is None:
+            print(WeatherFormatter.format_weather(parsed_data))
+        else:
+            print(metrics.call("format", WeatherFormatter.format_weather, parsed_data))
 
         # Salir con código 0 indicando ejecución exitosa
         sys.exit(0)
@@ -108,6 +748,14 @@ def main() -> NoReturn:
         print(WeatherFormatter.format_error(f"Error de la API: {str(e)}"))
         sys.exit(1)
 
+    # Archivo de ciudades inexistente o ilegible (modo batch) u otro error de E/S
+    except OSError as e:
+        if cities_file is not None:
+            print(WeatherFormatter.format_error(f"No se pudo leer el archivo de ciudades: {e}"))
+        else:
+            print(WeatherFormatter.format_error(f"Error de entrada/salida: {e}"))
+        sys.exit(1)
+
     # Manejo de Ctrl+C para salida limpia sin stack trace
     except KeyboardInterrupt:
         print("\n\n👋 ¡Hasta luego!\n")
@@ -118,6 +766,19 @@ def main() -> NoReturn:
         print(WeatherFormatter.format_error(f"Error inesperado: {str(e)}"))
         sys.exit(1)
 
+    # --metrics: guardar lo medido también cuando la consulta falló
+    finally:
+        if metrics is not None:
+            from .metrics import write_metrics
+
+            try:
+                write_metrics(metrics, args.metrics)
+            except OSError as e:
+                print(
+                    WeatherFormatter.format_error(f"No se pudieron guardar las métricas: {e}"),
+                    file=sys.stderr,
+                )
+
 
 if __name__ == "__main__":
-    main()
+    main(sys.argv[1:])
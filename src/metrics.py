@@ -0,0 +1,369 @@
+"""
+Instrumentación por consulta de WeatherService y exportación de métricas.
+
+latency_stats() dice cuánto tarda cada endpoint, pero no dónde se va el
+tiempo dentro de get_weather(). RequestMetrics mide las fases de cada
+consulta con histogramas de buckets fijos (como los de Prometheus):
+
+    url_build    Construcción de la URL (incluye la resolución por índice).
+    connect      Conexión TCP + TLS, solo cuando se abre una conexión nueva.
+    ttfb         Desde el envío hasta recibir los headers (sin el connect).
+    body_read    Lectura del cuerpo de la respuesta.
+    json_decode  Decodificación del JSON (fast_json).
+    parse        parse_weather_data().
+    format       Formateo de la salida (CLI y modo batch).
+
+Además cuenta los resultados por clase de excepción ("ok" si no hubo), los
+aciertos y fallos de caché y los reintentos. snapshot() devuelve todo como
+diccionario serializable a JSON y to_prometheus() en el formato de texto
+de Prometheus.
+
+Note:
+    Sin RequestMetrics (el default) el servicio solo paga una comparación
+    `self.metrics is None` por fase. Con métricas, cada observación es un
+    perf_counter() y una búsqueda binaria en los buckets bajo un lock.
+
+Example:
+    >>> metrics = RequestMetrics()
+    >>> with WeatherService(metrics=metrics) as service:
+    ...     service.parse_weather_data(service.get_weather("Madrid"))
+    >>> metrics.snapshot()["outcomes"]
+    {'ok': 1}
+    >>> print(metrics.to_prometheus())
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+# Fases medidas, en el orden en que ocurren dentro de una consulta
+PHASES = ("url_build", "connect", "ttfb", "body_read", "json_decode", "parse", "format")
+
+# Límites superiores de los buckets en segundos (de 100 µs a 10 s)
+BUCKETS: Tuple[float, ...] = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+# Prefijo de los nombres de métricas en el formato Prometheus
+PREFIX = "weather_"
+
+T = TypeVar("T")
+
+Labels = Dict[str, str]
+
+
+class _Histogram:
+    """Conteos por bucket (no acumulados), suma y total de una fase."""
+
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        # Un bucket más para las observaciones mayores al último límite
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def cumulative(self) -> List[int]:
+        """Conteos acumulados por bucket (el último es +Inf)."""
+        running = 0
+        result = []
+        for value in self.counts:
+            running += value
+            result.append(running)
+        return result
+
+
+class RequestMetrics:
+    """
+    Histogramas de fases y contadores de resultados, seguros entre hilos.
+
+    Una instancia se puede compartir entre varios servicios (por ejemplo
+    el servicio con caché y el sin caché del loadtest) para sumarlos.
+    """
+
+    def __init__(self):
+        """Inicializa los histogramas y contadores en cero."""
+        self._lock = threading.Lock()
+        self._phases: Dict[str, _Histogram] = {phase: _Histogram() for phase in PHASES}
+        self._outcomes: Dict[str, int] = {}
+        self._cache = {"hit": 0, "miss": 0}
+        self._retries = 0
+        # Duración del connect de la petición en curso de cada hilo, para
+        # descontarla del ttfb
+        self._local = threading.local()
+
+    def observe(self, phase: str, seconds: float) -> None:
+        """
+        Registra la duración de una fase.
+
+        Args:
+            phase (str): Una de PHASES.
+            seconds (float): Duración en segundos.
+        """
+        index = bisect_left(BUCKETS, seconds)
+        with self._lock:
+            histogram = self._phases[phase]
+            histogram.counts[index] += 1
+            histogram.total += seconds
+            histogram.count += 1
+
+    def call(self, phase: str, func: Callable[..., T], *args: Any) -> T:
+        """
+        Llama a func(*args) registrando su duración como la fase `phase`.
+
+        La duración se registra aunque la función lance una excepción.
+        """
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.observe(phase, time.perf_counter() - started)
+
+    def track(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Llama a func(*args) contando el resultado: "ok" o la clase de la excepción.
+        """
+        try:
+            result = func(*args)
+        except Exception as e:
+            self.count_outcome(type(e).__name__)
+            raise
+        self.count_outcome("ok")
+        return result
+
+    def record_connect(self, seconds: float) -> None:
+        """Registra una conexión nueva y la asocia a la petición del hilo."""
+        self.observe("connect", seconds)
+        self._local.connect = getattr(self._local, "connect", 0.0) + seconds
+
+    def observe_response(self, until_headers: float, body_read: float) -> None:
+        """
+        Registra ttfb y body_read de una respuesta.
+
+        Args:
+            until_headers (float): Segundos desde el envío hasta los headers,
+                incluido el connect si se abrió una conexión nueva (se
+                descuenta porque ya se registró como fase propia).
+            body_read (float): Segundos leyendo el cuerpo.
+        """
+        connect = getattr(self._local, "connect", 0.0)
+        self._local.connect = 0.0
+        self.observe("ttfb", max(0.0, until_headers - connect))
+        self.observe("body_read", body_read)
+
+    def count_outcome(self, outcome: str) -> None:
+        """Cuenta el resultado de una consulta ("ok" o clase de excepción)."""
+        with self._lock:
+            self._outcomes[outcome] = self._outcomes.get(outcome, 0) + 1
+
+    def count_cache(self, hit: bool) -> None:
+        """Cuenta un acierto o un fallo de caché."""
+        with self._lock:
+            self._cache["hit" if hit else "miss"] += 1
+
+    def count_retry(self) -> None:
+        """Cuenta un reintento de una petición HTTP."""
+        with self._lock:
+            self._retries += 1
+
+    def reset(self) -> None:
+        """Vuelve todos los histogramas y contadores a cero."""
+        with self._lock:
+            self._phases = {phase: _Histogram() for phase in PHASES}
+            self._outcomes = {}
+            self._cache = {"hit": 0, "miss": 0}
+            self._retries = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Devuelve una copia de las métricas serializable a JSON.
+
+        Returns:
+            Dict[str, Any]: phases (por fase: count, sum_s, mean_ms y
+                buckets acumulados por límite en segundos, con "+Inf"),
+                outcomes (por resultado), cache (hits, misses y hit_ratio)
+                y retries.
+        """
+        with self._lock:
+            phases = {}
+            for phase, histogram in self._phases.items():
+                cumulative = histogram.cumulative()
+                phases[phase] = {
+                    "count": histogram.count,
+                    "sum_s": round(histogram.total, 6),
+                    "mean_ms": (
+                        round(histogram.total / histogram.count * 1000, 3)
+                        if histogram.count
+                        else None
+                    ),
+                    "buckets": {
+                        **{f"{bound:g}": count for bound, count in zip(BUCKETS, cumulative)},
+                        "+Inf": cumulative[-1],
+                    },
+                }
+            lookups = self._cache["hit"] + self._cache["miss"]
+            return {
+                "phases": phases,
+                "outcomes": dict(self._outcomes),
+                "cache": {
+                    "hits": self._cache["hit"],
+                    "misses": self._cache["miss"],
+                    "hit_ratio": round(self._cache["hit"] / lookups, 4) if lookups else None,
+                },
+                "retries": self._retries,
+            }
+
+    def to_prometheus(self) -> str:
+        """
+        Exporta las métricas en el formato de texto de Prometheus (0.0.4).
+
+        Returns:
+            str: Histograma weather_phase_duration_seconds{phase=...} y los
+                contadores weather_requests_total{outcome=...},
+                weather_cache_lookups_total{result=...} y
+                weather_retries_total.
+        """
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {PREFIX}phase_duration_seconds Duración de cada fase de una consulta.",
+            f"# TYPE {PREFIX}phase_duration_seconds histogram",
+        ]
+        for phase, data in snapshot["phases"].items():
+            for bound, count in data["buckets"].items():
+                lines.append(sample(
+                    f"{PREFIX}phase_duration_seconds_bucket", {"phase": phase, "le": bound}, count
+                ))
+            lines.append(sample(f"{PREFIX}phase_duration_seconds_sum", {"phase": phase}, data["sum_s"]))
+            lines.append(sample(f"{PREFIX}phase_duration_seconds_count", {"phase": phase}, data["count"]))
+
+        lines += render(
+            f"{PREFIX}requests_total", "counter",
+            "Consultas por resultado (ok o clase de excepción).",
+            [({"outcome": outcome}, count) for outcome, count in sorted(snapshot["outcomes"].items())],
+        )
+        lines += render(
+            f"{PREFIX}cache_lookups_total", "counter", "Búsquedas en caché por resultado.",
+            [({"result": "hit"}, snapshot["cache"]["hits"]),
+             ({"result": "miss"}, snapshot["cache"]["misses"])],
+        )
+        lines += render(
+            f"{PREFIX}retries_total", "counter", "Reintentos de peticiones HTTP.",
+            [({}, snapshot["retries"])],
+        )
+        return "\n".join(lines) + "\n"
+
+    def http_adapter(self, pool_connections: int, pool_maxsize: int, pool_block: bool) -> Any:
+        """
+        Crea un HTTPAdapter de requests que mide el connect de cada conexión nueva.
+
+        Returns:
+            requests.adapters.HTTPAdapter: Adaptador con el pool pedido.
+        """
+        return _instrumented_adapter_class()(
+            self,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+
+
+def _escape(value: str) -> str:
+    """Escapa un valor de label según el formato de texto de Prometheus."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def sample(name: str, labels: Labels, value: float) -> str:
+    """Una línea de muestra de Prometheus: nombre{labels} valor."""
+    # repr() conserva la precisión de contadores grandes y sumas (:g no)
+    text = repr(value)
+    if labels:
+        rendered = ",".join(f'{key}="{_escape(str(label))}"' for key, label in labels.items())
+        return f"{name}{{{rendered}}} {text}"
+    return f"{name} {text}"
+
+
+def render(
+    name: str, kind: str, help_text: str, samples: Iterable[Tuple[Labels, float]]
+) -> List[str]:
+    """
+    Líneas HELP, TYPE y muestras de una métrica en formato Prometheus.
+
+    Args:
+        name (str): Nombre de la métrica.
+        kind (str): "counter" o "gauge".
+        help_text (str): Descripción.
+        samples (Iterable[Tuple[Labels, float]]): Labels y valor de cada serie.
+    """
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    lines += [sample(name, labels, value) for labels, value in samples]
+    return lines
+
+
+_ADAPTER_CLASS: Optional[type] = None
+
+
+def _instrumented_adapter_class() -> type:
+    """
+    Arma (una vez) la subclase de HTTPAdapter que mide los connect.
+
+    Se construye recién al usarla para no importar requests al importar
+    este módulo (el servidor lo importa aunque no haya métricas).
+    """
+    global _ADAPTER_CLASS
+    if _ADAPTER_CLASS is not None:
+        return _ADAPTER_CLASS
+
+    from requests.adapters import HTTPAdapter
+
+    def timed_pool(pool_class: type, metrics: RequestMetrics) -> type:
+        """Subclase del pool de urllib3 cuyas conexiones miden connect()."""
+        base = pool_class.ConnectionCls
+
+        class TimedConnection(base):
+            def connect(self):
+                started = time.perf_counter()
+                super().connect()
+                metrics.record_connect(time.perf_counter() - started)
+
+        return type(pool_class.__name__, (pool_class,), {"ConnectionCls": TimedConnection})
+
+    class InstrumentedHTTPAdapter(HTTPAdapter):
+        """HTTPAdapter cuyas conexiones nuevas registran la fase connect."""
+
+        def __init__(self, metrics: RequestMetrics, **kwargs):
+            # HTTPAdapter.__init__ llama a init_poolmanager(): metrics antes
+            self.metrics = metrics
+            super().__init__(**kwargs)
+
+        def init_poolmanager(self, *args, **kwargs):
+            super().init_poolmanager(*args, **kwargs)
+            self.poolmanager.pool_classes_by_scheme = {
+                scheme: timed_pool(pool_class, self.metrics)
+                for scheme, pool_class in self.poolmanager.pool_classes_by_scheme.items()
+            }
+
+    _ADAPTER_CLASS = InstrumentedHTTPAdapter
+    return _ADAPTER_CLASS
+
+
+def write_metrics(metrics: RequestMetrics, path: str) -> None:
+    """
+    Guarda las métricas en un archivo: Prometheus si termina en .prom, JSON si no.
+
+    Args:
+        metrics (RequestMetrics): Métricas a exportar.
+        path (str): Ruta del archivo.
+
+    Raises:
+        OSError: Si no se puede escribir el archivo.
+    """
+    import json
+
+    if path.endswith(".prom"):
+        text = metrics.to_prometheus()
+    else:
+        text = json.dumps(metrics.snapshot(), indent=2, ensure_ascii=False) + "\n"
+    with open(path, "w", encoding="utf-8") as output:
+        output.write(text)
@@ -0,0 +1,275 @@
+"""
+Registro compacto de una lectura del clima.
+
+parse_weather_data() devolvía un diccionario nuevo de 10 claves por cada
+resultado. Con millones de lecturas en memoria (agregaciones, batches
+grandes) el overhead de cada dict domina el uso de RAM. WeatherReading
+guarda los mismos campos en __slots__ (sin __dict__ por instancia) y los
+textos que se repiten entre lecturas (ciudad, país, descripción) se
+internan, así todas las lecturas de "ES" o "Cielo claro" comparten el mismo
+objeto str.
+
+WeatherReading implementa Mapping: se sigue pudiendo leer como el diccionario
+de antes (reading["city"], reading.get(...), dict(reading), comparación con un
+dict), así que WeatherFormatter y el resto de los llamadores no cambian. Para
+serializar a JSON se usa to_dict().
+
+LazyReading ofrece la misma interfaz sobre el cuerpo crudo de la respuesta:
+no decodifica nada hasta que se lee el primer campo, y sus bytes se pueden
+guardar tal cual en la caché en disco.
+
+Example:
+    >>> reading = WeatherReading.from_api(api_response)
+    >>> reading.city, reading["country"]
+    ('Madrid', 'ES')
+    >>> reading == reading.to_dict()
+    True
+"""
+
+import sys
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .exceptions import WeatherAPIException
+from .fast_json import FieldExtractor, JSONInput
+
+# Orden de los campos, igual al del diccionario que devolvía parse_weather_data()
+FIELDS: Tuple[str, ...] = (
+    "city",
+    "country",
+    "temperature",
+    "feels_like",
+    "description",
+    "humidity",
+    "pressure",
+    "wind_speed",
+    "latitude",
+    "longitude",
+)
+
+_FIELD_SET = frozenset(FIELDS)
+
+# Ruta de cada campo en la respuesta de /data/2.5/weather, en el orden de FIELDS
+_API_EXTRACTOR = FieldExtractor([
+    "name",
+    "sys.country",
+    "main.temp",
+    "main.feels_like",
+    "weather.0.description",
+    "main.humidity",
+    "main.pressure",
+    "wind.speed",
+    "coord.lat",
+    "coord.lon",
+])
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class WeatherReading(Mapping):
+    """
+    Lectura del clima de una ciudad, inmutable y sin __dict__ por instancia.
+
+    La igualdad es la de Mapping (igual a cualquier mapping con las mismas
+    claves y valores), no la de dataclass, para que una lectura siga siendo
+    intercambiable con el diccionario que reemplaza.
+
+    Attributes:
+        city (str): Nombre de la ciudad.
+        country (str): Código del país (AR, ES, US, etc.).
+        temperature (float): Temperatura actual en Celsius.
+        feels_like (float): Sensación térmica en Celsius.
+        description (str): Descripción del clima (capitalizada).
+        humidity (int): Humedad en porcentaje.
+        pressure (int): Presión atmosférica en hPa.
+        wind_speed (float): Velocidad del viento en m/s.
+        latitude (float): Latitud de la ciudad.
+        longitude (float): Longitud de la ciudad.
+    """
+
+    city: str
+    country: str
+    temperature: float
+    feels_like: float
+    description: str
+    humidity: int
+    pressure: int
+    wind_speed: float
+    latitude: float
+    longitude: float
+
+    @classmethod
+    def from_api(cls, data: Dict[str, Any]) -> "WeatherReading":
+        """
+        Construye la lectura desde el JSON de /data/2.5/weather.
+
+        Args:
+            data (Dict[str, Any]): Respuesta JSON completa de la API.
+
+        Returns:
+            WeatherReading: Lectura con la descripción capitalizada y los
+                textos repetitivos internados.
+
+        Raises:
+            KeyError: Si falta un campo esperado.
+            IndexError: Si la lista "weather" está vacía.
+            TypeError: Si un nivel del JSON no tiene el tipo esperado.
+        """
+        return cls._from_values(_API_EXTRACTOR(data))
+
+    @classmethod
+    def from_json(cls, body: JSONInput) -> "WeatherReading":
+        """
+        Construye la lectura directamente desde el cuerpo crudo de la respuesta.
+
+        Raises:
+            ValueError: Si el cuerpo no es JSON válido.
+            KeyError, IndexError, TypeError: Igual que from_api().
+        """
+        return cls._from_values(_API_EXTRACTOR.from_bytes(body))
+
+    @classmethod
+    def from_json_many(cls, bodies: Iterable[JSONInput]) -> List["WeatherReading"]:
+        """
+        Construye las lecturas de muchos cuerpos crudos (ej: los de la caché).
+
+        Raises:
+            ValueError: Si un cuerpo no es JSON válido.
+            KeyError, IndexError, TypeError: Igual que from_api().
+        """
+        build = cls._from_values
+        return [build(values) for values in _API_EXTRACTOR.extract_many(bodies)]
+
+    @classmethod
+    def _from_values(cls, values: Tuple[Any, ...]) -> "WeatherReading":
+        """Crea la lectura desde los valores extraídos en el orden de FIELDS."""
+        city, country, temperature, feels_like, description, *rest = values
+        return cls(
+            sys.intern(city),
+            sys.intern(country),
+            temperature,
+            feels_like,
+            # Capitalizar primera letra de la descripción para mejor formato
+            sys.intern(description.capitalize()),
+            *rest,
+        )
+
+    def __getitem__(self, key: str) -> Any:
+        """Devuelve el campo `key` como si la lectura fuera un diccionario."""
+        if key not in _FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        """Itera los nombres de los campos en el orden de FIELDS."""
+        return iter(FIELDS)
+
+    def __len__(self) -> int:
+        """Cantidad de campos de la lectura."""
+        return len(FIELDS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Copia la lectura a un diccionario (ej: para serializar a JSON)."""
+        return {name: getattr(self, name) for name in FIELDS}
+
+
+class LazyReading(Mapping):
+    """
+    Lectura del clima que decodifica el cuerpo crudo recién al primer acceso.
+
+    Guarda solo los bytes de la respuesta. La primera vez que se lee un campo
+    el cuerpo se decodifica (fast_json) y los campos extraídos quedan
+    guardados en un WeatherReading interno; el diccionario completo de la
+    respuesta se descarta. Una lectura que nunca se consulta no gasta CPU en
+    decodificar y ocupa solo lo que ocupan sus bytes.
+
+    Nota: ni json ni orjson permiten decodificar solo algunas claves, así que
+    el primer acceso decodifica el documento una vez y extrae todos los
+    campos a la vez; los accesos siguientes no vuelven a decodificar.
+
+    Attributes:
+        raw (bytes): Cuerpo JSON tal como llegó de la API (o de la caché);
+            se puede guardar en DiskCache/TTLCache sin volver a serializar.
+
+    Example:
+        >>> reading = LazyReading(response.content)
+        >>> reading.temperature       # decodifica aquí
+        18.3
+        >>> disk_cache.set(key, reading.raw)
+    """
+
+    __slots__ = ("_body", "_reading")
+
+    def __init__(self, body: bytes):
+        """
+        Envuelve el cuerpo crudo sin decodificarlo.
+
+        Args:
+            body (bytes): Cuerpo JSON de /data/2.5/weather.
+        """
+        self._body = body
+        self._reading: Optional[WeatherReading] = None
+
+    @property
+    def raw(self) -> bytes:
+        """Cuerpo JSON crudo de la lectura."""
+        return self._body
+
+    @property
+    def decoded(self) -> bool:
+        """Indica si el cuerpo ya se decodificó."""
+        return self._reading is not None
+
+    def to_reading(self) -> WeatherReading:
+        """
+        Decodifica el cuerpo (solo la primera vez) y devuelve la lectura.
+
+        Raises:
+            WeatherAPIException: Si el cuerpo no es JSON válido o faltan
+                campos (mismo mensaje que parse_weather_data()).
+        """
+        reading = self._reading
+        if reading is None:
+            try:
+                reading = WeatherReading.from_json(self._body)
+            except (ValueError, KeyError, IndexError, TypeError) as e:
+                raise WeatherAPIException(f"Error al parsear los datos de la API: {str(e)}")
+            self._reading = reading
+        return reading
+
+    def __getattr__(self, name: str) -> Any:
+        """Resuelve los campos de WeatherReading (city, temperature, ...)."""
+        if name in _FIELD_SET:
+            return getattr(self.to_reading(), name)
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def __getitem__(self, key: str) -> Any:
+        """Devuelve el campo `key` como si la lectura fuera un diccionario."""
+        if key not in _FIELD_SET:
+            raise KeyError(key)
+        return getattr(self.to_reading(), key)
+
+    def __contains__(self, key: object) -> bool:
+        """Indica si `key` es un campo, sin decodificar el cuerpo."""
+        return key in _FIELD_SET
+
+    def __iter__(self) -> Iterator[str]:
+        """Itera los nombres de los campos en el orden de FIELDS."""
+        return iter(FIELDS)
+
+    def __len__(self) -> int:
+        """Cantidad de campos de la lectura."""
+        return len(FIELDS)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """Se serializa (pickle) solo con los bytes crudos."""
+        return (type(self), (self._body,))
+
+    def __repr__(self) -> str:
+        """Muestra el tamaño del cuerpo sin forzar la decodificación."""
+        state = "decodificada" if self.decoded else "sin decodificar"
+        return f"LazyReading({len(self._body)} bytes, {state})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Copia la lectura a un diccionario (ej: para serializar a JSON)."""
+        return self.to_reading().to_dict()
@@ -0,0 +1,358 @@
+"""
+Limitador de tasa del lado del cliente (token bucket) compartido entre procesos.
+
+OpenWeatherMap limita las consultas por minuto (60 en el plan gratuito) y
+por período, y al superarlas responde 429. Sin control del lado del cliente,
+varios workers o varios procesos en paralelo superan la cuota enseguida y
+todas sus consultas empiezan a fallar.
+
+RateLimiter implementa un token bucket:
+    - El balde tiene capacidad `per_minute` y se rellena a per_minute/60
+      tokens por segundo; cada consulta consume un token.
+    - Opcionalmente hay un tope diario (`per_day`, día UTC).
+    - Ante un 429 la API se bloquea durante el Retry-After indicado o, si no
+      viene, con backoff exponencial (1s, 2s, 4s... hasta 60s).
+
+Estado compartido:
+    Con `state_path` el estado se guarda en un archivo JSON protegido con
+    un lock exclusivo (fcntl.flock), así todos los hilos y procesos del mismo
+    host comparten el mismo balde. En plataformas sin fcntl (Windows), sin
+    `state_path` o si el archivo no se puede crear, el estado vive en
+    memoria y solo se comparte entre hilos.
+
+Example:
+    >>> limiter = RateLimiter(per_minute=60, state_path="/tmp/weather-rl.json")
+    >>> limiter.acquire()         # espera si no quedan tokens
+    >>> limiter.remaining()["minute"]
+    59
+"""
+
+import datetime
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import IO, Any, Callable, Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+from .config import Config
+from .exceptions import RateLimitException
+
+# Límites del backoff adaptativo cuando un 429 no trae Retry-After
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 60.0
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """
+    Interpreta el header Retry-After (segundos o fecha HTTP).
+
+    Args:
+        value (Optional[str]): Valor del header, o None si no vino.
+        now (Optional[float]): Epoch actual (para fechas HTTP). Default: ahora.
+
+    Returns:
+        Optional[float]: Segundos a esperar (>= 0), o None si el header no
+            vino o no se pudo interpretar.
+
+    Example:
+        >>> parse_retry_after("30")
+        30.0
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    # Import diferido: email.utils solo hace falta para el formato de fecha
+    import email.utils
+
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at - (now if now is not None else time.time()))
+
+
+class RateLimiter:
+    """
+    Token bucket por minuto y tope diario, con backoff ante respuestas 429.
+
+    Attributes:
+        per_minute (int): Consultas permitidas por minuto (capacidad del balde).
+        per_day (int): Consultas permitidas por día UTC (0 = sin tope).
+        state_path (Optional[str]): Archivo de estado compartido entre
+            procesos, o None para estado solo en memoria.
+    """
+
+    def __init__(
+        self,
+        per_minute: int,
+        per_day: int = 0,
+        state_path: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Inicializa el limitador (el archivo de estado se crea en el primer uso).
+
+        Args:
+            per_minute (int): Consultas por minuto.
+            per_day (int): Consultas por día UTC (0 = sin tope).
+            state_path (Optional[str]): Archivo de estado compartido.
+            clock (Callable[[], float]): Reloj de pared (epoch); se usa tiempo
+                de pared porque el estado se comparte entre procesos.
+            sleep (Callable[[float], None]): Función de espera; inyectable en
+                tests.
+
+        Raises:
+            ValueError: Si per_minute no es positivo o per_day es negativo.
+        """
+        if per_minute <= 0:
+            raise ValueError("El límite por minuto debe ser mayor a 0")
+        if per_day < 0:
+            raise ValueError("El límite diario no puede ser negativo")
+
+        self.per_minute = per_minute
+        self.per_day = per_day
+        self.state_path = state_path
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._memory_state: Dict[str, Any] = {}
+        # Último valor visto de los 429 consecutivos: evita reescribir el
+        # estado en cada respuesta exitosa solo para dejarlo en cero
+        self._strikes = 0
+
+    @classmethod
+    def from_config(cls) -> "RateLimiter":
+        """Crea el limitador con los límites y el archivo definidos en Config."""
+        return cls(
+            per_minute=Config.RATE_LIMIT_PER_MINUTE,
+            per_day=Config.RATE_LIMIT_PER_DAY,
+            state_path=Config.RATE_LIMIT_STATE_FILE,
+        )
+
+    def _fresh_state(self, now: float) -> Dict[str, Any]:
+        """Estado inicial: balde lleno, contador diario en cero, sin bloqueo."""
+        return {
+            "tokens": float(self.per_minute),
+            "updated": now,
+            "day": self._utc_day(now),
+            "day_count": 0,
+            "blocked_until": 0.0,
+            "strikes": 0,
+        }
+
+    @staticmethod
+    def _utc_day(now: float) -> str:
+        """Día UTC (YYYY-MM-DD) del epoch indicado."""
+        return datetime.datetime.fromtimestamp(now, datetime.timezone.utc).strftime("%Y-%m-%d")
+
+    @contextmanager
+    def _state(self) -> Iterator[Dict[str, Any]]:
+        """
+        Da acceso exclusivo al estado y lo persiste al salir del bloque.
+
+        Con archivo de estado y fcntl disponible, el lock exclusivo del
+        archivo serializa a todos los procesos; el lock de hilos evita además
+        que dos hilos del mismo proceso lean el archivo a la vez.
+        """
+        now = self._clock()
+        with self._lock:
+            f = self._open_state_file()
+            if f is None:
+                if not self._memory_state:
+                    self._memory_state = self._fresh_state(now)
+                yield self._memory_state
+                return
+
+            with f:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                try:
+                    f.seek(0)
+                    try:
+                        state = json.loads(f.read() or "{}")
+                    except ValueError:
+                        state = {}
+                    if not state:
+                        state = self._fresh_state(now)
+
+                    yield state
+
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps(state))
+                    f.flush()
+                finally:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _open_state_file(self) -> Optional[IO[str]]:
+        """
+        Abre (creándolo si hace falta) el archivo de estado compartido.
+
+        Si el archivo no se puede crear (directorio sin permisos, ruta
+        inválida) el limitador sigue con estado en memoria, compartido solo
+        entre los hilos del proceso, y no vuelve a intentarlo: limitar la
+        tasa es una protección y no debe impedir consultar el clima.
+
+        Returns:
+            Optional[IO[str]]: El archivo abierto, o None si el estado vive
+                en memoria.
+        """
+        if self.state_path is None or fcntl is None:
+            return None
+        try:
+            directory = os.path.dirname(self.state_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            return open(self.state_path, "a+", encoding="utf-8")
+        except OSError:
+            self.state_path = None
+            return None
+
+    def _refill(self, state: Dict[str, Any], now: float) -> None:
+        """Agrega los tokens acumulados desde la última actualización."""
+        elapsed = max(0.0, now - state["updated"])
+        state["tokens"] = min(
+            float(self.per_minute), state["tokens"] + elapsed * self.per_minute / 60.0
+        )
+        state["updated"] = now
+        today = self._utc_day(now)
+        if state["day"] != today:
+            state["day"] = today
+            state["day_count"] = 0
+
+    def _seconds_until_next_day(self, now: float) -> float:
+        """Segundos que faltan para la medianoche UTC."""
+        current = datetime.datetime.fromtimestamp(now, datetime.timezone.utc)
+        tomorrow = (current + datetime.timedelta(days=1)).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        return (tomorrow - current).total_seconds()
+
+    def try_acquire(self) -> float:
+        """
+        Intenta consumir un token sin esperar.
+
+        Returns:
+            float: 0.0 si se consumió el token; si no, los segundos a esperar
+                antes de volver a intentar.
+
+        Raises:
+            RateLimitException: Si se agotó el tope diario (esperar hasta el
+                día siguiente no tiene sentido para una consulta).
+        """
+        with self._state() as state:
+            now = self._clock()
+            self._refill(state, now)
+            self._strikes = state["strikes"]
+
+            if state["blocked_until"] > now:
+                return state["blocked_until"] - now
+
+            if self.per_day and state["day_count"] >= self.per_day:
+                raise RateLimitException(
+                    "Se agotó la cuota diaria de consultas a la API",
+                    retry_after=self._seconds_until_next_day(now),
+                )
+
+            if state["tokens"] < 1.0:
+                # Tiempo hasta que se acumule un token completo
+                return (1.0 - state["tokens"]) * 60.0 / self.per_minute
+
+            state["tokens"] -= 1.0
+            state["day_count"] += 1
+            return 0.0
+
+    def acquire(self, max_wait: Optional[float] = None) -> None:
+        """
+        Consume un token, esperando lo necesario hasta max_wait segundos.
+
+        Args:
+            max_wait (Optional[float]): Espera máxima total. Default:
+                Config.RATE_LIMIT_MAX_WAIT.
+
+        Raises:
+            RateLimitException: Si habría que esperar más de max_wait o si se
+                agotó el tope diario.
+        """
+        limit = max_wait if max_wait is not None else Config.RATE_LIMIT_MAX_WAIT
+        waited = 0.0
+        while True:
+            wait = self.try_acquire()
+            if wait <= 0:
+                return
+            if waited + wait > limit:
+                raise RateLimitException(
+                    "Se alcanzó el límite de consultas por minuto a la API",
+                    retry_after=wait,
+                )
+            self._sleep(wait)
+            waited += wait
+
+    def on_rate_limited(self, retry_after: Optional[float] = None) -> float:
+        """
+        Registra un 429 de la API y bloquea a todos los procesos un tiempo.
+
+        Usa el Retry-After de la API si vino; si no, un backoff exponencial
+        según la cantidad de 429 consecutivos. También vacía el balde para
+        que la tasa se recupere gradualmente después del bloqueo.
+
+        Args:
+            retry_after (Optional[float]): Segundos indicados por la API.
+
+        Returns:
+            float: Segundos de bloqueo aplicados.
+        """
+        with self._state() as state:
+            now = self._clock()
+            state["strikes"] += 1
+            if retry_after is None:
+                retry_after = min(
+                    BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** (state["strikes"] - 1)
+                )
+            state["blocked_until"] = max(state["blocked_until"], now + retry_after)
+            state["tokens"] = 0.0
+            state["updated"] = now
+            self._strikes = state["strikes"]
+            return retry_after
+
+    def on_success(self) -> None:
+        """
+        Reinicia el backoff adaptativo tras una respuesta no 429.
+
+        Solo toca el estado (y el archivo compartido) si el último valor
+        visto en try_acquire() u on_rate_limited() tenía 429 pendientes: en
+        el caso normal una respuesta exitosa no cuesta ningún acceso a disco.
+        """
+        if not self._strikes:
+            return
+        with self._state() as state:
+            state["strikes"] = 0
+            self._strikes = 0
+
+    def remaining(self) -> Dict[str, float]:
+        """
+        Devuelve el presupuesto disponible sin consumir tokens.
+
+        Returns:
+            Dict[str, float]: "minute" (tokens enteros disponibles), "day"
+                (consultas restantes hoy, o -1 si no hay tope) y
+                "blocked_for" (segundos de bloqueo por 429 pendientes).
+        """
+        with self._state() as state:
+            now = self._clock()
+            self._refill(state, now)
+            return {
+                "minute": int(state["tokens"]),
+                "day": self.per_day - state["day_count"] if self.per_day else -1,
+                "blocked_for": max(0.0, state["blocked_until"] - now),
+            }
@@ -0,0 +1,338 @@
+"""
+Lote columnar de lecturas del clima respaldado por arrays de NumPy.
+
+Con miles de lecturas, calcular estadísticas (máxima por país, humedad
+media, viento en km/h) recorriendo diccionarios en Python es lento y cada
+lectura es un objeto aparte. ReadingBatch guarda cada campo numérico en un
+array contiguo y los textos repetitivos (ciudad, país, descripción) como
+categorías: un array de códigos enteros más la lista de valores distintos.
+
+    temperature, feels_like, wind_speed, latitude, longitude -> float64
+    humidity, pressure                                        -> int32
+    city, country, description                                -> códigos int32 + categorías
+
+Las conversiones de unidades usan las mismas funciones que el formateador
+(src/units.py) aplicadas al array completo, y las reducciones por grupo
+(group_by) se resuelven con np.bincount / ufunc.at en una sola pasada.
+
+Dependencias:
+    numpy (opcional): solo se necesita para este módulo. Si no está
+    instalado, crear un ReadingBatch lanza ConfigurationException con
+    instrucciones de instalación; el resto del CLI sigue funcionando.
+    pyarrow (opcional): solo para to_arrow().
+
+Example:
+    >>> batch = ReadingBatch.from_readings(readings)
+    >>> batch.group_by("country", "temperature", "max")
+    {'ES': 31.2, 'AR': 25.5}
+    >>> batch.wind_speed_kmh().mean()
+    14.8
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depende del entorno
+    np = None
+
+from .exceptions import ConfigurationException
+from .models import FIELDS, WeatherReading
+from .units import celsius_to_fahrenheit, ms_to_kmh
+
+# Columnas numéricas y su tipo de dato
+NUMERIC_COLUMNS: Dict[str, str] = {
+    "temperature": "float64",
+    "feels_like": "float64",
+    "humidity": "int32",
+    "pressure": "int32",
+    "wind_speed": "float64",
+    "latitude": "float64",
+    "longitude": "float64",
+}
+
+# Columnas de texto codificadas como categorías
+CATEGORICAL_COLUMNS: Tuple[str, ...] = ("city", "country", "description")
+
+# Reducciones soportadas por group_by()
+REDUCTIONS = ("count", "sum", "mean", "min", "max")
+
+
+def _require_numpy() -> None:
+    """Lanza ConfigurationException si NumPy no está instalado."""
+    if np is None:
+        raise ConfigurationException(
+            "ReadingBatch requiere numpy.\n"
+            "Instálalo con: pip install numpy"
+        )
+
+
+def _encode(values: List[str]) -> Tuple["np.ndarray", Tuple[str, ...]]:
+    """
+    Codifica una lista de textos como categorías.
+
+    Returns:
+        Tuple[np.ndarray, Tuple[str, ...]]: Códigos int32 (índice en las
+            categorías) y categorías en orden de primera aparición.
+    """
+    index: Dict[str, int] = {}
+    codes = np.fromiter(
+        (index.setdefault(value, len(index)) for value in values),
+        dtype="int32",
+        count=len(values),
+    )
+    return codes, tuple(index)
+
+
+class ReadingBatch:
+    """
+    Conjunto inmutable de lecturas almacenadas por columnas.
+
+    Los arrays que devuelven column(), codes() y columns() son vistas de
+    solo lectura sobre los datos del lote (sin copias).
+
+    Attributes:
+        categories (Dict[str, Tuple[str, ...]]): Valores distintos de city,
+            country y description; el código i corresponde a categories[i].
+
+    Example:
+        >>> batch = ReadingBatch.from_readings([reading_madrid, reading_lima])
+        >>> len(batch)
+        2
+        >>> batch.column("temperature")
+        array([18.3, 16.9])
+    """
+
+    def __init__(
+        self,
+        numeric: Mapping[str, "np.ndarray"],
+        codes: Mapping[str, "np.ndarray"],
+        categories: Mapping[str, Sequence[str]],
+    ):
+        """
+        Crea el lote a partir de columnas ya construidas.
+
+        Normalmente se usa from_readings(); este constructor sirve para armar
+        un lote desde arrays existentes sin recorrer lecturas.
+
+        Args:
+            numeric (Mapping[str, np.ndarray]): Un array por cada columna de
+                NUMERIC_COLUMNS.
+            codes (Mapping[str, np.ndarray]): Códigos de cada columna de
+                CATEGORICAL_COLUMNS.
+            categories (Mapping[str, Sequence[str]]): Categorías de cada
+                columna de CATEGORICAL_COLUMNS.
+
+        Raises:
+            ConfigurationException: Si numpy no está instalado.
+            ValueError: Si falta una columna o no todas tienen el mismo largo.
+        """
+        _require_numpy()
+
+        self._numeric: Dict[str, "np.ndarray"] = {}
+        self._codes: Dict[str, "np.ndarray"] = {}
+        self.categories: Dict[str, Tuple[str, ...]] = {}
+        try:
+            for name, dtype in NUMERIC_COLUMNS.items():
+                self._numeric[name] = _readonly(np.ascontiguousarray(numeric[name], dtype=dtype))
+            for name in CATEGORICAL_COLUMNS:
+                self._codes[name] = _readonly(np.ascontiguousarray(codes[name], dtype="int32"))
+                self.categories[name] = tuple(categories[name])
+        except KeyError as e:
+            raise ValueError(f"Falta la columna {e} en el lote")
+
+        lengths = {len(array) for array in (*self._numeric.values(), *self._codes.values())}
+        if len(lengths) > 1:
+            raise ValueError("Todas las columnas del lote deben tener el mismo largo")
+        self._length = lengths.pop() if lengths else 0
+
+    @classmethod
+    def from_readings(cls, readings: Iterable[Mapping[str, Any]]) -> "ReadingBatch":
+        """
+        Construye el lote desde lecturas parseadas.
+
+        Args:
+            readings (Iterable[Mapping[str, Any]]): WeatherReading (o
+                diccionarios con las mismas claves) devueltos por
+                parse_weather_data().
+
+        Returns:
+            ReadingBatch: Lote con una fila por lectura, en el mismo orden.
+
+        Raises:
+            ConfigurationException: Si numpy no está instalado.
+            KeyError: Si a una lectura le falta un campo.
+        """
+        _require_numpy()
+
+        values: Dict[str, List[Any]] = {
+            name: [] for name in (*NUMERIC_COLUMNS, *CATEGORICAL_COLUMNS)
+        }
+        appenders = [(name, column.append) for name, column in values.items()]
+        for reading in readings:
+            for name, append in appenders:
+                append(reading[name])
+
+        codes: Dict[str, "np.ndarray"] = {}
+        categories: Dict[str, Tuple[str, ...]] = {}
+        for name in CATEGORICAL_COLUMNS:
+            codes[name], categories[name] = _encode(values[name])
+        numeric = {
+            name: np.array(values[name], dtype=dtype) for name, dtype in NUMERIC_COLUMNS.items()
+        }
+        return cls(numeric, codes, categories)
+
+    def __len__(self) -> int:
+        """Cantidad de lecturas del lote."""
+        return self._length
+
+    def __getitem__(self, index: int) -> WeatherReading:
+        """Reconstruye la lectura de la fila `index` como WeatherReading."""
+        if not -self._length <= index < self._length:
+            raise IndexError("Índice fuera del lote")
+        fields = {name: array[index].item() for name, array in self._numeric.items()}
+        for name in CATEGORICAL_COLUMNS:
+            fields[name] = self.categories[name][self._codes[name][index]]
+        return WeatherReading(**fields)
+
+    def column(self, name: str) -> "np.ndarray":
+        """
+        Devuelve una columna numérica o los valores de una categórica.
+
+        Args:
+            name (str): Columna de NUMERIC_COLUMNS o de CATEGORICAL_COLUMNS.
+
+        Returns:
+            np.ndarray: Vista de solo lectura para las numéricas; para las
+                categóricas, un array de objetos str (se materializa).
+
+        Raises:
+            KeyError: Si la columna no existe.
+        """
+        if name in self._numeric:
+            return self._numeric[name]
+        if name in self._codes:
+            return np.asarray(self.categories[name], dtype=object)[self._codes[name]]
+        raise KeyError(name)
+
+    def codes(self, name: str) -> "np.ndarray":
+        """Códigos (vista de solo lectura) de una columna categórica."""
+        return self._codes[name]
+
+    def wind_speed_kmh(self) -> "np.ndarray":
+        """Velocidad del viento de todas las lecturas en km/h."""
+        return ms_to_kmh(self._numeric["wind_speed"])
+
+    def fahrenheit(self, name: str = "temperature") -> "np.ndarray":
+        """
+        Convierte una columna de temperatura a °F.
+
+        Args:
+            name (str): "temperature" o "feels_like".
+        """
+        if name not in ("temperature", "feels_like"):
+            raise ValueError(f"La columna {name!r} no es una temperatura")
+        return celsius_to_fahrenheit(self._numeric[name])
+
+    def group_by(self, key: str, column: str, reduction: str = "mean") -> Dict[str, float]:
+        """
+        Reduce una columna numérica agrupando por una categórica.
+
+        Args:
+            key (str): Columna de agrupación ("country", "city" o
+                "description").
+            column (str): Columna numérica a reducir.
+            reduction (str): Una de REDUCTIONS ("count", "sum", "mean",
+                "min", "max").
+
+        Returns:
+            Dict[str, float]: Resultado por categoría, en el orden de las
+                categorías (primera aparición). count devuelve enteros.
+
+        Raises:
+            KeyError: Si key o column no existen.
+            ValueError: Si la reducción no está soportada.
+
+        Example:
+            >>> batch.group_by("country", "humidity", "mean")
+            {'ES': 68.5, 'AR': 65.0}
+        """
+        if reduction not in REDUCTIONS:
+            raise ValueError(
+                f"Reducción no soportada: {reduction!r} (usar {', '.join(REDUCTIONS)})"
+            )
+        codes = self._codes[key]
+        values = self._numeric[column]
+        groups = len(self.categories[key])
+
+        counts = np.bincount(codes, minlength=groups)
+        if reduction == "count":
+            result = counts
+        elif reduction in ("sum", "mean"):
+            result = np.bincount(codes, weights=values, minlength=groups)
+            if reduction == "mean":
+                result = result / np.maximum(counts, 1)
+        else:
+            # ufunc.at acumula sin buffer: cada código actualiza su grupo
+            ufunc = np.maximum if reduction == "max" else np.minimum
+            result = np.full(groups, -np.inf if reduction == "max" else np.inf)
+            ufunc.at(result, codes, values)
+
+        return {
+            category: result[i].item()
+            for i, category in enumerate(self.categories[key])
+            if counts[i]
+        }
+
+    def columns(self) -> Dict[str, "np.ndarray"]:
+        """
+        Exporta las columnas como arrays de NumPy sin copiar.
+
+        Returns:
+            Dict[str, np.ndarray]: Columnas numéricas y, para cada categórica,
+                sus códigos bajo "<nombre>_code". Todas son vistas de solo
+                lectura sobre los buffers del lote.
+        """
+        exported = dict(self._numeric)
+        for name, codes in self._codes.items():
+            exported[f"{name}_code"] = codes
+        return exported
+
+    def to_arrow(self) -> Any:
+        """
+        Exporta el lote como pyarrow.Table.
+
+        Las columnas numéricas y los códigos se envuelven sin copiar (Arrow
+        reutiliza los buffers de NumPy) y las categóricas quedan como
+        DictionaryArray, el equivalente de Arrow a esta codificación.
+
+        Returns:
+            pyarrow.Table: Una columna por campo de WeatherReading.
+
+        Raises:
+            ConfigurationException: Si pyarrow no está instalado.
+        """
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ConfigurationException(
+                "ReadingBatch.to_arrow() requiere pyarrow.\n"
+                "Instálalo con: pip install pyarrow"
+            )
+
+        arrays = {
+            name: pa.DictionaryArray.from_arrays(
+                pa.array(self._codes[name]), pa.array(self.categories[name], type=pa.string())
+            )
+            for name in CATEGORICAL_COLUMNS
+        }
+        arrays.update((name, pa.array(array)) for name, array in self._numeric.items())
+        # Mismo orden de columnas que WeatherReading
+        return pa.table({name: arrays[name] for name in FIELDS})
+
+
+def _readonly(array: "np.ndarray") -> "np.ndarray":
+    """Devuelve una vista de solo lectura del array."""
+    view = array.view()
+    view.flags.writeable = False
+    return view
@@ -0,0 +1,329 @@
+"""
+Reintentos con backoff exponencial y circuit breaker por host.
+
+Una falla transitoria (timeout, conexión cortada, 502/503) no debería hacer
+fallar una consulta que un segundo intento resolvería. Pero reintentar sin
+control durante una caída de la API empeora las cosas: todos los workers
+siguen golpeando un host que no responde y cada uno espera su timeout.
+
+Este módulo combina dos mecanismos:
+
+RetryPolicy:
+    Decide qué se reintenta y cuánto esperar. Solo se reintentan fallas
+    transitorias de peticiones idempotentes (todas las consultas a la API
+    son GET): timeouts, errores de conexión y respuestas 500/502/503/504.
+    Los 4xx (ciudad inexistente, API key inválida, 429) nunca se reintentan.
+    La espera usa backoff exponencial con "full jitter": un valor aleatorio
+    entre 0 y base·2^(intento-1), acotado por un máximo, para que los
+    workers no reintenten todos al mismo tiempo.
+
+CircuitBreaker:
+    Cuenta las fallas consecutivas de un host. Al llegar al umbral el
+    circuito se abre y las consultas fallan de inmediato con
+    CircuitOpenException sin tocar la red. Pasado el tiempo de enfriamiento
+    pasa a half-open y deja pasar una sola consulta de prueba: si funciona
+    el circuito se cierra, si falla vuelve a abrirse.
+
+        closed --(N fallas seguidas)--> open --(reset_timeout)--> half_open
+          ^                                ^                          |
+          +----------(prueba ok)-----------+------(prueba falla)------+
+
+Example:
+    >>> policy = RetryPolicy(max_attempts=3)
+    >>> breakers = CircuitBreakerRegistry(failure_threshold=5, reset_timeout=30)
+    >>> breaker = breakers.get("api.openweathermap.org")
+    >>> breaker.before_call()     # lanza CircuitOpenException si está abierto
+    >>> breaker.record_success()
+"""
+
+import random
+import threading
+import time
+from typing import Callable, Dict, FrozenSet
+
+from .config import Config
+from .exceptions import CircuitOpenException
+
+# Estados del circuit breaker
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Códigos HTTP que indican una falla transitoria del servidor
+RETRYABLE_STATUS_CODES: FrozenSet[int] = frozenset({500, 502, 503, 504})
+
+
+class RetryPolicy:
+    """
+    Política de reintentos con backoff exponencial y full jitter.
+
+    Attributes:
+        max_attempts (int): Intentos totales por petición (1 = sin reintentos).
+        backoff_base (float): Espera base en segundos del primer reintento.
+        backoff_max (float): Espera máxima entre dos intentos.
+        retry_statuses (FrozenSet[int]): Códigos HTTP que se reintentan.
+
+    Example:
+        >>> policy = RetryPolicy(max_attempts=3, backoff_base=0.5)
+        >>> policy.should_retry(1), policy.should_retry(3)
+        (True, False)
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        retry_statuses: FrozenSet[int] = RETRYABLE_STATUS_CODES,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Callable[[float, float], float] = random.uniform,
+    ):
+        """
+        Inicializa la política.
+
+        Args:
+            max_attempts (int): Intentos totales por petición.
+            backoff_base (float): Espera base en segundos.
+            backoff_max (float): Tope de la espera en segundos.
+            retry_statuses (FrozenSet[int]): Códigos HTTP reintentables.
+            sleep (Callable[[float], None]): Función de espera; inyectable
+                en tests.
+            rng (Callable[[float, float], float]): Generador uniforme para el
+                jitter; inyectable en tests.
+
+        Raises:
+            ValueError: Si max_attempts es menor a 1 o las esperas son negativas.
+        """
+        if max_attempts < 1:
+            raise ValueError("La cantidad de intentos debe ser mayor a 0")
+        if backoff_base < 0 or backoff_max < 0:
+            raise ValueError("Las esperas del backoff no pueden ser negativas")
+
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = retry_statuses
+        self._sleep = sleep
+        self._rng = rng
+
+    @classmethod
+    def from_config(cls) -> "RetryPolicy":
+        """Crea la política con los valores definidos en Config (RETRY_*)."""
+        return cls(
+            max_attempts=Config.RETRY_MAX_ATTEMPTS,
+            backoff_base=Config.RETRY_BACKOFF_BASE,
+            backoff_max=Config.RETRY_BACKOFF_MAX,
+        )
+
+    def should_retry(self, attempt: int) -> bool:
+        """Indica si quedan intentos después del intento número `attempt`."""
+        return attempt < self.max_attempts
+
+    def is_retryable_status(self, status_code: int) -> bool:
+        """Indica si un código HTTP es una falla transitoria reintentable."""
+        return status_code in self.retry_statuses
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Calcula la espera antes del siguiente intento (full jitter).
+
+        Args:
+            attempt (int): Número del intento que acaba de fallar (1, 2, ...).
+
+        Returns:
+            float: Segundos a esperar, entre 0 y min(max, base·2^(attempt-1)).
+        """
+        ceiling = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return self._rng(0.0, ceiling)
+
+    def wait(self, attempt: int) -> None:
+        """Espera el backoff correspondiente al intento que falló."""
+        delay = self.backoff(attempt)
+        if delay > 0:
+            self._sleep(delay)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker de un host con estados closed, open y half_open.
+
+    Es seguro entre hilos: los workers del modo batch comparten el breaker
+    del host y en half-open solo uno de ellos hace la consulta de prueba.
+
+    Attributes:
+        host (str): Host protegido por este breaker.
+        failure_threshold (int): Fallos consecutivos que abren el circuito.
+        reset_timeout (float): Segundos abierto antes de pasar a half-open.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        failure_threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Inicializa el breaker cerrado.
+
+        Args:
+            host (str): Host protegido.
+            failure_threshold (int): Fallos consecutivos que abren el circuito.
+            reset_timeout (float): Segundos de enfriamiento.
+            clock (Callable[[], float]): Reloj monótono; inyectable en tests.
+
+        Raises:
+            ValueError: Si el umbral es menor a 1 o el enfriamiento negativo.
+        """
+        if failure_threshold < 1:
+            raise ValueError("El umbral de fallas debe ser mayor a 0")
+        if reset_timeout < 0:
+            raise ValueError("El tiempo de enfriamiento no puede ser negativo")
+
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._times_opened = 0
+        self._rejected = 0
+
+    @property
+    def state(self) -> str:
+        """Estado actual: "closed", "open" o "half_open"."""
+        with self._lock:
+            self._advance()
+            return self._state
+
+    def _advance(self) -> None:
+        """Pasa de open a half_open si ya venció el enfriamiento (sin lock)."""
+        if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._probe_in_flight = False
+
+    def before_call(self) -> None:
+        """
+        Autoriza una petición al host o falla rápido.
+
+        Raises:
+            CircuitOpenException: Si el circuito está abierto, o si está en
+                half-open y otra petición ya está haciendo la prueba.
+        """
+        with self._lock:
+            self._advance()
+            if self._state == CLOSED:
+                return
+            if self._state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+
+            self._rejected += 1
+            remaining = max(0.0, self.reset_timeout - (self._clock() - self._opened_at))
+            raise CircuitOpenException(self.host, remaining)
+
+    def record_success(self) -> None:
+        """Registra una respuesta del host: cierra el circuito y reinicia fallas."""
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Registra una falla; abre el circuito al llegar al umbral o en half-open."""
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self._times_opened += 1
+                self._state = OPEN
+                self._opened_at = self._clock()
+                self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """
+        Libera la consulta de prueba sin registrar éxito ni falla.
+
+        Para intentos que terminaron por un error que no dice nada del host
+        (limitador local, estado en disco): el circuito queda como estaba y
+        la próxima consulta puede hacer la prueba.
+        """
+        with self._lock:
+            self._probe_in_flight = False
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Devuelve el estado del breaker para monitoreo.
+
+        Returns:
+            Dict[str, object]: state, consecutive_failures, times_opened
+                (aperturas desde el inicio) y rejected (consultas rechazadas
+                sin tocar la red).
+        """
+        with self._lock:
+            self._advance()
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "times_opened": self._times_opened,
+                "rejected": self._rejected,
+            }
+
+
+class CircuitBreakerRegistry:
+    """
+    Conjunto de circuit breakers, uno por host, creados a demanda.
+
+    Example:
+        >>> breakers = CircuitBreakerRegistry(failure_threshold=5, reset_timeout=30)
+        >>> breakers.get("api.openweathermap.org").state
+        'closed'
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Inicializa el registro vacío.
+
+        Args:
+            failure_threshold (int): Umbral de cada breaker.
+            reset_timeout (float): Enfriamiento de cada breaker.
+            clock (Callable[[], float]): Reloj monótono; inyectable en tests.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    @classmethod
+    def from_config(cls) -> "CircuitBreakerRegistry":
+        """Crea el registro con los valores definidos en Config (CIRCUIT_*)."""
+        return cls(
+            failure_threshold=Config.CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=Config.CIRCUIT_RESET_TIMEOUT,
+        )
+
+    def get(self, host: str) -> CircuitBreaker:
+        """Devuelve el breaker del host, creándolo cerrado si no existía."""
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    host, self.failure_threshold, self.reset_timeout, clock=self._clock
+                )
+                self._breakers[host] = breaker
+            return breaker
+
+    def stats(self) -> Dict[str, Dict[str, object]]:
+        """Devuelve las estadísticas de cada breaker indexadas por host."""
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {breaker.host: breaker.stats() for breaker in breakers}
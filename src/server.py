@@ -0,0 +1,521 @@
+"""
+Servidor HTTP/JSON embebido para compartir un WeatherService entre consumidores.
+
+Muchos servicios internos necesitan el clima; si cada uno llama a
+OpenWeatherMap por su cuenta se multiplican las consultas, la cuota y las
+cachés frías. `python run.py serve` expone un único WeatherService (con su
+caché, caché negativa, coalescing y limitador) por HTTP:
+
+    GET  /weather?city=Madrid        -> datos de parse_weather_data()
+    POST /weather/batch              -> {"cities": ["Madrid", "Lima"]}
+    GET  /weather/batch?city=A&city=B
+    GET  /metrics                    -> contadores del servidor y del servicio
+    GET  /metrics?format=prometheus  -> los mismos en formato de texto Prometheus
+
+Los errores se responden como {"error": categoría, "message": "..."} con el
+código HTTP que corresponde (404 ciudad inexistente, 400 entrada inválida,
+429 límite de consultas, 502 error de la API, 503 circuito abierto, 504
+timeout de red).
+
+Backpressure:
+    Las conexiones aceptadas pasan por una cola acotada que atiende un
+    número fijo de hilos. Si la cola está llena, la conexión se responde de
+    inmediato con 503 y Retry-After (load shedding) en vez de acumular
+    trabajo que llegaría tarde de todos modos. El 503 lo escribe un hilo
+    aparte, así el hilo que acepta conexiones nunca espera a un cliente.
+
+Solo usa la biblioteca estándar (http.server), así no agrega dependencias.
+
+Example:
+    $ python run.py serve --port 8080
+    $ curl 'http://127.0.0.1:8080/weather?city=Madrid'
+"""
+
+import json
+import queue
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from . import __version__
+from .batch import _lookup
+from .config import Config
+from .daemon import error_category
+from .exceptions import CircuitOpenException, RateLimitException
+from .metrics import PREFIX, render
+
+# Código HTTP de cada categoría de error (ver daemon.error_category)
+_STATUS_BY_CATEGORY = {
+    "not_found": 404,
+    "invalid_input": 400,
+    "rate_limit": 429,
+    "invalid_key": 502,
+    "api": 502,
+    "network": 504,
+    "config": 500,
+    "internal": 500,
+}
+
+# Tamaño máximo del cuerpo de una petición batch
+MAX_BODY_BYTES = 1024 * 1024
+
+# Conexiones rechazadas esperando su 503; con más se cierran sin responder
+SHED_QUEUE_SIZE = 64
+
+# Content-Type del formato de texto de Prometheus
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def error_status(error: BaseException) -> int:
+    """
+    Código HTTP con el que se informa una excepción del servicio.
+
+    Args:
+        error (BaseException): Excepción lanzada por get_weather().
+
+    Returns:
+        int: Código HTTP de la respuesta de error.
+    """
+    if isinstance(error, CircuitOpenException):
+        # La API está caída: el servidor no puede atender por ahora
+        return 503
+    return _STATUS_BY_CATEGORY[error_category(error)]
+
+
+def error_body(error: BaseException) -> Dict[str, Any]:
+    """Cuerpo JSON de error: categoría y mensaje de la excepción."""
+    return {"error": error_category(error), "message": str(error)}
+
+
+class ServerMetrics:
+    """
+    Contadores del servidor para /metrics, seguros entre hilos.
+
+    Example:
+        >>> metrics = ServerMetrics()
+        >>> metrics.record("/weather", 200)
+        >>> metrics.snapshot()["requests"]
+        {'/weather': {'200': 1}}
+    """
+
+    def __init__(self):
+        """Inicializa los contadores en cero."""
+        self._lock = threading.Lock()
+        self._requests: Dict[str, Dict[str, int]] = {}
+        self._shed = 0
+        self._in_flight = 0
+
+    def record(self, route: str, status: int) -> None:
+        """Cuenta una respuesta por ruta y código HTTP."""
+        with self._lock:
+            by_status = self._requests.setdefault(route, {})
+            by_status[str(status)] = by_status.get(str(status), 0) + 1
+
+    def record_shed(self) -> None:
+        """Cuenta una conexión rechazada con 503 por la cola llena."""
+        with self._lock:
+            self._shed += 1
+
+    def started(self) -> None:
+        """Marca el inicio de la atención de una conexión."""
+        with self._lock:
+            self._in_flight += 1
+
+    def finished(self) -> None:
+        """Marca el fin de la atención de una conexión."""
+        with self._lock:
+            self._in_flight -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Devuelve una copia de los contadores.
+
+        Returns:
+            Dict[str, Any]: requests (por ruta y código), shed (conexiones
+                rechazadas) e in_flight (conexiones en atención).
+        """
+        with self._lock:
+            return {
+                "requests": {route: dict(counts) for route, counts in self._requests.items()},
+                "shed": self._shed,
+                "in_flight": self._in_flight,
+            }
+
+
+class WeatherRequestHandler(BaseHTTPRequestHandler):
+    """Atiende las rutas /weather, /weather/batch y /metrics."""
+
+    server_version = f"WeatherCLI/{__version__}"
+
+    # Un cliente que no envía la petición no retiene un hilo indefinidamente
+    timeout = 10
+
+    def do_GET(self) -> None:
+        """Atiende GET /weather, /weather/batch y /metrics."""
+        url = urlsplit(self.path)
+        params = parse_qs(url.query)
+        if url.path == "/weather":
+            city = (params.get("city") or [""])[0]
+            self._send_weather(city)
+        elif url.path == "/weather/batch":
+            self._send_batch(params.get("city", []))
+        elif url.path == "/metrics":
+            if (params.get("format") or [""])[0] == "prometheus":
+                payload = self.server.metrics_prometheus().encode("utf-8")
+                self._send_body(url.path, 200, payload, PROMETHEUS_CONTENT_TYPE)
+            else:
+                self._send_json(url.path, 200, self.server.metrics_snapshot())
+        else:
+            self._send_json(url.path, 404, {"error": "not_found", "message": "Ruta inexistente"})
+
+    def do_POST(self) -> None:
+        """Atiende POST /weather/batch con {"cities": [...]}."""
+        url = urlsplit(self.path)
+        if url.path != "/weather/batch":
+            self._send_json(url.path, 404, {"error": "not_found", "message": "Ruta inexistente"})
+            return
+
+        # Sin un largo válido no se puede leer el cuerpo sin arriesgar quedar
+        # bloqueado hasta el timeout del socket; la conexión se cierra porque
+        # el cuerpo queda sin leer
+        raw_length = self.headers.get("Content-Length")
+        if raw_length is None:
+            self.close_connection = True
+            self._send_json(url.path, 411, {
+                "error": "invalid_input", "message": "Falta el header Content-Length"
+            })
+            return
+        raw_length = raw_length.strip()
+        if not (raw_length.isascii() and raw_length.isdigit()):
+            self.close_connection = True
+            self._send_json(url.path, 400, {
+                "error": "invalid_input", "message": f"Content-Length inválido: {raw_length!r}"
+            })
+            return
+        length = int(raw_length)
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            self._send_json(url.path, 413, {
+                "error": "invalid_input", "message": "El cuerpo de la petición es demasiado grande"
+            })
+            return
+
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            cities = payload.get("cities") if isinstance(payload, dict) else None
+            if not isinstance(cities, list) or not all(isinstance(c, str) for c in cities):
+                raise ValueError("Se esperaba {\"cities\": [\"Ciudad\", ...]}")
+        except ValueError as e:
+            self._send_json(url.path, 400, {"error": "invalid_input", "message": str(e)})
+            return
+
+        self._send_batch(cities)
+
+    def _send_weather(self, city: str) -> None:
+        """Consulta una ciudad y responde los datos o el error."""
+        service = self.server.service
+        try:
+            data = service.parse_weather_data(service.get_weather(city))
+        except Exception as e:  # noqa: BLE001 - se informa como respuesta HTTP
+            headers = {}
+            if isinstance(e, (RateLimitException, CircuitOpenException)) and e.retry_after:
+                headers["Retry-After"] = str(max(1, round(e.retry_after)))
+            self._send_json("/weather", error_status(e), error_body(e), headers)
+            return
+        # parse_weather_data() devuelve un WeatherReading (Mapping)
+        self._send_json("/weather", 200, dict(data))
+
+    def _send_batch(self, cities: List[str]) -> None:
+        """Consulta varias ciudades en paralelo y responde en el orden pedido."""
+        route = "/weather/batch"
+        if not cities:
+            self._send_json(route, 400, {
+                "error": "invalid_input", "message": "Se necesita al menos una ciudad"
+            })
+            return
+        if len(cities) > Config.SERVER_MAX_BATCH:
+            self._send_json(route, 413, {
+                "error": "invalid_input",
+                "message": f"Máximo {Config.SERVER_MAX_BATCH} ciudades por petición",
+            })
+            return
+
+        results = []
+        for result in self.server.lookup_many(cities):
+            entry: Dict[str, Any] = {"city": result.city, "data": None, "error": None}
+            if result.ok:
+                entry["data"] = dict(result.data)
+            else:
+                entry["error"] = error_body(result.error)
+            results.append(entry)
+        self._send_json(route, 200, {"results": results})
+
+    def _send_json(
+        self,
+        route: str,
+        status: int,
+        body: Dict[str, Any],
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Serializa y envía una respuesta JSON, y la cuenta en las métricas."""
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self._send_body(route, status, payload, "application/json; charset=utf-8", headers)
+
+    def _send_body(
+        self,
+        route: str,
+        status: int,
+        payload: bytes,
+        content_type: str,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Envía una respuesta ya serializada y la cuenta en las métricas."""
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+        self.server.metrics.record(route, status)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Registra cada petición en stderr solo si el access log está activo."""
+        if self.server.access_log:
+            super().log_message(format, *args)
+
+
+class WeatherHTTPServer(HTTPServer):
+    """
+    Servidor HTTP con una cola acotada de conexiones y un pool fijo de hilos.
+
+    A diferencia de ThreadingHTTPServer (un hilo nuevo por conexión, sin
+    límite), las conexiones aceptadas se encolan y las atienden `workers`
+    hilos; con la cola llena se responde 503 sin procesar la petición.
+
+    Attributes:
+        service: WeatherService compartido por todas las peticiones.
+        metrics (ServerMetrics): Contadores expuestos en /metrics.
+        access_log (bool): Si es True, se registra cada petición en stderr.
+
+    Example:
+        >>> with WeatherService(cache=TTLCache.from_config()) as service:
+        ...     server = WeatherHTTPServer(("127.0.0.1", 8080), service)
+        ...     server.serve_forever()
+    """
+
+    # Sin SO_REUSEADDR un reinicio rápido falla con "Address already in use"
+    allow_reuse_address = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        service: Any,
+        workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        access_log: bool = False,
+    ):
+        """
+        Crea el servidor, lo deja escuchando y arranca los hilos de atención.
+
+        Args:
+            address (Tuple[str, int]): Host y puerto (puerto 0 = libre).
+            service: Servicio con get_weather() y parse_weather_data(),
+                seguro de usar desde varios hilos.
+            workers (Optional[int]): Hilos que atienden conexiones.
+                Default: Config.SERVER_WORKERS.
+            queue_size (Optional[int]): Conexiones en espera antes de
+                rechazar con 503. Default: Config.SERVER_QUEUE_SIZE.
+            access_log (bool): Registrar cada petición en stderr.
+
+        Raises:
+            ValueError: Si workers es menor a 1 o queue_size negativo.
+        """
+        workers = workers if workers is not None else Config.SERVER_WORKERS
+        queue_size = queue_size if queue_size is not None else Config.SERVER_QUEUE_SIZE
+        if workers < 1:
+            raise ValueError("El servidor necesita al menos un worker")
+        if queue_size < 0:
+            raise ValueError("El tamaño de la cola no puede ser negativo")
+
+        self.service = service
+        self.metrics = ServerMetrics()
+        self.access_log = access_log
+        # queue.Queue(0) no tiene límite: una cola de tamaño 0 se modela con
+        # tamaño 1 para que siempre haya un lugar para el hilo que lo toma
+        self._queue: "queue.Queue[Optional[Tuple[socket.socket, Any]]]" = queue.Queue(
+            maxsize=max(1, queue_size)
+        )
+        # TCPServer llama a server_close() si falla el bind: los hilos se
+        # crean recién con el socket escuchando
+        self._workers: List[threading.Thread] = []
+        self._shed_queue: "queue.Queue[Optional[socket.socket]]" = queue.Queue(
+            maxsize=SHED_QUEUE_SIZE
+        )
+        self._shedder: Optional[threading.Thread] = None
+        self._batch_executor: Optional[ThreadPoolExecutor] = None
+        super().__init__(address, WeatherRequestHandler)
+
+        self._batch_executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="weather-batch"
+        )
+        self._workers = [
+            threading.Thread(target=self._work, name=f"weather-http-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._workers:
+            thread.start()
+        self._shedder = threading.Thread(target=self._shed, name="weather-shed", daemon=True)
+        self._shedder.start()
+
+    def process_request(self, request: socket.socket, client_address: Any) -> None:
+        """Encola la conexión o la rechaza con 503 si la cola está llena."""
+        try:
+            self._queue.put_nowait((request, client_address))
+        except queue.Full:
+            self.metrics.record_shed()
+            try:
+                self._shed_queue.put_nowait(request)
+            except queue.Full:
+                self.shutdown_request(request)
+
+    def _work(self) -> None:
+        """Bucle de cada hilo de atención: toma conexiones de la cola."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            request, client_address = item
+            self.metrics.started()
+            try:
+                self.finish_request(request, client_address)
+            except Exception:  # noqa: BLE001 - un error no debe matar al worker
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+                self.metrics.finished()
+
+    def _shed(self) -> None:
+        """Bucle del hilo de rechazo: responde 503 a las conexiones descartadas."""
+        while True:
+            request = self._shed_queue.get()
+            if request is None:
+                return
+            try:
+                self._reject(request)
+            finally:
+                self.shutdown_request(request)
+
+    def _reject(self, request: socket.socket) -> None:
+        """
+        Responde 503 a una conexión sin procesarla (load shedding).
+
+        Corre en el hilo de rechazo, no en el que acepta conexiones: la
+        lectura de la petición puede esperar hasta 0,1 s a un cliente lento.
+        """
+        body = json.dumps({
+            "error": "overloaded", "message": "Servidor saturado, reintentar en breve"
+        }).encode("utf-8")
+        response = (
+            b"HTTP/1.0 503 Service Unavailable\r\n"
+            b"Content-Type: application/json; charset=utf-8\r\n"
+            b"Retry-After: 1\r\n"
+            b"Content-Length: " + str(len(body)).encode("ascii") + b"\r\n"
+            b"Connection: close\r\n\r\n" + body
+        )
+        try:
+            # Leer lo que ya llegó de la petición: cerrar con datos sin leer
+            # haría que el cliente reciba un reset en vez del 503
+            request.settimeout(0.1)
+            try:
+                request.recv(MAX_BODY_BYTES)
+            except OSError:
+                pass
+            request.sendall(response)
+        except OSError:
+            pass
+        self.metrics.record("shed", 503)
+
+    def lookup_many(self, cities: List[str]) -> List[Any]:
+        """
+        Consulta varias ciudades en el pool compartido del servidor.
+
+        Returns:
+            List[BatchResult]: Un resultado por ciudad, en el orden pedido.
+        """
+        return list(self._batch_executor.map(lambda city: _lookup(self.service, city), cities))
+
+    def metrics_snapshot(self) -> Dict[str, Any]:
+        """
+        Arma el cuerpo de /metrics.
+
+        Returns:
+            Dict[str, Any]: Contadores del servidor ("server", con la
+                profundidad de la cola en queue_depth) y estadísticas del
+                servicio: cachés, circuit breakers, latencias y cuota del
+                limitador de tasa ("rate_limit"), si las expone,
+                y fases, resultados y reintentos ("requests") si el servicio
+                está instrumentado (METRICS_ENABLED).
+        """
+        snapshot: Dict[str, Any] = {"server": self.metrics.snapshot()}
+        snapshot["server"]["queue_depth"] = self._queue.qsize()
+        for name in ("cache_stats", "circuit_stats", "latency_stats", "rate_limit_stats"):
+            stats = getattr(self.service, name, None)
+            if callable(stats):
+                snapshot[name.replace("_stats", "")] = stats()
+        request_metrics = getattr(self.service, "metrics", None)
+        if request_metrics is not None:
+            snapshot["requests"] = request_metrics.snapshot()
+        return snapshot
+
+    def metrics_prometheus(self) -> str:
+        """
+        Arma el cuerpo de /metrics?format=prometheus.
+
+        Returns:
+            str: Contadores del servidor (respuestas por ruta y código,
+                conexiones rechazadas, en atención y en cola) y, si el
+                servicio está instrumentado, sus fases y contadores.
+        """
+        server = self.metrics.snapshot()
+        lines = render(
+            f"{PREFIX}server_responses_total", "counter", "Respuestas por ruta y código HTTP.",
+            [
+                ({"route": route, "status": status}, count)
+                for route, by_status in sorted(server["requests"].items())
+                for status, count in sorted(by_status.items())
+            ],
+        )
+        lines += render(
+            f"{PREFIX}server_shed_total", "counter",
+            "Conexiones rechazadas con 503 por la cola llena.", [({}, server["shed"])],
+        )
+        lines += render(
+            f"{PREFIX}server_in_flight", "gauge", "Conexiones en atención.",
+            [({}, server["in_flight"])],
+        )
+        lines += render(
+            f"{PREFIX}server_queue_depth", "gauge", "Conexiones esperando un worker.",
+            [({}, self._queue.qsize())],
+        )
+        text = "\n".join(lines) + "\n"
+        request_metrics = getattr(self.service, "metrics", None)
+        if request_metrics is not None:
+            text += request_metrics.to_prometheus()
+        return text
+
+    def server_close(self) -> None:
+        """Detiene los hilos de atención y cierra el socket del servidor."""
+        super().server_close()
+        for _ in self._workers:
+            self._queue.put(None)
+        for thread in self._workers:
+            thread.join()
+        if self._shedder is not None:
+            self._shed_queue.put(None)
+            self._shedder.join()
+        if self._batch_executor is not None:
+            self._batch_executor.shutdown(wait=True)
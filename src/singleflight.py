@@ -0,0 +1,109 @@
+"""
+Coalescing de consultas duplicadas en vuelo (patrón single-flight).
+
+Cuando muchos hilos piden la misma ciudad al mismo tiempo (por ejemplo 200
+paneles de un dashboard pidiendo "Buenos Aires"), sin coalescing cada uno
+dispara su propia petición HTTP. SingleFlight agrupa las llamadas
+concurrentes con la misma clave: la primera (líder) ejecuta la función y las
+demás esperan y reciben su mismo resultado o su misma excepción.
+
+A diferencia de una caché, no guarda nada una vez que la llamada termina:
+solo deduplica lo que está en vuelo en ese momento.
+
+Example:
+    >>> flights = SingleFlight()
+    >>> value, shared = flights.do("madrid|es|metric", lambda: consultar_api())
+"""
+
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class _Call:
+    """Llamada en vuelo: el líder publica el resultado y despierta al resto."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Deduplicador de llamadas concurrentes por clave, seguro entre hilos.
+
+    Example:
+        >>> flights = SingleFlight()
+        >>> flights.do("clave", lambda: 42)
+        (42, False)
+    """
+
+    def __init__(self):
+        """Inicializa el registro de llamadas en vuelo vacío."""
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._leaders = 0
+        self._coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Ejecuta fn una sola vez por clave entre las llamadas concurrentes.
+
+        Args:
+            key (str): Clave que identifica llamadas equivalentes.
+            fn (Callable[[], Any]): Función a ejecutar si no hay otra llamada
+                en vuelo con la misma clave.
+
+        Returns:
+            Tuple[Any, bool]: El resultado de fn y un flag que indica si el
+                resultado fue compartido (True para los llamadores que
+                esperaron al líder, False para el líder).
+
+        Raises:
+            Exception: La misma excepción que lanzó fn en el líder, relanzada
+                en todos los llamadores que esperaban.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self._leaders += 1
+            else:
+                self._coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+            return call.result, False
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            # Quitar la llamada antes de despertar: quien llegue después
+            # inicia una consulta nueva en vez de recibir un resultado viejo
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Devuelve cuántas llamadas ejecutaron fn y cuántas se coalescieron.
+
+        Returns:
+            Dict[str, int]: Contadores leaders, coalesced e in_flight.
+        """
+        with self._lock:
+            return {
+                "leaders": self._leaders,
+                "coalesced": self._coalesced,
+                "in_flight": len(self._calls),
+            }
@@ -0,0 +1,31 @@
+"""
+Conversiones de unidades compartidas por el formateador y ReadingBatch.
+
+La API se consulta en unidades métricas (Config.UNITS = "metric"): viento en
+m/s y temperaturas en Celsius. Las funciones solo usan aritmética, así que
+aceptan tanto un número como un array de NumPy completo (conversión
+vectorizada en ReadingBatch).
+
+Example:
+    >>> ms_to_kmh(3.5)
+    12.6
+    >>> celsius_to_fahrenheit(25.0)
+    77.0
+"""
+
+from typing import TypeVar
+
+# Factor de conversión de m/s a km/h (3600 s / 1000 m)
+MS_TO_KMH = 3.6
+
+T = TypeVar("T")
+
+
+def ms_to_kmh(speed: T) -> T:
+    """Convierte una velocidad (o un array de velocidades) de m/s a km/h."""
+    return speed * MS_TO_KMH
+
+
+def celsius_to_fahrenheit(temperature: T) -> T:
+    """Convierte una temperatura (o un array de temperaturas) de °C a °F."""
+    return temperature * 9 / 5 + 32
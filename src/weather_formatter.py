@@ -1,6 +1,8 @@
 """Formateador de datos del clima para salida en consola."""
 
-from typing import Dict, Any
+from typing import Dict, Any, Mapping
+
+from .units import ms_to_kmh
 
 
 class WeatherFormatter:
@@ -46,8 +48,29 @@ class WeatherFormatter:
         "pin": "📍",
     }
 
+    # Espacio que sigue a cada emoji en la salida (los que llevan selector de
+    # variación ocupan un ancho menos en muchas terminales)
+    EMOJI_SPACING = {
+        "thermometer": "  ",
+        "cloud": "  ",
+        "droplet": " ",
+        "wind": " ",
+        "gauge": "  ",
+        "pin": " ",
+    }
+
+    @staticmethod
+    def _icons(emojis: bool) -> Dict[str, str]:
+        """Prefijo de cada línea: emoji y espacio, o vacío sin emojis."""
+        if not emojis:
+            return {name: "" for name in WeatherFormatter.EMOJI_SPACING}
+        return {
+            name: WeatherFormatter.EMOJIS[name] + spacing
+            for name, spacing in WeatherFormatter.EMOJI_SPACING.items()
+        }
+
     @staticmethod
-    def format_weather(weather_data: Dict[str, Any]) -> str:
+    def format_weather(weather_data: Mapping[str, Any], emojis: bool = True) -> str:
         """
         Formatea los datos del clima en un texto descriptivo amigable con emojis.
 
@@ -56,9 +79,11 @@ class WeatherFormatter:
         y conversión de unidades para mejor comprensión del usuario.
 
         Args:
-            weather_data (Dict[str, Any]): Diccionario con datos del clima parseados.
-                Debe contener las claves: city, country, temperature, description,
+            weather_data (Mapping[str, Any]): Datos del clima parseados (un
+                WeatherReading o un diccionario). Debe contener las claves: city, country, temperature, description,
                 humidity, wind_speed, pressure, latitude, longitude.
+            emojis (bool): Si es False se omiten los emojis (salida a un
+                archivo o a otro programa en vez de una terminal).
 
         Returns:
             str: String formateado con múltiples líneas conteniendo toda la
@@ -102,10 +127,11 @@ class WeatherFormatter:
         lon = weather_data["longitude"]
 
         # Convertir velocidad del viento de m/s a km/h (multiplicar por 3.6)
-        wind_kmh = wind_speed * 3.6
+        wind_kmh = ms_to_kmh(wind_speed)
 
         # Línea decorativa usando caracteres Unicode
         separator = "━" * 45
+        icons = WeatherFormatter._icons(emojis)
 
         # Construir string formateado con f-string multilínea
         output = f"""
@@ -113,19 +139,19 @@ class WeatherFormatter:
            CLIMA EN {city.upper()}, {country}
 {separator}
 
-{WeatherFormatter.EMOJIS['thermometer']}  Temperatura: {temp}°C
-{WeatherFormatter.EMOJIS['cloud']}  Condición: {description}
-{WeatherFormatter.EMOJIS['droplet']} Humedad: {humidity}%
-{WeatherFormatter.EMOJIS['wind']} Viento: {wind_speed} m/s ({wind_kmh:.1f} km/h)
-{WeatherFormatter.EMOJIS['gauge']}  Presión: {pressure} hPa
-{WeatherFormatter.EMOJIS['pin']} Coordenadas: {lat}, {lon}
+{icons['thermometer']}Temperatura: {temp}°C
+{icons['cloud']}Condición: {description}
+{icons['droplet']}Humedad: {humidity}%
+{icons['wind']}Viento: {wind_speed} m/s ({wind_kmh:.1f} km/h)
+{icons['gauge']}Presión: {pressure} hPa
+{icons['pin']}Coordenadas: {lat}, {lon}
 
 {separator}
 """
         return output
 
     @staticmethod
-    def format_error(error_message: str) -> str:
+    def format_error(error_message: str, emojis: bool = True) -> str:
         """
         Formatea un mensaje de error de forma amigable con emoji de error.
 
@@ -134,6 +160,7 @@ class WeatherFormatter:
 
         Args:
             error_message (str): Mensaje de error a formatear.
+            emojis (bool): Si es False se omite el emoji de error.
 
         Returns:
             str: String formateado con el error, emoji, y líneas en blanco.
@@ -145,7 +172,8 @@ class WeatherFormatter:
             ❌ Error: Ciudad no encontrada
             
         """
-        return f"\n❌ Error: {error_message}\n"
+        prefix = "❌ " if emojis else ""
+        return f"\n{prefix}Error: {error_message}\n"
 
     @staticmethod
     def format_welcome() -> str:
@@ -1,15 +1,127 @@
-"""Servicio para consultar el clima usando la API de OpenWeatherMap."""
+"""
+Servicio para consultar el clima usando la API de OpenWeatherMap.
 
-from typing import Dict, Any
-import requests
+Note:
+    requests (y con él urllib3, certifi, etc.) se importa recién al crear la
+    sesión HTTP o al hacer la primera petición, igual que concurrent.futures
+    y los módulos que solo se usan como tipos. Así importar este módulo es
+    barato y el CLI arranca rápido aunque termine sin tocar la red (error de
+    configuración, ciudad en caché negativa, etc.).
+"""
 
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Any, Iterable, List, NoReturn, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+from .cache import TTLCache, make_cache_key
+from . import fast_json
 from .config import Config
 from .exceptions import (
     CityNotFoundException,
     InvalidAPIKeyException,
     NetworkException,
+    RateLimitException,
+    ServerErrorException,
     WeatherAPIException,
 )
+from .latency import HedgeBudget, LatencyTracker
+from .models import LazyReading, WeatherReading
+from .rate_limiter import parse_retry_after
+from .singleflight import SingleFlight
+
+if TYPE_CHECKING:  # pragma: no cover - solo para anotaciones
+    from concurrent.futures import ThreadPoolExecutor
+
+    import requests
+    from requests.adapters import BaseAdapter
+
+    from .batch import BatchResult
+    from .city_index import CityIndex
+    from .disk_cache import DiskCache
+    from .metrics import RequestMetrics
+    from .rate_limiter import RateLimiter
+    from .resilience import CircuitBreakerRegistry, RetryPolicy
+
+
+def raise_for_status(
+    status_code: int, body: str, city: str, retry_after: Optional[float] = None
+) -> NoReturn:
+    """
+    Traduce un código HTTP de error de OpenWeatherMap a la excepción del dominio.
+
+    Se comparte entre el cliente síncrono y el asíncrono para que ambos
+    lancen exactamente las mismas excepciones ante las mismas respuestas.
+
+    Args:
+        status_code (int): Código de estado HTTP distinto de 200.
+        body (str): Cuerpo de la respuesta (se incluye en el mensaje de error).
+        city (str): Ciudad consultada (para CityNotFoundException).
+        retry_after (Optional[float]): Segundos del header Retry-After (429).
+
+    Raises:
+        CityNotFoundException: Si el código es 404.
+        InvalidAPIKeyException: Si el código es 401.
+        RateLimitException: Si el código es 429.
+        ServerErrorException: Si el código es 5xx (500, 503, etc.).
+        WeatherAPIException: Para cualquier otro código.
+    """
+    if status_code == 404:
+        # Ciudad no encontrada en la base de datos de OpenWeatherMap
+        raise CityNotFoundException(city)
+
+    if status_code == 401:
+        # API key inválida, expirada, o no autorizada
+        raise InvalidAPIKeyException()
+
+    if status_code == 429:
+        # Límite de consultas por minuto/período superado
+        raise RateLimitException(retry_after=retry_after)
+
+    if 500 <= status_code < 600:
+        # Error del servidor de la API, normalmente transitorio
+        raise ServerErrorException(status_code, body)
+
+    # Otros errores HTTP inesperados
+    raise WeatherAPIException(f"Error de la API: {status_code} - {body}")
+
+
+def _parse_reading(data: Dict[str, Any]) -> WeatherReading:
+    """WeatherReading.from_api() con los errores de estructura como WeatherAPIException."""
+    try:
+        return WeatherReading.from_api(data)
+    except (KeyError, IndexError, TypeError) as e:
+        # Faltan campos esperados o estructura JSON inválida
+        raise WeatherAPIException(f"Error al parsear los datos de la API: {str(e)}")
+
+
+def _retry_after(response: "requests.Response") -> Optional[float]:
+    """Segundos del header Retry-After de una respuesta 429 (None en otro caso)."""
+    if response.status_code != 429:
+        return None
+    return parse_retry_after(response.headers.get("Retry-After"))
+
+
+def _read_json(response: "requests.Response") -> Tuple[bytes, Any]:
+    """
+    Devuelve el cuerpo crudo de una respuesta y su JSON decodificado con
+    fast_json (orjson si está).
+
+    Una respuesta sin cuerpo crudo en bytes (adaptadores propios, dobles de
+    prueba) se decodifica con su propio json() y el cuerpo se serializa de
+    nuevo para poder guardarlo en las cachés.
+
+    Returns:
+        Tuple[bytes, Any]: Cuerpo en bytes y documento decodificado.
+
+    Raises:
+        ValueError: Si el cuerpo no es JSON válido.
+    """
+    content = response.content
+    if isinstance(content, (bytes, bytearray)):
+        return content, fast_json.loads(content)
+    data = response.json()
+    return fast_json.dumps(data), data
 
 
 class WeatherService:
@@ -24,24 +136,60 @@ class WeatherService:
     posibles (200, 404, 401, 500) y excepciones de red (timeout, connection error).
     
     Attributes:
-        No tiene atributos de instancia. Toda la configuración se obtiene
-        de la clase Config (API key, timeout, idioma, etc.).
+        session (requests.Session): Sesión HTTP de larga vida con un pool de
+            conexiones keep-alive. Se reutiliza entre llamadas para no pagar
+            un handshake TCP + TLS por cada ciudad consultada.
+        cache (Optional[TTLCache]): Caché en memoria de respuestas crudas, o
+            None si la caché está deshabilitada (por defecto).
+        negative_cache (Optional[TTLCache]): Caché en memoria de ciudades
+            inexistentes (404), o None si está deshabilitada (por defecto).
+        disk_cache (Optional["DiskCache"]): Caché SQLite persistente entre
+            invocaciones, o None si está deshabilitada (por defecto).
+        retry_policy (Optional["RetryPolicy"]): Política de reintentos ante
+            fallas transitorias, o None para no reintentar (por defecto).
+        circuit_breakers (Optional["CircuitBreakerRegistry"]): Circuit breakers
+            por host, o None si están deshabilitados (por defecto).
+        latency (LatencyTracker): Histogramas de latencia por endpoint de
+            las respuestas recibidas.
+        El resto de la configuración se obtiene de la clase Config
+        (API key, timeout, idioma, tamaño del pool, etc.).
     
     Example:
-        >>> service = WeatherService()
-        >>> data = service.get_weather("Buenos Aires")
-        >>> parsed = service.parse_weather_data(data)
+        >>> with WeatherService() as service:
+        ...     data = service.get_weather("Buenos Aires")
+        ...     parsed = service.parse_weather_data(data)
         >>> print(parsed["temperature"])
         25.5
     
     Note:
         Para tests, se puede instanciar con skip_validation=True para omitir
         la validación de la API key y otras configuraciones.
+        Usar close() (o el bloque with) al terminar para liberar las conexiones.
     """
 
-    def __init__(self, skip_validation=False):
+    def __init__(
+        self,
+        skip_validation=False,
+        session: Optional["requests.Session"] = None,
+        pool_connections: Optional[int] = None,
+        pool_maxsize: Optional[int] = None,
+        pool_block: Optional[bool] = None,
+        cache: Optional[TTLCache] = None,
+        negative_cache: Optional[TTLCache] = None,
+        disk_cache: Optional["DiskCache"] = None,
+        coalesce: bool = True,
+        city_index: Optional["CityIndex"] = None,
+        rate_limiter: Optional["RateLimiter"] = None,
+        retry_policy: Optional["RetryPolicy"] = None,
+        circuit_breakers: Optional["CircuitBreakerRegistry"] = None,
+        latency: Optional[LatencyTracker] = None,
+        adaptive_timeouts: bool = False,
+        hedge_budget: Optional[HedgeBudget] = None,
+        transport: Optional["BaseAdapter"] = None,
+        metrics: Optional["RequestMetrics"] = None,
+    ):
         """
-        Inicializa el servicio y valida la configuración.
+        Inicializa el servicio, valida la configuración y crea la sesión HTTP.
         
         Al inicializar, se valida automáticamente que:
         - La API key de OpenWeatherMap esté configurada
@@ -52,6 +200,53 @@ class WeatherService:
             skip_validation (bool): Si es True, omite la validación de configuración.
                 Útil para tests unitarios donde se mockean las configuraciones.
                 Por defecto False.
+            session (Optional["requests.Session"]): Sesión HTTP a reutilizar. Si se
+                provee, el servicio no la cierra en close() porque no es dueño
+                de ella. Por defecto se crea una sesión propia.
+            pool_connections (Optional[int]): Pools de conexión por host.
+                Default: Config.POOL_CONNECTIONS.
+            pool_maxsize (Optional[int]): Conexiones keep-alive por host.
+                Default: Config.POOL_MAXSIZE.
+            pool_block (Optional[bool]): Esperar una conexión libre cuando el
+                pool está lleno. Default: Config.POOL_BLOCK.
+            cache (Optional[TTLCache]): Caché de respuestas a consultar antes de
+                ir a la red. Se puede compartir entre varios servicios. Por
+                defecto no se cachea.
+            negative_cache (Optional[TTLCache]): Caché de ciudades inexistentes
+                (404) con su propio TTL, normalmente más corto. Por defecto
+                no se cachean los errores.
+            disk_cache (Optional["DiskCache"]): Caché persistente compartida
+                entre procesos, consultada después de la caché en memoria.
+            coalesce (bool): Si es True (por defecto), las consultas
+                concurrentes de la misma ciudad comparten una sola petición
+                HTTP (single-flight).
+            city_index (Optional["CityIndex"]): Índice local nombre → ID. Si se
+                provee, los nombres se resuelven a ID antes de la consulta y
+                los desconocidos se rechazan sin tocar la red.
+            rate_limiter (Optional["RateLimiter"]): Limitador de tasa a respetar
+                antes de cada petición HTTP. Por defecto no se limita.
+            retry_policy (Optional["RetryPolicy"]): Reintentos con backoff ante
+                timeouts, errores de conexión y 5xx. Por defecto cada
+                petición se intenta una sola vez.
+            circuit_breakers (Optional["CircuitBreakerRegistry"]): Breakers por
+                host que cortan las consultas mientras la API está caída. Se
+                pueden compartir entre servicios. Por defecto no se usan.
+            latency (Optional[LatencyTracker]): Histogramas de latencia a
+                alimentar. Por defecto se crea uno propio.
+            adaptive_timeouts (bool): Si es True, los timeouts de connect y
+                read se derivan de la latencia observada en vez de usar
+                Config.TIMEOUT para ambos. Por defecto False.
+            hedge_budget (Optional[HedgeBudget]): Si se provee, una petición
+                que supera el p95 del endpoint se duplica (dentro del
+                presupuesto) y se usa la primera respuesta. Por defecto no
+                se hace hedging.
+            transport (Optional["BaseAdapter"]): Adaptador de transporte de
+                requests a montar en la sesión propia en lugar del
+                HTTPAdapter (por ejemplo RecordingAdapter o ReplayAdapter de
+                src/cassette.py). Se ignora si se inyecta `session`.
+            metrics (Optional["RequestMetrics"]): Instrumentación de las
+                fases de cada consulta, resultados, caché y reintentos (ver
+                src/metrics.py). Por defecto no se mide nada.
         
         Raises:
             ConfigurationException: Si la validación falla (API key faltante,
@@ -60,6 +255,129 @@ class WeatherService:
         if not skip_validation:
             Config.validate()
 
+        # Sesión propia vs. sesión inyectada: solo cerramos la que creamos.
+        # La propia se crea en el primer uso (ver la propiedad session)
+        self._owns_session = session is None
+        self._session = session
+        self._session_lock = threading.Lock()
+        self._transport = transport
+        self._pool_settings = (
+            pool_connections if pool_connections is not None else Config.POOL_CONNECTIONS,
+            pool_maxsize if pool_maxsize is not None else Config.POOL_MAXSIZE,
+            pool_block if pool_block is not None else Config.POOL_BLOCK,
+        )
+        self.cache = cache
+        self.negative_cache = negative_cache
+        self.disk_cache = disk_cache
+        self._flights = SingleFlight() if coalesce else None
+        self.city_index = city_index
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.circuit_breakers = circuit_breakers
+        self.latency = latency if latency is not None else LatencyTracker.from_config()
+        self.adaptive_timeouts = adaptive_timeouts
+        self.hedge_budget = hedge_budget
+        self.metrics = metrics
+        # Pool para las peticiones con hedging (se crea en el primer uso)
+        self._hedge_executor: Optional["ThreadPoolExecutor"] = None
+        self._hedge_lock = threading.Lock()
+        self._hedge_workers = 2 * (pool_maxsize or Config.POOL_MAXSIZE)
+
+        # Refrescos stale-while-revalidate en curso (uno por clave)
+        self._refresh_lock = threading.Lock()
+        self._refreshing: Set[str] = set()
+        self._refresh_threads: List[threading.Thread] = []
+
+    @property
+    def session(self) -> "requests.Session":
+        """
+        Sesión HTTP del servicio, creada en el primer uso.
+
+        Crearla recién aquí evita importar requests (la dependencia más
+        pesada del CLI) en las invocaciones que no llegan a la red.
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    transport = self._transport
+                    if transport is None and self.metrics is not None:
+                        # Adaptador que además mide el connect de cada conexión
+                        transport = self.metrics.http_adapter(*self._pool_settings)
+                    self._session = self._build_session(*self._pool_settings, transport=transport)
+        return self._session
+
+    @staticmethod
+    def _build_session(
+        pool_connections: int,
+        pool_maxsize: int,
+        pool_block: bool,
+        transport: Optional["BaseAdapter"] = None,
+    ) -> "requests.Session":
+        """
+        Crea una sesión HTTP con un pool de conexiones keep-alive dimensionado.
+
+        requests.Session ya mantiene las conexiones abiertas (keep-alive) entre
+        peticiones; el HTTPAdapter montado define cuántas conexiones por host se
+        conservan en el pool para reutilizarse desde varios hilos.
+
+        Args:
+            pool_connections (int): Cantidad de pools (hosts) a cachear.
+            pool_maxsize (int): Máximo de conexiones reutilizables por host.
+            pool_block (bool): Si es True, espera una conexión libre en vez de
+                abrir conexiones descartables cuando el pool está lleno.
+            transport (Optional["BaseAdapter"]): Adaptador ya armado a montar
+                en lugar del HTTPAdapter (el pool lo configura quien lo crea).
+
+        Returns:
+            requests.Session: Sesión lista para usar con el adapter montado.
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = transport or HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def close(self) -> None:
+        """
+        Cierra la sesión HTTP, libera las conexiones del pool y cierra la
+        conexión a la caché en disco.
+
+        Antes espera a que terminen los refrescos en segundo plano para no
+        cerrar la sesión con peticiones en curso. Solo cierra la sesión si
+        fue creada por el servicio; una sesión inyectada sigue siendo
+        responsabilidad de quien la creó. La caché en disco reabre su
+        conexión si se vuelve a usar. Es seguro llamarlo más de una vez.
+        """
+        for thread in self._refresh_threads:
+            thread.join()
+        self._refresh_threads.clear()
+
+        # Las peticiones perdedoras del hedging terminan antes de cerrar
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=True)
+            self._hedge_executor = None
+
+        if self._owns_session and self._session is not None:
+            self._session.close()
+
+        if self.disk_cache is not None:
+            self.disk_cache.close()
+
+    def __enter__(self) -> "WeatherService":
+        """Permite usar el servicio como context manager (with)."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Cierra la sesión al salir del bloque with."""
+        self.close()
+
     def get_weather(self, city: str) -> Dict[str, Any]:
         """
         Obtiene la información del clima para una ciudad específica desde OpenWeatherMap.
@@ -86,8 +404,13 @@ class WeatherService:
             ValueError: Si el nombre de la ciudad está vacío o es solo espacios.
             CityNotFoundException: Si la API retorna 404 (ciudad no encontrada).
             InvalidAPIKeyException: Si la API retorna 401 (API key inválida).
+            RateLimitException: Si la API retorna 429 o el limitador del
+                cliente no consigue cuota dentro de RATE_LIMIT_MAX_WAIT.
+            ServerErrorException: Si la API retorna 5xx (tras agotar los
+                reintentos, si hay política de reintentos).
             NetworkException: Si hay timeout, error de conexión, o problemas de red.
-            WeatherAPIException: Para otros errores HTTP (500, etc.) o errores
+            CircuitOpenException: Si el circuit breaker del host está abierto.
+            WeatherAPIException: Para otros errores HTTP o errores
                 inesperados de la API.
         
         Example:
@@ -101,6 +424,85 @@ class WeatherService:
         Note:
             El timeout por defecto es 10 segundos (configurable vía REQUEST_TIMEOUT
             en .env). Las temperaturas se retornan en Celsius (units=metric).
+            Si el servicio tiene caché, una respuesta vigente para la misma
+            ciudad, idioma y unidades se devuelve sin hacer la petición HTTP.
+            Con caché en disco y ventana stale, una respuesta vencida se
+            devuelve de inmediato y se refresca en segundo plano.
+            Las consultas concurrentes de la misma ciudad comparten una sola
+            petición HTTP (y su resultado o excepción).
+            Con índice de ciudades, un nombre desconocido lanza
+            CityNotFoundException sin hacer ninguna petición HTTP. Lo mismo
+            ocurre con caché negativa para ciudades que ya dieron 404.
+        """
+        if self.metrics is not None:
+            return self.metrics.track(self._get_weather, city)
+        return self._get_weather(city)
+
+    def _get_weather(self, city: str) -> Dict[str, Any]:
+        """Implementación de get_weather() (sin contar el resultado)."""
+        city, cache_key = self._check_city(city)
+
+        # Responder desde la caché si hay una respuesta vigente
+        cached = self._get_cached_body(city, cache_key)
+        if cached is not None:
+            return fast_json.loads(cached)
+
+        body, data, shared = self._fetch_coalesced(city, cache_key)
+        # Cada llamador que esperó recibe su propio diccionario para que
+        # modificarlo no afecte a los demás (decodificar es más barato que
+        # deepcopy)
+        return fast_json.loads(body) if shared else data
+
+    def get_reading(self, city: str) -> LazyReading:
+        """
+        Obtiene el clima de una ciudad como lectura perezosa sobre el cuerpo crudo.
+
+        A diferencia de get_weather(), un acierto de caché (memoria o disco)
+        no se decodifica: la lectura guarda los bytes tal como están en la
+        caché y los decodifica recién cuando se accede a un campo. Conviene
+        cuando se consultan muchas ciudades y solo se leen algunas lecturas
+        o unos pocos campos.
+
+        Args:
+            city (str): Nombre de la ciudad a consultar.
+
+        Returns:
+            LazyReading: Lectura con la misma interfaz que WeatherReading;
+                reading.raw son los bytes de la respuesta, listos para
+                guardarse en una caché sin volver a serializar.
+
+        Raises:
+            Las mismas excepciones que get_weather(). Un cuerpo inválido o
+            incompleto lanza WeatherAPIException al acceder al primer campo.
+
+        Example:
+            >>> reading = service.get_reading("Madrid")
+            >>> reading.temperature   # decodifica en este momento
+            18.3
+        """
+        if self.metrics is not None:
+            return self.metrics.track(self._get_reading, city)
+        return self._get_reading(city)
+
+    def _get_reading(self, city: str) -> LazyReading:
+        """Implementación de get_reading() (sin contar el resultado)."""
+        city, cache_key = self._check_city(city)
+
+        body = self._get_cached_body(city, cache_key)
+        if body is None:
+            body, _, _ = self._fetch_coalesced(city, cache_key)
+        return LazyReading(body)
+
+    def _check_city(self, city: str) -> Tuple[str, str]:
+        """
+        Valida y limpia el nombre de la ciudad y descarta las inexistentes conocidas.
+
+        Returns:
+            Tuple[str, str]: Ciudad sin espacios y su clave de caché.
+
+        Raises:
+            ValueError: Si el nombre está vacío o es solo espacios.
+            CityNotFoundException: Si la caché negativa ya tiene la ciudad.
         """
         # Validar que el nombre de la ciudad no esté vacío
         if not city or not city.strip():
@@ -108,37 +510,463 @@ class WeatherService:
 
         # Limpiar espacios en blanco del nombre de la ciudad
         city = city.strip()
-        
+
+        # Rechazar sin red las ciudades que la API ya informó como inexistentes
+        cache_key = make_cache_key(city)
+        if self._is_known_not_found(cache_key):
+            raise CityNotFoundException(city)
+        return city, cache_key
+
+    def _fetch_coalesced(self, city: str, cache_key: str) -> Tuple[bytes, Dict[str, Any], bool]:
+        """
+        Consulta la API compartiendo la petición con consultas concurrentes.
+
+        Las llamadas simultáneas con la misma clave (ciudad normalizada,
+        idioma y unidades) esperan a una única petición HTTP y reciben su
+        resultado o su excepción.
+
+        Returns:
+            Tuple[bytes, Dict[str, Any], bool]: Cuerpo crudo, respuesta
+                decodificada y si el resultado es compartido con otro
+                llamador (en ese caso el diccionario no se debe modificar).
+        """
+        if self._flights is None:
+            return (*self._fetch(city, cache_key), False)
+
+        (body, data), shared = self._flights.do(cache_key, lambda: self._fetch(city, cache_key))
+        return body, data, shared
+
+    def _get_cached_body(self, city: str, cache_key: str) -> Optional[bytes]:
+        """
+        Busca la respuesta en la caché en memoria y luego en la caché en disco.
+
+        Un acierto fresco en disco se copia a la caché en memoria. Un acierto
+        vencido (dentro de la ventana stale) se devuelve igual y dispara un
+        refresco en segundo plano (stale-while-revalidate).
+
+        Args:
+            city (str): Nombre de la ciudad ya limpio (para el refresco).
+            cache_key (str): Clave construida con make_cache_key().
+
+        Returns:
+            Optional[bytes]: Cuerpo JSON crudo, o None si no hay ninguna
+                entrada utilizable.
+        """
+        body = self._read_caches(city, cache_key)
+        if self.metrics is not None and (self.cache is not None or self.disk_cache is not None):
+            self.metrics.count_cache(body is not None)
+        return body
+
+    def _read_caches(self, city: str, cache_key: str) -> Optional[bytes]:
+        """Búsqueda de _get_cached_body() en memoria y en disco."""
+        if self.cache is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        if self.disk_cache is not None:
+            entry = self.disk_cache.get(cache_key)
+            if entry is not None:
+                if not entry.fresh:
+                    self._refresh_in_background(city, cache_key)
+                elif self.cache is not None:
+                    self.cache.set(cache_key, entry.body)
+                return entry.body
+
+        return None
+
+    def _store(self, cache_key: str, body: bytes, data: Dict[str, Any]) -> None:
+        """Guarda una respuesta exitosa en las cachés configuradas."""
+        if self.cache is not None:
+            self.cache.set(cache_key, body)
+        if self.disk_cache is not None:
+            self.disk_cache.set(cache_key, body, observed_at=data.get("dt"))
+
+    def _refresh_in_background(self, city: str, cache_key: str) -> None:
+        """
+        Refresca una entrada vencida en un hilo aparte (una vez por clave).
+
+        El hilo no es daemon: al terminar el CLI, el intérprete espera a que
+        el refresco se guarde en disco, así la próxima invocación encuentra
+        el dato fresco. Los errores del refresco se ignoran porque el
+        llamador ya recibió la respuesta vencida.
+        """
+        with self._refresh_lock:
+            if cache_key in self._refreshing:
+                return
+            self._refreshing.add(cache_key)
+
+        def refresh() -> None:
+            try:
+                self._fetch_coalesced(city, cache_key)
+            except Exception:  # noqa: BLE001 - se reintenta en la próxima lectura
+                pass
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(cache_key)
+
+        thread = threading.Thread(target=refresh, name=f"refresh-{cache_key}")
+        self._refresh_threads.append(thread)
+        thread.start()
+
+    def _fetch(self, city: str, cache_key: str) -> Tuple[bytes, Dict[str, Any]]:
+        """
+        Consulta la API por HTTP y guarda la respuesta exitosa en las cachés.
+
+        Args:
+            city (str): Nombre de la ciudad ya limpio.
+            cache_key (str): Clave construida con make_cache_key().
+
+        Returns:
+            Tuple[bytes, Dict[str, Any]]: Cuerpo crudo y respuesta JSON
+                completa de la API.
+
+        Raises:
+            WeatherAPIException: Si una respuesta 200 no es JSON válido.
+            Las mismas excepciones que get_weather() (salvo ValueError).
+        """
+        metrics = self.metrics
+
         # Construir URL completa con API key, idioma, y unidades métricas
-        url = Config.get_api_url(city)
+        if metrics is None:
+            url = self._build_url(city)
+        else:
+            url = metrics.call("url_build", self._build_url, city)
+        response = self._http_get(url)
+
+        # Éxito: retornar datos JSON de la API
+        if response.status_code == 200:
+            try:
+                if metrics is None:
+                    body, data = _read_json(response)
+                else:
+                    body, data = metrics.call("json_decode", _read_json, response)
+            except ValueError as e:
+                # Un 200 con cuerpo que no es JSON válido
+                raise WeatherAPIException(f"Error al parsear los datos de la API: {str(e)}")
+            if self.cache is not None or self.disk_cache is not None:
+                self._store(cache_key, body, data)
+            return body, data
+
+        # Un 404 es determinístico: recordarlo para no repetir la consulta
+        if response.status_code == 404:
+            self._remember_not_found(cache_key)
+
+        # Cualquier otro código se traduce a la excepción correspondiente
+        raise_for_status(
+            response.status_code, response.text, city, retry_after=_retry_after(response)
+        )
+
+    def _is_known_not_found(self, cache_key: str) -> bool:
+        """Indica si la caché negativa (memoria o disco) tiene la ciudad como 404."""
+        if self.negative_cache is not None and self.negative_cache.get(cache_key) is not None:
+            return True
+        if self.disk_cache is not None and self.disk_cache.is_not_found(cache_key):
+            if self.negative_cache is not None:
+                self.negative_cache.set(cache_key, b"")
+            return True
+        return False
+
+    def _remember_not_found(self, cache_key: str) -> None:
+        """Registra una ciudad inexistente en las cachés negativas configuradas."""
+        if self.negative_cache is not None:
+            self.negative_cache.set(cache_key, b"")
+        if self.disk_cache is not None:
+            self.disk_cache.set_not_found(cache_key)
+
+    def cache_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Devuelve las estadísticas de todas las cachés del servicio.
 
+        Returns:
+            Dict[str, Dict[str, float]]: Estadísticas por caché configurada:
+                "memory" (respuestas), "negative" (ciudades inexistentes),
+                "disk" (persistente) y "coalescing" (single-flight).
+        """
+        stats: Dict[str, Dict[str, float]] = {}
+        if self.cache is not None:
+            stats["memory"] = self.cache.stats()
+        if self.negative_cache is not None:
+            stats["negative"] = self.negative_cache.stats()
+        if self.disk_cache is not None:
+            stats["disk"] = self.disk_cache.stats()
+        if self._flights is not None:
+            stats["coalescing"] = self._flights.stats()
+        return stats
+
+    def circuit_stats(self) -> Dict[str, Dict[str, object]]:
+        """
+        Devuelve el estado de los circuit breakers para monitoreo.
+
+        Returns:
+            Dict[str, Dict[str, object]]: Por host consultado: state
+                ("closed", "open" o "half_open"), consecutive_failures,
+                times_opened y rejected. Vacío si no hay circuit breakers.
+        """
+        if self.circuit_breakers is None:
+            return {}
+        return self.circuit_breakers.stats()
+
+    def rate_limit_stats(self) -> Dict[str, float]:
+        """
+        Devuelve el presupuesto del limitador de tasa para monitoreo.
+
+        Returns:
+            Dict[str, float]: per_minute y per_day configurados, y minute,
+                day y blocked_for de RateLimiter.remaining(). Vacío si no
+                hay limitador.
+        """
+        if self.rate_limiter is None:
+            return {}
+        return {
+            "per_minute": self.rate_limiter.per_minute,
+            "per_day": self.rate_limiter.per_day,
+            **self.rate_limiter.remaining(),
+        }
+
+    def latency_stats(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """
+        Devuelve los percentiles de latencia por endpoint y el uso del hedging.
+
+        Returns:
+            Dict[str, Dict[str, Optional[float]]]: Por endpoint: count, p50,
+                p95 y p99 en segundos; con hedging, además la clave
+                "hedging" con requests, hedged y wins.
+        """
+        stats = self.latency.stats()
+        if self.hedge_budget is not None:
+            stats["hedging"] = self.hedge_budget.stats()
+        return stats
+
+    def clear_cache(self, negative_only: bool = False) -> None:
+        """
+        Vacía las cachés del servicio (en memoria y en disco).
+
+        Args:
+            negative_only (bool): Si es True, solo olvida las ciudades
+                inexistentes (por ejemplo tras corregir un feed de entrada)
+                y conserva las respuestas exitosas.
+        """
+        if self.negative_cache is not None:
+            self.negative_cache.clear()
+        if self.disk_cache is not None:
+            self.disk_cache.clear_not_found()
+        if negative_only:
+            return
+        if self.cache is not None:
+            self.cache.clear()
+        if self.disk_cache is not None:
+            self.disk_cache.clear()
+
+    def _build_url(self, city: str) -> str:
+        """
+        Construye la URL de consulta, resolviendo el ID localmente si hay índice.
+
+        Con un índice de ciudades configurado, el nombre se traduce al ID
+        numérico (consulta `id=` sin ambigüedad) y un nombre desconocido se
+        rechaza sin hacer ninguna petición HTTP.
+
+        Args:
+            city (str): Nombre de la ciudad ya limpio.
+
+        Returns:
+            str: URL completa para el endpoint de clima.
+
+        Raises:
+            CityNotFoundException: Si hay índice y la ciudad no está en él.
+        """
+        if self.city_index is None:
+            return Config.get_api_url(city)
+
+        city_id = self.city_index.lookup(city)
+        if city_id is None:
+            raise CityNotFoundException(city)
+        return Config.get_api_url_by_id(city_id)
+
+    def _http_get(self, url: str) -> "requests.Response":
+        """
+        Realiza el GET HTTP con reintentos y circuit breaker por host.
+
+        Los timeouts, errores de conexión y respuestas 5xx cuentan como
+        fallas del host y se reintentan con backoff según la política del
+        servicio. Cualquier otra respuesta (200, 404, 401, 429) indica que
+        el host está sano y se devuelve sin reintentar.
+
+        Args:
+            url (str): URL completa a consultar.
+
+        Returns:
+            requests.Response: Respuesta HTTP (de cualquier código de estado).
+                Una respuesta 5xx se devuelve cuando se agotan los intentos.
+
+        Raises:
+            NetworkException: Si hay timeout, error de conexión u otro error
+                de la librería requests en el último intento.
+            CircuitOpenException: Si el circuito del host está abierto.
+            RateLimitException: Si el limitador no consigue cuota a tiempo.
+        """
+        policy = self.retry_policy
+        breaker = (
+            self.circuit_breakers.get(urlsplit(url).netloc)
+            if self.circuit_breakers is not None
+            else None
+        )
+
+        attempt = 0
+        while True:
+            attempt += 1
+            if breaker is not None:
+                # Falla rápido sin tocar la red si el host está caído
+                breaker.before_call()
+
+            try:
+                response = self._send_hedged(url)
+            except NetworkException:
+                if breaker is not None:
+                    breaker.record_failure()
+                if policy is None or not policy.should_retry(attempt):
+                    raise
+            except BaseException:
+                # Error ajeno al host (limitador, archivo de estado, etc.):
+                # no es éxito ni falla, pero la prueba de half-open no puede
+                # quedar reservada para siempre
+                if breaker is not None:
+                    breaker.release_probe()
+                raise
+            else:
+                server_error = 500 <= response.status_code < 600
+                if breaker is not None:
+                    if server_error:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                if (
+                    policy is None
+                    or not policy.is_retryable_status(response.status_code)
+                    or not policy.should_retry(attempt)
+                ):
+                    return response
+
+            # Falla transitoria con intentos restantes: esperar y reintentar
+            if self.metrics is not None:
+                self.metrics.count_retry()
+            policy.wait(attempt)
+
+    def _send_hedged(self, url: str) -> "requests.Response":
+        """
+        Realiza el GET duplicándolo si tarda más que el p95 del endpoint.
+
+        Sin presupuesto de hedging, o sin suficientes muestras de latencia,
+        equivale a _send(). Con hedging, la petición original corre en un
+        pool de hilos; si no respondió al llegar al p95 y el presupuesto lo
+        permite, se envía un duplicado y se devuelve la primera respuesta
+        que llegue. La perdedora no se puede cancelar: termina sola y su
+        conexión vuelve al pool.
+
+        Args:
+            url (str): URL completa a consultar.
+
+        Returns:
+            requests.Response: La primera respuesta obtenida.
+
+        Raises:
+            NetworkException: Si fallan la petición original y el duplicado.
+            RateLimitException: Si el limitador no consigue cuota a tiempo.
+        """
+        budget = self.hedge_budget
+        delay = budget and self.latency.percentile(urlsplit(url).path, 0.95)
+        if not delay:
+            return self._send(url)
+
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+        from concurrent.futures import TimeoutError as FutureTimeoutError
+
+        budget.record_request()
+        if self._hedge_executor is None:
+            with self._hedge_lock:
+                if self._hedge_executor is None:
+                    self._hedge_executor = ThreadPoolExecutor(
+                        max_workers=self._hedge_workers, thread_name_prefix="hedge"
+                    )
+
+        primary = self._hedge_executor.submit(self._send, url)
         try:
-            # Realizar petición GET con timeout configurado
-            response = requests.get(url, timeout=Config.TIMEOUT)
+            return primary.result(timeout=delay)
+        except FutureTimeoutError:
+            pass
 
-            # Manejo específico de códigos de estado HTTP
-            if response.status_code == 200:
-                # Éxito: retornar datos JSON de la API
-                return response.json()
+        if not budget.try_acquire():
+            return primary.result()
 
-            elif response.status_code == 404:
-                # Ciudad no encontrada en la base de datos de OpenWeatherMap
-                raise CityNotFoundException(city)
+        hedge = self._hedge_executor.submit(self._send, url)
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        budget.record_win()
+                    return future.result()
 
-            elif response.status_code == 401:
-                # API key inválida, expirada, o no autorizada
-                raise InvalidAPIKeyException()
+        # Fallaron las dos: propagar el error de la petición original
+        return primary.result()
 
+    def _send(self, url: str) -> "requests.Response":
+        """
+        Realiza un único GET HTTP traduciendo los errores de red a NetworkException.
+
+        Args:
+            url (str): URL completa a consultar.
+
+        Returns:
+            requests.Response: Respuesta HTTP (de cualquier código de estado).
+
+        Raises:
+            NetworkException: Si hay timeout, error de conexión u otro error
+                de la librería requests.
+            RateLimitException: Si el limitador no consigue cuota a tiempo.
+        """
+        # Esperar cuota en el limitador compartido antes de salir a la red
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
+        import requests
+
+        # Timeouts (connect, read) según la latencia observada del endpoint
+        endpoint = urlsplit(url).path
+        if self.adaptive_timeouts:
+            timeout = self.latency.timeouts(endpoint)
+            connect_timeout, read_timeout = timeout
+        else:
+            timeout = connect_timeout = read_timeout = Config.TIMEOUT
+
+        metrics = self.metrics
+        try:
+            # Realizar petición GET reutilizando las conexiones del pool
+            started = time.perf_counter()
+            if metrics is None:
+                response = self.session.get(url, timeout=timeout)
             else:
-                # Otros errores HTTP (500, 503, etc.)
-                raise WeatherAPIException(
-                    f"Error de la API: {response.status_code} - {response.text}"
-                )
+                # stream=True vuelve apenas llegan los headers: separa el
+                # tiempo hasta el primer byte de la lectura del cuerpo
+                response = self.session.get(url, timeout=timeout, stream=True)
+                headers_at = time.perf_counter()
+                response.content
+                metrics.observe_response(headers_at - started, time.perf_counter() - headers_at)
 
-        except requests.exceptions.Timeout:
-            # La API no respondió dentro del tiempo límite
+        except requests.exceptions.Timeout as e:
+            # La API no respondió dentro del tiempo límite. Se registra como
+            # muestra censurada para que el timeout adaptativo pueda crecer.
+            # Un connect agotado también cuenta como read_timeout: con el
+            # connect_timeout (más corto) una caída de conexiones achicaría
+            # el p99 y con él el read timeout
+            self.latency.record_timeout(endpoint, read_timeout)
+            if isinstance(e, requests.exceptions.ConnectTimeout):
+                raise NetworkException(
+                    f"Timeout al intentar conectar con la API (>{connect_timeout:g}s)"
+                )
             raise NetworkException(
-                f"Timeout al intentar conectar con la API (>{Config.TIMEOUT}s)"
+                f"Timeout esperando la respuesta de la API (>{read_timeout:g}s)"
             )
 
         except requests.exceptions.ConnectionError:
@@ -151,20 +979,143 @@ class WeatherService:
             # Otros errores de requests (SSL, redirect infinito, etc.)
             raise NetworkException(f"Error de red: {str(e)}")
 
-    def parse_weather_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        self.latency.record(endpoint, time.perf_counter() - started)
+
+        # Informar al limitador: un 429 bloquea a todos los procesos el
+        # tiempo del Retry-After (o con backoff adaptativo si no vino)
+        if self.rate_limiter is not None:
+            if response.status_code == 429:
+                self.rate_limiter.on_rate_limited(_retry_after(response))
+            else:
+                self.rate_limiter.on_success()
+
+        return response
+
+    def get_weather_many(
+        self, city_ids: Iterable[int], max_workers: Optional[int] = None
+    ) -> List["BatchResult"]:
+        """
+        Obtiene y parsea el clima de muchas ciudades por ID usando el endpoint group.
+
+        El endpoint /group devuelve hasta Config.GROUP_MAX_IDS ciudades por
+        petición, así que consultar N ciudades cuesta N/20 peticiones (y
+        cuota de la API) en vez de N. Los IDs se dividen en lotes, los lotes
+        se consultan en paralelo y la respuesta combinada se separa en un
+        resultado por ciudad.
+
+        Los fallos se informan por ciudad: un ID que no aparece en la
+        respuesta recibe CityNotFoundException, un registro mal formado
+        WeatherAPIException, y un error del lote completo (red, API key,
+        5xx) se asigna a cada ciudad de ese lote.
+
+        Args:
+            city_ids (Iterable[int]): IDs de ciudad de OpenWeatherMap (ver
+                city.list.json). Los duplicados se consultan una sola vez.
+            max_workers (Optional[int]): Lotes consultados en simultáneo.
+                Default: Config.BATCH_WORKERS.
+
+        Returns:
+            List[BatchResult]: Un resultado por ID en el orden de entrada, con
+                el ID (como str) en BatchResult.city y los datos parseados por
+                parse_weather_data() en BatchResult.data.
+
+        Raises:
+            ValueError: Si algún ID no es un entero positivo.
+
+        Example:
+            >>> results = service.get_weather_many([3435910, 3117735])
+            >>> [r.data["city"] for r in results]
+            ['Buenos Aires', 'Madrid']
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        ids = list(city_ids)
+        for city_id in ids:
+            if isinstance(city_id, bool) or not isinstance(city_id, int) or city_id <= 0:
+                raise ValueError(f"ID de ciudad inválido: {city_id!r}")
+
+        # Deduplicar preservando el orden y dividir en lotes del máximo permitido
+        unique_ids = list(dict.fromkeys(ids))
+        size = Config.GROUP_MAX_IDS
+        chunks = [unique_ids[i:i + size] for i in range(0, len(unique_ids), size)]
+
+        by_id: Dict[int, "BatchResult"] = {}
+        if chunks:
+            workers = min(len(chunks), max_workers or Config.BATCH_WORKERS)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for chunk_results in executor.map(self._fetch_group, chunks):
+                    by_id.update(chunk_results)
+
+        return [by_id[city_id] for city_id in ids]
+
+    def _fetch_group(self, chunk: List[int]) -> Dict[int, "BatchResult"]:
+        """
+        Consulta un lote de IDs en el endpoint group y separa la respuesta.
+
+        Args:
+            chunk (List[int]): Como máximo Config.GROUP_MAX_IDS IDs únicos.
+
+        Returns:
+            Dict[int, BatchResult]: Resultado de cada ID del lote.
+        """
+        from .batch import BatchResult
+
+        try:
+            response = self._http_get(Config.get_group_url(chunk))
+            if response.status_code != 200:
+                raise_for_status(
+                    response.status_code,
+                    response.text,
+                    ",".join(map(str, chunk)),
+                    retry_after=_retry_after(response),
+                )
+            _, payload = _read_json(response)
+            if not isinstance(payload, dict):
+                raise ValueError("se esperaba un objeto JSON")
+            items = payload.get("list", [])
+        except ValueError as e:
+            # Cuerpo que no es JSON válido: se trata como error del lote
+            error = WeatherAPIException(f"Error al parsear los datos de la API: {str(e)}")
+            return {city_id: BatchResult(str(city_id), None, error) for city_id in chunk}
+        except WeatherAPIException as e:
+            # El lote completo falló: cada ciudad recibe el mismo error
+            return {city_id: BatchResult(str(city_id), None, e) for city_id in chunk}
+
+        # Indexar los registros por ID para detectar los que faltan
+        records = {item.get("id"): item for item in items if isinstance(item, dict)}
+
+        results: Dict[int, "BatchResult"] = {}
+        for city_id in chunk:
+            record = records.get(city_id)
+            if record is None:
+                results[city_id] = BatchResult(
+                    str(city_id), None, CityNotFoundException(str(city_id))
+                )
+                continue
+            try:
+                results[city_id] = BatchResult(
+                    str(city_id), self.parse_weather_data(record), None
+                )
+            except WeatherAPIException as e:
+                results[city_id] = BatchResult(str(city_id), None, e)
+        return results
+
+    def parse_weather_data(self, data: Dict[str, Any]) -> WeatherReading:
         """
         Parsea y estructura los datos relevantes del clima desde el JSON de la API.
 
-        Extrae solo los campos necesarios del JSON completo de OpenWeatherMap,
-        transformándolos a un diccionario estructurado más simple y consistente.
-        También realiza pequeñas transformaciones como capitalizar la descripción.
+        Extrae solo los campos necesarios del JSON completo de OpenWeatherMap
+        en un WeatherReading: un registro compacto (__slots__) que se lee
+        igual que un diccionario. También realiza pequeñas transformaciones
+        como capitalizar la descripción.
 
         Args:
             data (Dict[str, Any]): Respuesta JSON completa de la API de OpenWeatherMap.
                 Debe contener las claves: name, sys, main, weather, wind, coord.
 
         Returns:
-            Dict[str, Any]: Diccionario con datos estructurados conteniendo:
+            WeatherReading: Lectura de solo lectura compatible con Mapping
+                (reading["city"] o reading.city) conteniendo:
                 - city (str): Nombre de la ciudad
                 - country (str): Código del país (AR, ES, US, etc.)
                 - temperature (float): Temperatura actual en Celsius
@@ -200,20 +1151,29 @@ class WeatherService:
             La descripción del clima se capitaliza automáticamente para mejor
             presentación (ej: "cielo claro" → "Cielo claro").
         """
+        if self.metrics is not None:
+            return self.metrics.call("parse", _parse_reading, data)
+        return _parse_reading(data)
+
+    def parse_weather_json(self, body: "fast_json.JSONInput") -> WeatherReading:
+        """
+        Parsea directamente el cuerpo crudo de una respuesta de la API.
+
+        Equivale a parse_weather_data(json.loads(body)) pero decodifica con
+        fast_json (orjson si está instalado) y extrae los campos con el
+        extractor precompilado, sin pasar por get_weather(). Pensado para
+        procesar en lote cuerpos ya guardados (caché en disco, archivos).
+
+        Args:
+            body (JSONInput): Cuerpo JSON de /data/2.5/weather en bytes o texto.
+
+        Returns:
+            WeatherReading: La misma lectura que devolvería parse_weather_data().
+
+        Raises:
+            WeatherAPIException: Si el cuerpo no es JSON válido o faltan campos.
+        """
         try:
-            return {
-                "city": data["name"],
-                "country": data["sys"]["country"],
-                "temperature": data["main"]["temp"],
-                "feels_like": data["main"]["feels_like"],
-                # Capitalizar primera letra de la descripción para mejor formato
-                "description": data["weather"][0]["description"].capitalize(),
-                "humidity": data["main"]["humidity"],
-                "pressure": data["main"]["pressure"],
-                "wind_speed": data["wind"]["speed"],
-                "latitude": data["coord"]["lat"],
-                "longitude": data["coord"]["lon"],
-            }
-        except (KeyError, IndexError) as e:
-            # Faltan campos esperados o estructura JSON inválida
+            return WeatherReading.from_json(body)
+        except (ValueError, KeyError, IndexError, TypeError) as e:
             raise WeatherAPIException(f"Error al parsear los datos de la API: {str(e)}")
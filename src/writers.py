@@ -0,0 +1,315 @@
+"""
+Escritores de resultados en streaming para el modo batch.
+
+WeatherFormatter arma un bloque decorado por ciudad pensado para una persona
+frente a la terminal. Para procesar la salida con otros programas (jq, una
+planilla, un pipeline) el modo batch puede escribir en formatos de máquina:
+
+    pretty  Bloques de WeatherFormatter (default). Sin emojis fuera de una TTY.
+    ndjson  Un objeto JSON por línea: {"city", "data", "error"}.
+    csv     Encabezado con los campos de WeatherReading más "error".
+    table   Tabla de texto plano con columnas de ancho fijo.
+
+Cada resultado se escribe apenas llega, pero los bytes se acumulan en un
+buffer propio y se vuelcan al stream binario en bloques de
+DEFAULT_BUFFER_SIZE: 100k resultados son unas pocas decenas de write() en
+lugar de un print() con flush por ciudad. Si la salida es una terminal se
+vuelca cada resultado para que el usuario los vea a medida que llegan.
+
+Example:
+    >>> with create_writer("ndjson", sys.stdout.buffer) as writer:
+    ...     for result in fetch_many(service, cities, workers=8):
+    ...         writer.write(result)
+"""
+
+import csv
+import io
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+from . import fast_json
+from .batch import BatchResult
+from .daemon import error_category
+from .models import FIELDS
+from .units import ms_to_kmh
+from .weather_formatter import WeatherFormatter
+
+# Formatos disponibles para --format
+FORMATS: Tuple[str, ...] = ("pretty", "ndjson", "csv", "table")
+
+# Bytes acumulados antes de escribir en el stream
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+
+class ResultWriter:
+    """
+    Base de los escritores: buffer propio, volcado por bloques y contadores.
+
+    Las subclases implementan _format_ok() y _format_error() (y
+    opcionalmente _header()) devolviendo bytes.
+
+    Attributes:
+        buffer_size (int): Bytes acumulados antes de escribir en el stream.
+        flush_each (bool): Si es True cada resultado se vuelca de inmediato.
+        written (int): Resultados escritos.
+        failures (int): Resultados con error.
+    """
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        flush_each: Optional[bool] = None,
+    ):
+        """
+        Inicializa el escritor sobre un stream binario.
+
+        Args:
+            stream (BinaryIO): Destino (sys.stdout.buffer o un archivo 'wb').
+                El escritor no lo cierra.
+            buffer_size (int): Bytes acumulados antes de escribir.
+            flush_each (Optional[bool]): Volcar cada resultado. Default: solo
+                si el stream es una terminal.
+        """
+        self._stream = stream
+        self._chunks: List[bytes] = []
+        self._pending = 0
+        self._started = False
+        self.buffer_size = buffer_size
+        self.flush_each = _isatty(stream) if flush_each is None else flush_each
+        self.written = 0
+        self.failures = 0
+
+    def write(self, result: BatchResult) -> None:
+        """
+        Agrega un resultado a la salida.
+
+        Args:
+            result (BatchResult): Resultado de una ciudad del batch.
+        """
+        if not self._started:
+            self._started = True
+            self._emit(self._header())
+
+        if result.ok:
+            chunk = self._format_ok(result)
+        else:
+            self.failures += 1
+            chunk = self._format_error(result)
+        self.written += 1
+        self._emit(chunk)
+        if self.flush_each:
+            self.flush()
+
+    def _emit(self, chunk: bytes) -> None:
+        """Acumula bytes y vuelca el buffer al superar buffer_size."""
+        if not chunk:
+            return
+        self._chunks.append(chunk)
+        self._pending += len(chunk)
+        if self._pending >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Escribe lo acumulado en el stream y lo vacía."""
+        if self._chunks:
+            self._stream.write(b"".join(self._chunks))
+            self._chunks.clear()
+            self._pending = 0
+        self._stream.flush()
+
+    def close(self) -> None:
+        """Vuelca lo pendiente (incluido el encabezado si no hubo resultados)."""
+        if not self._started:
+            self._started = True
+            self._emit(self._header())
+        self.flush()
+
+    def __enter__(self) -> "ResultWriter":
+        """Permite usar el escritor como context manager (with)."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Vuelca lo pendiente al salir del bloque with."""
+        self.close()
+
+    def _header(self) -> bytes:
+        """Bytes a escribir antes del primer resultado (ninguno por defecto)."""
+        return b""
+
+    def _format_ok(self, result: BatchResult) -> bytes:  # pragma: no cover - abstracto
+        """Bytes de un resultado exitoso."""
+        raise NotImplementedError
+
+    def _format_error(self, result: BatchResult) -> bytes:  # pragma: no cover - abstracto
+        """Bytes de un resultado con error."""
+        raise NotImplementedError
+
+
+class PrettyWriter(ResultWriter):
+    """Bloques de WeatherFormatter, como el modo batch de siempre."""
+
+    def __init__(self, stream: BinaryIO, emojis: Optional[bool] = None, **kwargs: Any):
+        """
+        Inicializa el escritor decidiendo si usar emojis.
+
+        Args:
+            stream (BinaryIO): Destino.
+            emojis (Optional[bool]): Incluir emojis. Default: solo si el
+                stream es una terminal.
+            **kwargs: buffer_size y flush_each de ResultWriter.
+        """
+        super().__init__(stream, **kwargs)
+        self.emojis = _isatty(stream) if emojis is None else emojis
+
+    def _format_ok(self, result: BatchResult) -> bytes:
+        return (WeatherFormatter.format_weather(result.data, emojis=self.emojis) + "\n").encode()
+
+    def _format_error(self, result: BatchResult) -> bytes:
+        message = WeatherFormatter.format_error(f"{result.city}: {result.error}", emojis=self.emojis)
+        return (message + "\n").encode()
+
+
+class NDJSONWriter(ResultWriter):
+    """
+    Un objeto JSON por línea.
+
+    Éxito: {"city": consulta, "data": {...campos de WeatherReading...}, "error": null}
+    Error: {"city": consulta, "data": null, "error": {"error": categoría, "message": "..."}}
+
+    Es el mismo formato que los resultados de /weather/batch del servidor.
+    """
+
+    def _format_ok(self, result: BatchResult) -> bytes:
+        record = {"city": result.city, "data": dict(result.data), "error": None}
+        return fast_json.dumps(record) + b"\n"
+
+    def _format_error(self, result: BatchResult) -> bytes:
+        record = {
+            "city": result.city,
+            "data": None,
+            "error": {"error": error_category(result.error), "message": str(result.error)},
+        }
+        return fast_json.dumps(record) + b"\n"
+
+
+class CSVWriter(ResultWriter):
+    """
+    CSV con encabezado: los campos de WeatherReading y una columna "error".
+
+    En las filas con error solo se completan city (la consulta) y error.
+    """
+
+    COLUMNS: Tuple[str, ...] = FIELDS + ("error",)
+
+    def __init__(self, stream: BinaryIO, **kwargs: Any):
+        """Inicializa el escritor con un csv.writer sobre un buffer de texto reutilizable."""
+        super().__init__(stream, **kwargs)
+        self._text = io.StringIO()
+        self._csv = csv.writer(self._text, lineterminator="\n")
+
+    def _row(self, values: List[Any]) -> bytes:
+        """Serializa una fila con csv (comillas y escapes) y la codifica."""
+        self._csv.writerow(values)
+        row = self._text.getvalue()
+        self._text.seek(0)
+        self._text.truncate()
+        return row.encode()
+
+    def _header(self) -> bytes:
+        return self._row(list(self.COLUMNS))
+
+    def _format_ok(self, result: BatchResult) -> bytes:
+        data = result.data
+        return self._row([data[name] for name in FIELDS] + [""])
+
+    def _format_error(self, result: BatchResult) -> bytes:
+        return self._row([result.city] + [""] * (len(FIELDS) - 1) + [str(result.error)])
+
+
+class TableWriter(ResultWriter):
+    """
+    Tabla de texto plano con columnas de ancho fijo.
+
+    Los anchos son fijos (no se conocen todos los resultados de antemano);
+    un valor más largo corre el resto de la fila en vez de truncarse.
+    """
+
+    # (título, campo, ancho, alineado a la derecha)
+    COLUMNS: Tuple[Tuple[str, str, int, bool], ...] = (
+        ("Ciudad", "city", 22, False),
+        ("País", "country", 4, False),
+        ("Temp °C", "temperature", 8, True),
+        ("Sens °C", "feels_like", 8, True),
+        ("Hum %", "humidity", 6, True),
+        ("hPa", "pressure", 6, True),
+        ("Viento km/h", "wind_kmh", 12, True),
+        ("Condición", "description", 0, False),
+    )
+
+    def _line(self, values: Dict[str, str]) -> bytes:
+        """Arma una línea alineando cada columna a su ancho."""
+        cells = []
+        for _, name, width, right in self.COLUMNS:
+            value = values.get(name, "")
+            cells.append(value.rjust(width) if right else value.ljust(width))
+        return ("  ".join(cells).rstrip() + "\n").encode()
+
+    def _header(self) -> bytes:
+        titles = {name: title for title, name, _, _ in self.COLUMNS}
+        rule = {name: "-" * max(width, len(title)) for title, name, width, _ in self.COLUMNS}
+        return self._line(titles) + self._line(rule)
+
+    def _format_ok(self, result: BatchResult) -> bytes:
+        data = result.data
+        return self._line({
+            "city": str(data["city"]),
+            "country": str(data["country"]),
+            "temperature": f"{data['temperature']:.1f}",
+            "feels_like": f"{data['feels_like']:.1f}",
+            "humidity": str(data["humidity"]),
+            "pressure": str(data["pressure"]),
+            "wind_kmh": f"{ms_to_kmh(data['wind_speed']):.1f}",
+            "description": str(data["description"]),
+        })
+
+    def _format_error(self, result: BatchResult) -> bytes:
+        return self._line({"city": result.city, "description": f"ERROR: {result.error}"})
+
+
+_WRITERS = {
+    "pretty": PrettyWriter,
+    "ndjson": NDJSONWriter,
+    "csv": CSVWriter,
+    "table": TableWriter,
+}
+
+
+def create_writer(output_format: str, stream: BinaryIO, **kwargs: Any) -> ResultWriter:
+    """
+    Crea el escritor de un formato.
+
+    Args:
+        output_format (str): Uno de FORMATS.
+        stream (BinaryIO): Destino binario.
+        **kwargs: Opciones del escritor (buffer_size, flush_each, emojis
+            para "pretty").
+
+    Returns:
+        ResultWriter: Escritor listo para usar (con `with`).
+
+    Raises:
+        ValueError: Si el formato no existe.
+    """
+    try:
+        writer_class = _WRITERS[output_format]
+    except KeyError:
+        raise ValueError(f"Formato de salida desconocido: {output_format!r}")
+    return writer_class(stream, **kwargs)
+
+
+def _isatty(stream: Any) -> bool:
+    """Indica si el stream es una terminal (False si no se puede saber)."""
+    try:
+        return bool(stream.isatty())
+    except (AttributeError, ValueError, OSError):
+        return False
@@ -0,0 +1,139 @@
+"""Servidor HTTP local que imita el endpoint de clima de OpenWeatherMap."""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from tests.fixtures.api_responses import (
+    get_madrid_response,
+    get_not_found_response,
+    get_successful_response,
+    get_unauthorized_response,
+)
+
+# Respuesta de los errores inyectados con error_rate
+INJECTED_ERROR = (500, {"cod": 500, "message": "Internal Server Error"})
+
+
+def default_routes() -> Dict[str, Tuple[int, Any]]:
+    """Rutas por defecto: ciudad consultada -> (status HTTP, cuerpo JSON)."""
+    return {
+        "Buenos Aires": (200, get_successful_response()),
+        "Madrid": (200, get_madrid_response()),
+        "Atlantis": (404, get_not_found_response()),
+        "ClaveInvalida": (401, get_unauthorized_response()),
+        "Caida": INJECTED_ERROR,
+    }
+
+
+class StubWeatherServer:
+    """
+    Servidor en un hilo aparte que responde según el parámetro q de la URL.
+
+    Las ciudades que no están en routes responden 404. Cuenta las peticiones
+    recibidas en request_count para verificar coalescing, caché, etc.
+
+    Para benchmarks se puede simular una API lenta o inestable: cada
+    respuesta se demora latency ± jitter segundos y una fracción error_rate
+    de las peticiones responde 500. Los cuerpos se serializan una sola vez
+    para que el servidor no sea el cuello de botella de la medición.
+    """
+
+    def __init__(
+        self,
+        routes: Dict[str, Tuple[int, Any]] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        """
+        Crea el servidor en un puerto libre de localhost (sin iniciarlo).
+
+        Args:
+            routes (Dict[str, Tuple[int, Any]]): Ciudad -> (status, cuerpo JSON).
+                Default: default_routes().
+            latency (float): Demora media de cada respuesta en segundos.
+            jitter (float): Variación máxima (uniforme) sumada o restada a la
+                demora, en segundos.
+            error_rate (float): Fracción de peticiones (0 a 1) que responden 500.
+            seed (Optional[int]): Semilla para que demoras y errores sean
+                reproducibles.
+        """
+        if not 0.0 <= error_rate <= 1.0:
+            raise ValueError("error_rate debe estar entre 0 y 1")
+
+        self.routes = routes if routes is not None else default_routes()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive como la API real: cada respuesta lleva Content-Length.
+            # Sin Nagle, encabezados y cuerpo (dos write) no esperan el ACK
+            # diferido del cliente (~40 ms por respuesta)
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query)
+                status, payload = stub._respond(query.get("q", [""])[0])
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._payloads: Dict[str, Tuple[int, bytes]] = {}
+        self._not_found = json.dumps(get_not_found_response()).encode("utf-8")
+        self._error = json.dumps(INJECTED_ERROR[1]).encode("utf-8")
+
+    def _respond(self, city: str) -> Tuple[int, bytes]:
+        """Decide status y cuerpo de una petición aplicando demora y errores."""
+        with self._lock:
+            self.request_count += 1
+            delay = self.latency + self._random.uniform(-self.jitter, self.jitter)
+            failed = self.error_rate and self._random.random() < self.error_rate
+            cached = self._payloads.get(city)
+        if delay > 0:
+            time.sleep(delay)
+        if failed:
+            return INJECTED_ERROR[0], self._error
+        if cached is not None:
+            return cached
+        if city not in self.routes:
+            return 404, self._not_found
+        status, body = self.routes[city]
+        cached = (status, json.dumps(body).encode("utf-8"))
+        with self._lock:
+            self._payloads[city] = cached
+        return cached
+
+    @property
+    def base_url(self) -> str:
+        """URL a usar como Config.BASE_URL para apuntar a este servidor."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/data/2.5/weather"
+
+    def __enter__(self) -> "StubWeatherServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
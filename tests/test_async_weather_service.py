@@ -0,0 +1,102 @@
+"""Tests para el cliente asíncrono AsyncWeatherService."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from src.async_weather_service import AsyncWeatherService
+from src.exceptions import (
+    CityNotFoundException,
+    ConfigurationException,
+    InvalidAPIKeyException,
+    NetworkException,
+    WeatherAPIException,
+)
+from src.weather_service import WeatherService
+from tests.fixtures.api_responses import get_successful_response
+from tests.fixtures.http_server import StubWeatherServer
+
+
+class TestAsyncWeatherService:
+    """Tests para la clase AsyncWeatherService."""
+
+    @pytest.fixture(autouse=True)
+    def setup_config(self, monkeypatch):
+        """Auto-fixture que configura el entorno para todos los tests."""
+        monkeypatch.setattr("src.async_weather_service.Config.API_KEY", "test_api_key")
+        monkeypatch.setattr("src.async_weather_service.Config.TIMEOUT", 5)
+
+    @pytest.fixture
+    def server(self, monkeypatch):
+        """Servidor local que imita OpenWeatherMap."""
+        with StubWeatherServer() as server:
+            monkeypatch.setattr("src.async_weather_service.Config.BASE_URL", server.base_url)
+            yield server
+
+    def run(self, coro_factory):
+        """Ejecuta una corrutina que recibe el servicio y lo cierra al final."""
+        async def runner():
+            async with AsyncWeatherService(skip_validation=True) as service:
+                return await coro_factory(service)
+        return asyncio.run(runner())
+
+    def test_get_weather_success(self, server):
+        """Verifica que get_weather() retorne el JSON de la API."""
+        result = self.run(lambda service: service.get_weather("Buenos Aires"))
+
+        assert result["name"] == "Buenos Aires"
+        assert result["cod"] == 200
+
+    def test_get_weather_raises_value_error_for_empty_city(self):
+        """Verifica que una ciudad vacía lance ValueError."""
+        with pytest.raises(ValueError):
+            self.run(lambda service: service.get_weather("  "))
+
+    @pytest.mark.parametrize(
+        "city, exception",
+        [
+            ("Atlantis", CityNotFoundException),
+            ("ClaveInvalida", InvalidAPIKeyException),
+            ("Caida", WeatherAPIException),
+        ],
+    )
+    def test_get_weather_raises_same_exceptions_as_sync_client(self, server, city, exception):
+        """Verifica que los errores HTTP se traduzcan igual que en WeatherService."""
+        with pytest.raises(exception):
+            self.run(lambda service: service.get_weather(city))
+
+    def test_get_weather_raises_network_exception_when_unreachable(self, monkeypatch):
+        """Verifica que un error de conexión lance NetworkException."""
+        monkeypatch.setattr(
+            "src.async_weather_service.Config.BASE_URL", "http://127.0.0.1:9/weather"
+        )
+
+        with pytest.raises(NetworkException):
+            self.run(lambda service: service.get_weather("Madrid"))
+
+    def test_parse_weather_data_matches_sync_client(self):
+        """Verifica que el parseo sea idéntico al del cliente síncrono."""
+        data = get_successful_response()
+
+        async_parsed = AsyncWeatherService(skip_validation=True).parse_weather_data(data)
+        sync_parsed = WeatherService(skip_validation=True).parse_weather_data(data)
+
+        assert async_parsed == sync_parsed
+
+    def test_get_many_reports_results_in_input_order(self, server):
+        """Verifica que get_many() devuelva un resultado por ciudad en orden."""
+        results = self.run(
+            lambda service: service.get_many(["Madrid", "Atlantis", "Buenos Aires"])
+        )
+
+        assert [r.city for r in results] == ["Madrid", "Atlantis", "Buenos Aires"]
+        assert results[0].data["city"] == "Madrid"
+        assert isinstance(results[1].error, CityNotFoundException)
+        assert results[2].ok
+
+    def test_invalid_max_concurrency_raises_configuration_exception(self):
+        """Verifica que una concurrencia menor a 1 sea rechazada."""
+        with pytest.raises(ConfigurationException):
+            AsyncWeatherService(skip_validation=True, max_concurrency=0)
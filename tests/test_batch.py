@@ -0,0 +1,84 @@
+"""Tests para el modo batch de consulta concurrente."""
+
+import io
+import threading
+
+import pytest
+from unittest.mock import Mock
+from src.batch import BatchResult, fetch_many, read_cities
+from src.exceptions import CityNotFoundException
+
+
+class TestReadCities:
+    """Tests para la lectura del archivo de ciudades."""
+
+    def test_read_cities_skips_blank_lines_and_comments(self):
+        """Verifica que se ignoren líneas vacías y comentarios."""
+        stream = io.StringIO("Madrid\n\n# comentario\n  Lima  \n")
+
+        assert list(read_cities(stream)) == ["Madrid", "Lima"]
+
+
+class TestFetchMany:
+    """Tests para fetch_many()."""
+
+    @pytest.fixture
+    def service(self):
+        """Servicio mock que parsea devolviendo el nombre de la ciudad."""
+        service = Mock()
+        service.get_weather.side_effect = lambda city: {"name": city}
+        service.parse_weather_data.side_effect = lambda data: {"city": data["name"]}
+        return service
+
+    def test_fetch_many_returns_one_result_per_city(self, service):
+        """Verifica que se obtenga un resultado por cada ciudad."""
+        results = list(fetch_many(service, ["Madrid", "Lima", "Quito"], max_workers=2))
+
+        assert sorted(r.city for r in results) == ["Lima", "Madrid", "Quito"]
+        assert all(r.ok for r in results)
+        assert {r.data["city"] for r in results} == {"Lima", "Madrid", "Quito"}
+
+    def test_fetch_many_reports_errors_per_city(self, service):
+        """Verifica que un error en una ciudad no corte el batch."""
+        def get_weather(city):
+            if city == "Atlantis":
+                raise CityNotFoundException(city)
+            return {"name": city}
+
+        service.get_weather.side_effect = get_weather
+
+        results = {r.city: r for r in fetch_many(service, ["Madrid", "Atlantis"])}
+
+        assert results["Madrid"].ok
+        assert not results["Atlantis"].ok
+        assert isinstance(results["Atlantis"].error, CityNotFoundException)
+
+    def test_fetch_many_limits_concurrency(self, service):
+        """Verifica que no haya más consultas simultáneas que max_workers."""
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def get_weather(city):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            threading.Event().wait(0.01)
+            with lock:
+                state["active"] -= 1
+            return {"name": city}
+
+        service.get_weather.side_effect = get_weather
+
+        list(fetch_many(service, (f"Ciudad {i}" for i in range(20)), max_workers=3))
+
+        assert state["peak"] <= 3
+
+    def test_fetch_many_rejects_invalid_worker_count(self, service):
+        """Verifica que max_workers < 1 lance ValueError."""
+        with pytest.raises(ValueError):
+            list(fetch_many(service, ["Madrid"], max_workers=0))
+
+    def test_batch_result_ok_property(self):
+        """Verifica que ok refleje la ausencia de error."""
+        assert BatchResult("Madrid", {}, None).ok
+        assert not BatchResult("Madrid", None, ValueError()).ok
@@ -0,0 +1,131 @@
+"""Tests para el paquete de benchmarks y el servidor local configurable."""
+
+import json
+import time
+
+import pytest
+import requests
+from benchmarks.stats import micro, summarize
+from benchmarks.suite import BenchmarkOptions, main, run_suite
+from tests.fixtures.http_server import StubWeatherServer
+
+# Corrida mínima: sin demora del servidor, una repetición y pocas iteraciones
+FAST = BenchmarkOptions(
+    requests=20, workers=4, latency_ms=0, jitter_ms=0, iterations=10, repeat=1, startup_runs=1
+)
+
+
+class TestStats:
+    """Tests para el resumen de mediciones."""
+
+    def test_summarize_reports_percentiles_in_ms(self):
+        """Verifica throughput y percentiles nearest-rank en milisegundos."""
+        latencies = [i / 1000 for i in range(1, 101)]
+
+        summary = summarize(latencies, elapsed=2.0, errors={"NetworkException": 3})
+
+        assert summary["requests"] == 100
+        assert summary["throughput_rps"] == 50.0
+        assert summary["error_count"] == 3
+        assert summary["latency_ms"]["p50"] == 50.0
+        assert summary["latency_ms"]["p99"] == 99.0
+        assert summary["latency_ms"]["max"] == 100.0
+
+    def test_summarize_without_samples(self):
+        """Verifica que un escenario sin consultas no falle."""
+        assert summarize([], elapsed=0.0, errors={})["latency_ms"]["p95"] is None
+
+    def test_micro_reports_cost_per_call(self):
+        """Verifica que micro() mida nanosegundos por llamada."""
+        result = micro(len, "abc", iterations=100, repeat=3)
+
+        assert result["best_ns"] <= result["median_ns"]
+        assert result["ops_per_s"] > 0
+        with pytest.raises(ValueError):
+            micro(len, "abc", iterations=0)
+
+
+class TestStubServer:
+    """Tests para la latencia y los errores simulados de StubWeatherServer."""
+
+    def test_latency_is_applied(self):
+        """Verifica que cada respuesta se demore al menos latency - jitter."""
+        with StubWeatherServer(latency=0.05, jitter=0.01, seed=1) as server:
+            start = time.perf_counter()
+            response = requests.get(server.base_url, params={"q": "Madrid"}, timeout=5)
+
+        assert response.status_code == 200
+        assert time.perf_counter() - start >= 0.04
+
+    def test_error_rate_injects_server_errors(self):
+        """Verifica que error_rate=1 haga responder 500 a todas las peticiones."""
+        with StubWeatherServer(error_rate=1.0) as server:
+            response = requests.get(server.base_url, params={"q": "Madrid"}, timeout=5)
+
+        assert response.status_code == 500
+
+    def test_rejects_invalid_error_rate(self):
+        """Verifica que una tasa de errores fuera de [0, 1] se rechace."""
+        with pytest.raises(ValueError):
+            StubWeatherServer(error_rate=1.5)
+
+
+class TestSuite:
+    """Tests para la ejecución de los escenarios."""
+
+    def test_run_suite_measures_every_scenario(self):
+        """Verifica que cada escenario produzca resultados serializables."""
+        document = run_suite(FAST)
+
+        results = document["results"]
+        assert json.loads(json.dumps(document)) == document
+        for name in ("single", "batch"):
+            assert results[name]["requests"] == 20
+            assert results[name]["error_count"] == 0
+            assert results[name]["latency_ms"]["p99"] is not None
+        assert results["parse"]["iterations"] == 10
+        assert results["format"]["best_ns"] > 0
+        assert "async" in results
+        assert results["pipeline"]["memory_peak_kb"] > 0
+        assert results["startup"]["startup_ms"]["p50"] > 0
+        assert len(results["startup"]["samples"]["startup_ms"]) == 1
+
+    def test_repetitions_keep_raw_samples(self):
+        """Verifica que cada repetición aporte muestras de latencia y throughput."""
+        options = BenchmarkOptions(
+            requests=6, workers=2, latency_ms=0, jitter_ms=0, iterations=1, repeat=3
+        )
+
+        result = run_suite(options, ["batch"])["results"]["batch"]
+
+        assert result["runs"] == 3
+        assert result["requests"] == 18
+        assert len(result["samples"]["latency_ms"]) == 18
+        assert len(result["samples"]["throughput_rps"]) == 3
+
+    def test_errors_are_counted_by_exception_class(self):
+        """Verifica que los 500 simulados se cuenten como ServerErrorException."""
+        options = BenchmarkOptions(
+            requests=5, workers=2, latency_ms=0, jitter_ms=0, error_rate=1.0, iterations=1,
+            repeat=1,
+        )
+
+        result = run_suite(options, ["single"])["results"]["single"]
+
+        assert result["errors"] == {"ServerErrorException": 5}
+
+    def test_main_writes_json_file(self, tmp_path):
+        """Verifica que la CLI escriba el JSON en --output."""
+        output = tmp_path / "resultados.json"
+
+        code = main([
+            "--scenarios", "parse,format", "--iterations", "10", "--output", str(output),
+        ])
+
+        assert code == 0
+        assert set(json.loads(output.read_text(encoding="utf-8"))["results"]) == {"parse", "format"}
+
+    def test_main_rejects_unknown_scenario(self, capsys):
+        """Verifica que un escenario desconocido termine con código 2."""
+        assert main(["--scenarios", "inexistente"]) == 2
+        assert "inexistente" in capsys.readouterr().err
@@ -0,0 +1,118 @@
+"""Tests para la caché en memoria TTL + LRU."""
+
+import pytest
+from src.cache import TTLCache, make_cache_key
+
+
+class FakeClock:
+    """Reloj manual para controlar la expiración en los tests."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestMakeCacheKey:
+    """Tests para make_cache_key()."""
+
+    def test_key_normalizes_case_and_whitespace(self):
+        """Verifica que variantes del mismo nombre compartan clave."""
+        assert make_cache_key("  Buenos   AIRES ", "es", "metric") == make_cache_key(
+            "buenos aires", "es", "metric"
+        )
+
+    def test_key_depends_on_lang_and_units(self):
+        """Verifica que idioma y unidades formen parte de la clave."""
+        assert make_cache_key("Madrid", "es", "metric") != make_cache_key("Madrid", "en", "metric")
+        assert make_cache_key("Madrid", "es", "metric") != make_cache_key("Madrid", "es", "imperial")
+
+
+class TestTTLCache:
+    """Tests para la clase TTLCache."""
+
+    @pytest.fixture
+    def clock(self):
+        """Reloj manual inyectado en la caché."""
+        return FakeClock()
+
+    def test_get_returns_stored_value_and_counts_hit(self, clock):
+        """Verifica que un valor guardado se recupere y cuente como hit."""
+        cache = TTLCache(ttl=60, clock=clock)
+        cache.set("madrid", b"{}")
+
+        assert cache.get("madrid") == b"{}"
+        assert cache.stats()["hits"] == 1
+
+    def test_get_missing_key_counts_miss(self, clock):
+        """Verifica que una clave inexistente cuente como miss."""
+        cache = TTLCache(ttl=60, clock=clock)
+
+        assert cache.get("lima") is None
+        assert cache.stats()["misses"] == 1
+
+    def test_entries_expire_after_ttl(self, clock):
+        """Verifica que las entradas expiren pasado el TTL."""
+        cache = TTLCache(ttl=60, clock=clock)
+        cache.set("madrid", b"{}")
+
+        clock.now = 60.0
+
+        assert cache.get("madrid") is None
+        assert cache.stats()["expirations"] == 1
+        assert len(cache) == 0
+
+    def test_lru_eviction_by_entry_count(self, clock):
+        """Verifica que se desaloje la entrada menos usada recientemente."""
+        cache = TTLCache(ttl=60, max_entries=2, clock=clock)
+        cache.set("a", b"1")
+        cache.set("b", b"2")
+        cache.get("a")  # "a" pasa a ser la más reciente
+        cache.set("c", b"3")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == b"1"
+        assert cache.stats()["evictions"] == 1
+
+    def test_lru_eviction_by_byte_budget(self, clock):
+        """Verifica que se respete el presupuesto en bytes."""
+        cache = TTLCache(ttl=60, max_bytes=10, clock=clock)
+        cache.set("a", b"12345")
+        cache.set("b", b"12345")
+        cache.set("c", b"12345")
+
+        assert cache.stats()["bytes"] == 10
+        assert cache.get("a") is None
+
+    def test_value_larger_than_budget_is_not_stored(self, clock):
+        """Verifica que un valor mayor al presupuesto no vacíe la caché."""
+        cache = TTLCache(ttl=60, max_bytes=4, clock=clock)
+        cache.set("a", b"123")
+        cache.set("b", b"123456")
+
+        assert cache.get("a") == b"123"
+        assert cache.get("b") is None
+
+    def test_hit_rate(self, clock):
+        """Verifica el cálculo de la tasa de aciertos."""
+        cache = TTLCache(ttl=60, clock=clock)
+        cache.set("a", b"1")
+        cache.get("a")
+        cache.get("b")
+
+        assert cache.stats()["hit_rate"] == 0.5
+
+    def test_clear_empties_cache(self, clock):
+        """Verifica que clear() elimine todas las entradas."""
+        cache = TTLCache(ttl=60, clock=clock)
+        cache.set("a", b"1")
+        cache.clear()
+
+        assert len(cache) == 0
+        assert cache.stats()["bytes"] == 0
+
+    def test_invalid_ttl_raises_value_error(self):
+        """Verifica que un TTL no positivo sea rechazado."""
+        with pytest.raises(ValueError):
+            TTLCache(ttl=0)
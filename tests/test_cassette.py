@@ -0,0 +1,273 @@
+"""Tests para la grabación y reproducción de tráfico HTTP (cassettes)."""
+
+import json
+import time
+
+import pytest
+from src.cassette import (
+    CassetteMissError,
+    RecordingAdapter,
+    ReplayAdapter,
+    load_cassette,
+    normalize_url,
+    transport_from_config,
+)
+from src.exceptions import (
+    CityNotFoundException,
+    ConfigurationException,
+    InvalidAPIKeyException,
+    NetworkException,
+    ServerErrorException,
+)
+from src.resilience import CircuitBreakerRegistry
+from src.weather_service import WeatherService
+from tests.fixtures.api_responses import get_madrid_response
+from tests.fixtures.http_server import StubWeatherServer
+
+BASE_URL = "http://api.test/data/2.5/weather"
+
+
+def write_cassette(path, interactions):
+    """Escribe un cassette a mano con las interacciones dadas."""
+    lines = [json.dumps({"cassette": 1})] + [json.dumps(entry) for entry in interactions]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def interaction(city, status=200, body=None, elapsed=0.0, **extra):
+    """Interacción grabada para la consulta de una ciudad."""
+    entry = {
+        "t": 0.0,
+        "method": "GET",
+        "url": normalize_url(f"{BASE_URL}?q={city}&lang=es&units=metric"),
+        "elapsed": elapsed,
+    }
+    if "error" not in extra:
+        entry.update(
+            status=status,
+            reason="OK",
+            headers={"Content-Type": "application/json; charset=utf-8"},
+            body=json.dumps(body if body is not None else {}),
+        )
+    entry.update(extra)
+    return entry
+
+
+@pytest.fixture(autouse=True)
+def api_config(monkeypatch):
+    """Config de la API apuntada a un host de prueba y sin idioma variable."""
+    monkeypatch.setattr("src.weather_service.Config.BASE_URL", BASE_URL)
+    monkeypatch.setattr("src.weather_service.Config.API_KEY", "clave_secreta")
+    monkeypatch.setattr("src.weather_service.Config.LANG", "es")
+
+
+class TestNormalizeUrl:
+    """Tests para la clave de búsqueda de las URLs."""
+
+    def test_removes_api_key_and_sorts_params(self):
+        """Verifica que la API key no participe de la clave ni quede grabada."""
+        url = "https://api.test/w?units=metric&appid=secreta&q=Madrid"
+
+        assert normalize_url(url) == "https://api.test/w?q=Madrid&units=metric"
+
+
+class TestRecordAndReplay:
+    """Tests de ida y vuelta contra el servidor local."""
+
+    def record(self, path, monkeypatch, cities):
+        """Graba las consultas de `cities` contra StubWeatherServer."""
+        with StubWeatherServer() as server:
+            monkeypatch.setattr("src.weather_service.Config.BASE_URL", server.base_url)
+            with WeatherService(skip_validation=True, transport=RecordingAdapter(str(path))) as service:
+                for city in cities:
+                    try:
+                        service.get_weather(city)
+                    except Exception:  # noqa: BLE001 - los errores también se graban
+                        pass
+            return server.base_url
+
+    @pytest.mark.parametrize("name", ["trafico.ndjson", "trafico.ndjson.gz"])
+    def test_replays_recorded_responses_without_network(self, tmp_path, monkeypatch, name):
+        """Verifica que la reproducción devuelva lo grabado con el servidor apagado."""
+        path = tmp_path / name
+        base_url = self.record(path, monkeypatch, ["Madrid"])
+
+        monkeypatch.setattr("src.weather_service.Config.BASE_URL", base_url)
+        with WeatherService(skip_validation=True, transport=ReplayAdapter(str(path))) as service:
+            data = service.get_weather("Madrid")
+
+        assert data == get_madrid_response()
+
+    def test_error_paths_are_identical(self, tmp_path, monkeypatch):
+        """Verifica que 404, 401 y 5xx lancen las mismas excepciones al reproducir."""
+        path = tmp_path / "errores.ndjson"
+        base_url = self.record(path, monkeypatch, ["Atlantis", "ClaveInvalida", "Caida"])
+
+        monkeypatch.setattr("src.weather_service.Config.BASE_URL", base_url)
+        with WeatherService(skip_validation=True, transport=ReplayAdapter(str(path))) as service:
+            with pytest.raises(CityNotFoundException):
+                service.get_weather("Atlantis")
+            with pytest.raises(InvalidAPIKeyException):
+                service.get_weather("ClaveInvalida")
+            with pytest.raises(ServerErrorException) as exc_info:
+                service.get_weather("Caida")
+
+        assert exc_info.value.status_code == 500
+
+    def test_cassette_does_not_contain_api_key(self, tmp_path, monkeypatch):
+        """Verifica que la API key no se escriba en el cassette."""
+        path = tmp_path / "trafico.ndjson"
+        self.record(path, monkeypatch, ["Madrid"])
+
+        text = path.read_text(encoding="utf-8")
+        entry = load_cassette(str(path))[0]
+
+        assert "clave_secreta" not in text
+        assert entry["status"] == 200
+        assert entry["elapsed"] >= 0
+        assert "Content-Length" not in entry["headers"]
+
+
+class TestReplayAdapter:
+    """Tests para la reproducción desde cassettes escritos a mano."""
+
+    def test_responses_for_same_url_rotate(self, tmp_path):
+        """Verifica que las respuestas de una URL se devuelvan en orden y en ciclo."""
+        path = tmp_path / "c.ndjson"
+        write_cassette(path, [
+            interaction("Madrid", body={"n": 1}),
+            interaction("Madrid", body={"n": 2}),
+        ])
+
+        with WeatherService(skip_validation=True, transport=ReplayAdapter(str(path))) as service:
+            values = [service.get_weather("Madrid")["n"] for _ in range(3)]
+
+        assert values == [1, 2, 1]
+
+    def test_original_timing_waits_recorded_latency(self, tmp_path):
+        """Verifica que el modo original respete la latencia grabada y wire no."""
+        path = tmp_path / "c.ndjson"
+        write_cassette(path, [interaction("Madrid", elapsed=0.05)])
+
+        timings = {}
+        for timing in ("wire", "original"):
+            adapter = ReplayAdapter(str(path), timing=timing)
+            with WeatherService(skip_validation=True, transport=adapter) as service:
+                started = time.perf_counter()
+                service.get_weather("Madrid")
+                timings[timing] = time.perf_counter() - started
+
+        assert timings["original"] >= 0.05
+        assert timings["wire"] < 0.05
+
+    def test_original_timing_paces_requests_by_recorded_offsets(self, tmp_path):
+        """Verifica que el modo original respete el espaciado grabado entre peticiones."""
+        path = tmp_path / "c.ndjson"
+        write_cassette(
+            path, [interaction("Madrid", t=10.0), interaction("Lima", t=10.1)]
+        )
+
+        adapter = ReplayAdapter(str(path), timing="original")
+        with WeatherService(skip_validation=True, transport=adapter) as service:
+            started = time.perf_counter()
+            service.get_weather("Madrid")
+            first = time.perf_counter() - started
+            service.get_weather("Lima")
+            second = time.perf_counter() - started
+
+        assert first < 0.05
+        assert second >= 0.1
+
+    def test_recorded_timeout_raises_network_exception(self, tmp_path):
+        """Verifica que un timeout grabado se reproduzca como NetworkException."""
+        path = tmp_path / "c.ndjson"
+        write_cassette(path, [interaction("Madrid", error="timeout")])
+
+        with WeatherService(skip_validation=True, transport=ReplayAdapter(str(path))) as service:
+            with pytest.raises(NetworkException, match="Timeout"):
+                service.get_weather("Madrid")
+
+    def test_unrecorded_request_fails_without_network(self, tmp_path):
+        """Verifica que una consulta sin grabar falle sin salir a la red ni reintentar."""
+        path = tmp_path / "c.ndjson"
+        write_cassette(path, [interaction("Madrid")])
+        adapter = ReplayAdapter(str(path))
+
+        with WeatherService(skip_validation=True, transport=adapter) as service:
+            with pytest.raises(CassetteMissError, match="Sin respuesta grabada"):
+                service.get_weather("Lima")
+
+        assert adapter.replayed == 0
+
+    def test_misses_do_not_open_the_circuit(self, tmp_path):
+        """Verifica que tras varias consultas sin grabar un 404 grabado siga siendo 404."""
+        path = tmp_path / "c.ndjson"
+        write_cassette(path, [interaction("Madrid", status=404, body={"cod": "404"})])
+        breakers = CircuitBreakerRegistry(failure_threshold=2, reset_timeout=60)
+
+        with WeatherService(
+            skip_validation=True, transport=ReplayAdapter(str(path)), circuit_breakers=breakers
+        ) as service:
+            for _ in range(3):
+                with pytest.raises(CassetteMissError):
+                    service.get_weather("Lima")
+            with pytest.raises(CityNotFoundException):
+                service.get_weather("Madrid")
+
+        assert service.circuit_stats()["api.test"]["state"] == "closed"
+
+    def test_rejects_invalid_cassettes(self, tmp_path):
+        """Verifica los errores de configuración al abrir un cassette."""
+        not_a_cassette = tmp_path / "otro.ndjson"
+        not_a_cassette.write_text('{"foo": 1}\n', encoding="utf-8")
+
+        with pytest.raises(ConfigurationException):
+            ReplayAdapter(str(tmp_path / "inexistente.ndjson"))
+        with pytest.raises(ConfigurationException, match="versión"):
+            ReplayAdapter(str(not_a_cassette))
+        with pytest.raises(ConfigurationException, match="reproducción"):
+            ReplayAdapter(str(not_a_cassette), timing="rapido")
+
+
+class TestTransportFromConfig:
+    """Tests para la creación del adaptador según CASSETTE_*."""
+
+    def test_disabled_by_default(self, monkeypatch):
+        """Verifica que sin CASSETTE_MODE se use la red real."""
+        monkeypatch.setattr("src.cassette.Config.CASSETTE_MODE", "")
+
+        assert transport_from_config() is None
+
+    def test_builds_adapter_for_each_mode(self, tmp_path, monkeypatch):
+        """Verifica el adaptador de cada modo y los errores de configuración."""
+        path = tmp_path / "c.ndjson"
+        write_cassette(path, [interaction("Madrid")])
+        monkeypatch.setattr("src.cassette.Config.CASSETTE_PATH", str(path))
+
+        monkeypatch.setattr("src.cassette.Config.CASSETTE_MODE", "replay")
+        assert isinstance(transport_from_config(), ReplayAdapter)
+        monkeypatch.setattr("src.cassette.Config.CASSETTE_MODE", "record")
+        assert isinstance(transport_from_config(), RecordingAdapter)
+
+        monkeypatch.setattr("src.cassette.Config.CASSETTE_MODE", "grabar")
+        with pytest.raises(ConfigurationException, match="CASSETTE_MODE"):
+            transport_from_config()
+        monkeypatch.setattr("src.cassette.Config.CASSETTE_PATH", None)
+        with pytest.raises(ConfigurationException, match="CASSETTE_PATH"):
+            transport_from_config()
+
+    def test_create_service_replays_without_rate_limiter(self, tmp_path, monkeypatch):
+        """Verifica que el CLI monte el cassette y no limite la tasa al reproducir."""
+        from src.main import create_service
+
+        path = tmp_path / "c.ndjson"
+        write_cassette(path, [interaction("Madrid", body=get_madrid_response())])
+        for module in ("src.main", "src.cassette"):
+            monkeypatch.setattr(f"{module}.Config.CASSETTE_MODE", "replay")
+            monkeypatch.setattr(f"{module}.Config.CASSETTE_PATH", str(path))
+        monkeypatch.setattr("src.main.Config.RATE_LIMIT_PER_MINUTE", 60)
+
+        with create_service(skip_validation=True, disk_cache=None) as service:
+            data = service.get_weather("Madrid")
+
+        assert service.rate_limiter is None
+        assert data == get_madrid_response()
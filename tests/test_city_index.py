@@ -0,0 +1,83 @@
+"""Tests para el índice offline de ciudades."""
+
+import gzip
+import json
+
+import pytest
+from src.city_index import CityIndex, build_index, build_index_from_file, main, normalize_city_name
+from src.exceptions import ConfigurationException
+
+CITY_LIST = [
+    {"id": 3435910, "name": "Buenos Aires", "country": "AR"},
+    {"id": 3117735, "name": "Madrid", "country": "ES"},
+    {"id": 3688689, "name": "Bogotá", "country": "CO"},
+    {"id": 2988507, "name": "Paris", "country": "FR"},
+    {"id": 4717560, "name": "Paris", "country": "US"},
+]
+
+
+class TestNormalizeCityName:
+    """Tests para normalize_city_name()."""
+
+    def test_removes_accents_case_and_extra_spaces(self):
+        """Verifica que se plieguen acentos, mayúsculas y espacios."""
+        assert normalize_city_name("  São   PAULO , BR ") == "sao paulo,br"
+
+
+class TestCityIndex:
+    """Tests para la clase CityIndex."""
+
+    @pytest.fixture
+    def index(self, tmp_path):
+        """Índice construido a partir de una lista de ciudades pequeña."""
+        path = tmp_path / "ciudades.idx"
+        build_index(CITY_LIST, str(path))
+        index = CityIndex.open(str(path))
+        yield index
+        index.close()
+
+    def test_lookup_by_name(self, index):
+        """Verifica la resolución de un nombre a su ID."""
+        assert index.lookup("Madrid") == 3117735
+
+    def test_lookup_is_accent_and_case_insensitive(self, index):
+        """Verifica que "BOGOTA" encuentre "Bogotá"."""
+        assert index.lookup("BOGOTA") == 3688689
+
+    def test_lookup_with_country_disambiguates(self, index):
+        """Verifica que el código de país desambigüe nombres repetidos."""
+        assert index.lookup("Paris") == 2988507  # primera de la lista
+        assert index.lookup("Paris, US") == 4717560
+
+    def test_lookup_unknown_city_returns_none(self, index):
+        """Verifica que un nombre desconocido devuelva None."""
+        assert index.lookup("Gotham") is None
+
+    def test_index_contains_name_and_name_country_keys(self, index):
+        """Verifica la cantidad de claves (nombre y nombre+país, sin duplicar)."""
+        # 5 ciudades * 2 claves, menos la clave "paris" repetida
+        assert len(index) == 9
+
+    def test_build_from_gzipped_city_list(self, tmp_path):
+        """Verifica la construcción desde city.list.json.gz."""
+        source = tmp_path / "city.list.json.gz"
+        with gzip.open(source, "wt", encoding="utf-8") as f:
+            json.dump(CITY_LIST, f)
+        output = tmp_path / "ciudades.idx"
+
+        assert main(["build", str(source), str(output)]) == 0
+        with CityIndex.open(str(output)) as index:
+            assert index.lookup("Buenos Aires, AR") == 3435910
+
+    def test_open_invalid_file_raises_configuration_exception(self, tmp_path):
+        """Verifica que un archivo que no es índice sea rechazado."""
+        path = tmp_path / "basura.idx"
+        path.write_bytes(b"no es un indice valido")
+
+        with pytest.raises(ConfigurationException):
+            CityIndex.open(str(path))
+
+    def test_open_missing_file_raises_configuration_exception(self, tmp_path):
+        """Verifica que un archivo inexistente sea un error de configuración."""
+        with pytest.raises(ConfigurationException):
+            CityIndex.open(str(tmp_path / "no_existe.idx"))
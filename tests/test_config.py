@@ -102,3 +102,36 @@ class TestConfig:
         assert src.config.Config.API_KEY == "env_key_123"
         assert src.config.Config.LANG == "en"
         assert src.config.Config.TIMEOUT == 20
+
+    def test_empty_xdg_cache_home_uses_home_cache(self, monkeypatch):
+        """Verifica que XDG_CACHE_HOME vacío no genere rutas relativas."""
+        monkeypatch.setenv("XDG_CACHE_HOME", "")
+        monkeypatch.delenv("DISK_CACHE_DIR", raising=False)
+        monkeypatch.delenv("RATE_LIMIT_STATE_FILE", raising=False)
+
+        from importlib import reload
+        import src.config
+        reload(src.config)
+
+        assert os.path.isabs(src.config.Config.DISK_CACHE_DIR)
+        assert os.path.isabs(src.config.Config.RATE_LIMIT_STATE_FILE)
+
+    def test_validate_raises_exception_when_pool_size_is_zero(self, monkeypatch):
+        """Verifica que validate() lance excepción si el pool está vacío."""
+        monkeypatch.setattr(Config, "API_KEY", "valid_key")
+        monkeypatch.setattr(Config, "POOL_MAXSIZE", 0)
+
+        with pytest.raises(ConfigurationException) as exc_info:
+            Config.validate()
+
+        assert "pool de conexiones" in str(exc_info.value)
+
+    def test_get_group_url_joins_ids(self, monkeypatch):
+        """Verifica que get_group_url() incluya los IDs separados por coma."""
+        monkeypatch.setattr(Config, "API_KEY", "test_key")
+
+        url = Config.get_group_url([3435910, 3117735])
+
+        assert url.startswith("https://api.openweathermap.org/data/2.5/group?")
+        assert "id=3435910,3117735" in url
+        assert "units=metric" in url
@@ -0,0 +1,126 @@
+"""Tests para el daemon residente y su cliente por socket Unix."""
+
+import socket
+import threading
+
+import pytest
+from unittest.mock import Mock
+from src.daemon import WeatherDaemon, query
+from src.exceptions import (
+    CityNotFoundException,
+    ConfigurationException,
+    NetworkException,
+)
+
+PARSED = {"city": "Madrid", "country": "ES", "temperature": 18.3}
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    """Ruta corta para el socket (los sockets Unix tienen límite de longitud)."""
+    return str(tmp_path / "w.sock")
+
+
+@pytest.fixture
+def service():
+    """Servicio falso que responde Madrid y rechaza el resto."""
+    mock = Mock()
+
+    def get_weather(city):
+        if city != "Madrid":
+            raise CityNotFoundException(city)
+        return {"name": "Madrid"}
+
+    mock.get_weather.side_effect = get_weather
+    mock.parse_weather_data.return_value = PARSED
+    return mock
+
+
+@pytest.fixture
+def running_daemon(service, socket_path):
+    """Daemon atendiendo en un hilo durante el test."""
+    daemon = WeatherDaemon(service, socket_path)
+    thread = threading.Thread(target=daemon.serve_forever)
+    thread.start()
+    yield daemon
+    daemon.shutdown()
+    thread.join()
+
+
+class TestWeatherDaemon:
+    """Tests de ida y vuelta entre cliente y daemon."""
+
+    def test_query_returns_parsed_data(self, running_daemon, socket_path):
+        """Verifica que el cliente reciba los datos parseados del daemon."""
+        assert query("Madrid", socket_path) == PARSED
+
+    def test_errors_are_rebuilt_as_domain_exceptions(self, running_daemon, socket_path):
+        """Verifica que un 404 en el daemon llegue como CityNotFoundException."""
+        with pytest.raises(CityNotFoundException) as exc_info:
+            query("Atlantis", socket_path)
+
+        assert exc_info.value.city_name == "Atlantis"
+
+    def test_network_errors_keep_their_message(self, running_daemon, service, socket_path):
+        """Verifica que los errores de red conserven el mensaje original."""
+        service.get_weather.side_effect = NetworkException("Timeout (>10s)")
+
+        with pytest.raises(NetworkException, match="Timeout"):
+            query("Madrid", socket_path)
+
+    def test_service_is_shared_between_connections(self, running_daemon, service, socket_path):
+        """Verifica que todas las conexiones usen el mismo servicio."""
+        for _ in range(3):
+            query("Madrid", socket_path)
+
+        assert service.get_weather.call_count == 3
+
+    def test_socket_is_removed_on_shutdown(self, service, socket_path):
+        """Verifica que al detenerse el daemon borre el socket."""
+        daemon = WeatherDaemon(service, socket_path)
+        daemon.close()
+
+        assert query("Madrid", socket_path) is None
+
+    def test_refuses_to_start_if_another_daemon_is_listening(
+        self, running_daemon, service, socket_path
+    ):
+        """Verifica que no se levanten dos daemons en el mismo socket."""
+        with pytest.raises(ConfigurationException):
+            WeatherDaemon(service, socket_path)
+
+    def test_replaces_stale_socket(self, service, socket_path):
+        """Verifica que un socket huérfano de un daemon caído se reemplace."""
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(socket_path)
+        stale.close()  # el archivo queda pero nadie escucha
+
+        daemon = WeatherDaemon(service, socket_path)
+        daemon.close()
+
+
+class TestQueryFallback:
+    """Tests del cliente cuando no hay daemon."""
+
+    def test_returns_none_without_socket(self, socket_path):
+        """Verifica que sin socket se indique consultar en el proceso."""
+        assert query("Madrid", socket_path) is None
+
+    def test_returns_none_when_nobody_listens(self, socket_path):
+        """Verifica que un socket sin daemon no lance error."""
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(socket_path)
+        stale.close()
+
+        assert query("Madrid", socket_path) is None
+
+    def test_unresponsive_daemon_raises_network_exception(self, socket_path):
+        """Verifica que un daemon vivo que no responde no se repita en el proceso."""
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(socket_path)
+        listener.listen(1)  # acepta en el backlog pero nunca contesta
+        try:
+            with pytest.raises(NetworkException, match="no respondió"):
+                query("Madrid", socket_path, timeout=0.1)
+        finally:
+            listener.close()
@@ -0,0 +1,146 @@
+"""Tests para la caché persistente en disco (SQLite)."""
+
+import pytest
+from src import disk_cache
+from src.disk_cache import DiskCache
+
+
+class FakeClock:
+    """Reloj manual (epoch) para controlar la frescura en los tests."""
+
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestDiskCache:
+    """Tests para la clase DiskCache."""
+
+    @pytest.fixture
+    def clock(self):
+        """Reloj manual inyectado en la caché."""
+        return FakeClock()
+
+    @pytest.fixture
+    def cache(self, tmp_path, clock):
+        """Caché con TTL de 60s y ventana stale de 120s."""
+        cache = DiskCache(str(tmp_path), ttl=60, stale_ttl=120, clock=clock)
+        yield cache
+        cache.close()
+
+    def test_set_and_get_fresh_entry(self, cache, clock):
+        """Verifica que una entrada recién guardada se lea como fresca."""
+        cache.set("madrid|es|metric", b'{"dt": 1}', observed_at=1)
+
+        entry = cache.get("madrid|es|metric")
+
+        assert entry.body == b'{"dt": 1}'
+        assert entry.observed_at == 1
+        assert entry.fetched_at == clock.now
+        assert entry.fresh
+
+    def test_entry_becomes_stale_after_ttl(self, cache, clock):
+        """Verifica que pasado el TTL la entrada se sirva como stale."""
+        cache.set("madrid|es|metric", b"{}")
+        clock.now += 90
+
+        entry = cache.get("madrid|es|metric")
+
+        assert entry is not None
+        assert not entry.fresh
+        assert cache.stats()["stale_hits"] == 1
+
+    def test_entry_is_discarded_after_stale_window(self, cache, clock):
+        """Verifica que pasada la ventana stale la entrada no se sirva."""
+        cache.set("madrid|es|metric", b"{}")
+        clock.now += 180
+
+        assert cache.get("madrid|es|metric") is None
+        assert cache.stats()["misses"] == 1
+
+    def test_entries_persist_across_instances(self, tmp_path, clock):
+        """Verifica que otra instancia (otro proceso) lea lo guardado."""
+        writer = DiskCache(str(tmp_path), ttl=60, clock=clock)
+        writer.set("lima|es|metric", b"{}")
+        writer.close()
+
+        reader = DiskCache(str(tmp_path), ttl=60, clock=clock)
+
+        assert reader.get("lima|es|metric").body == b"{}"
+        reader.close()
+
+    def test_purge_expired_removes_unservable_entries(self, cache, clock):
+        """Verifica que purge_expired() elimine solo las entradas inservibles."""
+        cache.set("vieja", b"{}")
+        clock.now += 200
+        cache.set("nueva", b"{}")
+
+        assert cache.purge_expired() == 1
+        assert cache.get("nueva") is not None
+
+    def test_opening_purges_expired_entries(self, tmp_path, clock):
+        """Verifica que abrir la caché elimine lo que ya no se puede servir."""
+        writer = DiskCache(str(tmp_path), ttl=60, clock=clock)
+        writer.set("vieja", b"{}")
+        writer.close()
+        clock.now += 60
+
+        reader = DiskCache(str(tmp_path), ttl=60, clock=clock)
+
+        assert reader._connection().execute("SELECT COUNT(*) FROM responses").fetchone()[0] == 0
+        reader.close()
+
+    def test_writes_purge_expired_entries_periodically(self, cache, clock, monkeypatch):
+        """Verifica que cada PURGE_EVERY escrituras se purguen las entradas vencidas."""
+        monkeypatch.setattr(disk_cache, "PURGE_EVERY", 3)
+        cache.set("vieja", b"{}")
+        clock.now += 200
+        cache.set("nueva", b"{}")
+        count = "SELECT COUNT(*) FROM responses"
+
+        assert cache._connection().execute(count).fetchone()[0] == 2
+        cache.set("otra", b"{}")
+        assert cache._connection().execute(count).fetchone()[0] == 2
+        assert cache.get("vieja") is None
+
+    def test_clear_removes_all_entries(self, cache):
+        """Verifica que clear() vacíe la caché."""
+        cache.set("madrid|es|metric", b"{}")
+        cache.clear()
+
+        assert cache.get("madrid|es|metric") is None
+
+    def test_invalid_ttl_raises_value_error(self, tmp_path):
+        """Verifica que un TTL no positivo sea rechazado."""
+        with pytest.raises(ValueError):
+            DiskCache(str(tmp_path), ttl=0)
+
+    def test_not_found_entries_expire_after_negative_ttl(self, tmp_path, clock):
+        """Verifica que los resultados negativos usen su propio TTL."""
+        cache = DiskCache(str(tmp_path), ttl=600, negative_ttl=30, clock=clock)
+        cache.set_not_found("atlantis|es|metric")
+
+        assert cache.is_not_found("atlantis|es|metric")
+        clock.now += 30
+        assert not cache.is_not_found("atlantis|es|metric")
+        cache.close()
+
+    def test_not_found_disabled_when_negative_ttl_is_zero(self, cache):
+        """Verifica que sin negative_ttl no se guarden resultados negativos."""
+        cache.set_not_found("atlantis|es|metric")
+
+        assert not cache.is_not_found("atlantis|es|metric")
+
+    def test_clear_not_found_keeps_positive_entries(self, tmp_path, clock):
+        """Verifica que clear_not_found() no borre las respuestas exitosas."""
+        cache = DiskCache(str(tmp_path), ttl=600, negative_ttl=30, clock=clock)
+        cache.set("madrid|es|metric", b"{}")
+        cache.set_not_found("atlantis|es|metric")
+
+        cache.clear_not_found()
+
+        assert not cache.is_not_found("atlantis|es|metric")
+        assert cache.get("madrid|es|metric") is not None
+        cache.close()
@@ -0,0 +1,73 @@
+"""Tests para la decodificación rápida de JSON y el extractor precompilado."""
+
+import json
+
+import pytest
+from src import fast_json
+from src.fast_json import FieldExtractor, loads
+from tests.fixtures.api_responses import get_madrid_response
+
+
+class TestLoads:
+    """Tests para loads()."""
+
+    def test_decodes_bytes_and_text(self):
+        """Verifica que loads() acepte bytes, bytearray, memoryview y str."""
+        body = b'{"name": "Madrid", "main": {"temp": 18.3}}'
+
+        assert loads(body) == json.loads(body)
+        assert loads(bytearray(body)) == json.loads(body)
+        assert loads(memoryview(body)) == json.loads(body)
+        assert loads(body.decode()) == json.loads(body)
+
+    def test_falls_back_to_stdlib_without_orjson(self, monkeypatch):
+        """Verifica que sin orjson se use json con el mismo resultado."""
+        monkeypatch.setattr(fast_json, "orjson", None)
+
+        assert loads(memoryview(b'{"a": [1, 2]}')) == {"a": [1, 2]}
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_invalid_json_raises_value_error(self, monkeypatch, use_orjson):
+        """Verifica que ambos backends lancen ValueError ante un cuerpo inválido."""
+        if not use_orjson:
+            monkeypatch.setattr(fast_json, "orjson", None)
+        elif fast_json.orjson is None:
+            pytest.skip("orjson no está instalado")
+
+        with pytest.raises(ValueError):
+            loads(b"<html>")
+
+
+class TestFieldExtractor:
+    """Tests para FieldExtractor."""
+
+    @pytest.fixture
+    def extractor(self):
+        """Extractor con campos anidados, índices de lista y prefijos compartidos."""
+        return FieldExtractor(["name", "main.temp", "main.humidity", "weather.0.description"])
+
+    def test_extracts_paths_in_order(self, extractor):
+        """Verifica que se devuelva un valor por ruta en el orden pedido."""
+        assert extractor(get_madrid_response()) == ("Madrid", 18.3, 72, "muy nuboso")
+
+    def test_missing_fields_raise_like_manual_indexing(self, extractor):
+        """Verifica que los errores sean los mismos que indexando a mano."""
+        with pytest.raises(KeyError):
+            extractor({"name": "Madrid", "weather": [{"description": "x"}]})
+        with pytest.raises(IndexError):
+            extractor({"name": "Madrid", "main": {"temp": 1, "humidity": 2}, "weather": []})
+        with pytest.raises(TypeError):
+            extractor({"name": "Madrid", "main": None})
+
+    def test_extract_many_decodes_raw_bodies(self, extractor):
+        """Verifica que extract_many() procese varios cuerpos crudos."""
+        bodies = [json.dumps(get_madrid_response()).encode()] * 3
+
+        assert list(extractor.extract_many(bodies)) == [("Madrid", 18.3, 72, "muy nuboso")] * 3
+
+    def test_rejects_empty_paths(self):
+        """Verifica que no se pueda crear un extractor sin rutas o con rutas vacías."""
+        with pytest.raises(ValueError):
+            FieldExtractor([])
+        with pytest.raises(ValueError):
+            FieldExtractor(["main", ""])
@@ -0,0 +1,132 @@
+"""Tests para los histogramas de latencia, timeouts adaptativos y hedging."""
+
+import pytest
+from src.latency import (
+    MIN_READ_TIMEOUT,
+    HedgeBudget,
+    LatencyHistogram,
+    LatencyTracker,
+    percentile,
+)
+
+ENDPOINT = "/data/2.5/weather"
+
+
+class TestLatencyHistogram:
+    """Tests para la clase LatencyHistogram."""
+
+    def test_percentiles_use_nearest_rank(self):
+        """Verifica el cálculo de percentiles sobre la ventana."""
+        histogram = LatencyHistogram(window=100)
+        for ms in range(1, 101):
+            histogram.record(ms / 1000)
+
+        assert histogram.percentile(0.50) == 0.050
+        assert histogram.percentile(0.95) == 0.095
+        assert histogram.percentile(0.99) == 0.099
+
+    def test_window_keeps_only_recent_samples(self):
+        """Verifica que las muestras viejas salgan de la ventana."""
+        histogram = LatencyHistogram(window=3)
+        for seconds in (5.0, 0.1, 0.1, 0.1):
+            histogram.record(seconds)
+
+        assert len(histogram) == 3
+        assert histogram.percentile(0.99) == 0.1
+
+    def test_empty_histogram_has_no_percentiles(self):
+        """Verifica que sin muestras el percentil sea None."""
+        assert LatencyHistogram().percentile(0.5) is None
+
+    def test_percentile_function_matches_histogram(self):
+        """Verifica que percentile() use el mismo nearest-rank sobre una lista ordenada."""
+        samples = [ms / 1000 for ms in range(1, 101)]
+
+        assert percentile(samples, 0.95) == 0.095
+        assert percentile(samples, 0.0) == 0.001
+        assert percentile([], 0.5) is None
+
+
+class TestLatencyTracker:
+    """Tests para la clase LatencyTracker."""
+
+    @pytest.fixture(autouse=True)
+    def setup_config(self, monkeypatch):
+        """Fija los topes de timeout de Config."""
+        monkeypatch.setattr("src.latency.Config.TIMEOUT", 10)
+        monkeypatch.setattr("src.latency.Config.CONNECT_TIMEOUT", 3.0)
+
+    def test_uses_config_until_min_samples(self):
+        """Verifica que sin muestras suficientes se usen los timeouts de Config."""
+        tracker = LatencyTracker(min_samples=5)
+        tracker.record(ENDPOINT, 0.2)
+
+        assert tracker.timeouts(ENDPOINT) == (3.0, 10)
+        assert tracker.percentile(ENDPOINT, 0.95) is None
+
+    def test_timeouts_follow_observed_latency(self):
+        """Verifica que los timeouts se deriven de p50 y p99."""
+        tracker = LatencyTracker(min_samples=5)
+        for _ in range(10):
+            tracker.record(ENDPOINT, 0.5)
+
+        assert tracker.timeouts(ENDPOINT) == (1.5, 1.5)
+
+    def test_timeouts_are_clamped(self):
+        """Verifica los pisos y los topes de los timeouts."""
+        fast, slow = LatencyTracker(min_samples=1), LatencyTracker(min_samples=1)
+        fast.record(ENDPOINT, 0.001)
+        slow.record(ENDPOINT, 8.0)
+
+        assert fast.timeouts(ENDPOINT)[1] == MIN_READ_TIMEOUT
+        assert slow.timeouts(ENDPOINT) == (3.0, 10)
+
+    def test_timeouts_grow_back_after_latency_step_up(self):
+        """Verifica que los timeouts registrados agranden un timeout ya achicado."""
+        tracker = LatencyTracker(window=100, min_samples=5)
+        for _ in range(100):
+            tracker.record(ENDPOINT, 0.1)
+        assert tracker.timeouts(ENDPOINT)[1] == MIN_READ_TIMEOUT
+
+        # La API pasa a tardar 5 s: cada petición se corta con el timeout vigente
+        reads = []
+        for _ in range(20):
+            read = tracker.timeouts(ENDPOINT)[1]
+            reads.append(read)
+            if read >= 5.0:
+                break
+            tracker.record_timeout(ENDPOINT, read)
+
+        assert reads[-1] >= 5.0
+        assert reads == sorted(reads)
+
+    def test_endpoints_are_tracked_separately(self):
+        """Verifica que cada endpoint tenga su propio histograma."""
+        tracker = LatencyTracker(min_samples=1)
+        tracker.record(ENDPOINT, 0.1)
+        tracker.record("/data/2.5/group", 0.4)
+
+        stats = tracker.stats()
+
+        assert stats[ENDPOINT]["p99"] == 0.1
+        assert stats["/data/2.5/group"] == {"count": 1, "p50": 0.4, "p95": 0.4, "p99": 0.4}
+
+
+class TestHedgeBudget:
+    """Tests para la clase HedgeBudget."""
+
+    def test_limits_hedges_to_ratio(self):
+        """Verifica que no se duplique más que la fracción permitida."""
+        budget = HedgeBudget(ratio=0.2)
+        for _ in range(10):
+            budget.record_request()
+
+        granted = [budget.try_acquire() for _ in range(3)]
+
+        assert granted == [True, True, False]
+        assert budget.stats() == {"requests": 10, "hedged": 2, "wins": 0}
+
+    def test_invalid_ratio_raises_value_error(self):
+        """Verifica que una fracción fuera de [0, 1] sea rechazada."""
+        with pytest.raises(ValueError):
+            HedgeBudget(ratio=1.5)
@@ -0,0 +1,165 @@
+"""Tests para el generador de carga."""
+
+import asyncio
+import random
+import time
+
+import pytest
+from src.exceptions import CityNotFoundException, NetworkException
+from src.loadtest import (
+    CityMix,
+    LoadTestOptions,
+    format_report,
+    run_async_load_test,
+    run_load_test,
+)
+
+# Corrida corta con muestreo frecuente para que haya serie temporal
+SHORT = dict(duration=0.3, concurrency=4, sample_interval=0.1, seed=7)
+
+
+def fake_call(city, hit):
+    """Consulta simulada: 1 ms de latencia y error para Atlantis y Desconectada."""
+    time.sleep(0.001)
+    if city == "Atlantis":
+        raise CityNotFoundException(city)
+    if city == "Desconectada":
+        raise NetworkException("Sin conexión")
+
+
+class TestCityMix:
+    """Tests para CityMix."""
+
+    def test_parses_weights_and_defaults_to_one(self):
+        """Verifica el formato 'Ciudad=peso' y el peso 1 por defecto."""
+        mix = CityMix.parse("Madrid=3, Buenos Aires ,Lima=0.5")
+
+        assert mix.cities == ("Madrid", "Buenos Aires", "Lima")
+        assert mix.weights == (3.0, 1.0, 0.5)
+
+    def test_parses_file(self, tmp_path):
+        """Verifica que '@archivo' lea una entrada por línea ignorando comentarios."""
+        path = tmp_path / "mezcla.txt"
+        path.write_text("# ciudades calientes\nMadrid=9\n\nLima\n", encoding="utf-8")
+
+        assert CityMix.parse(f"@{path}").cities == ("Madrid", "Lima")
+
+    @pytest.mark.parametrize("spec", ["", "Madrid=abc", "Madrid=0", "Lima=-1"])
+    def test_rejects_invalid_mix(self, spec):
+        """Verifica que mezclas vacías o con pesos inválidos se rechacen."""
+        with pytest.raises(ValueError):
+            CityMix.parse(spec)
+
+    def test_pick_respects_weights(self):
+        """Verifica que la ciudad más pesada se elija proporcionalmente más."""
+        mix = CityMix([("Madrid", 9), ("Lima", 1)])
+        rng = random.Random(1)
+
+        picks = [mix.pick(rng) for _ in range(2000)]
+
+        assert 0.85 < picks.count("Madrid") / len(picks) < 0.95
+
+
+class TestLoadTestOptions:
+    """Tests para la validación de LoadTestOptions."""
+
+    @pytest.mark.parametrize(
+        "overrides",
+        [
+            {"duration": 0},
+            {"concurrency": 0},
+            {"rate": 0},
+            {"cache_hit_ratio": 1.5},
+            {"sample_interval": 0},
+        ],
+    )
+    def test_rejects_out_of_range_values(self, overrides):
+        """Verifica que los valores fuera de rango lancen ValueError."""
+        with pytest.raises(ValueError):
+            LoadTestOptions(**overrides).validate()
+
+
+class TestRunLoadTest:
+    """Tests para run_load_test() y run_async_load_test()."""
+
+    def test_concurrency_mode_reports_latency_errors_and_resources(self):
+        """Verifica RPS, percentiles, errores por clase y serie de recursos."""
+        mix = CityMix([("Madrid", 2), ("Atlantis", 1), ("Desconectada", 1)])
+
+        report = run_load_test(fake_call, mix, LoadTestOptions(**SHORT))
+
+        assert report["mode"] == "concurrency"
+        assert report["requests"] > 0
+        assert report["achieved_rps"] > 0
+        assert report["latency_ms"]["p50"] >= 1.0
+        assert set(report["errors"]) == {"CityNotFoundException", "NetworkException"}
+        assert report["error_count"] == sum(report["errors"].values())
+        assert len(report["timeline"]) >= 2
+        assert report["rss_mb_peak"] > 0
+
+    def test_rate_mode_sends_the_requested_rate(self):
+        """Verifica que con --rate se envíen duración × tasa consultas."""
+        options = LoadTestOptions(duration=0.5, concurrency=4, rate=100, sample_interval=0.1)
+
+        report = run_load_test(fake_call, CityMix([("Madrid", 1)]), options)
+
+        assert report["mode"] == "rate"
+        assert report["requests"] == 50
+        assert report["error_count"] == 0
+
+    def test_rate_mode_includes_queueing_in_latency(self):
+        """Verifica que la latencia se mida desde el momento programado."""
+        def slow_call(city, hit):
+            time.sleep(0.02)
+
+        # Un solo trabajador a 100/s con consultas de 20 ms: la cola crece
+        options = LoadTestOptions(duration=0.2, concurrency=1, rate=100, sample_interval=0.1)
+
+        report = run_load_test(slow_call, CityMix([("Madrid", 1)]), options)
+
+        assert report["latency_ms"]["max"] > 100
+
+    def test_cache_hit_ratio_is_passed_to_each_call(self):
+        """Verifica que la fracción de aciertos pedida llegue a las consultas."""
+        hits = []
+
+        def call(city, hit):
+            hits.append(hit)
+
+        options = LoadTestOptions(duration=0.1, concurrency=1, rate=2000, cache_hit_ratio=0.25, seed=3)
+        run_load_test(call, CityMix([("Madrid", 1)]), options)
+
+        assert 0.15 < sum(hits) / len(hits) < 0.35
+
+    def test_async_load_test_runs_cleanup_in_the_loop(self):
+        """Verifica la carga asíncrona y que cleanup se espere al final."""
+        closed = []
+
+        async def call(city, hit):
+            await asyncio.sleep(0.001)
+            if city == "Atlantis":
+                raise CityNotFoundException(city)
+
+        async def cleanup():
+            closed.append(asyncio.get_running_loop())
+
+        mix = CityMix([("Madrid", 1), ("Atlantis", 1)])
+        report = run_async_load_test(call, mix, LoadTestOptions(**SHORT), cleanup=cleanup)
+
+        assert report["requests"] > 0
+        assert set(report["errors"]) == {"CityNotFoundException"}
+        assert len(closed) == 1
+
+    def test_format_report_shows_every_section(self):
+        """Verifica que el texto incluya resumen, latencias, errores y recursos."""
+        report = run_load_test(
+            fake_call, CityMix([("Madrid", 1), ("Atlantis", 1)]), LoadTestOptions(**SHORT)
+        )
+        report["target"] = "sync"
+
+        text = format_report(report)
+
+        assert text.startswith("Load test: sync")
+        assert "p95" in text
+        assert "CityNotFoundException" in text
+        assert "RSS MB" in text
@@ -2,6 +2,8 @@
 
 import pytest
 from unittest.mock import Mock, patch, MagicMock
+import threading
+from src.daemon import WeatherDaemon
 from src.main import main
 from src.exceptions import (
     CityNotFoundException,
@@ -20,6 +22,8 @@ class TestMain:
         """Auto-fixture que configura el entorno para todos los tests."""
         monkeypatch.setattr("src.config.Config.API_KEY", "test_api_key")
         monkeypatch.setattr("src.config.Config.TIMEOUT", 10)
+        # Sin daemon: todas las consultas se resuelven en el proceso
+        monkeypatch.setattr("src.main.Config.DAEMON_SOCKET", "/nonexistent/weather.sock")
 
     def test_main_exits_with_0_on_success(self, monkeypatch, capsys):
         """Verifica que main() salga con código 0 en caso de éxito."""
@@ -253,3 +257,347 @@ class TestMain:
         
         captured = capsys.readouterr()
         assert "Error inesperado" in captured.out
+
+    def test_main_batch_mode_prints_each_city(self, tmp_path, capsys):
+        """Verifica que --cities-file consulte y muestre todas las ciudades."""
+        cities_file = tmp_path / "ciudades.txt"
+        cities_file.write_text("Buenos Aires\nMadrid\n", encoding="utf-8")
+
+        mock_service = MagicMock()
+        mock_service.__enter__.return_value = mock_service
+        mock_service.get_weather.side_effect = lambda city: {"name": city}
+        mock_service.parse_weather_data.side_effect = lambda data: {
+            "city": data["name"], "country": "XX", "temperature": 20.0,
+            "feels_like": 19.0, "description": "Despejado", "humidity": 50,
+            "pressure": 1010, "wind_speed": 1.0, "latitude": 0.0, "longitude": 0.0,
+        }
+
+        with patch("src.main.WeatherService", return_value=mock_service):
+            with pytest.raises(SystemExit) as exc_info:
+                main(["--cities-file", str(cities_file), "--workers", "2"])
+
+        assert exc_info.value.code == 0
+        captured = capsys.readouterr()
+        assert "BUENOS AIRES" in captured.out
+        assert "MADRID" in captured.out
+
+    def test_main_batch_mode_exits_with_1_if_any_city_fails(self, tmp_path, capsys):
+        """Verifica que el batch salga con código 1 si alguna ciudad falla."""
+        cities_file = tmp_path / "ciudades.txt"
+        cities_file.write_text("Atlantis\n", encoding="utf-8")
+
+        mock_service = MagicMock()
+        mock_service.__enter__.return_value = mock_service
+        mock_service.get_weather.side_effect = CityNotFoundException("Atlantis")
+
+        with patch("src.main.WeatherService", return_value=mock_service):
+            with pytest.raises(SystemExit) as exc_info:
+                main(["--cities-file", str(cities_file)])
+
+        assert exc_info.value.code == 1
+        assert "Atlantis" in capsys.readouterr().out
+
+    def test_main_batch_mode_writes_ndjson_to_file(self, tmp_path):
+        """Verifica que --format ndjson --output escriba un objeto por ciudad."""
+        import json
+
+        cities_file = tmp_path / "ciudades.txt"
+        cities_file.write_text("Madrid\nAtlantis\n", encoding="utf-8")
+        output = tmp_path / "salida.ndjson"
+
+        def get_weather(city):
+            if city != "Madrid":
+                raise CityNotFoundException(city)
+            return {"name": city}
+
+        mock_service = MagicMock()
+        mock_service.__enter__.return_value = mock_service
+        mock_service.get_weather.side_effect = get_weather
+        mock_service.parse_weather_data.side_effect = lambda data: {"city": data["name"]}
+
+        with patch("src.main.WeatherService", return_value=mock_service):
+            with pytest.raises(SystemExit) as exc_info:
+                main([
+                    "--cities-file", str(cities_file),
+                    "--format", "ndjson", "--output", str(output),
+                ])
+
+        assert exc_info.value.code == 1
+        records = {
+            record["city"]: record
+            for record in map(json.loads, output.read_text(encoding="utf-8").splitlines())
+        }
+        assert records["Madrid"]["data"] == {"city": "Madrid"}
+        assert records["Atlantis"]["error"]["error"] == "not_found"
+
+    def test_main_batch_mode_exits_with_1_on_missing_file(self, tmp_path, capsys):
+        """Verifica que un archivo de ciudades inexistente termine con error."""
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--cities-file", str(tmp_path / "no_existe.txt")])
+
+        assert exc_info.value.code == 1
+        assert "archivo de ciudades" in capsys.readouterr().out
+
+    def test_main_interactive_survives_unwritable_rate_limit_state(
+        self, monkeypatch, tmp_path, capsys
+    ):
+        """Verifica que un archivo de estado del limitador inválido no rompa la consulta."""
+        from tests.fixtures.http_server import StubWeatherServer
+
+        blocker = tmp_path / "archivo"
+        blocker.write_text("", encoding="utf-8")
+        monkeypatch.setattr("builtins.input", lambda _: "Madrid")
+        monkeypatch.setattr("src.main.Config.RATE_LIMIT_PER_MINUTE", 60)
+        monkeypatch.setattr("src.main.Config.DISK_CACHE_ENABLED", False)
+        monkeypatch.setattr(
+            "src.rate_limiter.Config.RATE_LIMIT_STATE_FILE", str(blocker / "rl.json")
+        )
+
+        with StubWeatherServer() as server:
+            monkeypatch.setattr("src.weather_service.Config.BASE_URL", server.base_url)
+            monkeypatch.setattr("src.weather_service.Config.API_KEY", "test_api_key")
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+
+        assert exc_info.value.code == 0
+        assert "MADRID" in capsys.readouterr().out
+
+    def test_main_io_error_outside_batch_is_not_a_cities_file_error(self, monkeypatch, capsys):
+        """Verifica que un OSError fuera del modo batch no culpe al archivo de ciudades."""
+        monkeypatch.setattr("builtins.input", lambda _: "Madrid")
+        mock_service = Mock()
+        mock_service.get_weather.side_effect = PermissionError("sin permisos")
+
+        with patch("src.main.WeatherService", return_value=mock_service):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+
+        output = capsys.readouterr().out
+        assert exc_info.value.code == 1
+        assert "archivo de ciudades" not in output
+        assert "sin permisos" in output
+
+    def test_main_batch_mode_writes_metrics(self, monkeypatch, tmp_path, capsys):
+        """Verifica que --metrics guarde fases y resultados aunque falle una ciudad."""
+        from tests.fixtures.http_server import StubWeatherServer
+
+        cities = tmp_path / "ciudades.txt"
+        cities.write_text("Madrid\nAtlantis\n", encoding="utf-8")
+        metrics_file = tmp_path / "metricas.prom"
+
+        with StubWeatherServer() as server:
+            monkeypatch.setattr("src.weather_service.Config.BASE_URL", server.base_url)
+            monkeypatch.setattr("src.weather_service.Config.API_KEY", "test_api_key")
+            monkeypatch.setattr("src.main.Config.RATE_LIMIT_PER_MINUTE", 0)
+            monkeypatch.setattr("src.main.Config.RETRY_MAX_ATTEMPTS", 1)
+            with pytest.raises(SystemExit) as exc_info:
+                main(["--cities-file", str(cities), "--metrics", str(metrics_file)])
+
+        text = metrics_file.read_text(encoding="utf-8")
+        assert exc_info.value.code == 1
+        assert 'weather_requests_total{outcome="ok"} 1' in text
+        assert 'weather_requests_total{outcome="CityNotFoundException"} 1' in text
+        assert 'weather_phase_duration_seconds_count{phase="format"} 2' in text
+
+    def test_main_loadtest_serves_hits_from_the_warmed_cache(self, monkeypatch, tmp_path, capsys):
+        """Verifica que con --cache-hit-ratio 1 solo la precarga llegue a la API."""
+        import json
+
+        from tests.fixtures.http_server import StubWeatherServer
+
+        report_file = tmp_path / "carga.json"
+        with StubWeatherServer() as server:
+            monkeypatch.setattr("src.weather_service.Config.BASE_URL", server.base_url)
+            monkeypatch.setattr("src.weather_service.Config.API_KEY", "test_api_key")
+            with pytest.raises(SystemExit) as exc_info:
+                main([
+                    "loadtest", "--mix", "Madrid=3,Buenos Aires", "--duration", "0.2",
+                    "--workers", "2", "--cache-hit-ratio", "1", "--output", str(report_file),
+                ])
+
+        assert exc_info.value.code == 0
+        assert server.request_count == 2
+        report = json.loads(report_file.read_text(encoding="utf-8"))
+        assert report["target"] == "sync"
+        assert report["requests"] > 0
+        assert "Load test: sync" in capsys.readouterr().out
+
+    def test_main_loadtest_misses_all_reach_the_api(self, monkeypatch, tmp_path, capsys):
+        """Verifica que las consultas concurrentes sin caché no se junten en una sola."""
+        import json
+
+        from tests.fixtures.http_server import StubWeatherServer
+
+        report_file = tmp_path / "carga.json"
+        with StubWeatherServer(latency=0.02) as server:
+            monkeypatch.setattr("src.weather_service.Config.BASE_URL", server.base_url)
+            monkeypatch.setattr("src.weather_service.Config.API_KEY", "test_api_key")
+            monkeypatch.setattr("src.main.Config.RATE_LIMIT_PER_MINUTE", 0)
+            monkeypatch.setattr("src.main.Config.HEDGE_BUDGET", 0)
+            with pytest.raises(SystemExit) as exc_info:
+                main([
+                    "loadtest", "--mix", "Madrid", "--duration", "0.2",
+                    "--workers", "8", "--output", str(report_file),
+                ])
+
+        report = json.loads(report_file.read_text(encoding="utf-8"))
+        assert exc_info.value.code == 0
+        assert report["requests"] > 8
+        assert server.request_count == report["requests"]
+
+    def test_main_loadtest_writes_metrics_of_the_load(self, monkeypatch, tmp_path, capsys):
+        """Verifica que --metrics en loadtest mida las consultas de la carga."""
+        import json
+
+        from tests.fixtures.http_server import StubWeatherServer
+
+        metrics_file = tmp_path / "metricas.json"
+        report_file = tmp_path / "carga.json"
+        with StubWeatherServer() as server:
+            monkeypatch.setattr("src.weather_service.Config.BASE_URL", server.base_url)
+            monkeypatch.setattr("src.weather_service.Config.API_KEY", "test_api_key")
+            monkeypatch.setattr("src.main.Config.RATE_LIMIT_PER_MINUTE", 0)
+            monkeypatch.setattr("src.main.Config.HEDGE_BUDGET", 0)
+            with pytest.raises(SystemExit) as exc_info:
+                main([
+                    "loadtest", "--mix", "Madrid", "--duration", "0.1", "--workers", "2",
+                    "--output", str(report_file), "--metrics", str(metrics_file),
+                ])
+
+        snapshot = json.loads(metrics_file.read_text(encoding="utf-8"))
+        report = json.loads(report_file.read_text(encoding="utf-8"))
+        assert exc_info.value.code == 0
+        assert snapshot["outcomes"] == {"ok": report["requests"]}
+        assert snapshot["phases"]["parse"]["count"] == report["requests"]
+
+    def test_main_loadtest_rejects_metrics_for_other_targets(self, tmp_path, capsys):
+        """Verifica que --metrics con --target async o daemon se rechace sin escribir nada."""
+        metrics_file = tmp_path / "metricas.json"
+
+        with pytest.raises(SystemExit) as exc_info:
+            main([
+                "loadtest", "--target", "daemon", "--duration", "0.1",
+                "--metrics", str(metrics_file),
+            ])
+
+        assert exc_info.value.code == 1
+        assert "--target sync" in capsys.readouterr().out
+        assert not metrics_file.exists()
+
+    def test_main_serve_passes_metrics_to_the_service(self, monkeypatch, tmp_path):
+        """Verifica que serve use el colector de --metrics y no uno vacío aparte."""
+        metrics_file = tmp_path / "metricas.json"
+        received = {}
+
+        def fake_run_server(host, port, metrics=None):
+            received["metrics"] = metrics
+            metrics.count_outcome("ok")
+            return 0
+
+        monkeypatch.setattr("src.main.run_server", fake_run_server)
+        with pytest.raises(SystemExit):
+            main(["serve", "--port", "0", "--metrics", str(metrics_file)])
+
+        assert received["metrics"] is not None
+        assert '"ok": 1' in metrics_file.read_text(encoding="utf-8")
+
+    def test_main_loadtest_counts_errors_by_exception_class(self, monkeypatch, capsys):
+        """Verifica que los errores de la API se informen por clase y salgan con 1."""
+        from tests.fixtures.http_server import StubWeatherServer
+
+        with StubWeatherServer() as server:
+            monkeypatch.setattr("src.weather_service.Config.BASE_URL", server.base_url)
+            monkeypatch.setattr("src.weather_service.Config.API_KEY", "test_api_key")
+            with pytest.raises(SystemExit) as exc_info:
+                main(["loadtest", "--mix", "Atlantis", "--duration", "0.1", "--workers", "1"])
+
+        assert exc_info.value.code == 1
+        assert "CityNotFoundException" in capsys.readouterr().out
+
+    @pytest.mark.parametrize(
+        "extra, message",
+        [
+            (["--target", "async", "--cache-hit-ratio", "0.5"], "--target sync"),
+            (["--target", "daemon"], "No hay un daemon"),
+            (["--mix", "Madrid=0"], "loadtest inválidos"),
+        ],
+    )
+    def test_main_loadtest_rejects_invalid_parameters(self, extra, message, capsys):
+        """Verifica que parámetros incoherentes terminen con error de configuración."""
+        with pytest.raises(SystemExit) as exc_info:
+            main(["loadtest", "--duration", "0.1", *extra])
+
+        assert exc_info.value.code == 1
+        assert message in capsys.readouterr().out
+
+    def test_main_serve_reports_port_in_use(self, capsys):
+        """Verifica que `serve` en un puerto ocupado termine con error de configuración."""
+        import socket
+
+        with socket.socket() as busy:
+            busy.bind(("127.0.0.1", 0))
+            busy.listen()
+            port = busy.getsockname()[1]
+
+            with patch("src.main.WeatherService"):
+                with pytest.raises(SystemExit) as exc_info:
+                    main(["serve", "--host", "127.0.0.1", "--port", str(port)])
+
+        assert exc_info.value.code == 1
+        assert "No se pudo escuchar" in capsys.readouterr().out
+
+
+class TestMainWithDaemon:
+    """Tests del CLI como cliente liviano del daemon."""
+
+    PARSED = {
+        "city": "Madrid",
+        "country": "ES",
+        "temperature": 18.3,
+        "feels_like": 17.9,
+        "description": "Muy nuboso",
+        "humidity": 72,
+        "pressure": 1015,
+        "wind_speed": 4.2,
+        "latitude": 40.42,
+        "longitude": -3.7,
+    }
+
+    @pytest.fixture
+    def daemon_socket(self, tmp_path, monkeypatch):
+        """Daemon real con un servicio falso escuchando en un socket temporal."""
+        service = Mock()
+        service.parse_weather_data.return_value = self.PARSED
+        path = str(tmp_path / "w.sock")
+        daemon = WeatherDaemon(service, path)
+        thread = threading.Thread(target=daemon.serve_forever)
+        thread.start()
+        monkeypatch.setattr("src.main.Config.DAEMON_SOCKET", path)
+        yield service
+        daemon.shutdown()
+        thread.join()
+
+    def test_main_queries_daemon_without_local_service(self, daemon_socket, monkeypatch, capsys):
+        """Verifica que con daemon activo no se cree un servicio local."""
+        monkeypatch.setattr("builtins.input", lambda _: "Madrid")
+        local_service = Mock()
+
+        with patch("src.main.WeatherService", local_service):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+
+        assert exc_info.value.code == 0
+        assert "MADRID" in capsys.readouterr().out
+        daemon_socket.get_weather.assert_called_once_with("Madrid")
+        local_service.assert_not_called()
+
+    def test_main_reports_daemon_errors(self, daemon_socket, monkeypatch, capsys):
+        """Verifica que los errores del daemon se muestren como en modo local."""
+        monkeypatch.setattr("builtins.input", lambda _: "Atlantis")
+        daemon_socket.get_weather.side_effect = CityNotFoundException("Atlantis")
+
+        with pytest.raises(SystemExit) as exc_info:
+            main()
+
+        assert exc_info.value.code == 1
+        assert "No se encontró la ciudad: Atlantis" in capsys.readouterr().out
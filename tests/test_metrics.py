@@ -0,0 +1,176 @@
+"""Tests para la instrumentación por fases y la exportación de métricas."""
+
+import json
+
+import pytest
+from src.cache import TTLCache
+from src.exceptions import CityNotFoundException, ServerErrorException
+from src.metrics import BUCKETS, PHASES, RequestMetrics, sample, write_metrics
+from src.resilience import RetryPolicy
+from src.weather_service import WeatherService
+from tests.fixtures.http_server import StubWeatherServer
+
+
+class TestRequestMetrics:
+    """Tests para los histogramas y contadores."""
+
+    def test_observations_fall_in_cumulative_buckets(self):
+        """Verifica conteos acumulados, suma y media de una fase."""
+        metrics = RequestMetrics()
+        metrics.observe("parse", 0.0002)
+        metrics.observe("parse", 0.003)
+        metrics.observe("parse", 60.0)
+
+        parse = metrics.snapshot()["phases"]["parse"]
+
+        assert parse["count"] == 3
+        assert parse["buckets"]["0.00025"] == 1
+        assert parse["buckets"]["0.005"] == 2
+        assert parse["buckets"]["10"] == 2
+        assert parse["buckets"]["+Inf"] == 3
+        assert parse["sum_s"] == pytest.approx(60.0032)
+        assert len(parse["buckets"]) == len(BUCKETS) + 1
+
+    def test_call_records_duration_even_on_error(self):
+        """Verifica que call() mida la fase aunque la función falle."""
+        metrics = RequestMetrics()
+
+        with pytest.raises(ZeroDivisionError):
+            metrics.call("format", lambda value: 1 / value, 0)
+
+        assert metrics.snapshot()["phases"]["format"]["count"] == 1
+
+    def test_track_counts_outcomes_by_exception_class(self):
+        """Verifica el conteo de resultados "ok" y por clase de excepción."""
+        metrics = RequestMetrics()
+
+        def lookup(city):
+            if city == "Atlantis":
+                raise CityNotFoundException(city)
+            return city
+
+        metrics.track(lookup, "Madrid")
+        with pytest.raises(CityNotFoundException):
+            metrics.track(lookup, "Atlantis")
+
+        assert metrics.snapshot()["outcomes"] == {"ok": 1, "CityNotFoundException": 1}
+
+    def test_ttfb_excludes_connect(self):
+        """Verifica que el connect de la petición se descuente del ttfb."""
+        metrics = RequestMetrics()
+        metrics.record_connect(0.04)
+        metrics.observe_response(until_headers=0.05, body_read=0.001)
+        metrics.observe_response(until_headers=0.02, body_read=0.001)
+
+        phases = metrics.snapshot()["phases"]
+
+        assert phases["connect"]["count"] == 1
+        assert phases["ttfb"]["sum_s"] == pytest.approx(0.03)
+
+    def test_reset(self):
+        """Verifica que reset() vuelva todo a cero."""
+        metrics = RequestMetrics()
+        metrics.count_retry()
+        metrics.count_cache(True)
+        metrics.observe("parse", 0.1)
+
+        metrics.reset()
+        snapshot = metrics.snapshot()
+
+        assert snapshot["retries"] == 0
+        assert snapshot["cache"] == {"hits": 0, "misses": 0, "hit_ratio": None}
+        assert all(phase["count"] == 0 for phase in snapshot["phases"].values())
+
+
+class TestExport:
+    """Tests para los formatos de exportación."""
+
+    def test_prometheus_text_format(self):
+        """Verifica HELP/TYPE, buckets, sumas y contadores en formato Prometheus."""
+        metrics = RequestMetrics()
+        metrics.observe("ttfb", 0.02)
+        metrics.count_outcome("ok")
+        metrics.count_cache(False)
+
+        lines = metrics.to_prometheus().splitlines()
+
+        assert "# TYPE weather_phase_duration_seconds histogram" in lines
+        assert 'weather_phase_duration_seconds_bucket{phase="ttfb",le="0.025"} 1' in lines
+        assert 'weather_phase_duration_seconds_bucket{phase="ttfb",le="+Inf"} 1' in lines
+        assert 'weather_phase_duration_seconds_count{phase="ttfb"} 1' in lines
+        assert 'weather_requests_total{outcome="ok"} 1' in lines
+        assert 'weather_cache_lookups_total{result="miss"} 1' in lines
+        assert "weather_retries_total 0" in lines
+        # Cada fase exporta sus buckets, aunque no tenga observaciones
+        buckets = [line for line in lines if line.startswith("weather_phase_duration_seconds_bucket")]
+        assert len(buckets) == len(PHASES) * (len(BUCKETS) + 1)
+
+    def test_label_values_are_escaped(self):
+        """Verifica el escape de comillas, barras y saltos de línea en labels."""
+        assert sample("m", {"k": 'a"b\\c\nd'}, 1) == 'm{k="a\\"b\\\\c\\nd"} 1'
+
+    def test_write_metrics_picks_format_by_extension(self, tmp_path):
+        """Verifica JSON por defecto y Prometheus con extensión .prom."""
+        metrics = RequestMetrics()
+        metrics.count_outcome("ok")
+
+        write_metrics(metrics, str(tmp_path / "m.json"))
+        write_metrics(metrics, str(tmp_path / "m.prom"))
+
+        assert json.loads((tmp_path / "m.json").read_text())["outcomes"] == {"ok": 1}
+        assert "weather_requests_total" in (tmp_path / "m.prom").read_text()
+
+
+class TestServiceInstrumentation:
+    """Tests de las fases medidas por WeatherService contra el servidor local."""
+
+    @pytest.fixture
+    def server(self, monkeypatch):
+        """StubWeatherServer con la configuración del servicio apuntada a él."""
+        with StubWeatherServer() as server:
+            monkeypatch.setattr("src.weather_service.Config.BASE_URL", server.base_url)
+            monkeypatch.setattr("src.weather_service.Config.API_KEY", "test_api_key")
+            yield server
+
+    def test_records_every_phase_of_a_query(self, server):
+        """Verifica fases, resultados y caché de consultas reales."""
+        metrics = RequestMetrics()
+        with WeatherService(skip_validation=True, cache=TTLCache(ttl=60), metrics=metrics) as service:
+            service.parse_weather_data(service.get_weather("Madrid"))
+            service.get_weather("Madrid")
+            with pytest.raises(CityNotFoundException):
+                service.get_weather("Atlantis")
+
+        snapshot = metrics.snapshot()
+        counts = {phase: data["count"] for phase, data in snapshot["phases"].items()}
+
+        # Una conexión keep-alive para las dos peticiones HTTP
+        assert counts == {
+            "url_build": 2, "connect": 1, "ttfb": 2, "body_read": 2,
+            "json_decode": 1, "parse": 1, "format": 0,
+        }
+        assert snapshot["outcomes"] == {"ok": 2, "CityNotFoundException": 1}
+        assert snapshot["cache"]["hits"] == 1
+        assert snapshot["cache"]["misses"] == 2
+
+    def test_counts_retries(self, server):
+        """Verifica el conteo de reintentos ante 5xx."""
+        metrics = RequestMetrics()
+        policy = RetryPolicy(max_attempts=3, backoff_base=0, backoff_max=0)
+        with WeatherService(skip_validation=True, retry_policy=policy, metrics=metrics) as service:
+            with pytest.raises(ServerErrorException):
+                service.get_weather("Caida")
+
+        assert metrics.snapshot()["retries"] == 2
+        assert metrics.snapshot()["outcomes"] == {"ServerErrorException": 1}
+
+    def test_disabled_by_default(self, server):
+        """Verifica que sin métricas la sesión use el HTTPAdapter normal."""
+        from requests.adapters import HTTPAdapter
+
+        with WeatherService(skip_validation=True) as service:
+            service.get_weather("Madrid")
+            adapter = service.session.get_adapter(server.base_url)
+
+        assert service.metrics is None
+        assert type(adapter) is HTTPAdapter
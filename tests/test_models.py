@@ -0,0 +1,137 @@
+"""Tests para los registros WeatherReading y LazyReading."""
+
+import dataclasses
+import json
+import pickle
+import sys
+
+import pytest
+from src.exceptions import WeatherAPIException
+from src.models import FIELDS, LazyReading, WeatherReading
+from tests.fixtures.api_responses import get_madrid_response, get_successful_response
+
+
+class TestWeatherReading:
+    """Tests para WeatherReading."""
+
+    def test_from_api_extracts_fields(self):
+        """Verifica que from_api() extraiga los campos del JSON de la API."""
+        reading = WeatherReading.from_api(get_madrid_response())
+
+        assert reading.city == "Madrid"
+        assert reading.country == "ES"
+        assert reading.temperature == 18.3
+        assert reading.description[0].isupper()
+
+    def test_behaves_like_the_previous_dict(self):
+        """Verifica que la lectura se lea y compare como el diccionario de antes."""
+        reading = WeatherReading.from_api(get_successful_response())
+
+        assert list(reading) == list(FIELDS)
+        assert len(reading) == len(FIELDS)
+        assert reading["city"] == "Buenos Aires"
+        assert reading.get("humidity") == 65
+        assert reading.get("inexistente") is None
+        assert "wind_speed" in reading
+        assert reading == dict(reading)
+        assert dict(reading) == reading.to_dict()
+
+    def test_unknown_key_raises_key_error(self):
+        """Verifica que una clave inexistente lance KeyError como un dict."""
+        reading = WeatherReading.from_api(get_madrid_response())
+
+        with pytest.raises(KeyError):
+            reading["city_name"]
+
+    def test_is_immutable_and_has_no_instance_dict(self):
+        """Verifica que la lectura no tenga __dict__ y no se pueda modificar."""
+        reading = WeatherReading.from_api(get_madrid_response())
+
+        assert not hasattr(reading, "__dict__")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            reading.city = "Lima"
+
+    def test_is_smaller_than_the_equivalent_dict(self):
+        """Verifica que la lectura ocupe menos memoria que el dict equivalente."""
+        reading = WeatherReading.from_api(get_madrid_response())
+
+        assert sys.getsizeof(reading) < sys.getsizeof(reading.to_dict())
+
+    def test_repeated_strings_are_interned(self):
+        """Verifica que país y descripción se compartan entre lecturas."""
+        first = WeatherReading.from_api(get_madrid_response())
+        # json.loads crea strings nuevos, como cada respuesta de la API
+        second = WeatherReading.from_api(json.loads(json.dumps(get_madrid_response())))
+
+        assert first.country is second.country
+        assert first.description is second.description
+        assert first.city is second.city
+
+    def test_survives_pickle(self):
+        """Verifica que la lectura se pueda enviar entre procesos."""
+        reading = WeatherReading.from_api(get_madrid_response())
+
+        assert pickle.loads(pickle.dumps(reading)) == reading
+
+
+class TestLazyReading:
+    """Tests para LazyReading."""
+
+    @pytest.fixture
+    def body(self):
+        """Cuerpo crudo de la respuesta de Madrid."""
+        return json.dumps(get_madrid_response()).encode("utf-8")
+
+    def test_decodes_only_on_first_access(self, body):
+        """Verifica que el cuerpo se decodifique recién al leer un campo."""
+        reading = LazyReading(body)
+
+        assert not reading.decoded
+        assert "sin decodificar" in repr(reading)
+        assert reading.temperature == 18.3
+        assert reading.decoded
+
+    def test_matches_eager_reading(self, body):
+        """Verifica que la lectura perezosa sea igual a WeatherReading."""
+        reading = LazyReading(body)
+
+        assert reading == WeatherReading.from_api(get_madrid_response())
+        assert reading["description"] == "Muy nuboso"
+        assert reading.to_dict() == WeatherReading.from_api(get_madrid_response()).to_dict()
+
+    def test_keeps_raw_bytes_for_cache_write_back(self, body):
+        """Verifica que raw sean los mismos bytes recibidos, sin re-serializar."""
+        reading = LazyReading(body)
+        reading.city
+
+        assert reading.raw is body
+
+    def test_invalid_body_raises_api_exception_on_access(self):
+        """Verifica que un cuerpo inválido falle con WeatherAPIException al leerlo."""
+        reading = LazyReading(b'{"name": "Madrid"}')
+
+        with pytest.raises(WeatherAPIException):
+            reading.temperature
+
+    def test_membership_does_not_decode(self):
+        """Verifica que `in` responda por los campos sin decodificar el cuerpo."""
+        reading = LazyReading(b"no es json")
+
+        assert "city" in reading
+        assert "humedad" not in reading
+        assert not reading.decoded
+
+    def test_unknown_attribute_raises_attribute_error(self, body):
+        """Verifica que un atributo desconocido no decodifique el cuerpo."""
+        reading = LazyReading(body)
+
+        with pytest.raises(AttributeError):
+            reading.humedad
+        assert not reading.decoded
+
+    def test_pickles_as_raw_bytes(self, body):
+        """Verifica que pickle conserve solo los bytes y decodifique al volver."""
+        restored = pickle.loads(pickle.dumps(LazyReading(body)))
+
+        assert not restored.decoded
+        assert restored.city == "Madrid"
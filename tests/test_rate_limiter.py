@@ -0,0 +1,187 @@
+"""Tests para el limitador de tasa del cliente (token bucket)."""
+
+import pytest
+from src.exceptions import RateLimitException
+from src.rate_limiter import RateLimiter, parse_retry_after
+
+
+class FakeTime:
+    """Reloj y sleep manuales: dormir avanza el reloj sin esperar de verdad."""
+
+    def __init__(self):
+        self.now = 1_700_000_000.0
+        self.slept = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class TestParseRetryAfter:
+    """Tests para parse_retry_after()."""
+
+    def test_parses_seconds(self):
+        """Verifica el formato en segundos."""
+        assert parse_retry_after("30") == 30.0
+
+    def test_parses_http_date(self):
+        """Verifica el formato de fecha HTTP relativo a now."""
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:30 GMT", now=1445412480) == 30.0
+
+    def test_missing_or_invalid_returns_none(self):
+        """Verifica que un header ausente o inválido devuelva None."""
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("pronto") is None
+
+
+@pytest.fixture(params=["memoria", "archivo"])
+def make_limiter(request, tmp_path):
+    """Fábrica de limitadores con estado en memoria y en archivo compartido."""
+    fake = FakeTime()
+
+    def factory(**kwargs):
+        state_path = str(tmp_path / "rl.json") if request.param == "archivo" else None
+        return RateLimiter(
+            state_path=state_path, clock=fake.clock, sleep=fake.sleep, **kwargs
+        )
+
+    factory.time = fake
+    return factory
+
+
+class TestRateLimiter:
+    """Tests para la clase RateLimiter."""
+
+    def test_allows_burst_up_to_per_minute(self, make_limiter):
+        """Verifica que el balde lleno permita per_minute consultas seguidas."""
+        limiter = make_limiter(per_minute=5)
+
+        waits = [limiter.try_acquire() for _ in range(6)]
+
+        assert waits[:5] == [0.0] * 5
+        assert waits[5] == pytest.approx(12.0)  # 60s / 5 tokens
+
+    def test_acquire_waits_for_refill(self, make_limiter):
+        """Verifica que acquire() espere hasta que haya un token."""
+        limiter = make_limiter(per_minute=60)
+        for _ in range(60):
+            limiter.acquire()
+
+        limiter.acquire()
+
+        assert make_limiter.time.slept == [pytest.approx(1.0)]
+
+    def test_acquire_raises_when_wait_exceeds_max_wait(self, make_limiter):
+        """Verifica que no se espere más que max_wait."""
+        limiter = make_limiter(per_minute=1)
+        limiter.acquire()
+
+        with pytest.raises(RateLimitException) as exc_info:
+            limiter.acquire(max_wait=5)
+
+        assert exc_info.value.retry_after == pytest.approx(60.0)
+
+    def test_daily_quota_is_enforced(self, make_limiter):
+        """Verifica el tope diario."""
+        limiter = make_limiter(per_minute=100, per_day=2)
+        limiter.acquire()
+        limiter.acquire()
+
+        with pytest.raises(RateLimitException):
+            limiter.try_acquire()
+        assert limiter.remaining()["day"] == 0
+
+    def test_rate_limited_honors_retry_after(self, make_limiter):
+        """Verifica que un 429 con Retry-After bloquee ese tiempo."""
+        limiter = make_limiter(per_minute=100)
+
+        limiter.on_rate_limited(retry_after=30)
+
+        assert limiter.try_acquire() == pytest.approx(30.0)
+        assert limiter.remaining()["blocked_for"] == pytest.approx(30.0)
+
+    def test_rate_limited_backs_off_exponentially_without_retry_after(self, make_limiter):
+        """Verifica el backoff adaptativo ante 429 consecutivos."""
+        limiter = make_limiter(per_minute=100)
+
+        delays = [limiter.on_rate_limited() for _ in range(3)]
+        limiter.on_success()
+
+        assert delays == [1.0, 2.0, 4.0]
+        assert limiter.on_rate_limited() == 1.0
+
+    def test_success_without_strikes_does_not_touch_state(self, make_limiter, monkeypatch):
+        """Verifica que on_success() no lea ni escriba el estado sin 429 pendientes."""
+        limiter = make_limiter(per_minute=10)
+        limiter.acquire()
+        monkeypatch.setattr(
+            limiter, "_state", lambda: pytest.fail("on_success tocó el estado")
+        )
+
+        limiter.on_success()
+
+    def test_success_after_strike_resets_shared_state(self, make_limiter):
+        """Verifica que on_success() tras un 429 sí reinicie el backoff."""
+        limiter = make_limiter(per_minute=10)
+        limiter.on_rate_limited()
+        limiter.on_success()
+
+        assert limiter.on_rate_limited() == 1.0
+
+    def test_remaining_reports_budget(self, make_limiter):
+        """Verifica el presupuesto restante sin consumir tokens."""
+        limiter = make_limiter(per_minute=10)
+        limiter.acquire()
+
+        assert limiter.remaining() == {"minute": 9, "day": -1, "blocked_for": 0.0}
+
+    def test_invalid_limits_raise_value_error(self):
+        """Verifica que los límites inválidos sean rechazados."""
+        with pytest.raises(ValueError):
+            RateLimiter(per_minute=0)
+
+
+class TestSharedState:
+    """Tests del estado compartido entre instancias (procesos)."""
+
+    def test_two_limiters_share_the_same_bucket(self, tmp_path):
+        """Verifica que dos instancias con el mismo archivo compartan cuota."""
+        fake = FakeTime()
+        path = str(tmp_path / "rl.json")
+        first = RateLimiter(per_minute=2, state_path=path, clock=fake.clock)
+        second = RateLimiter(per_minute=2, state_path=path, clock=fake.clock)
+
+        assert first.try_acquire() == 0.0
+        assert second.try_acquire() == 0.0
+        assert first.try_acquire() > 0
+
+    def test_success_resets_strikes_seen_from_other_instance(self, tmp_path):
+        """Verifica que un 429 de otra instancia se reinicie al ver el estado."""
+        fake = FakeTime()
+        path = str(tmp_path / "rl.json")
+        first = RateLimiter(per_minute=100, state_path=path, clock=fake.clock)
+        second = RateLimiter(per_minute=100, state_path=path, clock=fake.clock)
+        second.on_rate_limited()
+        fake.now += 2
+
+        first.try_acquire()
+        first.on_success()
+
+        assert second.on_rate_limited() == 1.0
+
+    def test_unwritable_state_file_falls_back_to_memory(self, tmp_path):
+        """Verifica que sin poder crear el archivo el limitador siga en memoria."""
+        blocker = tmp_path / "archivo"
+        blocker.write_text("", encoding="utf-8")
+        fake = FakeTime()
+        limiter = RateLimiter(
+            per_minute=2, state_path=str(blocker / "rl.json"), clock=fake.clock
+        )
+
+        assert limiter.try_acquire() == 0.0
+        assert limiter.try_acquire() == 0.0
+        assert limiter.try_acquire() > 0
+        assert limiter.state_path is None
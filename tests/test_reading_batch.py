@@ -0,0 +1,121 @@
+"""Tests para el lote columnar ReadingBatch."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.models import FIELDS, WeatherReading  # noqa: E402
+from src.reading_batch import ReadingBatch  # noqa: E402
+from src.units import MS_TO_KMH  # noqa: E402
+
+
+def reading(city, country, temperature, humidity=60, wind_speed=2.0, description="Cielo claro"):
+    """Crea una lectura con valores por defecto para los campos no relevantes."""
+    return WeatherReading(
+        city=city,
+        country=country,
+        temperature=temperature,
+        feels_like=temperature - 1,
+        description=description,
+        humidity=humidity,
+        pressure=1013,
+        wind_speed=wind_speed,
+        latitude=0.0,
+        longitude=0.0,
+    )
+
+
+@pytest.fixture
+def batch():
+    """Lote con dos ciudades de España y una de Argentina."""
+    return ReadingBatch.from_readings([
+        reading("Madrid", "ES", 18.0, humidity=70, wind_speed=4.0),
+        reading("Buenos Aires", "AR", 25.5, humidity=65, wind_speed=3.5),
+        reading("Sevilla", "ES", 31.0, humidity=40, wind_speed=1.0, description="Nuboso"),
+    ])
+
+
+class TestReadingBatch:
+    """Tests para ReadingBatch."""
+
+    def test_stores_contiguous_typed_columns(self, batch):
+        """Verifica que cada campo numérico sea un array contiguo del tipo esperado."""
+        temperature = batch.column("temperature")
+
+        assert len(batch) == 3
+        assert temperature.dtype == np.float64
+        assert temperature.flags.c_contiguous
+        assert batch.column("humidity").dtype == np.int32
+        assert temperature.tolist() == [18.0, 25.5, 31.0]
+
+    def test_encodes_text_columns_as_categories(self, batch):
+        """Verifica que país y ciudad se guarden como códigos + categorías."""
+        assert batch.categories["country"] == ("ES", "AR")
+        assert batch.codes("country").tolist() == [0, 1, 0]
+        assert batch.column("country").tolist() == ["ES", "AR", "ES"]
+
+    def test_rebuilds_readings_by_index(self, batch):
+        """Verifica que una fila se reconstruya como la lectura original."""
+        assert batch[1] == reading("Buenos Aires", "AR", 25.5, humidity=65, wind_speed=3.5)
+        assert batch[-1]["description"] == "Nuboso"
+        with pytest.raises(IndexError):
+            batch[3]
+
+    def test_columns_are_read_only(self, batch):
+        """Verifica que las columnas expuestas no permitan modificar el lote."""
+        with pytest.raises(ValueError):
+            batch.column("temperature")[0] = 0.0
+
+    def test_vectorized_unit_conversions(self, batch):
+        """Verifica las conversiones de viento a km/h y temperatura a °F."""
+        assert batch.wind_speed_kmh().tolist() == pytest.approx(
+            [4.0 * MS_TO_KMH, 3.5 * MS_TO_KMH, 1.0 * MS_TO_KMH]
+        )
+        assert batch.fahrenheit().tolist() == pytest.approx([64.4, 77.9, 87.8])
+        with pytest.raises(ValueError):
+            batch.fahrenheit("humidity")
+
+    @pytest.mark.parametrize(
+        "reduction,expected",
+        [
+            ("max", {"ES": 31.0, "AR": 25.5}),
+            ("min", {"ES": 18.0, "AR": 25.5}),
+            ("mean", {"ES": 24.5, "AR": 25.5}),
+            ("sum", {"ES": 49.0, "AR": 25.5}),
+            ("count", {"ES": 2, "AR": 1}),
+        ],
+    )
+    def test_group_by_reductions(self, batch, reduction, expected):
+        """Verifica cada reducción agrupando la temperatura por país."""
+        assert batch.group_by("country", "temperature", reduction) == pytest.approx(expected)
+
+    def test_group_by_rejects_unknown_reduction(self, batch):
+        """Verifica que una reducción desconocida se rechace."""
+        with pytest.raises(ValueError):
+            batch.group_by("country", "temperature", "median")
+
+    def test_empty_batch(self):
+        """Verifica que un lote vacío no falle al reducir."""
+        empty = ReadingBatch.from_readings([])
+
+        assert len(empty) == 0
+        assert empty.group_by("country", "temperature", "max") == {}
+
+    def test_columns_export_without_copy(self, batch):
+        """Verifica que columns() comparta los buffers del lote."""
+        exported = batch.columns()
+
+        assert np.shares_memory(exported["temperature"], batch.column("temperature"))
+        assert exported["country_code"].tolist() == [0, 1, 0]
+
+    def test_to_arrow_shares_numeric_buffers(self, batch):
+        """Verifica que to_arrow() use DictionaryArray y no copie las columnas numéricas."""
+        pa = pytest.importorskip("pyarrow")
+
+        table = batch.to_arrow()
+
+        assert table.column_names == list(FIELDS)
+        assert pa.types.is_dictionary(table.schema.field("country").type)
+        assert table.column("country").to_pylist() == ["ES", "AR", "ES"]
+        arrow_buffer = table.column("temperature").chunk(0).buffers()[1]
+        assert arrow_buffer.address == batch.column("temperature").ctypes.data
@@ -0,0 +1,227 @@
+"""Tests para los baselines y la detección de regresiones de benchmarks."""
+
+import json
+
+import pytest
+from benchmarks import regression
+from benchmarks.regression import (
+    bootstrap_percentile_greater,
+    compare,
+    load_document,
+    mann_whitney_greater,
+    parse_tolerances,
+    save_baseline,
+)
+from benchmarks.suite import main as suite_main
+
+
+def document(latencies, throughput, ns_per_call=None, memory_peak_kb=1000.0):
+    """Arma un documento de resultados mínimo con muestras crudas."""
+    ordered = sorted(latencies)
+    results = {
+        "single": {
+            "throughput_rps": sum(throughput) / len(throughput),
+            "latency_ms": {
+                "p50": ordered[len(ordered) // 2],
+                "p95": ordered[int(len(ordered) * 0.95)],
+                "p99": ordered[-1],
+            },
+            "memory_peak_kb": memory_peak_kb,
+            "samples": {"latency_ms": latencies, "throughput_rps": throughput},
+        },
+    }
+    if ns_per_call is not None:
+        results["parse"] = {
+            "median_ns": sorted(ns_per_call)[len(ns_per_call) // 2],
+            "samples": {"ns_per_call": ns_per_call},
+        }
+    return {"schema": 2, "environment": {}, "options": {}, "results": results}
+
+
+def statuses(comparisons):
+    """Estado de cada comparación indexado por (escenario, métrica)."""
+    return {(item.scenario, item.metric): item.status for item in comparisons}
+
+
+BASE = document(
+    latencies=[10.0 + i * 0.1 for i in range(40)],
+    throughput=[100.0, 101.0, 99.0, 100.5, 99.5],
+    ns_per_call=[1000.0, 1010.0, 990.0, 1005.0, 995.0],
+)
+
+
+class TestMannWhitney:
+    """Tests para el test estadístico."""
+
+    def test_separated_samples_are_significant(self):
+        """Verifica un p-valor chico cuando la candidata es siempre mayor."""
+        assert mann_whitney_greater([1, 2, 3, 4, 5], [6, 7, 8, 9, 10]) < 0.01
+
+    def test_direction_matters(self):
+        """Verifica que el test sea de una cola."""
+        assert mann_whitney_greater([6, 7, 8, 9, 10], [1, 2, 3, 4, 5]) > 0.99
+
+    def test_degenerate_samples(self):
+        """Verifica p = 1 con muestras vacías o todas iguales."""
+        assert mann_whitney_greater([], [1, 2]) == 1.0
+        assert mann_whitney_greater([3, 3, 3], [3, 3, 3]) == 1.0
+
+
+class TestBootstrapPercentile:
+    """Tests para el bootstrap de percentiles altos."""
+
+    def test_tail_slowdown_is_significant(self):
+        """Verifica un p-valor chico cuando solo empeora la cola."""
+        reference = [10.0 + (i % 20) * 0.05 for i in range(1000)]
+        candidate = [value * 10 if i % 25 == 0 else value for i, value in enumerate(reference)]
+
+        assert bootstrap_percentile_greater(reference, candidate, 0.99) < 0.01
+        assert mann_whitney_greater(reference, candidate) > 0.01
+
+    def test_same_samples_are_not_significant(self):
+        """Verifica que las mismas muestras no den un percentil mayor."""
+        samples = [10.0 + i * 0.1 for i in range(100)]
+
+        assert bootstrap_percentile_greater(samples, samples, 0.95) > 0.1
+        assert bootstrap_percentile_greater([], samples, 0.95) == 1.0
+
+
+class TestCompare:
+    """Tests para la comparación contra un baseline."""
+
+    def test_identical_runs_are_ok(self):
+        """Verifica que comparar un documento consigo mismo no marque nada."""
+        assert set(statuses(compare(BASE, BASE)).values()) == {"ok"}
+
+    def test_consistent_slowdown_is_a_regression(self):
+        """Verifica que latencias 30 % mayores en todas las muestras sean regresión."""
+        slower = document(
+            latencies=[value * 1.3 for value in BASE["results"]["single"]["samples"]["latency_ms"]],
+            throughput=[100.0, 101.0, 99.0, 100.5, 99.5],
+        )
+
+        result = statuses(compare(BASE, slower))
+
+        assert result[("single", "latency_p50_ms")] == "regression"
+        assert result[("single", "throughput_rps")] == "ok"
+
+    def test_throughput_drop_is_a_regression(self):
+        """Verifica que para throughput empeorar sea bajar."""
+        slower = document(
+            latencies=BASE["results"]["single"]["samples"]["latency_ms"],
+            throughput=[70.0, 71.0, 69.0, 70.5, 69.5],
+        )
+        faster = document(
+            latencies=BASE["results"]["single"]["samples"]["latency_ms"],
+            throughput=[130.0, 131.0, 129.0, 130.5, 129.5],
+        )
+
+        assert statuses(compare(BASE, slower))[("single", "throughput_rps")] == "regression"
+        assert statuses(compare(BASE, faster))[("single", "throughput_rps")] == "improvement"
+
+    def test_tail_only_slowdown_is_a_regression(self):
+        """Verifica que un 4 % de consultas 10 veces más lentas rompa p99 y no p50."""
+        latencies = [10.0 + (i % 20) * 0.05 for i in range(1000)]
+        throughput = [100.0, 101.0, 99.0, 100.5, 99.5]
+        base = document(latencies, throughput)
+        tail = document(
+            [value * 10 if i % 25 == 0 else value for i, value in enumerate(latencies)],
+            throughput,
+        )
+
+        result = statuses(compare(base, tail))
+
+        assert result[("single", "latency_p99_ms")] == "regression"
+        assert result[("single", "latency_p50_ms")] == "ok"
+
+    def test_difference_without_significance_is_noise(self):
+        """Verifica que una mediana peor con muestras solapadas no rompa el gate."""
+        noisy = document(
+            latencies=BASE["results"]["single"]["samples"]["latency_ms"],
+            throughput=[100.0, 101.0, 99.0, 100.5, 99.5],
+            ns_per_call=[900.0, 1300.0, 950.0, 1250.0, 1000.0, 1200.0],
+        )
+
+        assert statuses(compare(BASE, noisy))[("parse", "ns_per_call")] == "noise"
+
+    def test_memory_is_judged_by_tolerance(self):
+        """Verifica que la memoria (sin muestras) se juzgue solo por tolerancia."""
+        heavier = dict(BASE, results=dict(BASE["results"]))
+        heavier["results"]["single"] = dict(BASE["results"]["single"], memory_peak_kb=1200.0)
+
+        memory = [item for item in compare(BASE, heavier) if item.metric == "memory_peak_kb"][0]
+        relaxed = statuses(compare(BASE, heavier, {"memory": 0.5}))
+
+        assert memory.status == "regression"
+        assert memory.p_value is None
+        assert relaxed[("single", "memory_peak_kb")] == "ok"
+
+    def test_skipped_scenarios_are_ignored(self):
+        """Verifica que un escenario omitido no aporte métricas."""
+        current = dict(BASE, results=dict(BASE["results"], single={"skipped": "sin aiohttp"}))
+
+        assert all(item.scenario != "single" for item in compare(BASE, current))
+
+
+class TestBaselines:
+    """Tests para guardar, cargar y comparar baselines desde la CLI."""
+
+    def test_parse_tolerances(self):
+        """Verifica la interpretación y validación de --tolerance."""
+        assert parse_tolerances(["latency=0.25"]) == {"latency": 0.25}
+        for invalid in (["cpu=0.1"], ["latency=mucho"], ["latency=-1"]):
+            with pytest.raises(ValueError):
+                parse_tolerances(invalid)
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        """Verifica que un baseline se recupere por nombre y por ruta."""
+        path = save_baseline(BASE, "main", str(tmp_path))
+
+        assert load_document("main", str(tmp_path)) == BASE
+        assert load_document(path) == BASE
+        assert not (tmp_path / "main.json.tmp").exists()
+
+    def test_rejects_invalid_baseline_names(self, tmp_path):
+        """Verifica que el nombre no pueda escapar del directorio."""
+        with pytest.raises(ValueError):
+            save_baseline(BASE, "../fuera", str(tmp_path))
+
+    def test_regression_main_exit_codes(self, tmp_path, capsys):
+        """Verifica 0 sin regresiones, 1 con regresiones y 2 si falta un documento."""
+        slower = document(
+            latencies=[value * 2 for value in BASE["results"]["single"]["samples"]["latency_ms"]],
+            throughput=[50.0, 51.0, 49.0, 50.5, 49.5],
+        )
+        base = tmp_path / "base.json"
+        current = tmp_path / "actual.json"
+        base.write_text(json.dumps(BASE), encoding="utf-8")
+        current.write_text(json.dumps(slower), encoding="utf-8")
+
+        assert regression.main([str(base), str(base)]) == 0
+        assert regression.main([str(base), str(current)]) == 1
+        assert "regression" in capsys.readouterr().out
+        assert regression.main([str(base), "inexistente", "--baseline-dir", str(tmp_path)]) == 2
+
+    def test_suite_saves_and_compares_baseline(self, tmp_path, capsys):
+        """Verifica el flujo --save-baseline / --compare de la suite."""
+        options = [
+            "--scenarios", "parse,format", "--iterations", "10",
+            "--baseline-dir", str(tmp_path),
+        ]
+
+        assert suite_main(options + ["--save-baseline", "main"]) == 0
+        assert (tmp_path / "main.json").exists()
+        # Tolerancias amplias: dos corridas de 10 iteraciones son muy ruidosas
+        code = suite_main(options + ["--compare", "main", "--tolerance", "micro=100"])
+
+        assert code == 0
+        assert "Sin regresiones" in capsys.readouterr().out
+
+    def test_suite_rejects_missing_baseline(self, tmp_path, capsys):
+        """Verifica que comparar contra un baseline inexistente termine con 2."""
+        code = suite_main([
+            "--scenarios", "parse", "--compare", "nada", "--baseline-dir", str(tmp_path),
+        ])
+
+        assert code == 2
+        assert "Error" in capsys.readouterr().err
@@ -0,0 +1,174 @@
+"""Tests para la política de reintentos y el circuit breaker."""
+
+import pytest
+from src.exceptions import CircuitOpenException
+from src.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    RetryPolicy,
+)
+
+
+class FakeClock:
+    """Reloj monótono manual para controlar el enfriamiento."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestRetryPolicy:
+    """Tests para la clase RetryPolicy."""
+
+    def test_should_retry_until_max_attempts(self):
+        """Verifica que se reintente solo mientras queden intentos."""
+        policy = RetryPolicy(max_attempts=3)
+
+        assert [policy.should_retry(n) for n in (1, 2, 3)] == [True, True, False]
+
+    def test_only_transient_statuses_are_retryable(self):
+        """Verifica que solo los 5xx transitorios se reintenten."""
+        policy = RetryPolicy()
+
+        assert policy.is_retryable_status(503)
+        assert not policy.is_retryable_status(404)
+        assert not policy.is_retryable_status(429)
+
+    def test_backoff_is_exponential_with_full_jitter(self):
+        """Verifica que el techo del jitter crezca exponencialmente y se acote."""
+        ceilings = []
+        policy = RetryPolicy(
+            backoff_base=0.5, backoff_max=3, rng=lambda low, high: ceilings.append(high) or high
+        )
+
+        for attempt in (1, 2, 3, 4):
+            policy.backoff(attempt)
+
+        assert ceilings == [0.5, 1.0, 2.0, 3]
+
+    def test_wait_sleeps_the_backoff(self):
+        """Verifica que wait() duerma el valor sorteado."""
+        slept = []
+        policy = RetryPolicy(sleep=slept.append, rng=lambda low, high: high / 2)
+
+        policy.wait(2)
+
+        assert slept == [0.5]
+
+    def test_invalid_attempts_raise_value_error(self):
+        """Verifica que max_attempts menor a 1 sea rechazado."""
+        with pytest.raises(ValueError):
+            RetryPolicy(max_attempts=0)
+
+
+class TestCircuitBreaker:
+    """Tests para la clase CircuitBreaker."""
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.fixture
+    def breaker(self, clock):
+        return CircuitBreaker("api.test", failure_threshold=3, reset_timeout=30, clock=clock)
+
+    def test_opens_after_consecutive_failures(self, breaker):
+        """Verifica que el circuito se abra al llegar al umbral."""
+        for _ in range(3):
+            breaker.before_call()
+            breaker.record_failure()
+
+        assert breaker.state == OPEN
+        with pytest.raises(CircuitOpenException) as exc_info:
+            breaker.before_call()
+        assert exc_info.value.retry_after == 30
+
+    def test_success_resets_failure_count(self, breaker):
+        """Verifica que un éxito reinicie las fallas consecutivas."""
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state == CLOSED
+
+    def test_half_open_allows_a_single_probe(self, breaker, clock):
+        """Verifica que tras el enfriamiento pase una sola consulta de prueba."""
+        for _ in range(3):
+            breaker.record_failure()
+        clock.now = 30
+
+        assert breaker.state == HALF_OPEN
+        breaker.before_call()
+        with pytest.raises(CircuitOpenException):
+            breaker.before_call()
+
+    def test_successful_probe_closes_the_circuit(self, breaker, clock):
+        """Verifica que una prueba exitosa cierre el circuito."""
+        for _ in range(3):
+            breaker.record_failure()
+        clock.now = 30
+        breaker.before_call()
+
+        breaker.record_success()
+
+        assert breaker.state == CLOSED
+        breaker.before_call()
+
+    def test_failed_probe_reopens_the_circuit(self, breaker, clock):
+        """Verifica que una prueba fallida vuelva a abrir el circuito."""
+        for _ in range(3):
+            breaker.record_failure()
+        clock.now = 30
+        breaker.before_call()
+
+        breaker.record_failure()
+
+        assert breaker.state == OPEN
+        assert breaker.stats()["times_opened"] == 2
+
+    def test_released_probe_lets_next_call_through(self, breaker, clock):
+        """Verifica que liberar la prueba no cambie el estado y habilite otra."""
+        for _ in range(3):
+            breaker.record_failure()
+        clock.now = 30
+        breaker.before_call()
+
+        breaker.release_probe()
+
+        assert breaker.state == HALF_OPEN
+        breaker.before_call()
+
+    def test_stats_count_rejected_calls(self, breaker):
+        """Verifica que stats() informe estado y consultas rechazadas."""
+        for _ in range(3):
+            breaker.record_failure()
+        with pytest.raises(CircuitOpenException):
+            breaker.before_call()
+
+        assert breaker.stats() == {
+            "state": OPEN,
+            "consecutive_failures": 3,
+            "times_opened": 1,
+            "rejected": 1,
+        }
+
+
+class TestCircuitBreakerRegistry:
+    """Tests para la clase CircuitBreakerRegistry."""
+
+    def test_one_breaker_per_host(self):
+        """Verifica que cada host tenga su propio breaker."""
+        breakers = CircuitBreakerRegistry(failure_threshold=1, reset_timeout=30)
+
+        breakers.get("a.test").record_failure()
+        breakers.get("b.test")
+
+        assert breakers.get("a.test") is breakers.get("a.test")
+        assert breakers.stats()["a.test"]["state"] == OPEN
+        assert breakers.stats()["b.test"]["state"] == CLOSED
@@ -0,0 +1,320 @@
+"""Tests para el servidor HTTP/JSON embebido."""
+
+import http.client
+import json
+import queue
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+from unittest.mock import Mock
+from src.exceptions import (
+    CircuitOpenException,
+    CityNotFoundException,
+    NetworkException,
+    RateLimitException,
+)
+from src.metrics import RequestMetrics
+from src.server import WeatherHTTPServer, error_status
+
+PARSED = {"city": "Madrid", "country": "ES", "temperature": 18.3}
+
+
+@pytest.fixture
+def service():
+    """Servicio falso: Madrid y Lima existen, el resto no."""
+    mock = Mock(spec=["get_weather", "parse_weather_data", "cache_stats"])
+
+    def get_weather(city):
+        if city not in ("Madrid", "Lima"):
+            raise CityNotFoundException(city)
+        return {"name": city}
+
+    mock.get_weather.side_effect = get_weather
+    mock.parse_weather_data.side_effect = lambda data: {**PARSED, "city": data["name"]}
+    mock.cache_stats.return_value = {"hits": 3, "misses": 1}
+    return mock
+
+
+def start(server):
+    """Atiende el servidor en un hilo y devuelve una función para detenerlo."""
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05})
+    thread.start()
+
+    def stop():
+        server.shutdown()
+        thread.join()
+        server.server_close()
+
+    return stop
+
+
+@pytest.fixture
+def server(service):
+    """Servidor en un puerto libre durante el test."""
+    server = WeatherHTTPServer(("127.0.0.1", 0), service, workers=2, queue_size=4)
+    stop = start(server)
+    yield server
+    stop()
+
+
+def request(server, path, body=None):
+    """Hace una petición y devuelve (código, headers, JSON)."""
+    host, port = server.server_address[:2]
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    req = urllib.request.Request(f"http://{host}:{port}{path}", data=data)
+    try:
+        with urllib.request.urlopen(req, timeout=5) as response:
+            return response.status, response.headers, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, json.loads(e.read())
+
+
+def raw_post(server, path, headers):
+    """Envía un POST sin cuerpo con headers exactos y devuelve (código, JSON)."""
+    host, port = server.server_address[:2]
+    connection = http.client.HTTPConnection(host, port, timeout=5)
+    try:
+        connection.putrequest("POST", path, skip_accept_encoding=True)
+        for name, value in headers.items():
+            connection.putheader(name, value)
+        connection.endheaders()
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+
+class TestWeatherEndpoint:
+    """Tests de GET /weather."""
+
+    def test_returns_parsed_data(self, server):
+        """Verifica que /weather responda los datos de parse_weather_data()."""
+        status, headers, body = request(server, "/weather?city=Madrid")
+
+        assert status == 200
+        assert headers["Content-Type"].startswith("application/json")
+        assert body == PARSED
+
+    def test_unknown_city_is_404(self, server):
+        """Verifica que una ciudad inexistente se responda con 404 y su categoría."""
+        status, _, body = request(server, "/weather?city=Atlantis")
+
+        assert status == 404
+        assert body["error"] == "not_found"
+        assert "Atlantis" in body["message"]
+
+    def test_unknown_route_is_404(self, server):
+        """Verifica que una ruta desconocida responda 404."""
+        status, _, _ = request(server, "/otra")
+
+        assert status == 404
+
+
+class TestBatchEndpoint:
+    """Tests de /weather/batch."""
+
+    def test_post_returns_results_in_input_order(self, server):
+        """Verifica que el batch responda una entrada por ciudad en el orden pedido."""
+        status, _, body = request(
+            server, "/weather/batch", {"cities": ["Lima", "Atlantis", "Madrid"]}
+        )
+
+        assert status == 200
+        assert [r["city"] for r in body["results"]] == ["Lima", "Atlantis", "Madrid"]
+        assert body["results"][0]["data"]["city"] == "Lima"
+        assert body["results"][1]["data"] is None
+        assert body["results"][1]["error"]["error"] == "not_found"
+        assert body["results"][2]["error"] is None
+
+    def test_get_accepts_repeated_city_params(self, server):
+        """Verifica que GET /weather/batch acepte varios parámetros city."""
+        status, _, body = request(server, "/weather/batch?city=Madrid&city=Lima")
+
+        assert status == 200
+        assert [r["data"]["city"] for r in body["results"]] == ["Madrid", "Lima"]
+
+    def test_invalid_body_is_400(self, server):
+        """Verifica que un cuerpo sin lista de ciudades se rechace con 400."""
+        status, _, body = request(server, "/weather/batch", {"cities": "Madrid"})
+
+        assert status == 400
+        assert body["error"] == "invalid_input"
+
+    @pytest.mark.parametrize("length", ["abc", "-1", "1_0"])
+    def test_invalid_content_length_is_400(self, server, length):
+        """Verifica que un Content-Length no numérico o negativo se rechace sin esperar."""
+        started = time.perf_counter()
+        status, body = raw_post(server, "/weather/batch", {"Content-Length": length})
+
+        assert status == 400
+        assert body["error"] == "invalid_input"
+        assert time.perf_counter() - started < 2
+
+    def test_missing_content_length_is_411(self, server):
+        """Verifica que un POST sin Content-Length se rechace con 411."""
+        status, body = raw_post(server, "/weather/batch", {})
+
+        assert status == 411
+        assert body["error"] == "invalid_input"
+
+    def test_too_many_cities_is_413(self, server, monkeypatch):
+        """Verifica que un batch mayor a SERVER_MAX_BATCH se rechace con 413."""
+        monkeypatch.setattr("src.server.Config.SERVER_MAX_BATCH", 2)
+
+        status, _, _ = request(server, "/weather/batch", {"cities": ["A", "B", "C"]})
+
+        assert status == 413
+
+
+class TestMetricsEndpoint:
+    """Tests de GET /metrics."""
+
+    def test_reports_server_and_service_counters(self, server):
+        """Verifica que /metrics incluya los contadores del servidor y del servicio."""
+        request(server, "/weather?city=Madrid")
+        request(server, "/weather?city=Atlantis")
+
+        status, _, body = request(server, "/metrics")
+
+        assert status == 200
+        assert body["server"]["requests"]["/weather"] == {"200": 1, "404": 1}
+        assert body["server"]["shed"] == 0
+        assert body["cache"] == {"hits": 3, "misses": 1}
+        assert "requests" not in body
+
+    def test_includes_rate_limit_budget_when_exposed(self, service):
+        """Verifica que /metrics incluya la cuota del limitador si el servicio la expone."""
+        service.rate_limit_stats = Mock(
+            return_value={"per_minute": 60, "per_day": 0, "minute": 59, "day": -1, "blocked_for": 0.0}
+        )
+        server = WeatherHTTPServer(("127.0.0.1", 0), service, workers=1, queue_size=1)
+        stop = start(server)
+        try:
+            _, _, body = request(server, "/metrics")
+        finally:
+            stop()
+
+        assert body["rate_limit"]["minute"] == 59
+        assert body["rate_limit"]["blocked_for"] == 0.0
+
+    def test_includes_request_metrics_when_instrumented(self, service):
+        """Verifica las fases y contadores del servicio en JSON y en Prometheus."""
+        service.metrics = RequestMetrics()
+        service.metrics.count_outcome("CityNotFoundException")
+        server = WeatherHTTPServer(("127.0.0.1", 0), service, workers=1, queue_size=1)
+        stop = start(server)
+        try:
+            request(server, "/weather?city=Madrid")
+            _, _, body = request(server, "/metrics")
+            host, port = server.server_address[:2]
+            url = f"http://{host}:{port}/metrics?format=prometheus"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                content_type = response.headers["Content-Type"]
+                text = response.read().decode("utf-8")
+        finally:
+            stop()
+
+        assert body["requests"]["outcomes"] == {"CityNotFoundException": 1}
+        assert content_type.startswith("text/plain; version=0.0.4")
+        assert 'weather_server_responses_total{route="/weather",status="200"} 1' in text
+        assert 'weather_requests_total{outcome="CityNotFoundException"} 1' in text
+
+
+class TestLoadShedding:
+    """Tests de la cola acotada y el rechazo con 503."""
+
+    def test_full_queue_responds_503(self, service):
+        """Verifica que con el worker ocupado y la cola llena se responda 503."""
+        entered = threading.Event()
+        release = threading.Event()
+
+        def slow_get_weather(city):
+            entered.set()
+            release.wait(5)
+            return {"name": city}
+
+        service.get_weather.side_effect = slow_get_weather
+        server = WeatherHTTPServer(("127.0.0.1", 0), service, workers=1, queue_size=1)
+        stop = start(server)
+        results = []
+        try:
+            # La primera ocupa al único worker y la segunda la cola
+            busy = [
+                threading.Thread(
+                    target=lambda: results.append(request(server, "/weather?city=Madrid"))
+                )
+                for _ in range(2)
+            ]
+            busy[0].start()
+            assert entered.wait(5)
+            busy[1].start()
+            while server._queue.qsize() == 0:
+                time.sleep(0.01)
+
+            status, headers, body = request(server, "/weather?city=Madrid")
+
+            assert status == 503
+            assert headers["Retry-After"] == "1"
+            assert body["error"] == "overloaded"
+            assert server.metrics.snapshot()["shed"] == 1
+        finally:
+            release.set()
+            for thread in busy:
+                thread.join()
+            stop()
+
+        assert [r[0] for r in results] == [200, 200]
+
+    def test_rejection_does_not_block_accept_thread(self, service, monkeypatch):
+        """Verifica que el 503 se escriba fuera del hilo que acepta conexiones."""
+        server = WeatherHTTPServer(("127.0.0.1", 0), service, workers=1, queue_size=1)
+        monkeypatch.setattr(server._queue, "put_nowait", Mock(side_effect=queue.Full))
+        release = threading.Event()
+        rejected_in = []
+
+        def slow_reject(request):
+            rejected_in.append(threading.current_thread().name)
+            release.wait(5)
+
+        monkeypatch.setattr(server, "_reject", slow_reject)
+        client, accepted = socket.socketpair()
+        try:
+            started = time.perf_counter()
+            server.process_request(accepted, ("127.0.0.1", 0))
+            elapsed = time.perf_counter() - started
+        finally:
+            release.set()
+            server.server_close()
+            client.close()
+
+        assert elapsed < 0.5
+        assert rejected_in == ["weather-shed"]
+        assert server.metrics.snapshot()["shed"] == 1
+
+    def test_invalid_pool_sizes_are_rejected(self, service):
+        """Verifica que workers < 1 se rechace al crear el servidor."""
+        with pytest.raises(ValueError):
+            WeatherHTTPServer(("127.0.0.1", 0), service, workers=0)
+
+
+class TestErrorStatus:
+    """Tests del mapeo de excepciones a códigos HTTP."""
+
+    @pytest.mark.parametrize(
+        "error,status",
+        [
+            (CityNotFoundException("X"), 404),
+            (ValueError("vacío"), 400),
+            (RateLimitException(retry_after=2), 429),
+            (CircuitOpenException("api.test", 5), 503),
+            (NetworkException("timeout"), 504),
+            (RuntimeError("bug"), 500),
+        ],
+    )
+    def test_maps_domain_errors(self, error, status):
+        """Verifica el código HTTP de cada categoría de error."""
+        assert error_status(error) == status
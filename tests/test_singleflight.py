@@ -0,0 +1,76 @@
+"""Tests para el coalescing de consultas en vuelo (SingleFlight)."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from src.exceptions import CityNotFoundException
+from src.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Tests para la clase SingleFlight."""
+
+    def run_concurrently(self, flights, fn, callers=10):
+        """Lanza `callers` llamadas a do() que arrancan todas a la vez."""
+        barrier = threading.Barrier(callers)
+
+        def call():
+            barrier.wait()
+            return flights.do("buenos aires|es|metric", fn)
+
+        with ThreadPoolExecutor(max_workers=callers) as executor:
+            futures = [executor.submit(call) for _ in range(callers)]
+        return futures
+
+    def test_single_call_returns_result_not_shared(self):
+        """Verifica que una llamada sola devuelva el resultado como líder."""
+        assert SingleFlight().do("clave", lambda: 42) == (42, False)
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Verifica que llamadas concurrentes ejecuten la función una sola vez."""
+        flights = SingleFlight()
+        release = threading.Event()
+        executions = []
+
+        def slow_fetch():
+            executions.append(1)
+            release.wait(1)
+            return {"name": "Buenos Aires"}
+
+        threading.Timer(0.1, release.set).start()
+        futures = self.run_concurrently(flights, slow_fetch)
+
+        results = [f.result() for f in futures]
+        assert len(executions) == 1
+        assert all(value == {"name": "Buenos Aires"} for value, _ in results)
+        assert sum(1 for _, shared in results if not shared) == 1
+        assert flights.stats()["coalesced"] == 9
+
+    def test_concurrent_calls_share_the_exception(self):
+        """Verifica que todos los llamadores reciban la excepción del líder."""
+        flights = SingleFlight()
+        release = threading.Event()
+
+        def failing_fetch():
+            release.wait(1)
+            raise CityNotFoundException("Atlantis")
+
+        threading.Timer(0.1, release.set).start()
+        futures = self.run_concurrently(flights, failing_fetch, callers=5)
+
+        for future in futures:
+            with pytest.raises(CityNotFoundException):
+                future.result()
+
+    def test_key_is_released_after_completion(self):
+        """Verifica que una llamada posterior ejecute la función de nuevo."""
+        flights = SingleFlight()
+        counter = iter(range(10))
+
+        flights.do("clave", lambda: next(counter))
+        value, shared = flights.do("clave", lambda: next(counter))
+
+        assert value == 1
+        assert not shared
+        assert flights.stats()["in_flight"] == 0
@@ -0,0 +1,106 @@
+"""Tests del costo de arranque del CLI (importaciones diferidas)."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+import src.config as config_module
+
+# Presupuesto de tiempo de importación en frío de src.main, en milisegundos.
+# Sin importaciones diferidas (requests, sqlite3, concurrent.futures, etc.)
+# el arranque supera los 100 ms; con ellas ronda los 10 ms.
+STARTUP_IMPORT_BUDGET_MS = 50
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_python(code: str, *flags: str) -> subprocess.CompletedProcess:
+    """Ejecuta código en un intérprete nuevo desde la raíz del proyecto."""
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def cold_import_ms(module: str) -> float:
+    """Tiempo acumulado de importar el módulo según `python -X importtime`."""
+    result = run_python(f"import {module}", "-X", "importtime")
+    for line in result.stderr.splitlines():
+        _, cumulative_us, name = line.split("|")
+        if name.strip() == module:
+            return int(cumulative_us) / 1000
+    pytest.fail(f"No se encontró {module} en la salida de -X importtime")
+
+
+class TestStartup:
+    """Tests del arranque en frío del CLI."""
+
+    def test_cold_import_of_cli_is_within_budget(self):
+        """Verifica que importar src.main no supere el presupuesto de arranque."""
+        # El mejor de tres descarta el ruido de una máquina cargada
+        best = min(cold_import_ms("src.main") for _ in range(3))
+
+        assert best <= STARTUP_IMPORT_BUDGET_MS, (
+            f"Importar src.main tomó {best:.1f} ms "
+            f"(presupuesto: {STARTUP_IMPORT_BUDGET_MS} ms)"
+        )
+
+    def test_heavy_modules_are_not_imported_at_startup(self):
+        """Verifica que requests y compañía no se importen al cargar el CLI."""
+        result = run_python(
+            "import sys, src.main\n"
+            "heavy = ('requests', 'urllib3', 'sqlite3', 'concurrent.futures', 'email.utils')\n"
+            "print(','.join(m for m in heavy if m in sys.modules))"
+        )
+
+        assert result.stdout.strip() == ""
+
+    def test_service_creates_http_session_on_first_use(self):
+        """Verifica que crear WeatherService no importe requests hasta usarlo."""
+        result = run_python(
+            "import sys\n"
+            "from src.weather_service import WeatherService\n"
+            "service = WeatherService(skip_validation=True)\n"
+            "print('requests' in sys.modules)\n"
+            "service.session\n"
+            "print('requests' in sys.modules)"
+        )
+
+        assert result.stdout.split() == ["False", "True"]
+
+
+class TestLoadEnv:
+    """Tests de la carga diferida y cacheada del archivo .env."""
+
+    def test_env_file_is_parsed_once(self, monkeypatch):
+        """Verifica que load_env() busque y cargue el .env una sola vez."""
+        calls = []
+        monkeypatch.setattr(
+            config_module, "find_env_file", lambda: calls.append(1) or None
+        )
+        config_module.load_env.cache_clear()
+
+        try:
+            config_module.load_env()
+            config_module.load_env()
+        finally:
+            config_module.load_env.cache_clear()
+
+        assert calls == [1]
+
+    def test_dotenv_is_not_imported_without_env_file(self, monkeypatch):
+        """Verifica que sin archivo .env no se importe python-dotenv."""
+        monkeypatch.setattr(config_module, "find_env_file", lambda: None)
+        monkeypatch.delitem(sys.modules, "dotenv", raising=False)
+        config_module.load_env.cache_clear()
+
+        try:
+            assert config_module.load_env() is None
+        finally:
+            config_module.load_env.cache_clear()
+
+        assert "dotenv" not in sys.modules
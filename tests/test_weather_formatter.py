@@ -87,6 +87,15 @@ class TestWeatherFormatter:
         assert "🎚️" in result   # Presión
         assert "📍" in result   # Coordenadas
 
+    def test_format_weather_without_emojis(self, sample_weather_data):
+        """Verifica que emojis=False conserve los datos y quite los emojis."""
+        result = WeatherFormatter.format_weather(sample_weather_data, emojis=False)
+
+        assert "Temperatura:" in result
+        assert "🌡️" not in result
+        assert "📍" not in result
+        assert "❌" not in WeatherFormatter.format_error("Falla", emojis=False)
+
     def test_format_weather_includes_separator(self, sample_weather_data):
         """Verifica que el formato incluya líneas decorativas."""
         result = WeatherFormatter.format_weather(sample_weather_data)
@@ -1,15 +1,31 @@
 """Tests para el servicio de clima."""
 
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 import requests
+import responses
 from unittest.mock import Mock, patch, MagicMock
+from src.cache import TTLCache, make_cache_key
+from src.city_index import CityIndex, build_index
+from src.disk_cache import DiskCache
+from src.latency import HedgeBudget, LatencyTracker
+from src.models import WeatherReading
 from src.weather_service import WeatherService
 from src.exceptions import (
+    CircuitOpenException,
     CityNotFoundException,
     InvalidAPIKeyException,
     NetworkException,
+    RateLimitException,
+    ServerErrorException,
     WeatherAPIException,
 )
+from src.rate_limiter import RateLimiter
+from src.resilience import CircuitBreakerRegistry, RetryPolicy
 from tests.fixtures.api_responses import (
     get_successful_response,
     get_madrid_response,
@@ -39,7 +55,7 @@ class TestWeatherService:
         mock_response.status_code = 200
         mock_response.json.return_value = get_successful_response()
         
-        monkeypatch.setattr("requests.get", lambda *args, **kwargs: mock_response)
+        monkeypatch.setattr("requests.Session.get", lambda *args, **kwargs: mock_response)
         
         result = weather_service.get_weather("Buenos Aires")
         
@@ -68,7 +84,7 @@ class TestWeatherService:
         mock_response.json.return_value = get_successful_response()
         
         mock_get = Mock(return_value=mock_response)
-        monkeypatch.setattr("requests.get", mock_get)
+        monkeypatch.setattr("requests.Session.get", mock_get)
         
         weather_service.get_weather("  Madrid  ")
         
@@ -83,7 +99,7 @@ class TestWeatherService:
         mock_response.status_code = 404
         mock_response.json.return_value = get_not_found_response()
         
-        monkeypatch.setattr("requests.get", lambda *args, **kwargs: mock_response)
+        monkeypatch.setattr("requests.Session.get", lambda *args, **kwargs: mock_response)
         
         with pytest.raises(CityNotFoundException) as exc_info:
             weather_service.get_weather("CiudadInexistente")
@@ -96,7 +112,7 @@ class TestWeatherService:
         mock_response.status_code = 401
         mock_response.json.return_value = get_unauthorized_response()
         
-        monkeypatch.setattr("requests.get", lambda *args, **kwargs: mock_response)
+        monkeypatch.setattr("requests.Session.get", lambda *args, **kwargs: mock_response)
         
         with pytest.raises(InvalidAPIKeyException):
             weather_service.get_weather("Madrid")
@@ -107,7 +123,7 @@ class TestWeatherService:
         mock_response.status_code = 500
         mock_response.text = "Internal Server Error"
         
-        monkeypatch.setattr("requests.get", lambda *args, **kwargs: mock_response)
+        monkeypatch.setattr("requests.Session.get", lambda *args, **kwargs: mock_response)
         
         with pytest.raises(WeatherAPIException) as exc_info:
             weather_service.get_weather("Madrid")
@@ -119,7 +135,7 @@ class TestWeatherService:
         def mock_get(*args, **kwargs):
             raise requests.exceptions.Timeout("Connection timed out")
         
-        monkeypatch.setattr("requests.get", mock_get)
+        monkeypatch.setattr("requests.Session.get", mock_get)
         
         with pytest.raises(NetworkException) as exc_info:
             weather_service.get_weather("Madrid")
@@ -131,7 +147,7 @@ class TestWeatherService:
         def mock_get(*args, **kwargs):
             raise requests.exceptions.ConnectionError("Connection failed")
         
-        monkeypatch.setattr("requests.get", mock_get)
+        monkeypatch.setattr("requests.Session.get", mock_get)
         
         with pytest.raises(NetworkException) as exc_info:
             weather_service.get_weather("Madrid")
@@ -183,6 +199,29 @@ class TestWeatherService:
         
         assert result["description"][0].isupper()  # Primera letra en mayúscula
 
+    def test_parse_weather_data_returns_compact_reading(self, weather_service):
+        """Verifica que parse_weather_data() devuelva un WeatherReading con vista de dict."""
+        result = weather_service.parse_weather_data(get_madrid_response())
+
+        assert isinstance(result, WeatherReading)
+        assert result.city == result["city"] == "Madrid"
+
+    def test_parse_weather_json_matches_parse_weather_data(self, weather_service):
+        """Verifica que parsear el cuerpo crudo dé la misma lectura que el dict."""
+        data = get_madrid_response()
+
+        result = weather_service.parse_weather_json(json.dumps(data).encode("utf-8"))
+
+        assert result == weather_service.parse_weather_data(data)
+
+    @pytest.mark.parametrize("body", [b"<html>", json.dumps(get_malformed_response())])
+    def test_parse_weather_json_raises_api_exception(self, weather_service, body):
+        """Verifica que un cuerpo inválido o incompleto lance WeatherAPIException."""
+        with pytest.raises(WeatherAPIException) as exc_info:
+            weather_service.parse_weather_json(body)
+
+        assert "parsear" in str(exc_info.value).lower()
+
     def test_weather_service_uses_config_timeout(self, weather_service, monkeypatch):
         """Verifica que WeatherService use el timeout de Config."""
         mock_response = Mock()
@@ -190,10 +229,684 @@ class TestWeatherService:
         mock_response.json.return_value = get_successful_response()
         
         mock_get = Mock(return_value=mock_response)
-        monkeypatch.setattr("requests.get", mock_get)
+        monkeypatch.setattr("requests.Session.get", mock_get)
         
         weather_service.get_weather("Madrid")
         
         # Verificar que se llamó con el timeout correcto (10 del autofixture)
         call_kwargs = mock_get.call_args[1]
         assert call_kwargs.get("timeout") == 10
+
+    def test_get_weather_reuses_the_same_session(self, weather_service, monkeypatch):
+        """Verifica que todas las consultas usen la misma sesión (keep-alive)."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = get_successful_response()
+
+        sessions = []
+
+        def mock_get(session, *args, **kwargs):
+            sessions.append(session)
+            return mock_response
+
+        monkeypatch.setattr("requests.Session.get", mock_get)
+
+        weather_service.get_weather("Madrid")
+        weather_service.get_weather("Buenos Aires")
+
+        assert sessions == [weather_service.session, weather_service.session]
+
+    def test_session_adapter_uses_configured_pool_size(self, monkeypatch):
+        """Verifica que el adapter HTTP use el tamaño de pool de Config."""
+        monkeypatch.setattr("src.weather_service.Config.POOL_CONNECTIONS", 3)
+        monkeypatch.setattr("src.weather_service.Config.POOL_MAXSIZE", 25)
+
+        service = WeatherService(skip_validation=True)
+        adapter = service.session.get_adapter("https://api.openweathermap.org")
+
+        assert adapter._pool_connections == 3
+        assert adapter._pool_maxsize == 25
+
+    def test_context_manager_closes_own_session(self):
+        """Verifica que el bloque with cierre la sesión creada por el servicio."""
+        with WeatherService(skip_validation=True) as service:
+            service.session.close = Mock()
+
+        service.session.close.assert_called_once()
+
+    def test_close_does_not_close_injected_session(self):
+        """Verifica que close() no cierre una sesión provista externamente."""
+        session = Mock(spec=requests.Session)
+
+        service = WeatherService(skip_validation=True, session=session)
+        service.close()
+
+        session.close.assert_not_called()
+
+    def test_close_closes_disk_cache(self):
+        """Verifica que close() cierre la caché en disco."""
+        disk_cache = Mock(spec=DiskCache)
+
+        service = WeatherService(skip_validation=True, disk_cache=disk_cache)
+        service.close()
+
+        disk_cache.close.assert_called_once()
+
+    @responses.activate
+    def test_get_weather_serves_repeated_city_from_cache(self):
+        """Verifica que una ciudad repetida no vuelva a consultar la API."""
+        responses.add(
+            responses.GET,
+            "https://api.openweathermap.org/data/2.5/weather",
+            json=get_successful_response(),
+        )
+        service = WeatherService(skip_validation=True, cache=TTLCache(ttl=60))
+
+        first = service.get_weather("Buenos Aires")
+        second = service.get_weather("  buenos aires ")
+
+        assert first == second
+        assert len(responses.calls) == 1
+        assert service.cache.stats()["hits"] == 1
+
+    @responses.activate
+    def test_get_weather_does_not_cache_errors(self):
+        """Verifica que las respuestas de error no se guarden en la caché."""
+        responses.add(
+            responses.GET,
+            "https://api.openweathermap.org/data/2.5/weather",
+            json=get_not_found_response(),
+            status=404,
+        )
+        service = WeatherService(skip_validation=True, cache=TTLCache(ttl=60))
+
+        for _ in range(2):
+            with pytest.raises(CityNotFoundException):
+                service.get_weather("Atlantis")
+
+        assert len(responses.calls) == 2
+
+    @responses.activate
+    def test_get_weather_serves_fresh_entry_from_disk_cache(self, tmp_path):
+        """Verifica que otra instancia reutilice la respuesta guardada en disco."""
+        responses.add(
+            responses.GET,
+            "https://api.openweathermap.org/data/2.5/weather",
+            json=get_successful_response(),
+        )
+        disk_cache = DiskCache(str(tmp_path), ttl=60)
+
+        WeatherService(skip_validation=True, disk_cache=disk_cache).get_weather("Buenos Aires")
+        result = WeatherService(skip_validation=True, disk_cache=disk_cache).get_weather(
+            "Buenos Aires"
+        )
+
+        assert result["name"] == "Buenos Aires"
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_get_reading_serves_raw_cached_bytes_without_decoding(self, tmp_path):
+        """Verifica que get_reading() devuelva los bytes de la caché sin decodificarlos."""
+        responses.add(
+            responses.GET,
+            "https://api.openweathermap.org/data/2.5/weather",
+            json=get_successful_response(),
+        )
+        disk_cache = DiskCache(str(tmp_path), ttl=60)
+        WeatherService(skip_validation=True, disk_cache=disk_cache).get_weather("Buenos Aires")
+
+        reading = WeatherService(skip_validation=True, disk_cache=disk_cache).get_reading(
+            "Buenos Aires"
+        )
+
+        assert len(responses.calls) == 1
+        assert reading.raw == disk_cache.get(make_cache_key("Buenos Aires")).body
+        assert not reading.decoded
+        assert reading.temperature == 25.5
+        assert reading.decoded
+
+    @responses.activate
+    def test_get_reading_fetches_and_caches_on_miss(self):
+        """Verifica que sin caché get_reading() consulte la API y guarde el cuerpo."""
+        responses.add(
+            responses.GET,
+            "https://api.openweathermap.org/data/2.5/weather",
+            json=get_successful_response(),
+        )
+        service = WeatherService(skip_validation=True, cache=TTLCache(ttl=60))
+
+        reading = service.get_reading("Buenos Aires")
+
+        assert reading == service.parse_weather_data(service.get_weather("Buenos Aires"))
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_get_weather_serves_stale_entry_and_refreshes(self, tmp_path):
+        """Verifica stale-while-revalidate: responde vencido y refresca detrás."""
+        responses.add(
+            responses.GET,
+            "https://api.openweathermap.org/data/2.5/weather",
+            json=get_successful_response(),
+        )
+        now = [1_700_000_000.0]
+        disk_cache = DiskCache(str(tmp_path), ttl=60, stale_ttl=600, clock=lambda: now[0])
+        key = make_cache_key("Buenos Aires")
+        disk_cache.set(key, b'{"name": "Vieja"}')
+        now[0] += 120
+
+        service = WeatherService(skip_validation=True, disk_cache=disk_cache)
+        result = service.get_weather("Buenos Aires")
+        service.close()  # espera al refresco en segundo plano
+
+        assert result["name"] == "Vieja"
+        assert len(responses.calls) == 1
+        assert disk_cache.get(key).fresh
+
+    def test_concurrent_lookups_of_same_city_share_one_request(self, weather_service, monkeypatch):
+        """Verifica que consultas simultáneas de una ciudad hagan una sola petición."""
+        release = threading.Event()
+        calls = []
+
+        def slow_get(*args, **kwargs):
+            calls.append(1)
+            release.wait(1)
+            mock_response = Mock()
+            mock_response.status_code = 200
+            mock_response.json.return_value = get_successful_response()
+            return mock_response
+
+        monkeypatch.setattr("requests.Session.get", slow_get)
+        barrier = threading.Barrier(8)
+
+        def lookup():
+            barrier.wait()
+            return weather_service.get_weather("Buenos Aires")
+
+        threading.Timer(0.1, release.set).start()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = [f.result() for f in [executor.submit(lookup) for _ in range(8)]]
+
+        assert len(calls) == 1
+        assert all(r["name"] == "Buenos Aires" for r in results)
+        # Cada llamador recibe su propia copia del diccionario
+        assert len({id(r) for r in results}) == 8
+
+    @responses.activate
+    def test_get_weather_many_splits_ids_into_chunks(self, monkeypatch):
+        """Verifica que los IDs se consulten en lotes del tamaño máximo."""
+        monkeypatch.setattr("src.weather_service.Config.GROUP_MAX_IDS", 2)
+        madrid = get_madrid_response()
+        buenos_aires = get_successful_response()
+
+        def group_callback(request):
+            ids = request.params["id"].split(",")
+            records = [r for r in (buenos_aires, madrid) if str(r["id"]) in ids]
+            return 200, {}, json.dumps({"cnt": len(records), "list": records})
+
+        responses.add_callback(
+            responses.GET,
+            "https://api.openweathermap.org/data/2.5/group",
+            callback=group_callback,
+        )
+        service = WeatherService(skip_validation=True)
+
+        results = service.get_weather_many([3117735, 3435910, 3117735, 999])
+
+        assert len(responses.calls) == 2  # 3 IDs únicos en lotes de 2
+        assert [r.city for r in results] == ["3117735", "3435910", "3117735", "999"]
+        assert results[0].data["city"] == "Madrid"
+        assert results[1].data["city"] == "Buenos Aires"
+        assert isinstance(results[3].error, CityNotFoundException)
+
+    @responses.activate
+    def test_get_weather_many_reports_chunk_failure_per_city(self):
+        """Verifica que un error del lote se informe en cada ciudad del lote."""
+        responses.add(
+            responses.GET,
+            "https://api.openweathermap.org/data/2.5/group",
+            json=get_unauthorized_response(),
+            status=401,
+        )
+        service = WeatherService(skip_validation=True)
+
+        results = service.get_weather_many([3117735, 3435910])
+
+        assert all(isinstance(r.error, InvalidAPIKeyException) for r in results)
+
+    @responses.activate
+    def test_get_weather_raises_api_exception_on_malformed_body(self):
+        """Verifica que un 200 con cuerpo que no es JSON lance WeatherAPIException."""
+        responses.add(
+            responses.GET,
+            "https://api.openweathermap.org/data/2.5/weather",
+            body="<html>Bad Gateway</html>",
+            status=200,
+        )
+        service = WeatherService(skip_validation=True)
+
+        with pytest.raises(WeatherAPIException, match="Error al parsear"):
+            service.get_weather("Madrid")
+
+    @responses.activate
+    @pytest.mark.parametrize("body", ["<html>Bad Gateway</html>", "[]"])
+    def test_get_weather_many_reports_malformed_body_per_city(self, body):
+        """Verifica que un lote con cuerpo inválido sea un error de cada ciudad."""
+        responses.add(
+            responses.GET,
+            "https://api.openweathermap.org/data/2.5/group",
+            body=body,
+            status=200,
+        )
+        service = WeatherService(skip_validation=True)
+
+        results = service.get_weather_many([3117735, 3435910])
+
+        assert all(isinstance(r.error, WeatherAPIException) for r in results)
+        assert all("Error al parsear" in str(r.error) for r in results)
+
+    def test_get_weather_many_rejects_invalid_ids(self, weather_service):
+        """Verifica que IDs no enteros o no positivos lancen ValueError."""
+        with pytest.raises(ValueError):
+            weather_service.get_weather_many([3117735, "Madrid"])
+
+    @responses.activate
+    def test_get_weather_with_city_index_queries_by_id(self, tmp_path):
+        """Verifica que con índice la consulta se haga por ID."""
+        responses.add(
+            responses.GET,
+            "https://api.openweathermap.org/data/2.5/weather",
+            json=get_madrid_response(),
+        )
+        path = tmp_path / "ciudades.idx"
+        build_index([{"id": 3117735, "name": "Madrid", "country": "ES"}], str(path))
+        service = WeatherService(skip_validation=True, city_index=CityIndex.open(str(path)))
+
+        service.get_weather("madrid, es")
+
+        assert "id=3117735" in responses.calls[0].request.url
+
+    def test_get_weather_with_city_index_rejects_unknown_city_without_http(
+        self, tmp_path, monkeypatch
+    ):
+        """Verifica que un nombre desconocido falle sin petición HTTP."""
+        mock_get = Mock()
+        monkeypatch.setattr("requests.Session.get", mock_get)
+        path = tmp_path / "ciudades.idx"
+        build_index([{"id": 3117735, "name": "Madrid", "country": "ES"}], str(path))
+        service = WeatherService(skip_validation=True, city_index=CityIndex.open(str(path)))
+
+        with pytest.raises(CityNotFoundException):
+            service.get_weather("Madridd")
+
+        mock_get.assert_not_called()
+
+    @responses.activate
+    def test_negative_cache_rejects_repeated_unknown_city_without_http(self):
+        """Verifica que una ciudad que dio 404 falle sin repetir la consulta."""
+        responses.add(
+            responses.GET,
+            "https://api.openweathermap.org/data/2.5/weather",
+            json=get_not_found_response(),
+            status=404,
+        )
+        service = WeatherService(skip_validation=True, negative_cache=TTLCache(ttl=60))
+
+        for _ in range(3):
+            with pytest.raises(CityNotFoundException) as exc_info:
+                service.get_weather("Atlantis")
+
+        assert "Atlantis" in str(exc_info.value)
+        assert len(responses.calls) == 1
+        assert service.cache_stats()["negative"]["hits"] == 2
+
+    @responses.activate
+    def test_clear_cache_negative_only_forgets_unknown_cities(self):
+        """Verifica que clear_cache(negative_only=True) vuelva a consultar la API."""
+        responses.add(
+            responses.GET,
+            "https://api.openweathermap.org/data/2.5/weather",
+            json=get_not_found_response(),
+            status=404,
+        )
+        service = WeatherService(skip_validation=True, negative_cache=TTLCache(ttl=60))
+
+        with pytest.raises(CityNotFoundException):
+            service.get_weather("Atlantis")
+        service.clear_cache(negative_only=True)
+        with pytest.raises(CityNotFoundException):
+            service.get_weather("Atlantis")
+
+        assert len(responses.calls) == 2
+
+    @responses.activate
+    def test_negative_results_persist_in_disk_cache(self, tmp_path):
+        """Verifica que otra instancia rechace sin red una ciudad que dio 404."""
+        responses.add(
+            responses.GET,
+            "https://api.openweathermap.org/data/2.5/weather",
+            json=get_not_found_response(),
+            status=404,
+        )
+        disk_cache = DiskCache(str(tmp_path), ttl=60, negative_ttl=60)
+
+        for _ in range(2):
+            service = WeatherService(skip_validation=True, disk_cache=disk_cache)
+            with pytest.raises(CityNotFoundException):
+                service.get_weather("Atlantis")
+
+        assert len(responses.calls) == 1
+        assert service.cache_stats()["disk"]["negative_hits"] == 1
+
+    @responses.activate
+    def test_get_weather_raises_rate_limit_exception_on_429(self):
+        """Verifica que un 429 lance RateLimitException y bloquee el limitador."""
+        responses.add(
+            responses.GET,
+            "https://api.openweathermap.org/data/2.5/weather",
+            json={"cod": 429, "message": "Too many requests"},
+            status=429,
+            headers={"Retry-After": "30"},
+        )
+        limiter = RateLimiter(per_minute=60)
+        service = WeatherService(skip_validation=True, rate_limiter=limiter)
+
+        with pytest.raises(RateLimitException) as exc_info:
+            service.get_weather("Madrid")
+
+        assert exc_info.value.retry_after == 30.0
+        assert limiter.remaining()["blocked_for"] > 29
+
+    @responses.activate
+    def test_get_weather_consumes_rate_limiter_tokens(self):
+        """Verifica que cada petición HTTP consuma un token del limitador."""
+        responses.add(
+            responses.GET,
+            "https://api.openweathermap.org/data/2.5/weather",
+            json=get_madrid_response(),
+        )
+        limiter = RateLimiter(per_minute=10)
+        service = WeatherService(skip_validation=True, rate_limiter=limiter)
+
+        service.get_weather("Madrid")
+        service.get_weather("Lima")
+
+        assert limiter.remaining()["minute"] == 8
+
+    def test_rate_limit_stats_reports_limiter_budget(self):
+        """Verifica que rate_limit_stats() exponga la cuota del limitador."""
+        limiter = RateLimiter(per_minute=10, per_day=100)
+        limiter.acquire()
+        service = WeatherService(skip_validation=True, rate_limiter=limiter)
+
+        assert service.rate_limit_stats() == {
+            "per_minute": 10, "per_day": 100, "minute": 9, "day": 99, "blocked_for": 0.0,
+        }
+        assert WeatherService(skip_validation=True).rate_limit_stats() == {}
+
+
+class TestResilience:
+    """Tests de reintentos y circuit breaker en WeatherService."""
+
+    URL = "https://api.openweathermap.org/data/2.5/weather"
+
+    @pytest.fixture(autouse=True)
+    def setup_env(self, monkeypatch):
+        """Configura una API key de prueba."""
+        monkeypatch.setattr("src.weather_service.Config.API_KEY", "test_api_key")
+
+    @pytest.fixture
+    def no_wait_policy(self):
+        """Política de 3 intentos que no duerme entre reintentos."""
+        return RetryPolicy(max_attempts=3, sleep=lambda s: None)
+
+    @responses.activate
+    def test_retries_transient_server_error_then_succeeds(self, no_wait_policy):
+        """Verifica que un 503 transitorio se reintente hasta obtener 200."""
+        responses.add(responses.GET, self.URL, body="Service Unavailable", status=503)
+        responses.add(responses.GET, self.URL, json=get_madrid_response())
+        service = WeatherService(skip_validation=True, retry_policy=no_wait_policy)
+
+        data = service.get_weather("Madrid")
+
+        assert data["name"] == "Madrid"
+        assert len(responses.calls) == 2
+
+    @responses.activate
+    def test_retries_timeouts(self, no_wait_policy):
+        """Verifica que los timeouts se reintenten."""
+        responses.add(responses.GET, self.URL, body=requests.exceptions.Timeout())
+        responses.add(responses.GET, self.URL, json=get_madrid_response())
+        service = WeatherService(skip_validation=True, retry_policy=no_wait_policy)
+
+        assert service.get_weather("Madrid")["name"] == "Madrid"
+
+    @responses.activate
+    def test_gives_up_after_max_attempts(self, no_wait_policy):
+        """Verifica que tras agotar los intentos se lance ServerErrorException."""
+        responses.add(responses.GET, self.URL, body="Bad Gateway", status=502)
+        service = WeatherService(skip_validation=True, retry_policy=no_wait_policy)
+
+        with pytest.raises(ServerErrorException) as exc_info:
+            service.get_weather("Madrid")
+
+        assert exc_info.value.status_code == 502
+        assert len(responses.calls) == 3
+
+    @responses.activate
+    def test_client_errors_are_not_retried(self, no_wait_policy):
+        """Verifica que un 404 no se reintente."""
+        responses.add(
+            responses.GET, self.URL, json=get_not_found_response(), status=404
+        )
+        service = WeatherService(skip_validation=True, retry_policy=no_wait_policy)
+
+        with pytest.raises(CityNotFoundException):
+            service.get_weather("Atlantis")
+
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_open_circuit_fails_fast_without_network(self):
+        """Verifica que con el circuito abierto no se haga la petición HTTP."""
+        responses.add(responses.GET, self.URL, body="Internal Server Error", status=500)
+        breakers = CircuitBreakerRegistry(failure_threshold=2, reset_timeout=60)
+        service = WeatherService(
+            skip_validation=True, coalesce=False, circuit_breakers=breakers
+        )
+
+        for _ in range(2):
+            with pytest.raises(ServerErrorException):
+                service.get_weather("Madrid")
+        with pytest.raises(CircuitOpenException):
+            service.get_weather("Madrid")
+
+        assert len(responses.calls) == 2
+        stats = service.circuit_stats()["api.openweathermap.org"]
+        assert stats["state"] == "open"
+        assert stats["rejected"] == 1
+
+    @responses.activate
+    def test_client_errors_do_not_open_the_circuit(self):
+        """Verifica que los 404 no cuenten como fallas del host."""
+        responses.add(
+            responses.GET, self.URL, json=get_not_found_response(), status=404
+        )
+        breakers = CircuitBreakerRegistry(failure_threshold=1, reset_timeout=60)
+        service = WeatherService(skip_validation=True, circuit_breakers=breakers)
+
+        for _ in range(3):
+            with pytest.raises(CityNotFoundException):
+                service.get_weather("Atlantis")
+
+        assert service.circuit_stats()["api.openweathermap.org"]["state"] == "closed"
+
+    @responses.activate
+    def test_non_network_error_during_probe_releases_it(self):
+        """Verifica que un error del limitador en half-open no deje el circuito trabado."""
+        responses.add(responses.GET, self.URL, body="Internal Server Error", status=500)
+        responses.add(responses.GET, self.URL, json=get_madrid_response())
+        breakers = CircuitBreakerRegistry(failure_threshold=1, reset_timeout=0)
+        limiter = Mock()
+        limiter.acquire.side_effect = [None, RateLimitException(retry_after=1), None]
+        service = WeatherService(
+            skip_validation=True, coalesce=False, circuit_breakers=breakers,
+            rate_limiter=limiter,
+        )
+
+        with pytest.raises(ServerErrorException):
+            service.get_weather("Madrid")
+        with pytest.raises(RateLimitException):
+            service.get_weather("Madrid")
+
+        assert service.get_weather("Madrid")["name"] == "Madrid"
+        assert service.circuit_stats()["api.openweathermap.org"]["state"] == "closed"
+
+
+class TestLatencyAwareRequests:
+    """Tests de timeouts adaptativos y hedging en WeatherService."""
+
+    ENDPOINT = "/data/2.5/weather"
+
+    @pytest.fixture(autouse=True)
+    def setup_env(self, monkeypatch):
+        """Configura API key y timeouts de prueba."""
+        monkeypatch.setattr("src.weather_service.Config.API_KEY", "test_api_key")
+        monkeypatch.setattr("src.latency.Config.TIMEOUT", 10)
+        monkeypatch.setattr("src.latency.Config.CONNECT_TIMEOUT", 3.0)
+
+    @staticmethod
+    def ok_response():
+        response = Mock()
+        response.status_code = 200
+        response.json.return_value = get_madrid_response()
+        return response
+
+    def test_records_latency_per_endpoint(self):
+        """Verifica que cada respuesta alimente el histograma del endpoint."""
+        session = Mock()
+        session.get.return_value = self.ok_response()
+        service = WeatherService(skip_validation=True, session=session)
+
+        service.get_weather("Madrid")
+
+        assert service.latency_stats()[self.ENDPOINT]["count"] == 1
+
+    def test_adaptive_timeouts_pass_connect_and_read(self):
+        """Verifica que con timeouts adaptativos se pase (connect, read)."""
+        session = Mock()
+        session.get.return_value = self.ok_response()
+        latency = LatencyTracker(min_samples=3)
+        for _ in range(3):
+            latency.record(self.ENDPOINT, 0.5)
+        service = WeatherService(
+            skip_validation=True, session=session, latency=latency, adaptive_timeouts=True
+        )
+
+        service.get_weather("Madrid")
+
+        assert session.get.call_args.kwargs["timeout"] == (1.5, 1.5)
+
+    def test_timeouts_feed_the_adaptive_timeout(self):
+        """Verifica que un timeout se registre y agrande el siguiente timeout."""
+        session = Mock()
+        session.get.side_effect = requests.exceptions.ReadTimeout()
+        latency = LatencyTracker(window=10, min_samples=3)
+        for _ in range(10):
+            latency.record(self.ENDPOINT, 0.1)
+        service = WeatherService(
+            skip_validation=True, session=session, latency=latency,
+            adaptive_timeouts=True, coalesce=False,
+        )
+
+        for _ in range(3):
+            with pytest.raises(NetworkException, match="Timeout"):
+                service.get_weather("Madrid")
+
+        timeouts = [call.kwargs["timeout"][1] for call in session.get.call_args_list]
+        assert timeouts == [1.0, 3.0, 9.0]
+
+    def test_connect_timeout_reports_connect_and_records_read_length_sample(self):
+        """Verifica que un connect agotado informe su timeout y no achique el read."""
+        session = Mock()
+        session.get.side_effect = requests.exceptions.ConnectTimeout()
+        latency = LatencyTracker(window=10, min_samples=3)
+        for _ in range(10):
+            latency.record(self.ENDPOINT, 0.1)
+        latency.record_timeout = Mock(wraps=latency.record_timeout)
+        service = WeatherService(
+            skip_validation=True, session=session, latency=latency,
+            adaptive_timeouts=True, coalesce=False,
+        )
+
+        with pytest.raises(NetworkException, match=r"conectar con la API \(>0.5s\)"):
+            service.get_weather("Madrid")
+
+        latency.record_timeout.assert_called_once_with(self.ENDPOINT, 1.0)
+
+    def test_read_timeout_reports_read_timeout(self):
+        """Verifica que un read agotado informe el read timeout."""
+        session = Mock()
+        session.get.side_effect = requests.exceptions.ReadTimeout()
+        latency = LatencyTracker(window=10, min_samples=3)
+        for _ in range(10):
+            latency.record(self.ENDPOINT, 0.1)
+        service = WeatherService(
+            skip_validation=True, session=session, latency=latency,
+            adaptive_timeouts=True, coalesce=False,
+        )
+
+        with pytest.raises(NetworkException, match=r"respuesta de la API \(>1s\)"):
+            service.get_weather("Madrid")
+
+    def test_hedges_slow_request_and_returns_first_response(self):
+        """Verifica que una petición lenta se duplique y gane el duplicado."""
+        release = threading.Event()
+        calls = []
+
+        def fake_get(url, timeout):
+            calls.append(url)
+            if len(calls) == 1:
+                release.wait(5)  # la petición original queda colgada
+            return self.ok_response()
+
+        session = Mock()
+        session.get.side_effect = fake_get
+        latency = LatencyTracker(min_samples=1)
+        latency.record(self.ENDPOINT, 0.01)
+        budget = HedgeBudget(ratio=1.0)
+        service = WeatherService(
+            skip_validation=True, session=session, latency=latency, hedge_budget=budget
+        )
+
+        try:
+            data = service.get_weather("Madrid")
+        finally:
+            release.set()
+            service.close()
+
+        assert data["name"] == "Madrid"
+        assert len(calls) == 2
+        assert service.latency_stats()["hedging"] == {"requests": 1, "hedged": 1, "wins": 1}
+
+    def test_does_not_hedge_without_budget(self):
+        """Verifica que sin presupuesto disponible no se envíe el duplicado."""
+        session = Mock()
+
+        def slow_get(url, timeout):
+            time.sleep(0.05)
+            return self.ok_response()
+
+        session.get.side_effect = slow_get
+        latency = LatencyTracker(min_samples=1)
+        latency.record(self.ENDPOINT, 0.001)
+        service = WeatherService(
+            skip_validation=True,
+            session=session,
+            latency=latency,
+            hedge_budget=HedgeBudget(ratio=0.0),
+        )
+
+        with service:
+            service.get_weather("Madrid")
+
+        assert session.get.call_count == 1
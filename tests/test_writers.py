@@ -0,0 +1,126 @@
+"""Tests para los escritores de resultados del modo batch."""
+
+import csv
+import io
+import json
+
+import pytest
+from src.batch import BatchResult
+from src.exceptions import CityNotFoundException
+from src.models import FIELDS, WeatherReading
+from src.writers import FORMATS, create_writer
+from tests.fixtures.api_responses import get_madrid_response
+
+
+class CountingStream(io.BytesIO):
+    """BytesIO que cuenta las llamadas a write() y puede simular una TTY."""
+
+    def __init__(self, tty=False):
+        super().__init__()
+        self.tty = tty
+        self.writes = 0
+
+    def write(self, data):
+        self.writes += 1
+        return super().write(data)
+
+    def isatty(self):
+        return self.tty
+
+
+@pytest.fixture
+def ok_result():
+    """Resultado exitoso para Madrid."""
+    return BatchResult("Madrid", data=WeatherReading.from_api(get_madrid_response()), error=None)
+
+
+@pytest.fixture
+def error_result():
+    """Resultado con ciudad inexistente."""
+    return BatchResult("Atlantis", data=None, error=CityNotFoundException("Atlantis"))
+
+
+def write_all(output_format, results, **kwargs):
+    """Escribe los resultados con el formato pedido y devuelve el texto."""
+    stream = CountingStream()
+    with create_writer(output_format, stream, **kwargs) as writer:
+        for result in results:
+            writer.write(result)
+    return stream.getvalue().decode("utf-8"), writer
+
+
+class TestWriters:
+    """Tests para los formatos de salida."""
+
+    def test_ndjson_writes_one_object_per_line(self, ok_result, error_result):
+        """Verifica que cada línea NDJSON sea un objeto con city, data y error."""
+        text, writer = write_all("ndjson", [ok_result, error_result])
+
+        first, second = [json.loads(line) for line in text.splitlines()]
+        assert first == {"city": "Madrid", "data": ok_result.data.to_dict(), "error": None}
+        assert second["data"] is None
+        assert second["error"]["error"] == "not_found"
+        assert "Atlantis" in second["error"]["message"]
+        assert (writer.written, writer.failures) == (2, 1)
+
+    def test_csv_has_header_and_error_column(self, ok_result, error_result):
+        """Verifica el encabezado CSV y que los errores ocupen la columna error."""
+        text, _ = write_all("csv", [ok_result, error_result])
+
+        rows = list(csv.reader(io.StringIO(text)))
+        assert rows[0] == list(FIELDS) + ["error"]
+        assert rows[1][0] == "Madrid"
+        assert rows[1][-1] == ""
+        assert rows[2][0] == "Atlantis"
+        assert "Atlantis" in rows[2][-1]
+
+    def test_csv_writes_header_without_results(self):
+        """Verifica que un batch vacío igual produzca el encabezado CSV."""
+        text, _ = write_all("csv", [])
+
+        assert text == ",".join(FIELDS) + ",error\n"
+
+    def test_table_aligns_columns(self, ok_result, error_result):
+        """Verifica que la tabla tenga encabezado y columnas alineadas."""
+        text, _ = write_all("table", [ok_result, error_result])
+
+        header, rule, madrid, atlantis = text.splitlines()
+        assert header.startswith("Ciudad")
+        assert set(rule.replace(" ", "")) == {"-"}
+        assert madrid.index("ES") == header.index("País")
+        assert madrid.index("15.1") + len("15.1") == header.index("Viento km/h") + len("Viento km/h")
+        assert "ERROR:" in atlantis
+
+    def test_pretty_has_no_emojis_outside_a_tty(self, ok_result):
+        """Verifica que pretty omita los emojis si la salida no es una terminal."""
+        text, _ = write_all("pretty", [ok_result])
+
+        assert "MADRID" in text
+        assert "🌡️" not in text
+        assert "Temperatura:" in text
+
+    def test_buffers_writes_in_chunks(self, ok_result):
+        """Verifica que los resultados se vuelquen en bloques y no de a uno."""
+        stream = CountingStream()
+        with create_writer("ndjson", stream, buffer_size=1024) as writer:
+            for _ in range(100):
+                writer.write(ok_result)
+
+        assert len(stream.getvalue().splitlines()) == 100
+        assert 1 < stream.writes < 100
+
+    def test_flushes_each_result_on_a_tty(self, ok_result):
+        """Verifica que en una terminal cada resultado se escriba apenas llega."""
+        stream = CountingStream(tty=True)
+        writer = create_writer("pretty", stream)
+
+        writer.write(ok_result)
+
+        assert writer.flush_each and writer.emojis
+        assert "🌡️" in stream.getvalue().decode("utf-8")
+
+    def test_unknown_format_raises_value_error(self):
+        """Verifica que un formato desconocido se rechace."""
+        assert "ndjson" in FORMATS
+        with pytest.raises(ValueError):
+            create_writer("xml", io.BytesIO())